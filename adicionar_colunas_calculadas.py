@@ -3,10 +3,6 @@ import numpy as np
 from pathlib import Path
 import glob
 
-print(f"{'='*80}")
-print(f"PROCESSAMENTO DE DADOS - ADIÇÃO DE COLUNAS CALCULADAS")
-print(f"{'='*80}\n")
-
 # Diretórios para processar
 diretorios = [
     "dados_premier_league",
@@ -104,123 +100,132 @@ def processar_arquivo(filepath):
     except Exception as e:
         return None, f"Erro: {str(e)}"
 
-# Processar arquivos em cada diretório
-total_arquivos = 0
-total_jogos = 0
-resumo = []
+def main():
+    print(f"{'='*80}")
+    print(f"PROCESSAMENTO DE DADOS - ADIÇÃO DE COLUNAS CALCULADAS")
+    print(f"{'='*80}\n")
+
+    # Processar arquivos em cada diretório
+    total_arquivos = 0
+    total_jogos = 0
+    resumo = []
 
-for diretorio in diretorios:
-    dir_path = Path(diretorio)
+    for diretorio in diretorios:
+        dir_path = Path(diretorio)
     
-    if not dir_path.exists():
-        print(f"⚠ Diretório não encontrado: {diretorio}")
-        continue
+        if not dir_path.exists():
+            print(f"⚠ Diretório não encontrado: {diretorio}")
+            continue
     
-    print(f"\n{'='*80}")
-    print(f"PROCESSANDO: {diretorio}")
-    print(f"{'='*80}")
+        print(f"\n{'='*80}")
+        print(f"PROCESSANDO: {diretorio}")
+        print(f"{'='*80}")
     
-    # Buscar arquivos CSV (excluir arquivos temporários e individuais)
-    arquivos = glob.glob(str(dir_path / "*_completo.csv"))
+        # Buscar arquivos CSV (excluir arquivos temporários e individuais)
+        arquivos = glob.glob(str(dir_path / "*_completo.csv"))
     
-    if not arquivos:
-        # Tentar padrão alternativo
-        arquivos = glob.glob(str(dir_path / "*.csv"))
-        # Filtrar apenas consolidados
-        arquivos = [f for f in arquivos if '_completo' in f or 'premier_league_completo' in f]
+        if not arquivos:
+            # Tentar padrão alternativo
+            arquivos = glob.glob(str(dir_path / "*.csv"))
+            # Filtrar apenas consolidados
+            arquivos = [f for f in arquivos if '_completo' in f or 'premier_league_completo' in f]
     
-    if not arquivos:
-        print(f"  ⚠ Nenhum arquivo encontrado")
-        continue
+        if not arquivos:
+            print(f"  ⚠ Nenhum arquivo encontrado")
+            continue
     
-    print(f"  Encontrados {len(arquivos)} arquivos\n")
+        print(f"  Encontrados {len(arquivos)} arquivos\n")
     
-    for arquivo in sorted(arquivos):
-        filename = Path(arquivo).name
-        print(f"  Processando {filename}...", end=" ")
-        
-        jogos, mensagem = processar_arquivo(arquivo)
-        
-        if jogos:
-            print(f"✓ {mensagem}")
-            total_arquivos += 1
-            total_jogos += jogos
-            resumo.append({
-                'arquivo': filename,
-                'jogos': jogos,
-                'status': 'OK'
-            })
-        else:
-            print(f"✗ {mensagem}")
-            resumo.append({
-                'arquivo': filename,
-                'jogos': 0,
-                'status': mensagem
-            })
+        for arquivo in sorted(arquivos):
+            filename = Path(arquivo).name
+            print(f"  Processando {filename}...", end=" ")
+        
+            jogos, mensagem = processar_arquivo(arquivo)
+        
+            if jogos:
+                print(f"✓ {mensagem}")
+                total_arquivos += 1
+                total_jogos += jogos
+                resumo.append({
+                    'arquivo': filename,
+                    'jogos': jogos,
+                    'status': 'OK'
+                })
+            else:
+                print(f"✗ {mensagem}")
+                resumo.append({
+                    'arquivo': filename,
+                    'jogos': 0,
+                    'status': mensagem
+                })
 
-# Processar arquivos do padrão /new
-dir_new = Path("dados_ligas_new")
-if dir_new.exists():
-    print(f"\n{'='*80}")
-    print(f"PROCESSANDO: dados_ligas_new")
-    print(f"{'='*80}")
+    # Processar arquivos do padrão /new
+    dir_new = Path("dados_ligas_new")
+    if dir_new.exists():
+        print(f"\n{'='*80}")
+        print(f"PROCESSANDO: dados_ligas_new")
+        print(f"{'='*80}")
     
-    arquivos_new = glob.glob(str(dir_new / "*.csv"))
-    # Excluir relatórios
-    arquivos_new = [f for f in arquivos_new if 'relatorio' not in f.lower()]
+        arquivos_new = glob.glob(str(dir_new / "*.csv"))
+        # Excluir relatórios
+        arquivos_new = [f for f in arquivos_new if 'relatorio' not in f.lower()]
     
-    print(f"  Encontrados {len(arquivos_new)} arquivos\n")
+        print(f"  Encontrados {len(arquivos_new)} arquivos\n")
     
-    for arquivo in sorted(arquivos_new):
-        filename = Path(arquivo).name
-        print(f"  Processando {filename}...", end=" ")
-        
-        jogos, mensagem = processar_arquivo(arquivo)
-        
-        if jogos:
-            print(f"✓ {mensagem}")
-            total_arquivos += 1
-            total_jogos += jogos
-            resumo.append({
-                'arquivo': filename,
-                'jogos': jogos,
-                'status': 'OK'
-            })
-        else:
-            print(f"✗ {mensagem}")
-            resumo.append({
-                'arquivo': filename,
-                'jogos': 0,
-                'status': mensagem
-            })
+        for arquivo in sorted(arquivos_new):
+            filename = Path(arquivo).name
+            print(f"  Processando {filename}...", end=" ")
+        
+            jogos, mensagem = processar_arquivo(arquivo)
+        
+            if jogos:
+                print(f"✓ {mensagem}")
+                total_arquivos += 1
+                total_jogos += jogos
+                resumo.append({
+                    'arquivo': filename,
+                    'jogos': jogos,
+                    'status': 'OK'
+                })
+            else:
+                print(f"✗ {mensagem}")
+                resumo.append({
+                    'arquivo': filename,
+                    'jogos': 0,
+                    'status': mensagem
+                })
+
+    # Relatório final
+    print(f"\n{'='*80}")
+    print(f"RELATÓRIO FINAL")
+    print(f"{'='*80}\n")
+
+    df_resumo = pd.DataFrame(resumo)
+    df_resumo_ok = df_resumo[df_resumo['status'] == 'OK']
 
-# Relatório final
-print(f"\n{'='*80}")
-print(f"RELATÓRIO FINAL")
-print(f"{'='*80}\n")
+    if len(df_resumo_ok) > 0:
+        print(f"✓ Arquivos processados com sucesso: {len(df_resumo_ok)}")
+        print(f"✓ Total de jogos processados: {total_jogos:,}")
+        print(f"\nArquivos processados:")
+        for _, row in df_resumo_ok.iterrows():
+            print(f"  - {row['arquivo']}: {row['jogos']:,} jogos")
 
-df_resumo = pd.DataFrame(resumo)
-df_resumo_ok = df_resumo[df_resumo['status'] == 'OK']
+    if len(df_resumo[df_resumo['status'] != 'OK']) > 0:
+        print(f"\n⚠ Arquivos com problemas: {len(df_resumo[df_resumo['status'] != 'OK'])}")
+        for _, row in df_resumo[df_resumo['status'] != 'OK'].iterrows():
+            print(f"  - {row['arquivo']}: {row['status']}")
 
-if len(df_resumo_ok) > 0:
-    print(f"✓ Arquivos processados com sucesso: {len(df_resumo_ok)}")
-    print(f"✓ Total de jogos processados: {total_jogos:,}")
-    print(f"\nArquivos processados:")
-    for _, row in df_resumo_ok.iterrows():
-        print(f"  - {row['arquivo']}: {row['jogos']:,} jogos")
+    print(f"\n{'='*80}")
+    print(f"COLUNAS ADICIONADAS:")
+    print(f"{'='*80}")
+    print(f"  • CGH = 1 / (B365H * GH), quando GH = 0, CGH = 1")
+    print(f"  • CGA = 1 / (B365A * GA), quando GA = 0, CGA = 1")
+    print(f"  • VGH = GH / B365A")
+    print(f"  • VGA = GA / B365H")
+    print(f"\n{'='*80}")
+    print(f"CONCLUÍDO!")
+    print(f"{'='*80}")
 
-if len(df_resumo[df_resumo['status'] != 'OK']) > 0:
-    print(f"\n⚠ Arquivos com problemas: {len(df_resumo[df_resumo['status'] != 'OK'])}")
-    for _, row in df_resumo[df_resumo['status'] != 'OK'].iterrows():
-        print(f"  - {row['arquivo']}: {row['status']}")
 
-print(f"\n{'='*80}")
-print(f"COLUNAS ADICIONADAS:")
-print(f"{'='*80}")
-print(f"  • CGH = 1 / (B365H * GH), quando GH = 0, CGH = 1")
-print(f"  • CGA = 1 / (B365A * GA), quando GA = 0, CGA = 1")
-print(f"  • VGH = GH / B365A")
-print(f"  • VGA = GA / B365H")
-print(f"\n{'='*80}")
-print(f"CONCLUÍDO!")
-print(f"{'='*80}")
+if __name__ == '__main__':
+    main()
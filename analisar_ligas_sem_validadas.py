@@ -5,7 +5,7 @@ import requests
 import json
 
 try:
-    response = requests.get('http://localhost:5001/api/backtest_acumulado')
+    response = requests.get('http://localhost:5002/api/backtest_acumulado')
     data = response.json()
     
     if not data.get('success'):
@@ -80,7 +80,7 @@ try:
     print()
 
 except requests.exceptions.ConnectionError:
-    print("❌ Erro: Não consegui conectar à API em http://localhost:5001")
-    print("   Verifique se o servidor está rodando: python servidor_api.py")
+    print("❌ Erro: Não consegui conectar à API em http://localhost:5002")
+    print("   Verifique se o servidor está rodando: python servidor_analise_backtest.py")
 except Exception as e:
     print(f"❌ Erro: {e}")
@@ -3,8 +3,10 @@ import numpy as np
 from pathlib import Path
 import glob
 import warnings
-from scipy.stats import poisson
+from analise_colunar import CATEGORIAS_DXG, classificar_dxg
+from tabela_canonica import LIGAS, carregar_tabela, dicionario_liga
 from validador_combinacoes import carregar_combinacoes_validadas, validar_jogo
+from integracao_stake_sizing import adicionar_stakes_rodada
 
 # Suprimir warnings do pandas
 warnings.filterwarnings('ignore')
@@ -17,52 +19,9 @@ print(f"{'='*80}\n")
 combinacoes_validadas = carregar_combinacoes_validadas()
 print(f"[OK] Carregadas {len(combinacoes_validadas)} combinações validadas\n")
 
-# Mapeamento de códigos de liga para arquivos
-mapeamento_ligas = {
-    # Premier League e divisões inglesas
-    'E0': 'dados_ligas/E0_completo.csv',
-    'E1': 'dados_ligas/E1_completo.csv',
-    # Alemanha
-    'D1': 'dados_ligas/D1_completo.csv',
-    'D2': 'dados_ligas/D2_completo.csv',
-    # Itália
-    'I1': 'dados_ligas/I1_completo.csv',
-    'I2': 'dados_ligas/I2_completo.csv',
-    # França
-    'F1': 'dados_ligas/F1_completo.csv',
-    'F2': 'dados_ligas/F2_completo.csv',
-    # Espanha
-    'SP1': 'dados_ligas/SP1_completo.csv',
-    'SP2': 'dados_ligas/SP2_completo.csv',
-    # Portugal
-    'P1': 'dados_ligas/P1_completo.csv',
-    # Grécia
-    'G1': 'dados_ligas/G1_completo.csv',
-    # Turquia
-    'T1': 'dados_ligas/T1_completo.csv',
-    # Holanda
-    'N1': 'dados_ligas/N1_completo.csv',
-    # Bélgica
-    'B1': 'dados_ligas/B1_completo.csv',
-    # Ligas do padrão /new
-    'ARG': 'dados_ligas_new/ARG.csv',
-    'AUT': 'dados_ligas_new/AUT.csv',
-    'BRA': 'dados_ligas_new/BRA.csv',
-    'Serie A': 'dados_ligas_new/BRA.csv',  # Alias para Brasil
-    'CHN': 'dados_ligas_new/CHN.csv',
-    'DNK': 'dados_ligas_new/DNK.csv',
-    'FIN': 'dados_ligas_new/FIN.csv',
-    'IRL': 'dados_ligas_new/IRL.csv',
-    'JPN': 'dados_ligas_new/JPN.csv',
-    'MEX': 'dados_ligas_new/MEX.csv',
-    'NOR': 'dados_ligas_new/NOR.csv',
-    'POL': 'dados_ligas_new/POL.csv',
-    'ROU': 'dados_ligas_new/ROU.csv',
-    'RUS': 'dados_ligas_new/RUS.csv',
-    'SWE': 'dados_ligas_new/SWE.csv',
-    'SWZ': 'dados_ligas_new/SWZ.csv',
-    'USA': 'dados_ligas_new/USA.csv',
-}
+# Códigos de liga dos fixtures -> liga da tabela canônica (tabela_canonica.py)
+mapeamento_ligas = {liga: liga for liga in LIGAS}
+mapeamento_ligas['Serie A'] = 'BRA'  # Alias para Brasil
 
 # Cache para históricos das ligas
 cache_historicos = {}
@@ -121,135 +80,153 @@ def carregar_historico_liga(codigo_liga):
     if codigo_liga not in mapeamento_ligas:
         return None
     
-    arquivo = mapeamento_ligas[codigo_liga]
-    if not Path(arquivo).exists():
-        return None
-    
     try:
-        df = pd.read_csv(arquivo, low_memory=False)
-        # Verificar se tem as colunas necessárias
-        colunas_necessarias = ['CGH', 'CGA', 'VGH', 'VGA']
-        if not all(col in df.columns for col in colunas_necessarias):
+        df = carregar_tabela(mapeamento_ligas[codigo_liga])
+        if df is None:
             return None
+        # Só jogos com placar e odds (coeficientes calculados)
+        df = df.dropna(subset=['CGH', 'CGA', 'VGH', 'VGA'])
+        df['fonte_odds'] = df['fonte_odds'].cat.remove_unused_categories()
         
         cache_historicos[codigo_liga] = df
         return df
     except:
         return None
 
-def calcular_medias_historicas(time, eh_home, odd_time, odd_adversario, historico_liga, range_percent=0.07):
+# Colunas de odds dos fixtures, em ordem de preferência
+ODDS_FIXTURES = [
+    ('B365H', 'B365A'),      # Bet365 abertura (mais comum nos fixtures)
+    ('B365CH', 'B365CA'),    # Bet365 fechamento
+    ('PSCH', 'PSCA'),        # Pinnacle fechamento
+    ('PSH', 'PSA'),          # Pinnacle abertura
+    ('MaxCH', 'MaxCA'),      # Máxima fechamento
+    ('MaxH', 'MaxA'),        # Máxima abertura
+    ('AvgCH', 'AvgCA'),      # Média fechamento
+    ('AvgH', 'AvgA')         # Média abertura
+]
+
+# Índice por time do histórico de cada liga
+cache_indices = {}
+
+def indice_times_liga(codigo_liga):
+    """
+    Índice por time do histórico da liga, montado uma vez por liga.
+    
+    Para cada lado do confronto ('home': jogos como mandante, 'away': como
+    visitante) as linhas do histórico ficam ordenadas pelo id do time (na
+    ordem original dentro de cada time); inicio[id]:fim[id] é a fatia do
+    time em prob_time, prob_adv, cg e vg.
+    
+    Returns:
+        dict com 'times' (DicionarioTimes), 'fontes' (fontes de odds do
+        histórico), 'home' e 'away'; ou None se a liga não tiver histórico
+    """
+    if codigo_liga in cache_indices:
+        return cache_indices[codigo_liga]
+    
+    historico = carregar_historico_liga(codigo_liga)
+    if historico is None:
+        return None
+    
+    times = dicionario_liga(mapeamento_ligas[codigo_liga])
+    indice = {'times': times, 'fontes': set(historico['fonte_odds'].cat.categories)}
+    lados = [('home', 'id_home', 'prob_h', 'prob_a', 'CGH', 'VGH'),
+             ('away', 'id_away', 'prob_a', 'prob_h', 'CGA', 'VGA')]
+    for lado, coluna_id, prob_time, prob_adv, cg, vg in lados:
+        ids = historico[coluna_id].to_numpy()
+        ordem = np.argsort(ids, kind='stable')
+        ids_ordenados = ids[ordem]
+        indice[lado] = {
+            'inicio': np.searchsorted(ids_ordenados, np.arange(len(times)), side='left'),
+            'fim': np.searchsorted(ids_ordenados, np.arange(len(times)), side='right'),
+            'prob_time': historico[prob_time].to_numpy()[ordem],
+            'prob_adv': historico[prob_adv].to_numpy()[ordem],
+            'cg': historico[cg].to_numpy()[ordem],
+            'vg': historico[vg].to_numpy()[ordem],
+        }
+    
+    cache_indices[codigo_liga] = indice
+    return indice
+
+def calcular_medias_historicas(lado, ids, odd_time, odd_adversario, range_percent):
     """
-    Calcula médias e desvios padrão históricas de CGH/VGH ou CGA/VGA baseado em ranges de probabilidade
+    Calcula médias e desvios padrão históricos de CGH/VGH (lado home) ou CGA/VGA
+    (lado away) para um grupo de fixtures da mesma liga, baseado em ranges de probabilidade
     
     Args:
-        time: Nome do time
-        eh_home: True se o time joga em casa
-        odd_time: Odd do time (oddH se home, oddA se away)
-        odd_adversario: Odd do adversário (oddA se time home, oddH se time away)
-        historico_liga: DataFrame com histórico da liga
-        range_percent: Porcentagem do range (padrão 7% = 0.07)
+        lado: indice_times_liga(liga)['home'] ou ['away']
+        ids: array de ids dos times no dicionário da liga (SEM_ID se desconhecido)
+        odd_time: array de odds do time (oddH se home, oddA se away), > 0
+        odd_adversario: array de odds do adversário, > 0
+        range_percent: array de ranges (0.07 = ±7%)
     
     Returns:
-        (media_cg, media_vg, std_cg, std_vg) ou (None, None, None, None) se não houver dados
+        (media_cg, media_vg, std_cg, std_vg): arrays com NaN onde não há jogos
+        no range (desvio NaN com menos de 2 jogos, como no pandas)
     """
-    if historico_liga is None or len(historico_liga) == 0:
-        return None, None, None, None
+    n = len(ids)
+    conhecidos = (ids >= 0) & (ids < len(lado['inicio']))
+    ids_validos = np.where(conhecidos, ids, 0)
+    inicio = np.where(conhecidos, lado['inicio'][ids_validos], 0)
+    tamanhos = np.where(conhecidos, lado['fim'][ids_validos] - inicio, 0)
     
-    # Calcular probabilidades
-    prob_time = 1 / odd_time if odd_time > 0 else 0
-    prob_adversario = 1 / odd_adversario if odd_adversario > 0 else 0
+    # Jogos do time de cada fixture, todos de uma vez (fixture -> linhas da fatia)
+    fixture = np.repeat(np.arange(n), tamanhos)
+    deslocamento = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+    linhas = np.repeat(inicio, tamanhos) + deslocamento
     
     # Calcular ranges (±7%)
+    prob_time = 1 / odd_time
+    prob_adversario = 1 / odd_adversario
     prob_time_min = prob_time * (1 - range_percent)
     prob_time_max = prob_time * (1 + range_percent)
     prob_adv_min = prob_adversario * (1 - range_percent)
     prob_adv_max = prob_adversario * (1 + range_percent)
     
-    # Identificar colunas de odds (preferir B365H para compatibilidade com fixtures)
-    col_odd_h, col_odd_a = None, None
-    odds_priority = [
-        ('B365H', 'B365A'),      # Bet365 abertura (mais comum nos fixtures)
-        ('B365CH', 'B365CA'),    # Bet365 fechamento
-        ('PSCH', 'PSCA'),        # Pinnacle fechamento
-        ('PSH', 'PSA'),          # Pinnacle abertura
-        ('MaxCH', 'MaxCA'),
-        ('MaxH', 'MaxA'),
-        ('AvgCH', 'AvgCA'),
-        ('AvgH', 'AvgA')
-    ]
-    
-    for h_col, a_col in odds_priority:
-        if h_col in historico_liga.columns and a_col in historico_liga.columns:
-            col_odd_h = h_col
-            col_odd_a = a_col
-            break
-    
-    if not col_odd_h or not col_odd_a:
-        return None, None, None, None
-    
-    # Identificar coluna de time
-    col_home = 'HomeTeam' if 'HomeTeam' in historico_liga.columns else 'Home'
-    col_away = 'AwayTeam' if 'AwayTeam' in historico_liga.columns else 'Away'
-    
-    if eh_home:
-        # Time joga em casa: buscar jogos onde ele foi mandante
-        jogos_time = historico_liga[historico_liga[col_home] == time].copy()
-        
-        if len(jogos_time) == 0:
-            return None, None, None, None
-        
-        # Calcular probabilidades das odds históricas
-        jogos_time['prob_h'] = 1 / jogos_time[col_odd_h]
-        jogos_time['prob_a'] = 1 / jogos_time[col_odd_a]
-        
-        # Filtrar por range de probabilidade
-        jogos_filtrados = jogos_time[
-            (jogos_time['prob_h'] >= prob_time_min) & 
-            (jogos_time['prob_h'] <= prob_time_max) &
-            (jogos_time['prob_a'] >= prob_adv_min) & 
-            (jogos_time['prob_a'] <= prob_adv_max)
-        ]
-        
-        if len(jogos_filtrados) == 0:
-            return None, None, None, None
-        
-        # Calcular médias e desvios padrão de CGH e VGH
-        media_cgh = jogos_filtrados['CGH'].mean()
-        media_vgh = jogos_filtrados['VGH'].mean()
-        std_cgh = jogos_filtrados['CGH'].std()
-        std_vgh = jogos_filtrados['VGH'].std()
-        
-        return media_cgh, media_vgh, std_cgh, std_vgh
-    
-    else:
-        # Time joga fora: buscar jogos onde ele foi visitante
-        jogos_time = historico_liga[historico_liga[col_away] == time].copy()
-        
-        if len(jogos_time) == 0:
-            return None, None, None, None
-        
-        # Calcular probabilidades das odds históricas
-        jogos_time['prob_h'] = 1 / jogos_time[col_odd_h]
-        jogos_time['prob_a'] = 1 / jogos_time[col_odd_a]
-        
-        # Filtrar por range de probabilidade (invertido: odd do time é oddA, do adversário é oddH)
-        jogos_filtrados = jogos_time[
-            (jogos_time['prob_a'] >= prob_time_min) & 
-            (jogos_time['prob_a'] <= prob_time_max) &
-            (jogos_time['prob_h'] >= prob_adv_min) & 
-            (jogos_time['prob_h'] <= prob_adv_max)
-        ]
-        
-        if len(jogos_filtrados) == 0:
-            return None, None, None, None
-        
-        # Calcular médias e desvios padrão de CGA e VGA
-        media_cga = jogos_filtrados['CGA'].mean()
-        media_vga = jogos_filtrados['VGA'].mean()
-        std_cga = jogos_filtrados['CGA'].std()
-        std_vga = jogos_filtrados['VGA'].std()
-        
-        return media_cga, media_vga, std_cga, std_vga
+    # Filtrar por range de probabilidade
+    pt = lado['prob_time'][linhas]
+    pa = lado['prob_adv'][linhas]
+    no_range = ((pt >= prob_time_min[fixture]) & (pt <= prob_time_max[fixture]) &
+                (pa >= prob_adv_min[fixture]) & (pa <= prob_adv_max[fixture]))
+    fixture = fixture[no_range]
+    linhas = linhas[no_range]
+    
+    contagem = np.bincount(fixture, minlength=n)
+    estatisticas = []
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for coluna in ('cg', 'vg'):
+            valores = lado[coluna][linhas]
+            media = np.bincount(fixture, valores, minlength=n) / contagem
+            desvio = np.sqrt(np.bincount(fixture, (valores - media[fixture]) ** 2, minlength=n) / (contagem - 1))
+            media[contagem == 0] = np.nan
+            desvio[contagem < 2] = np.nan
+            estatisticas.append((media, desvio))
+    (media_cg, std_cg), (media_vg, std_vg) = estatisticas
+    return media_cg, media_vg, std_cg, std_vg
+
+def calcular_probabilidades_poisson(xgh, xga):
+    """
+    Probabilidades de vitória da casa, empate e vitória visitante por Poisson
+    (0-5 gols), vetorizado. Mesma soma do backtest_engine.py.
+    """
+    from scipy.stats import poisson
+
+    gols = np.arange(6)
+    pmf_h = poisson.pmf(gols[None, :], xgh[:, None])
+    pmf_a = poisson.pmf(gols[None, :], xga[:, None])
+    
+    prob_home_win = np.zeros(len(xgh))
+    prob_away_win = np.zeros(len(xgh))
+    for h in range(0, 6):
+        for a in range(0, 6):
+            if h > a:
+                prob_home_win += pmf_h[:, h] * pmf_a[:, a]
+            elif a > h:
+                prob_away_win += pmf_h[:, h] * pmf_a[:, a]
+    
+    # Probabilidade de empate (mais preciso: 1 - soma das outras)
+    prob_draw = 1.0 - prob_home_win - prob_away_win
+    return prob_home_win, prob_draw, prob_away_win
 
 # Carregar fixtures da próxima rodada
 # Buscar o arquivo mais recente (excluir o arquivo com_analise.csv)
@@ -264,24 +241,12 @@ df_fixtures = pd.read_csv(fixture_path)
 print(f"{len(df_fixtures)} jogos encontrados\n")
 
 # Criar colunas para as médias
-df_fixtures['MCGH'] = np.nan
-df_fixtures['MVGH'] = np.nan
-df_fixtures['MCGA'] = np.nan
-df_fixtures['MVGA'] = np.nan
-df_fixtures['DesvioPadrão_MCGH'] = np.nan
-df_fixtures['DesvioPadrão_MVGH'] = np.nan
-df_fixtures['DesvioPadrão_MCGA'] = np.nan
-df_fixtures['DesvioPadrão_MVGA'] = np.nan
-df_fixtures['CFxGH'] = np.nan
-df_fixtures['CFxGA'] = np.nan
-df_fixtures['xGH'] = np.nan
-df_fixtures['xGA'] = np.nan
-df_fixtures['PROB_H'] = np.nan
-df_fixtures['PROB_D'] = np.nan
-df_fixtures['PROB_A'] = np.nan
-df_fixtures['ODD_H_CALC'] = np.nan
-df_fixtures['ODD_D_CALC'] = np.nan
-df_fixtures['ODD_A_CALC'] = np.nan
+COLUNAS_ANALISE = ['MCGH', 'MVGH', 'MCGA', 'MVGA',
+                   'DesvioPadrão_MCGH', 'DesvioPadrão_MVGH', 'DesvioPadrão_MCGA', 'DesvioPadrão_MVGA',
+                   'CFxGH', 'CFxGA', 'xGH', 'xGA', 'PROB_H', 'PROB_D', 'PROB_A',
+                   'ODD_H_CALC', 'ODD_D_CALC', 'ODD_A_CALC']
+for coluna in COLUNAS_ANALISE:
+    df_fixtures[coluna] = np.nan
 # Colunas de validação de combinações
 df_fixtures['VALIDADA_HOME'] = 'NÃO'
 df_fixtures['VALIDADA_AWAY'] = 'NÃO'
@@ -291,214 +256,116 @@ print("Calculando médias históricas...\n")
 sucessos = 0
 sem_historico = 0
 sem_dados = 0
+# Resultado de cada jogo para o log (na ordem dos fixtures)
+situacao = pd.Series('', index=df_fixtures.index, dtype=object)
 
-for idx, row in df_fixtures.iterrows():
-    liga = row['LIGA']
-    home = row['HOME']
-    away = row['AWAY']
-    data = row.get('DATA', '')  # Extrair data para calcular temporada
-    
-    print(f"[{idx+1}/{len(df_fixtures)}] {liga}: {home} vs {away}", end=" ")
-    
-    # Carregar histórico da liga primeiro
-    historico = carregar_historico_liga(liga)
-    if historico is None:
-        print("Sem historico")
-        sem_historico += 1
-        continue
-    
-    # Range dinâmico baseado na data do jogo (ano)
-    # Primeira temporada (2013): ±12%, Segunda (2014): ±10%, Terceira+ (2015+): ±7%
-    range_percent = calcular_range_percent(data)
-    
-    # Debug: mostrar qual range está sendo usado
-    debug_ano = int(data.split('/')[1]) if '/' in data else 'desconhecido'
-    debug_range = f"±{int(range_percent*100)}%"
-    
-    # Identificar quais odds usar baseado no histórico e fixtures
-    odds_h_col, odds_a_col = None, None
-    odds_options = [
-        ('B365H', 'B365A'),      # Bet365 abertura (mais comum nos fixtures)
-        ('B365CH', 'B365CA'),    # Bet365 fechamento
-        ('PSCH', 'PSCA'),        # Pinnacle fechamento
-        ('PSH', 'PSA'),          # Pinnacle abertura
-        ('MaxCH', 'MaxCA'),      # Máxima fechamento
-        ('MaxH', 'MaxA'),        # Máxima abertura
-        ('AvgCH', 'AvgCA'),      # Média fechamento
-        ('AvgH', 'AvgA')         # Média abertura
-    ]
-    
-    # Primeiro tentar encontrar odds que existem em ambos (histórico e fixtures)
-    for h_col, a_col in odds_options:
-        if (h_col in historico.columns and a_col in historico.columns and 
-            h_col in row.index and a_col in row.index and
-            pd.notna(row.get(h_col)) and pd.notna(row.get(a_col))):
-            odds_h_col = h_col
-            odds_a_col = a_col
-            break
-    
-    # Se não encontrou, usar B365H dos fixtures com qualquer odds do histórico
-    if not odds_h_col and 'B365H' in row.index and 'B365A' in row.index:
-        if pd.notna(row.get('B365H')) and pd.notna(row.get('B365A')):
-            # Usar B365H dos fixtures
-            odds_h_col = 'B365H'
-            odds_a_col = 'B365A'
-    
-    if not odds_h_col:
-        print("Sem odds compativeis")
-        sem_dados += 1
+# Uma passada por liga: histórico e índice por time resolvidos uma vez, estatísticas em arrays
+for liga, grupo in df_fixtures.groupby('LIGA', sort=False, dropna=False):
+    indice = indice_times_liga(liga)
+    if indice is None:
+        situacao[grupo.index] = "Sem historico"
+        sem_historico += len(grupo)
         continue
     
-    odd_h = row.get(odds_h_col, np.nan)
-    odd_a = row.get(odds_a_col, np.nan)
+    # Odds: primeiro par que existe no histórico e nos fixtures; senão B365H/B365A dos fixtures
+    n = len(grupo)
+    odd_h = np.full(n, np.nan)
+    odd_a = np.full(n, np.nan)
+    com_odds = np.zeros(n, dtype=bool)
+    pares = [(h, a) for h, a in ODDS_FIXTURES if h[:-1] in indice['fontes']] + [('B365H', 'B365A')]
+    for h_col, a_col in pares:
+        if h_col not in grupo.columns or a_col not in grupo.columns:
+            continue
+        odds_h = pd.to_numeric(grupo[h_col], errors='coerce').to_numpy(dtype=float)
+        odds_a = pd.to_numeric(grupo[a_col], errors='coerce').to_numpy(dtype=float)
+        usar = ~com_odds & ~np.isnan(odds_h) & ~np.isnan(odds_a)
+        odd_h[usar] = odds_h[usar]
+        odd_a[usar] = odds_a[usar]
+        com_odds |= usar
     
     # Verificar se tem odds válidas
-    if pd.isna(odd_h) or pd.isna(odd_a) or odd_h <= 0 or odd_a <= 0:
-        print("Sem odds validas")
-        sem_dados += 1
+    with np.errstate(invalid='ignore'):
+        validas = com_odds & (odd_h > 0) & (odd_a > 0)
+    situacao[grupo.index[~com_odds]] = "Sem odds compativeis"
+    situacao[grupo.index[com_odds & ~validas]] = "Sem odds validas"
+    sem_dados += int((~validas).sum())
+    if not validas.any():
         continue
     
-    # Calcular médias para time home
-    mcgh, mvgh, std_mcgh, std_mvgh = calcular_medias_historicas(home, True, odd_h, odd_a, historico, range_percent=range_percent)
-    
-    # Calcular médias para time away
-    mcga, mvga, std_mcga, std_mvga = calcular_medias_historicas(away, False, odd_a, odd_h, historico, range_percent=range_percent)
+    jogos = grupo[validas]
+    odd_h = odd_h[validas]
+    odd_a = odd_a[validas]
     
-    # Atualizar DataFrame
-    if mcgh is not None:
-        df_fixtures.at[idx, 'MCGH'] = mcgh
-        df_fixtures.at[idx, 'MVGH'] = mvgh
-        if pd.notna(std_mcgh):
-            df_fixtures.at[idx, 'DesvioPadrão_MCGH'] = std_mcgh
-        if pd.notna(std_mvgh):
-            df_fixtures.at[idx, 'DesvioPadrão_MVGH'] = std_mvgh
-    
-    if mcga is not None:
-        df_fixtures.at[idx, 'MCGA'] = mcga
-        df_fixtures.at[idx, 'MVGA'] = mvga
-        if pd.notna(std_mcga):
-            df_fixtures.at[idx, 'DesvioPadrão_MCGA'] = std_mcga
-        if pd.notna(std_mvga):
-            df_fixtures.at[idx, 'DesvioPadrão_MVGA'] = std_mvga
-    
-    # Calcular coeficientes de confiança (CF)
-    if (mcgh is not None and pd.notna(std_mcgh) and pd.notna(std_mvgh) and 
-        mcgh > 0 and mvgh > 0):
-        try:
-            cv_cgh = std_mcgh / mcgh
-            cv_vgh = std_mvgh / mvgh
-            cfxgh = 1 / (1 + np.sqrt(cv_cgh**2 + cv_vgh**2))
-            df_fixtures.at[idx, 'CFxGH'] = cfxgh
-        except:
-            pass
-    
-    if (mcga is not None and pd.notna(std_mcga) and pd.notna(std_mvga) and 
-        mcga > 0 and mvga > 0):
-        try:
-            cv_cga = std_mcga / mcga
-            cv_vga = std_mvga / mvga
-            cfxga = 1 / (1 + np.sqrt(cv_cga**2 + cv_vga**2))
-            df_fixtures.at[idx, 'CFxGA'] = cfxga
-        except:
-            pass
-    
-    # Calcular xGH e xGA
-    if mcgh is not None and mcga is not None and mvgh is not None:
-        try:
-            # xGH = (1 + MCGH * MVGH * oddH * oddA) / (2 * MCGH * oddH)
-            xgh = (1 + mcgh * mvgh * odd_h * odd_a) / (2 * mcgh * odd_h)
-            df_fixtures.at[idx, 'xGH'] = xgh
-        except:
-            pass
-    
-    if mcga is not None and mcgh is not None and mvga is not None:
-        try:
-            # xGA = (1 + MCGA * MVGA * oddH * oddA) / (2 * MCGA * oddA)
-            xga = (1 + mcga * mvga * odd_h * odd_a) / (2 * mcga * odd_a)
-            df_fixtures.at[idx, 'xGA'] = xga
-        except:
-            pass
-    
-    # Calcular probabilidades usando Poisson se temos xGH e xGA
-    xgh = df_fixtures.at[idx, 'xGH']
-    xga = df_fixtures.at[idx, 'xGA']
-    
-    # Calcular DxG e validar combinações
-    dxg_tipo = ''
-    if pd.notna(xgh) and pd.notna(xga):
-        try:
-            diff = float(xgh) - float(xga)
-            if diff < -1.0:
-                dxg_tipo = 'FA'
-            elif -1.0 <= diff < -0.3:
-                dxg_tipo = 'LA'
-            elif -0.3 <= diff <= 0.3:
-                dxg_tipo = 'EQ'
-            elif 0.3 < diff <= 1.0:
-                dxg_tipo = 'LH'
-            else:
-                dxg_tipo = 'FH'
-        except:
-            pass
-    
-    # Validar combinações
-    if dxg_tipo and liga:
-        # Verificar HOME
-        if validar_jogo(liga, 'HOME', dxg_tipo, combinacoes_validadas):
-            df_fixtures.at[idx, 'VALIDADA_HOME'] = 'SIM'
+    # Range dinâmico baseado na data do jogo (ano)
+    # Primeira temporada (2013): ±12%, Segunda (2014): ±10%, Terceira+ (2015+): ±7%
+    datas = jogos['DATA'] if 'DATA' in jogos.columns else pd.Series('', index=jogos.index)
+    range_percent = datas.map(calcular_range_percent).to_numpy(dtype=float)
+    
+    # Ids dos times no dicionário da liga (nomes normalizados + aliases)
+    ids_home = indice['times'].codificar(jogos['HOME'])
+    ids_away = indice['times'].codificar(jogos['AWAY'])
+    
+    # Médias para os mandantes e para os visitantes
+    mcgh, mvgh, std_mcgh, std_mvgh = calcular_medias_historicas(indice['home'], ids_home, odd_h, odd_a, range_percent)
+    mcga, mvga, std_mcga, std_mvga = calcular_medias_historicas(indice['away'], ids_away, odd_a, odd_h, range_percent)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Coeficientes de confiança (CF)
+        cfxgh = np.where(~np.isnan(std_mcgh) & ~np.isnan(std_mvgh) & (mcgh > 0) & (mvgh > 0),
+                         1 / (1 + np.sqrt((std_mcgh / mcgh)**2 + (std_mvgh / mvgh)**2)), np.nan)
+        cfxga = np.where(~np.isnan(std_mcga) & ~np.isnan(std_mvga) & (mcga > 0) & (mvga > 0),
+                         1 / (1 + np.sqrt((std_mcga / mcga)**2 + (std_mvga / mvga)**2)), np.nan)
         
-        # Verificar AWAY
-        if validar_jogo(liga, 'AWAY', dxg_tipo, combinacoes_validadas):
-            df_fixtures.at[idx, 'VALIDADA_AWAY'] = 'SIM'
-    
-    if pd.notna(xgh) and pd.notna(xga) and xgh > 0 and xga > 0:
-        try:
-            # Calcular odds esperadas usando distribuição de Poisson (0-6 gols)
-            # Implementação idêntica ao backtest_engine.py
-            
-            # Probabilidade de vitória da casa
-            prob_home_win = 0.0
-            for h in range(0, 6):
-                for a in range(0, 6):
-                    if h > a:
-                        prob_home_win += poisson.pmf(h, xgh) * poisson.pmf(a, xga)
-            
-            # Probabilidade de vitória visitante
-            prob_away_win = 0.0
-            for h in range(0, 6):
-                for a in range(0, 6):
-                    if a > h:
-                        prob_away_win += poisson.pmf(h, xgh) * poisson.pmf(a, xga)
-            
-            # Probabilidade de empate (mais preciso: 1 - soma das outras)
-            prob_draw = 1.0 - prob_home_win - prob_away_win
-            
-            # Salvar probabilidades
-            df_fixtures.at[idx, 'PROB_H'] = prob_home_win
-            df_fixtures.at[idx, 'PROB_D'] = prob_draw
-            df_fixtures.at[idx, 'PROB_A'] = prob_away_win
-            
-            # Converter para odds com margem de segurança (5% mínimo, odd máxima 20)
-            odd_home_calc = 1 / prob_home_win if prob_home_win > 0.05 else 20.0
-            odd_draw_calc = 1 / prob_draw if prob_draw > 0.05 else 20.0
-            odd_away_calc = 1 / prob_away_win if prob_away_win > 0.05 else 20.0
-            
-            df_fixtures.at[idx, 'ODD_H_CALC'] = odd_home_calc
-            df_fixtures.at[idx, 'ODD_D_CALC'] = odd_draw_calc
-            df_fixtures.at[idx, 'ODD_A_CALC'] = odd_away_calc
-        except Exception as e:
-            print(f"  ⚠️ Erro ao calcular Poisson: {e}")
-            pass
-    
-    if mcgh is not None and mcga is not None:
-        print(f"OK MCGH:{mcgh:.3f} MVGH:{mvgh:.3f} MCGA:{mcga:.3f} MVGA:{mvga:.3f}")
-        sucessos += 1
-    elif mcgh is not None or mcga is not None:
-        print(f"Parcial")
-        sucessos += 1
-    else:
-        print("Sem dados suficientes")
-        sem_dados += 1
+        # xGH = (1 + MCGH * MVGH * oddH * oddA) / (2 * MCGH * oddH)
+        # xGA = (1 + MCGA * MVGA * oddH * oddA) / (2 * MCGA * oddA)
+        ambos = ~np.isnan(mcgh) & ~np.isnan(mcga)
+        xgh = np.where(ambos, (1 + mcgh * mvgh * odd_h * odd_a) / (2 * mcgh * odd_h), np.nan)
+        xga = np.where(ambos, (1 + mcga * mvga * odd_h * odd_a) / (2 * mcga * odd_a), np.nan)
+    
+    # DxG e validação das combinações (HOME/AWAY) por tipo; código -1 (sem DxG) cai no 'NÃO' do fim
+    codigos_dxg = classificar_dxg(xgh, xga).codes
+    validada_home = np.array([('SIM' if validar_jogo(liga, 'HOME', tipo, combinacoes_validadas) else 'NÃO')
+                              for tipo in CATEGORIAS_DXG] + ['NÃO'], dtype=object)
+    validada_away = np.array([('SIM' if validar_jogo(liga, 'AWAY', tipo, combinacoes_validadas) else 'NÃO')
+                              for tipo in CATEGORIAS_DXG] + ['NÃO'], dtype=object)
+    
+    # Probabilidades e odds esperadas por Poisson (implementação idêntica ao backtest_engine.py)
+    with np.errstate(invalid='ignore'):
+        com_xg = (xgh > 0) & (xga > 0)
+    prob_h = np.full(len(jogos), np.nan)
+    prob_d = np.full(len(jogos), np.nan)
+    prob_a = np.full(len(jogos), np.nan)
+    if com_xg.any():
+        prob_h[com_xg], prob_d[com_xg], prob_a[com_xg] = calcular_probabilidades_poisson(xgh[com_xg], xga[com_xg])
+    
+    # Converter para odds com margem de segurança (5% mínimo, odd máxima 20)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        odd_h_calc = np.where(com_xg, np.where(prob_h > 0.05, 1 / prob_h, 20.0), np.nan)
+        odd_d_calc = np.where(com_xg, np.where(prob_d > 0.05, 1 / prob_d, 20.0), np.nan)
+        odd_a_calc = np.where(com_xg, np.where(prob_a > 0.05, 1 / prob_a, 20.0), np.nan)
+    
+    # Atualizar DataFrame (todas as colunas do grupo de uma vez)
+    df_fixtures.loc[jogos.index, COLUNAS_ANALISE] = np.column_stack([
+        mcgh, mvgh, mcga, mvga, std_mcgh, std_mvgh, std_mcga, std_mvga,
+        cfxgh, cfxga, xgh, xga, prob_h, prob_d, prob_a, odd_h_calc, odd_d_calc, odd_a_calc,
+    ])
+    df_fixtures.loc[jogos.index, 'VALIDADA_HOME'] = validada_home[codigos_dxg]
+    df_fixtures.loc[jogos.index, 'VALIDADA_AWAY'] = validada_away[codigos_dxg]
+    
+    for idx, cgh, vgh, cga, vga in zip(jogos.index, mcgh, mvgh, mcga, mvga):
+        if not np.isnan(cgh) and not np.isnan(cga):
+            situacao[idx] = f"OK MCGH:{cgh:.3f} MVGH:{vgh:.3f} MCGA:{cga:.3f} MVGA:{vga:.3f}"
+            sucessos += 1
+        elif not np.isnan(cgh) or not np.isnan(cga):
+            situacao[idx] = "Parcial"
+            sucessos += 1
+        else:
+            situacao[idx] = "Sem dados suficientes"
+            sem_dados += 1
+
+for idx, liga, home, away, texto in zip(df_fixtures.index, df_fixtures['LIGA'], df_fixtures['HOME'],
+                                        df_fixtures['AWAY'], situacao):
+    print(f"[{idx+1}/{len(df_fixtures)}] {liga}: {home} vs {away} {texto}")
 
 # Adicionar coluna BACK (entrada HOME ou AWAY baseado em value bet)
 def calcular_entrada(row):
@@ -552,6 +419,9 @@ def calcular_entrada(row):
 
 df_fixtures['BACK'] = df_fixtures.apply(calcular_entrada, axis=1)
 
+# Stakes sugeridos para as entradas validadas da rodada (Kelly simultâneo: dividem a mesma banca)
+df_fixtures = adicionar_stakes_rodada(df_fixtures)
+
 # Salvar arquivo atualizado
 output_csv = Path("fixtures/proxima_rodada_com_analise.csv")
 df_fixtures.to_csv(output_csv, index=False, encoding='utf-8-sig')
@@ -0,0 +1,712 @@
+"""
+Camada de análise colunar sobre o backtest acumulado
+
+Carrega as entradas de fixtures/backtest_acumulado.json UMA vez em colunas
+tipadas (float64 / categóricas), normaliza em bloco as variantes de campos
+(GH/gc/fthg, LP/lp, xGH/xg_casa/xgh, B365H/odd_casa/b365h, ...) e expõe
+kernels de agrupamento (liga × DxG × entrada × faixa de odd) usados pelo
+relatório de padrões da IA (salvar_jogo.analisar_padroes_ia) e pela análise
+DxG dos backtests salvos (analisar_backtest_dxg).
+
+Resultados derivados do arquivo ficam memorizados por versão (mtime/tamanho):
+nada é recalculado até o backtest acumulado mudar.
+"""
+import json
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BASE_DIR = Path(__file__).parent
+BACKTEST_ACUMULADO = BASE_DIR / 'fixtures' / 'backtest_acumulado.json'
+
+CATEGORIAS_DXG = ['FH', 'LH', 'EQ', 'LA', 'FA']
+FAIXAS_ODD = ['1.0-1.5', '1.5-2.0', '2.0-3.0', '3.0-5.0', '5.0+']
+LIMITES_FAIXAS_ODD = [1.5, 2.0, 3.0, 5.0]
+MOMENTOS = ['INICIO', 'MEIO', 'FIM']
+
+# Variantes aceitas para cada campo canônico (em ordem de prioridade)
+VARIANTES_CAMPOS = {
+    'GH': ['GH', 'gc', 'fthg'],
+    'GA': ['GA', 'gv', 'ftag'],
+    'LP': ['LP', 'lp'],
+    'LIGA': ['LIGA', 'liga'],
+    'temporada': ['temporada'],
+    'data': ['data', 'date'],
+    'xGH': ['xGH', 'xg_casa', 'xgh'],
+    'xGA': ['xGA', 'xg_visitante', 'xga'],
+    'B365H': ['B365H', 'odd_casa', 'b365h'],
+    'B365A': ['B365A', 'odd_visitante', 'b365a'],
+    'ODD_H_CALC': ['ODD_H_CALC', 'odd_home_calc'],
+    'ODD_A_CALC': ['ODD_A_CALC', 'odd_away_calc'],
+    'entrada': ['entrada', 'ENTRADA'],
+}
+
+# Variantes para a análise DxG dos backtests (campos do engine têm prioridade)
+VARIANTES_BACKTEST_DXG = {
+    'GH': ['fthg', 'GH'],
+    'GA': ['ftag', 'GA'],
+    'xGH': ['xgh', 'xGH'],
+    'xGA': ['xga', 'xGA'],
+    'LP': ['lp', 'LP'],
+    'LIGA': ['liga', 'LIGA'],
+}
+
+_cache_versoes = {}
+_cache_lock = threading.Lock()
+
+
+def _colunas_brutas(entradas, variantes_campos):
+    """
+    {campo: Series object} com o primeiro valor não nulo entre as variantes
+    de cada campo (coalesce em bloco). Só as chaves presentes nas entradas
+    viram colunas: montar um DataFrame com todos os campos dos registros
+    custava mais que o resto da tabela.
+    """
+    chaves = set().union(*entradas) if entradas else set()
+    listas = {}
+    brutas = {}
+    for campo, variantes in variantes_campos.items():
+        valores = None
+        for chave in variantes:
+            if chave not in chaves:
+                continue
+            if chave not in listas:
+                listas[chave] = pd.Series([e.get(chave) for e in entradas], dtype=object)
+            valores = listas[chave] if valores is None else valores.where(valores.notna(), listas[chave])
+        brutas[campo] = valores if valores is not None else pd.Series([None] * len(entradas), dtype=object)
+    return brutas
+
+
+def _numerico(valores):
+    """Converte uma coluna object para float64 (aceita vírgula decimal)"""
+    numeros = pd.to_numeric(valores, errors='coerce').astype('float64')
+    falhas = numeros.isna() & valores.notna()
+    if falhas.any():
+        texto = valores[falhas].astype(str).str.replace(',', '.', regex=False)
+        numeros[falhas] = pd.to_numeric(texto, errors='coerce')
+    return numeros
+
+
+def classificar_dxg(xgh, xga):
+    """Classificação DxG vetorizada (mesmas faixas de salvar_jogo._calcular_dxg)"""
+    diff = np.asarray(xgh, dtype='float64') - np.asarray(xga, dtype='float64')
+    codigos = np.select(
+        [diff > 1.0, diff > 0.3, diff >= -0.3, diff >= -1.0],
+        [0, 1, 2, 3],
+        default=4
+    )
+    codigos[np.isnan(diff)] = -1
+    return pd.Categorical.from_codes(codigos, categories=CATEGORIAS_DXG)
+
+
+def classificar_faixa_odd(odds):
+    """Faixa de odd vetorizada: 1.0-1.5, 1.5-2.0, 2.0-3.0, 3.0-5.0, 5.0+"""
+    odds = np.asarray(odds, dtype='float64')
+    codigos = np.searchsorted(LIMITES_FAIXAS_ODD, odds, side='right')
+    codigos[np.isnan(odds)] = -1
+    return pd.Categorical.from_codes(codigos, categories=FAIXAS_ODD)
+
+
+def tabela_de_entradas(entradas):
+    """
+    Monta a tabela colunar a partir de uma lista de entradas (dicts).
+
+    Mantém apenas entradas com resultado completo (GH, GA e LP). A quantidade
+    de entradas brutas fica em tabela.attrs['total_entradas'].
+    """
+    entradas = [e for e in (entradas or []) if isinstance(e, dict)]
+    brutas = _colunas_brutas(entradas, VARIANTES_CAMPOS)
+
+    lp = _numerico(brutas['LP'])
+    completo = (brutas['GH'].notna() & brutas['GA'].notna() & lp.notna()).to_numpy()
+
+    df = pd.DataFrame({
+        'ordem': np.arange(len(entradas)),
+        'LIGA': brutas['LIGA'].fillna('Desconhecida').astype(str),
+        'temporada': brutas['temporada'].fillna('2024-25').astype(str),
+        'data': brutas['data'].fillna('').astype(str),
+        'GH': _numerico(brutas['GH']),
+        'GA': _numerico(brutas['GA']),
+        'LP': lp,
+    })
+
+    # xG ausente conta como 0 (como no cálculo original); texto inválido vira NaN
+    tem_xgh = brutas['xGH'].notna().to_numpy()
+    xgh = _numerico(brutas['xGH'].fillna(0)).to_numpy()
+    xga = _numerico(brutas['xGA'].fillna(0)).to_numpy()
+    df['xGH'] = xgh
+    df['xGA'] = xga
+    df['dxg'] = classificar_dxg(xgh, xga)
+
+    # Odds esperadas derivadas do xG quando não vierem no registro
+    odd_h_calc = _numerico(brutas['ODD_H_CALC']).to_numpy()
+    odd_a_calc = _numerico(brutas['ODD_A_CALC']).to_numpy()
+    xga_calc = _numerico(brutas['xGA'].fillna(1)).to_numpy()
+    soma = xgh + xga_calc
+    with np.errstate(divide='ignore', invalid='ignore'):
+        prob_casa = np.where(soma > 0, xgh / soma, np.nan)
+        odd_h_xg = np.where(prob_casa > 0, 1 / prob_casa, 2.0)
+        odd_a_xg = np.where((1 - prob_casa) > 0, 1 / (1 - prob_casa), 2.0)
+    derivar = np.isnan(odd_h_calc) & tem_xgh & (soma > 0)
+    odd_h_calc = np.where(derivar, odd_h_xg, odd_h_calc)
+    odd_a_calc = np.where(derivar, odd_a_xg, odd_a_calc)
+    odd_h_calc = np.where(~derivar & brutas['ODD_H_CALC'].isna().to_numpy(), 1.0, odd_h_calc)
+    odd_a_calc = np.where(~derivar & brutas['ODD_A_CALC'].isna().to_numpy(), 1.0, odd_a_calc)
+
+    b365h = _numerico(brutas['B365H'].fillna(0)).to_numpy()
+    b365a = _numerico(brutas['B365A'].fillna(0)).to_numpy()
+    df['B365H'] = b365h
+    df['B365A'] = b365a
+    df['ODD_H_CALC'] = odd_h_calc
+    df['ODD_A_CALC'] = odd_a_calc
+
+    # Odd apostada (value bet com 10% de margem) e faixa de odd
+    odds_validas = ~(np.isnan(b365h) | np.isnan(b365a) | np.isnan(odd_h_calc) | np.isnan(odd_a_calc))
+    value_home = odds_validas & (b365h > odd_h_calc * 1.1)
+    value_away = odds_validas & ~value_home & (b365a > odd_a_calc * 1.1)
+    odd_apostada = np.where(value_home, b365h, np.where(value_away, b365a, np.nan))
+    odd_apostada[odd_apostada == 0] = np.nan
+    df['odd_apostada'] = odd_apostada
+    df['faixa_odd'] = classificar_faixa_odd(odd_apostada)
+
+    entrada_calc = np.where(value_home, 'HOME', np.where(value_away, 'AWAY', None))
+    # Maiúsculas só nos valores distintos
+    codigos, distintos = pd.factorize(brutas['entrada'])
+    distintos = np.append(np.array([str(v).upper() for v in distintos], dtype=object), None)
+    entrada = pd.Series(distintos[codigos], dtype=object)
+    df['entrada'] = entrada.where(entrada.notna(), pd.Series(entrada_calc, dtype=object))
+
+    df = df[completo].reset_index(drop=True)
+    df['acerto'] = df['LP'] > 0
+    df['LIGA'] = df['LIGA'].astype('category')
+    df['temporada'] = df['temporada'].astype('category')
+    df['data'] = pd.Categorical(df['data'])  # categorias ordenadas: ordenar por data usa os códigos
+    df['entrada'] = df['entrada'].astype('category')
+    df.attrs['total_entradas'] = len(entradas)
+    return df
+
+
+def versao_arquivo(caminho):
+    """Versão de um arquivo de dados: (mtime em ns, tamanho) ou None se não existir"""
+    try:
+        stat = Path(caminho).stat()
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def memorizar_por_versao(caminho, nome, calcular):
+    """
+    Retorna calcular() memorizado por (arquivo, nome) enquanto a versão do
+    arquivo não mudar. Retorna None se o arquivo não existir.
+    """
+    versao = versao_arquivo(caminho)
+    if versao is None:
+        return None
+    chave = (str(Path(caminho).resolve()), nome)
+
+    with _cache_lock:
+        cache = _cache_versoes.get(chave)
+        if cache and cache[0] == versao:
+            return cache[1]
+
+    resultado = calcular()
+    with _cache_lock:
+        _cache_versoes[chave] = (versao, resultado)
+    return resultado
+
+
+def ler_entradas(caminho):
+    """Lê uma lista de entradas JSON (aceita arquivos com BOM)"""
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            entradas = json.load(f)
+    except UnicodeDecodeError:
+        with open(caminho, 'r', encoding='utf-8-sig') as f:
+            entradas = json.load(f)
+    return entradas if isinstance(entradas, list) else []
+
+
+def carregar_tabela(caminho=None):
+    """
+    Carrega a tabela colunar de um arquivo JSON de entradas.
+
+    O resultado fica em cache por processo e só é recalculado quando o
+    arquivo muda (mtime/tamanho). Retorna None se o arquivo não existir.
+    """
+    caminho = Path(caminho or BACKTEST_ACUMULADO)
+    return memorizar_por_versao(caminho, 'tabela', lambda: tabela_de_entradas(ler_entradas(caminho)))
+
+
+def agregar(df, chaves, ordenar=True):
+    """
+    Kernel de agrupamento: apostas, acertos, L/P, taxa (%) e ROI (%) por grupo.
+
+    Grupos vazios (categorias não observadas) e chaves nulas são descartados.
+    Com ordenar=False os grupos saem na ordem da primeira ocorrência.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=['apostas', 'acertos', 'lp', 'taxa', 'roi'])
+    grupos = df.groupby(chaves, observed=True, sort=ordenar)
+    stats = pd.DataFrame({
+        'apostas': grupos.size(),
+        'acertos': grupos['acerto'].sum().astype(int),
+        'lp': grupos['LP'].sum(),
+    })
+    stats['taxa'] = stats['acertos'] / stats['apostas'] * 100
+    stats['roi'] = stats['lp'] / stats['apostas'] * 100
+    return stats
+
+
+def como_dict(stats):
+    """Converte o resultado de agregar() em {chave_do_grupo: linha}"""
+    return dict(zip(stats.index, stats.itertuples(index=False)))
+
+
+def _marcar_momentos(df, chaves):
+    """
+    Ordena por data dentro de cada grupo (empates: ordem DxG, depois ordem
+    original) e marca INICIO (25%), MEIO e FIM (25%), mínimo de 2 jogos nas
+    pontas. Um jogo pode cair em INICIO e FIM quando o grupo é pequeno.
+    """
+    df = df.assign(_dxg=df['dxg'].cat.codes)
+    df = df.sort_values(chaves + ['data', '_dxg', 'ordem'], kind='stable')
+    grupos = df.groupby(chaves, observed=True, sort=False)
+    pos = grupos.cumcount().to_numpy()
+    total = grupos['LP'].transform('size').to_numpy()
+    pontas = np.maximum(2, (total * 0.25).astype(int))
+    return df.assign(
+        INICIO=pos < pontas,
+        MEIO=(pos >= pontas) & (pos < total - pontas),
+        FIM=pos >= total - pontas,
+    ).drop(columns='_dxg')
+
+
+def _desvio(valores, media):
+    return (sum((v - media) ** 2 for v in valores) / len(valores)) ** 0.5
+
+
+def analisar_padroes(tabela):
+    """
+    Relatório de padrões (seções 4.5, 4.6, 5.1 e 5.2) calculado com kernels
+    de agrupamento sobre a tabela colunar.
+
+    Returns:
+        dict com 'resumo', 'insights' e 'recomendacoes'
+    """
+    insights = []
+    recomendacoes = []
+
+    colunas = ['ordem', 'LIGA', 'temporada', 'data', 'dxg', 'faixa_odd', 'LP', 'acerto']
+    validos = tabela.loc[tabela['dxg'].notna(), colunas]
+    ligas = sorted(validos['LIGA'].unique().tolist())
+    por_liga = validos.groupby('LIGA', observed=True)['LP']
+    total_liga = por_liga.size().to_dict()
+    lp_liga = por_liga.sum().to_dict()
+    acertos_liga = validos.groupby('LIGA', observed=True)['acerto'].sum().to_dict()
+
+    stats_dxg = como_dict(agregar(validos, ['LIGA', 'dxg']))
+    stats_faixa = como_dict(agregar(validos[validos['faixa_odd'].notna()], ['LIGA', 'dxg', 'faixa_odd']))
+
+    # ==================== SECAO 4.5: ANALISE DE DxG POR LIGA ====================
+    insights.append("═" * 80)
+    insights.append("SECAO 4.5: ANALISE DE LUCRO, ROI E WINRATE POR DxG E LIGA")
+    insights.append("═" * 80)
+
+    for liga in ligas:
+        insights.append("")
+        insights.append(f"  ▼ LIGA: {liga}")
+        insights.append("  " + "─" * 76)
+
+        # Threshold: mínimo 3 entradas OU 15% do total da liga (o que for maior)
+        threshold_minimo = max(3, int(total_liga[liga] * 0.15))
+
+        for dxg in CATEGORIAS_DXG:
+            s = stats_dxg.get((liga, dxg))
+            if s is None or s.apostas < threshold_minimo:
+                continue
+
+            status = "★ LUCRATIVO" if s.lp > 0 and s.roi > 0 else "✗ PREJUIZO"
+            insights.append(f"    {dxg}: {s.apostas} apostas | {s.acertos} acertos ({s.taxa:.1f}%) | L/P: {s.lp:+.2f} | ROI: {s.roi:+.1f}% | {status}")
+
+            melhor_faixa = None
+            melhor_roi_faixa = -999
+            threshold_faixa = max(2, int(s.apostas * 0.20))  # Mínimo 2 ou 20% do DxG
+
+            for faixa_odd in FAIXAS_ODD:
+                f = stats_faixa.get((liga, dxg, faixa_odd))
+                if f is None or f.apostas < threshold_faixa:
+                    continue
+
+                status_faixa = "✓" if f.lp > 0 else "✗"
+                insights.append(f"      Odds {faixa_odd}: {f.apostas} ap. | {f.acertos} acertos ({f.taxa:.1f}%) | L/P: {f.lp:+.2f} | ROI: {f.roi:+.1f}% {status_faixa}")
+
+                if f.roi > melhor_roi_faixa and f.lp > 0:
+                    melhor_roi_faixa = f.roi
+                    melhor_faixa = faixa_odd
+
+            if melhor_faixa and melhor_roi_faixa > 0:
+                insights.append(f"      ★ MELHOR FAIXA: {melhor_faixa} com ROI {melhor_roi_faixa:+.1f}%")
+                recomendacoes.append(f"★ {liga} - {dxg}: Focar odds {melhor_faixa} (ROI {melhor_roi_faixa:+.1f}%)")
+
+    insights.append("")
+
+    # ==================== SECAO 4.6: ANALISE DE DxG POR MOMENTO DA TEMPORADA ====================
+    insights.append("═" * 80)
+    insights.append("SECAO 4.6: ANALISE DE DxG POR MOMENTO DA TEMPORADA (INICIO, MEIO, FIM)")
+    insights.append("═" * 80)
+
+    momentos_liga = _marcar_momentos(validos, ['LIGA'])
+    contagem_momento = {}
+    stats_momento = {}
+    for momento in MOMENTOS:
+        subset = momentos_liga[momentos_liga[momento]]
+        contagem_momento[momento] = subset.groupby('LIGA', observed=True).size().to_dict()
+        stats_momento[momento] = como_dict(agregar(subset, ['LIGA', 'dxg']))
+
+    rotulos = {'INICIO': 'INÍCIO', 'MEIO': 'MEIO', 'FIM': 'FIM'}
+    for liga in ligas:
+        n = {m: contagem_momento[m].get(liga, 0) for m in MOMENTOS}
+        insights.append("")
+        insights.append(f"  ▼ LIGA: {liga} (Total: {total_liga[liga]} jogos | Início: {n['INICIO']} | Meio: {n['MEIO']} | Fim: {n['FIM']})")
+        insights.append("  " + "─" * 76)
+
+        for momento in MOMENTOS:
+            if not n[momento]:
+                continue
+            insights.append(f"    └─ {rotulos[momento]} ({n[momento]} jogos):")
+
+            for dxg in CATEGORIAS_DXG:
+                s = stats_momento[momento].get((liga, dxg))
+                if s is None or s.apostas < 2:
+                    continue
+                status = "★" if s.lp > 0 and s.roi > 0 else "✗"
+                insights.append(f"       {dxg}: {s.apostas} ap. | {s.acertos} acer. ({s.taxa:.1f}%) | L/P: {s.lp:+.2f} | ROI: {s.roi:+.1f}% {status}")
+
+    insights.append("")
+
+    # ==================== SECAO 5: ANALISE DE TENDENCIAS ====================
+    insights.append("═" * 80)
+    insights.append("SECAO 5: TENDENCIAS E RECOMENDACOES POR LIGA (INCLUINDO COMPARACAO MULTI-TEMPORADA)")
+    insights.append("═" * 80)
+
+    # ==================== SECAO 5.1: ANALISE COMPARATIVA ENTRE TEMPORADAS ====================
+    insights.append("")
+    insights.append("─" * 80)
+    insights.append("SECAO 5.1: COMPARACAO DE ESTRATEGIAS ENTRE TEMPORADAS")
+    insights.append("─" * 80)
+
+    stats_temp = como_dict(agregar(validos, ['LIGA', 'temporada']))
+    stats_temp_dxg = como_dict(agregar(validos, ['LIGA', 'temporada', 'dxg']))
+    temporadas_por_liga = {}
+    for liga, temporada in stats_temp:
+        temporadas_por_liga.setdefault(liga, []).append(temporada)
+
+    momentos_temp = _marcar_momentos(validos, ['LIGA', 'temporada'])
+    stats_momento_temp = {
+        m: como_dict(agregar(momentos_temp[momentos_temp[m]], ['LIGA', 'dxg', 'temporada']))
+        for m in MOMENTOS
+    }
+    # {(liga, dxg, momento): [temporadas com jogos, mais recente primeiro]}
+    temporadas_momento = {}
+    for m in MOMENTOS:
+        for liga, dxg, temporada in sorted(stats_momento_temp[m], key=lambda k: k[2], reverse=True):
+            temporadas_momento.setdefault((liga, dxg, m), []).append(temporada)
+
+    for liga in ligas:
+        temporadas = sorted(temporadas_por_liga.get(liga, []), reverse=True)
+        if len(temporadas) < 2:
+            continue
+
+        insights.append("")
+        insights.append(f"  ▼ LIGA: {liga} ({len(temporadas)} temporadas)")
+        insights.append("  " + "─" * 76)
+
+        roi_por_dxg_temporada = {}  # {dxg: [roi por temporada]}
+
+        for temporada in temporadas:
+            t = stats_temp[(liga, temporada)]
+            insights.append(f"    📅 TEMPORADA {temporada}: {t.apostas} jogos | ROI: {t.roi:+.1f}%")
+
+            for dxg in CATEGORIAS_DXG:
+                s = stats_temp_dxg.get((liga, temporada, dxg))
+                if s is None or s.apostas < 2:
+                    continue
+                roi_por_dxg_temporada.setdefault(dxg, []).append(s.roi)
+                status = "✓" if s.lp > 0 else "✗"
+                insights.append(f"       {dxg}: {s.apostas} ap. | {s.acertos} acer. ({s.taxa:.1f}%) | ROI: {s.roi:+.1f}% {status}")
+
+        insights.append("")
+        insights.append("    🔍 ANALISE DE CONSISTENCIA ENTRE TEMPORADAS:")
+
+        estrategias_consistentes = []
+        for dxg in CATEGORIAS_DXG:
+            rois = roi_por_dxg_temporada.get(dxg, [])
+            if len(rois) < 2:
+                continue
+
+            roi_medio = sum(rois) / len(rois)
+            rois_positivos = sum(1 for r in rois if r > 0)
+            desvio = _desvio(rois, roi_medio)
+
+            if roi_medio > 5 and desvio < 20:
+                estrategias_consistentes.append({'dxg': dxg, 'roi_medio': roi_medio, 'desvio': desvio})
+                insights.append(f"       ★★ {dxg}: ESTRATEGIA CONSISTENTE - ROI médio {roi_medio:+.1f}% | Variação: {desvio:.1f}% | Lucro em {rois_positivos}/{len(rois)} temporadas")
+                recomendacoes.append(f"★★ {liga} - {dxg}: Estratégia CONSISTENTE entre temporadas (ROI médio {roi_medio:+.1f}%)")
+            elif desvio > 40:
+                insights.append(f"       ⚠ {dxg}: ALTA VARIACAO - ROI médio {roi_medio:+.1f}% | Variação: {desvio:.1f}% | Instável entre temporadas")
+            elif roi_medio > 0:
+                insights.append(f"       ★ {dxg}: LUCRATIVA - ROI médio {roi_medio:+.1f}% | Variação: {desvio:.1f}% | Lucro em {rois_positivos}/{len(rois)} temporadas")
+            else:
+                insights.append(f"       ✗ {dxg}: NÃO LUCRATIVA - ROI médio {roi_medio:+.1f}% | Evitar")
+
+        if estrategias_consistentes:
+            insights.append("")
+            insights.append(f"    💎 MELHORES ESTRATEGIAS PARA {liga}:")
+            for est in sorted(estrategias_consistentes, key=lambda x: x['roi_medio'], reverse=True)[:3]:
+                insights.append(f"       1º {est['dxg']}: ROI {est['roi_medio']:+.1f}% (±{est['desvio']:.1f}%)")
+
+        # ==================== ANALISE POR MOMENTO DA TEMPORADA (MULTI-TEMPORADA) ====================
+        insights.append("")
+        insights.append("    ⏱ ANALISE POR MOMENTO DA TEMPORADA (INICIO/MEIO/FIM):")
+
+        dxg_presentes = [d for d in CATEGORIAS_DXG if (liga, d) in stats_dxg]
+        roi_momentos = {}  # {dxg: {momento: [roi das temporadas com >= 2 jogos]}}
+        for dxg in dxg_presentes:
+            for momento in MOMENTOS:
+                temps = temporadas_momento.get((liga, dxg, momento), [])
+                if len(temps) < 2:
+                    continue
+                roi_momentos.setdefault(dxg, {})[momento] = [
+                    (temp, s.roi) for temp in temps
+                    for s in [stats_momento_temp[momento][(liga, dxg, temp)]]
+                    if s.apostas >= 2
+                ]
+
+        for dxg in dxg_presentes:
+            insights.append(f"       {dxg}:")
+
+            for momento, rois_temp in roi_momentos.get(dxg, {}).items():
+                if len(rois_temp) < 2:
+                    continue
+
+                rois_momento = [roi for _, roi in rois_temp]
+                roi_medio_momento = sum(rois_momento) / len(rois_momento)
+                desvio_momento = _desvio(rois_momento, roi_medio_momento)
+                rois_positivos_momento = sum(1 for r in rois_momento if r > 0)
+
+                if roi_medio_momento > 5 and desvio_momento < 15:
+                    status = "★★ CONSISTENTE"
+                    recomendacoes.append(f"★★ {liga} - {dxg} no {momento}: Altamente consistente (ROI médio {roi_medio_momento:+.1f}%)")
+                elif roi_medio_momento > 0:
+                    status = "★ LUCRATIVO"
+                else:
+                    status = "✗"
+
+                temporadas_str = " | ".join(f"{temp}:{roi:+.1f}%" for temp, roi in rois_temp)
+                insights.append(f"          {momento}: ROI médio {roi_medio_momento:+.1f}% (±{desvio_momento:.1f}%) | {rois_positivos_momento}/{len(rois_momento)} temp. lucrativas | {status}")
+                insights.append(f"             [{temporadas_str}]")
+
+        insights.append("")
+        insights.append("    🎯 PADROES IDENTIFICADOS:")
+
+        for dxg in dxg_presentes:
+            roi_por_momento = {
+                momento: sum(roi for _, roi in rois_temp) / len(rois_temp)
+                for momento, rois_temp in roi_momentos.get(dxg, {}).items()
+                if rois_temp
+            }
+            if len(roi_por_momento) < 2:
+                continue
+
+            melhor_momento = max(roi_por_momento, key=roi_por_momento.get)
+            pior_momento = min(roi_por_momento, key=roi_por_momento.get)
+            diferenca = roi_por_momento[melhor_momento] - roi_por_momento[pior_momento]
+
+            if diferenca > 15:
+                insights.append(f"       • {dxg}: FORTE preferência pelo {melhor_momento} (ROI {roi_por_momento[melhor_momento]:+.1f}% vs {roi_por_momento[pior_momento]:+.1f}% no {pior_momento})")
+                recomendacoes.append(f"⏱ {liga} - {dxg}: Focar no {melhor_momento} da temporada (+{diferenca:.1f}% de diferença)")
+            elif diferenca > 8:
+                insights.append(f"       • {dxg}: Melhor desempenho no {melhor_momento} (ROI {roi_por_momento[melhor_momento]:+.1f}%)")
+
+    insights.append("")
+
+    # ==================== SECAO 5.2: TENDENCIAS POR LIGA (ANÁLISE GERAL) ====================
+    insights.append("─" * 80)
+    insights.append("SECAO 5.2: TENDENCIAS GERAIS POR LIGA")
+    insights.append("─" * 80)
+
+    lp_inicio = momentos_liga[momentos_liga['INICIO']].groupby('LIGA', observed=True)['LP'].mean().to_dict()
+    lp_fim = momentos_liga[momentos_liga['FIM']].groupby('LIGA', observed=True)['LP'].mean().to_dict()
+
+    for liga in ligas:
+        total_entradas_liga = total_liga[liga]
+        total_lp_liga = lp_liga[liga]
+        taxa_liga = acertos_liga[liga] / total_entradas_liga * 100
+        roi_liga = total_lp_liga / total_entradas_liga * 100
+
+        insights.append("")
+        insights.append(f"  ▼ LIGA: {liga}")
+        insights.append(f"     Total: {total_entradas_liga} apostas | Taxa: {taxa_liga:.1f}% | L/P: {total_lp_liga:+.2f} | ROI: {roi_liga:+.1f}%")
+
+        melhor_dxg_roi = None
+        melhor_dxg_valor = -999
+        threshold_minimo = max(3, int(total_entradas_liga * 0.15))
+        for dxg in CATEGORIAS_DXG:
+            s = stats_dxg.get((liga, dxg))
+            if s is None or s.apostas < threshold_minimo:
+                continue
+            if s.roi > melhor_dxg_valor:
+                melhor_dxg_valor = s.roi
+                melhor_dxg_roi = dxg
+
+        desempenho_inicio = lp_inicio[liga] * 100 if liga in lp_inicio else None
+        desempenho_fim = lp_fim[liga] * 100 if liga in lp_fim else None
+
+        tendencias = []
+        if melhor_dxg_roi:
+            tendencias.append(f"★ DxG {melhor_dxg_roi} é mais lucrativo (ROI {melhor_dxg_valor:+.1f}%)")
+            recomendacoes.append(f"★ {liga}: Priorizar DxG {melhor_dxg_roi} (ROI {melhor_dxg_valor:+.1f}%)")
+
+        if desempenho_inicio is not None and desempenho_fim is not None:
+            if desempenho_inicio > desempenho_fim + 20:
+                tendencias.append(f"★ TEMPORADA: Melhor desempenho no INÍCIO (ROI {desempenho_inicio:+.1f}% vs {desempenho_fim:+.1f}%)")
+                recomendacoes.append(f"★ {liga}: Aumentar volume no INÍCIO da temporada")
+            elif desempenho_fim > desempenho_inicio + 20:
+                tendencias.append(f"★ TEMPORADA: Melhor desempenho no FIM (ROI {desempenho_fim:+.1f}% vs {desempenho_inicio:+.1f}%)")
+                recomendacoes.append(f"★ {liga}: Aumentar volume no FIM da temporada")
+            else:
+                tendencias.append(f"★ TEMPORADA: Desempenho equilibrado entre início e fim")
+
+        if roi_liga > 20:
+            tendencias.append(f"★ SAUDE: Liga com ROI positivo e consistente (+{roi_liga:.1f}%)")
+        elif roi_liga > 0:
+            tendencias.append(f"★ SAUDE: Liga com ROI positivo mas marginal (+{roi_liga:.1f}%)")
+        else:
+            tendencias.append(f"★ SAUDE: Liga com ROI negativo ({roi_liga:.1f}%) - Revisar estratégia")
+
+        for tendencia in tendencias:
+            insights.append(f"     {tendencia}")
+
+    insights.append("")
+
+    # Resumo executivo (todas as entradas com resultado, inclusive sem xG válido)
+    total_jogos = len(tabela)
+    total_lp = float(tabela['LP'].sum())
+    total_wins = int(tabela['acerto'].sum())
+    taxa_geral = (total_wins / total_jogos * 100) if total_jogos > 0 else 0
+    roi_geral = (total_lp / total_jogos * 100) if total_jogos > 0 else 0
+
+    resumo = f"ANALISE COMPLETA: {total_jogos} resultados | Taxa Geral: {taxa_geral:.1f}% | L/P Total: {total_lp:+.2f} | ROI Geral: {roi_geral:+.1f}%"
+
+    return {
+        'resumo': resumo,
+        'insights': insights,
+        'recomendacoes': recomendacoes
+    }
+
+
+def analisar_backtest_dxg(backtests):
+    """Análise de backtests focado em DxG, ligas lucrativas e odds"""
+    print(f"[DEBUG] analisar_backtest_dxg recebeu {len(backtests) if backtests else 0} registros", flush=True)
+
+    if not backtests or len(backtests) < 3:
+        return {
+            'resumo': f'Apenas {len(backtests) if backtests else 0} resultado(s) disponivel(is). Minimo de 3 necessarios para analise.',
+            'insights': [],
+            'recomendacoes': []
+        }
+
+    # Normalizar em bloco; registros com valores não numéricos são descartados
+    campos = _colunas_brutas([b for b in backtests if isinstance(b, dict)], VARIANTES_BACKTEST_DXG)
+    numeros = {campo: _numerico(campos[campo].fillna(0)) for campo in ['GH', 'GA', 'xGH', 'xGA', 'LP']}
+    convertidos = pd.concat(numeros, axis=1).notna().all(axis=1)
+    com_xg = (numeros['xGH'] > 0) | (numeros['xGA'] > 0)
+    mascara = (convertidos & com_xg).to_numpy()
+
+    df = pd.DataFrame({
+        'LIGA': campos['LIGA'].fillna('Desconhecida').astype(str),
+        'LP': numeros['LP'],
+        'dxg': classificar_dxg(numeros['xGH'], numeros['xGA']),
+    })[mascara]
+    df['acerto'] = df['LP'] > 0
+
+    print(f"[DEBUG] Dados válidos após normalização: {len(df)}", flush=True)
+
+    if len(df) < 3:
+        return {
+            'resumo': f'Apenas {len(df)} resultado(s) com dados válidos. Minimo de 3 necessarios.',
+            'insights': [],
+            'recomendacoes': []
+        }
+
+    total = len(df)
+    lucro = float(df['LP'].sum())
+    roi_global = lucro / total * 100
+    winrate_global = int(df['acerto'].sum()) / total * 100
+
+    resumo = f"📊 Total: {total} jogos | Lucro: +{lucro:.2f} | Taxa: {winrate_global:.1f}% | ROI: {roi_global:.1f}%"
+
+    insights = []
+    insights.append("="*80)
+    insights.append("ANÁLISE POR TIPO DE DxG")
+    insights.append("="*80)
+    insights.append("")
+
+    stats_dxg = agregar(df, ['dxg'])
+    stats_dxg_liga = agregar(df, ['dxg', 'LIGA'], ordenar=False)
+
+    for dxg_tipo, s in stats_dxg.iterrows():
+        insights.append(f"▶ {dxg_tipo} ({int(s['apostas'])} jogos)")
+        insights.append(f"  • Lucro: +{s['lp']:.2f} | Taxa: {s['taxa']:.1f}% | ROI: {s['roi']:.1f}%")
+
+        # Ligas mais lucrativas para este DxG
+        ligas = stats_dxg_liga.xs(dxg_tipo, level='dxg').sort_values('lp', ascending=False, kind='stable')
+        insights.append(f"  • Ligas mais lucrativas:")
+        for liga, stats in ligas.head(3).iterrows():
+            insights.append(f"    - {liga}: +{stats['lp']:.2f} ({int(stats['apostas'])} jogos, {stats['taxa']:.1f}%)")
+
+        insights.append("")
+
+    recomendacoes = []
+    recomendacoes.append("="*80)
+    recomendacoes.append("RECOMENDAÇÕES DE ESTRATÉGIA")
+    recomendacoes.append("="*80)
+    recomendacoes.append("")
+
+    # Melhor DxG (empate: o que aparece primeiro nos dados)
+    lp_por_dxg = agregar(df, ['dxg'], ordenar=False)['lp']
+    melhor_dxg = lp_por_dxg.idxmax()
+    recomendacoes.append(f"1️⃣ Tipo DxG mais lucrativo: {melhor_dxg} (+{lp_por_dxg[melhor_dxg]:.2f})")
+    recomendacoes.append(f"   Concentre entradas em matchups com este padrão DxG")
+    recomendacoes.append("")
+
+    # Ligas mais lucrativas globalmente
+    ligas_top = agregar(df, ['LIGA'], ordenar=False).sort_values('lp', ascending=False, kind='stable').head(3)
+    recomendacoes.append(f"2️⃣ Ligas mais lucrativas:")
+    for liga, stats in ligas_top.iterrows():
+        recomendacoes.append(f"   • {liga}: +{stats['lp']:.2f} ({int(stats['apostas'])} jogos)")
+    recomendacoes.append("")
+
+    if roi_global > 0:
+        recomendacoes.append(f"3️⃣ Status geral: ✅ Estratégia LUCRATIVA (ROI: {roi_global:.1f}%)")
+    else:
+        recomendacoes.append(f"3️⃣ Status geral: ⚠️ Estratégia COM PREJUÍZO (ROI: {roi_global:.1f}%)")
+        recomendacoes.append("   Revise a seleção de matchups e entradas")
+
+    return {
+        'resumo': resumo,
+        'insights': insights,
+        'recomendacoes': recomendacoes
+    }
+
+
+def analisar_backtest_dxg_arquivo(caminho=None):
+    """
+    analisar_backtest_dxg() sobre o backtest acumulado, memorizada pela versão
+    do arquivo. Retorna None se o arquivo não existir.
+    """
+    caminho = Path(caminho or BACKTEST_ACUMULADO)
+    return memorizar_por_versao(caminho, 'analise_dxg', lambda: analisar_backtest_dxg(ler_entradas(caminho)))
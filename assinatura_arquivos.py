@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Assinatura e hash de arquivos
+
+Usados pelos caches que dependem de um arquivo de origem (esquemas, datas
+convertidas, tabela canônica, manifesto de resultados, ledger do backtest):
+
+    assinatura_arquivo(caminho) -> [tamanho, mtime_ns]  (barato: só stat)
+    hash_arquivo(caminho)       -> sha1 do conteúdo     (confirma mudança real)
+"""
+
+import hashlib
+import os
+
+
+def assinatura_arquivo(caminho):
+    """Tamanho e mtime do arquivo (None se não existir)"""
+    try:
+        st = os.stat(caminho)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def hash_arquivo(caminho):
+    """sha1 do conteúdo de um arquivo (None se não existir)"""
+    try:
+        with open(caminho, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
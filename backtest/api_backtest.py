@@ -1,11 +1,21 @@
-from flask import Flask, jsonify, request, send_from_directory
+from flask import Flask, Response, jsonify, request, send_from_directory, stream_with_context
 from flask_cors import CORS
 from backtest_engine import BacktestEngine
 import json
 import numpy as np
 import os
+import sys
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from collections import defaultdict
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from analise_colunar import analisar_backtest_dxg_arquivo
+from leitor_backtest import iterar_backtest_acumulado, resposta_em_streaming
+from manifesto_resultados import ManifestoResultados
+from servidor_wsgi import aquecer_analise_backtest, servir
+from fila_tarefas import fila, resposta_enfileirada, resposta_tarefa
 
 app = Flask(__name__, static_folder='.', static_url_path='')
 CORS(app)
@@ -43,12 +53,9 @@ def _gerar_resumo_engine(eng, max_times=8):
     try:
         times = set()
         if hasattr(eng, 'df_teste') and eng.df_teste is not None:
-            df = eng.df_teste
-            if eng.coluna_home in df.columns:
-                times.update(df[eng.coluna_home].dropna().astype(str).tolist())
-            if eng.coluna_away in df.columns:
-                times.update(df[eng.coluna_away].dropna().astype(str).tolist())
-        times_amostra = sorted(list(times))[:max_times]
+            ids = np.union1d(eng.df_teste['id_home'].to_numpy(), eng.df_teste['id_away'].to_numpy())
+            times = {eng.times.nome(int(i)) for i in ids if i >= 0}
+        times_amostra = sorted(times)[:max_times]
     except Exception:
         times_amostra = []
 
@@ -61,190 +68,99 @@ def _gerar_resumo_engine(eng, max_times=8):
         'times_amostra': times_amostra
     }
 
-def analisar_backtest_dxg(backtests):
-    """Análise de backtests focado em DxG, ligas lucrativas e odds"""
-    print(f"[DEBUG] analisar_backtest_dxg recebeu {len(backtests) if backtests else 0} registros", flush=True)
-    
-    if not backtests or len(backtests) < 3:
-        return {
-            'resumo': f'Apenas {len(backtests) if backtests else 0} resultado(s) disponivel(is). Minimo de 3 necessarios para analise.',
-            'insights': [],
-            'recomendacoes': []
-        }
-    
-    # Normalizar e filtrar dados válidos
-    dados_validos = []
-    for i, b in enumerate(backtests):
+# Máximo de engines (liga, temporada) mantidos em memória
+MAX_ENGINES = int(os.environ.get('MAX_ENGINES', 8))
+
+class RegistroEngines:
+    """
+    Engines de backtest por (liga, temporada), criados sob demanda.
+
+    Cada sessão tem sua própria trava: abas em ligas diferentes processam em
+    paralelo sem recarregar CSVs, e pedidos na mesma sessão são serializados.
+    A trava da liga (sempre tomada antes da trava da sessão) cobre a criação
+    do engine e as operações de escrita, porque todas as temporadas de uma
+    liga gravam no mesmo {liga}_treino.csv; depois de uma escrita os
+    engines das outras temporadas da liga são descartados e relidos do disco
+    no próximo uso. Acima de MAX_ENGINES o engine usado há mais tempo sai da
+    memória (o estado já está salvo em disco).
+    """
+
+    def __init__(self, max_engines=MAX_ENGINES):
+        self.max_engines = max_engines
+        self._engines = OrderedDict()
+        self._travas = {}
+        self._lock = threading.Lock()
+
+    def _trava(self, chave):
+        with self._lock:
+            return self._travas.setdefault(chave, threading.RLock())
+
+    def _obter(self, liga, temporada, recriar):
+        chave = (liga, temporada)
+        with self._lock:
+            eng = None if recriar else self._engines.get(chave)
+            if eng is not None:
+                self._engines.move_to_end(chave)
+                return eng
+
+        # Criado fora da trava global: outras sessões seguem atendendo
+        print(f"🔵 [API] Criando BacktestEngine(liga={liga}, temporada={temporada})")
+        eng = BacktestEngine(liga=liga, temporada=temporada)
+        with self._lock:
+            self._engines[chave] = eng
+            self._engines.move_to_end(chave)
+            while len(self._engines) > self.max_engines:
+                antiga, _ = self._engines.popitem(last=False)
+                print(f"🔵 [API] Engine {antiga[0]} {antiga[1]} removido da memória (LRU)")
+        return eng
+
+    @contextmanager
+    def sessao(self, liga, temporada, escrita=False, recriar=False):
+        """Engine da sessão, com a trava da sessão (e da liga, se escrita) mantida no bloco"""
+        trava_liga = self._trava(liga)
         try:
-            gh = float(b.get('fthg') or b.get('GH') or 0)
-            ga = float(b.get('ftag') or b.get('GA') or 0)
-            xgh = float(b.get('xgh') or b.get('xGH') or 0)
-            xga = float(b.get('xga') or b.get('xGA') or 0)
-            lp = float(b.get('lp') or b.get('LP') or 0)
-            liga = str(b.get('liga') or b.get('LIGA') or 'Desconhecida')
-            
-            if xgh > 0 or xga > 0:
-                dados_validos.append({
-                    'GH': gh, 'GA': ga, 'xGH': xgh, 'xGA': xga,
-                    'LP': lp, 'LIGA': liga,
-                    'ENTRADA': (b.get('entrada') or b.get('ENTRADA') or 'HOME').upper()
-                })
-        except Exception as e:
-            continue
-    
-    print(f"[DEBUG] Dados válidos após normalização: {len(dados_validos)}", flush=True)
-    
-    if len(dados_validos) < 3:
-        return {
-            'resumo': f'Apenas {len(dados_validos)} resultado(s) com dados válidos.',
-            'insights': [],
-            'recomendacoes': []
-        }
-    
-    # Análise por DxG
-    insights = []
-    stats_globais = {'total': 0, 'lucro': 0, 'acertos': 0}
-    
-    for d in dados_validos:
-        stats_globais['total'] += 1
-        stats_globais['lucro'] += d['LP']
-        if d['LP'] > 0:
-            stats_globais['acertos'] += 1
-    
-    roi_global = (stats_globais['lucro'] / stats_globais['total'] * 100) if stats_globais['total'] > 0 else 0
-    winrate_global = (stats_globais['acertos'] / stats_globais['total'] * 100) if stats_globais['total'] > 0 else 0
-    
-    resumo = f"📊 Total: {stats_globais['total']} jogos | Lucro: +{stats_globais['lucro']:.2f} | Taxa: {winrate_global:.1f}% | ROI: {roi_global:.1f}%"
-    
-    insights.append("="*80)
-    insights.append("ANÁLISE POR TIPO DE DxG")
-    insights.append("="*80)
-    insights.append("")
-    
-    # Agrupar por DxG
-    por_dxg = defaultdict(list)
-    for d in dados_validos:
-        diff = d['xGH'] - d['xGA']
-        if diff > 1.0:
-            dxg = 'FH'
-        elif 0.3 < diff <= 1.0:
-            dxg = 'LH'
-        elif -0.3 <= diff <= 0.3:
-            dxg = 'EQ'
-        elif -1.0 <= diff < -0.3:
-            dxg = 'LA'
-        else:
-            dxg = 'FA'
-        
-        d['DXG'] = dxg
-        por_dxg[dxg].append(d)
-    
-    # Análise por cada DxG
-    for dxg_tipo in ['FH', 'LH', 'EQ', 'LA', 'FA']:
-        if dxg_tipo not in por_dxg or len(por_dxg[dxg_tipo]) == 0:
-            continue
-        
-        jogos = por_dxg[dxg_tipo]
-        total_lp = sum(j['LP'] for j in jogos)
-        acertos = sum(1 for j in jogos if j['LP'] > 0)
-        winrate = (acertos / len(jogos) * 100)
-        roi = (total_lp / len(jogos) * 100)
-        
-        insights.append(f"▶ {dxg_tipo} ({len(jogos)} jogos)")
-        insights.append(f"  • Lucro: +{total_lp:.2f} | Taxa: {winrate:.1f}% | ROI: {roi:.1f}%")
-        
-        # Ligas mais lucrativas para este DxG
-        por_liga = defaultdict(lambda: {'lp': 0, 'count': 0, 'acertos': 0})
-        for j in jogos:
-            liga = j['LIGA']
-            por_liga[liga]['lp'] += j['LP']
-            por_liga[liga]['count'] += 1
-            if j['LP'] > 0:
-                por_liga[liga]['acertos'] += 1
-        
-        ligas_ord = sorted(por_liga.items(), key=lambda x: x[1]['lp'], reverse=True)
-        top_3_ligas = ligas_ord[:3]
-        
-        if top_3_ligas:
-            insights.append(f"  • Ligas mais lucrativas:")
-            for liga, stats in top_3_ligas:
-                lp = stats['lp']
-                winrate_liga = (stats['acertos'] / stats['count'] * 100)
-                insights.append(f"    - {liga}: +{lp:.2f} ({stats['count']} jogos, {winrate_liga:.1f}%)")
-        
-        insights.append("")
-    
-    # Recomendações
-    recomendacoes = []
-    recomendacoes.append("="*80)
-    recomendacoes.append("RECOMENDAÇÕES DE ESTRATÉGIA")
-    recomendacoes.append("="*80)
-    recomendacoes.append("")
-    
-    # Melhor DxG
-    melhor_dxg = max(por_dxg.items(), 
-                     key=lambda x: sum(j['LP'] for j in x[1]),
-                     default=None)
-    if melhor_dxg:
-        dxg, jogos = melhor_dxg
-        lp_total = sum(j['LP'] for j in jogos)
-        recomendacoes.append(f"1️⃣ Tipo DxG mais lucrativo: {dxg} (+{lp_total:.2f})")
-        recomendacoes.append(f"   Concentre entradas em matchups com este padrão DxG")
-        recomendacoes.append("")
-    
-    # Ligas mais lucrativas globalmente
-    por_liga_global = defaultdict(lambda: {'lp': 0, 'count': 0})
-    for d in dados_validos:
-        por_liga_global[d['LIGA']]['lp'] += d['LP']
-        por_liga_global[d['LIGA']]['count'] += 1
-    
-    ligas_top = sorted(por_liga_global.items(), key=lambda x: x[1]['lp'], reverse=True)[:3]
-    if ligas_top:
-        recomendacoes.append(f"2️⃣ Ligas mais lucrativas:")
-        for liga, stats in ligas_top:
-            recomendacoes.append(f"   • {liga}: +{stats['lp']:.2f} ({stats['count']} jogos)")
-        recomendacoes.append("")
-    
-    # Status geral
-    if roi_global > 0:
-        recomendacoes.append(f"3️⃣ Status geral: ✅ Estratégia LUCRATIVA (ROI: {roi_global:.1f}%)")
-    else:
-        recomendacoes.append(f"3️⃣ Status geral: ⚠️ Estratégia COM PREJUÍZO (ROI: {roi_global:.1f}%)")
-        recomendacoes.append("   Revise a seleção de matchups e entradas")
-    
-    return {
-        'resumo': resumo,
-        'insights': insights,
-        'recomendacoes': recomendacoes
-    }
-
-# Instância global do engine - Lazy initialization
-engine = None
-engine_liga_atual = 'E0'
-engine_temporada_atual = '2024-25'
-
-def get_engine():
-    """Get or initialize the engine - recria se temporada/liga mudaram"""
-    global engine, engine_liga_atual, engine_temporada_atual
-    if engine is None or engine.liga != engine_liga_atual or engine.temporada != engine_temporada_atual:
-        engine = BacktestEngine(liga=engine_liga_atual, temporada=engine_temporada_atual)
-    return engine
-
-def _atualizar_contexto_por_request(dados):
-    """Atualiza liga/temporada globais a partir do request (quando informado)."""
-    global engine_liga_atual, engine_temporada_atual
-    if not dados:
-        return
-    liga = dados.get('liga')
-    temporada = dados.get('temporada')
-
-    if liga:
-        if liga not in LIGAS_DISPONIVEIS:
-            raise ValueError('Liga não encontrada')
-        engine_liga_atual = liga
-
-    if temporada:
-        engine_temporada_atual = temporada
+            with ExitStack() as travas:
+                with trava_liga:
+                    travas.enter_context(self._trava((liga, temporada)))
+                    eng = self._obter(liga, temporada, recriar)
+                    if escrita:
+                        travas.enter_context(trava_liga)  # RLock: segue travada no bloco
+                yield eng
+        finally:
+            if escrita:
+                self._descartar_outras_temporadas(liga, temporada)
+
+    def recarregar(self, liga, temporada):
+        """Recria o engine da sessão a partir dos arquivos em disco"""
+        with self.sessao(liga, temporada, escrita=True, recriar=True) as eng:
+            return eng
+
+    def _descartar_outras_temporadas(self, liga, temporada):
+        with self._lock:
+            for chave in [c for c in self._engines if c[0] == liga and c[1] != temporada]:
+                del self._engines[chave]
+
+    def sessoes(self):
+        """Sessões em memória, da usada há mais tempo à mais recente"""
+        with self._lock:
+            return list(self._engines)
+
+registro = RegistroEngines()
+
+# Sessão usada quando o request não informa liga/temporada (última selecionada)
+sessao_padrao = {'liga': 'E0', 'temporada': '2024-25'}
+
+def _sessao_do_request():
+    """
+    (liga, temporada) informados no corpo JSON ou na query string do request;
+    o que faltar vem da sessão padrão. Não altera a sessão padrão.
+    """
+    dados = request.get_json(silent=True) or {}
+    liga = dados.get('liga') or request.args.get('liga') or sessao_padrao['liga']
+    temporada = dados.get('temporada') or request.args.get('temporada') or sessao_padrao['temporada']
+    if liga not in LIGAS_DISPONIVEIS:
+        raise ValueError('Liga não encontrada')
+    return liga, temporada
 
 LIGAS_DISPONIVEIS = {
     'B1': 'Bélgica - Primeira Divisão',
@@ -293,19 +209,22 @@ def serve_file(filename):
         return send_from_directory('.', filename)
     return "File not found", 404
 
+@app.route('/api/health', methods=['GET'])
+def health():
+    """Prova de prontidão usada pelo supervisor (iniciar_todos_servidores.py)"""
+    return jsonify({'status': 'ok', 'servidor': 'api_backtest'}), 200
+
 @app.route('/api/backtest/ligas', methods=['GET'])
 def get_ligas():
     """Retorna lista de ligas disponíveis"""
     print("🔵 [API] Endpoint /api/backtest/ligas chamado")
     print(f"🔵 [API] LIGAS_DISPONIVEIS: {len(LIGAS_DISPONIVEIS)} ligas")
-    print(f"🔵 [API] engine_liga_atual: {engine_liga_atual}")
-    
-    eng = get_engine()
+    print(f"🔵 [API] Liga padrão: {sessao_padrao['liga']}")
     
     resultado = {
         'success': True, 
         'ligas': LIGAS_DISPONIVEIS, 
-        'atual': engine_liga_atual
+        'atual': sessao_padrao['liga']
     }
     
     print(f"🔵 [API] Retornando: success=True, {len(resultado['ligas'])} ligas, atual={resultado['atual']}")
@@ -313,9 +232,8 @@ def get_ligas():
 
 @app.route('/api/backtest/selecionar-liga', methods=['POST'])
 def selecionar_liga():
-    """Seleciona uma liga e temporada para o backtest"""
+    """Seleciona uma liga e temporada como sessão padrão do backtest"""
     try:
-        global engine, engine_liga_atual, engine_temporada_atual
         dados = request.get_json()
         liga = dados.get('liga', 'E0')
         temporada = dados.get('temporada', '2024-25')
@@ -325,16 +243,13 @@ def selecionar_liga():
         if liga not in LIGAS_DISPONIVEIS:
             return jsonify({'success': False, 'error': 'Liga não encontrada'}), 400
         
-        # Criar novo engine com liga e temporada especificadas
-        print(f"🔵 [API] Criando BacktestEngine(liga={liga}, temporada={temporada})")
-        engine = BacktestEngine(liga=liga, temporada=temporada)
-        engine_liga_atual = liga
-        engine_temporada_atual = temporada
-        
-        print(f"🔵 [API] Engine criado! Total de jogos na temporada: {len(engine.df_teste)}")
-        print(f"🔵 [API] Arquivo de resultados: {engine.arquivo_resultados.name}")
+        # Reaproveita o engine da sessão se já estiver em memória
+        with registro.sessao(liga, temporada) as eng:
+            print(f"🔵 [API] Engine pronto! Total de jogos na temporada: {len(eng.df_teste)}")
+            print(f"🔵 [API] Arquivo de resultados: {eng.arquivo_resultados.name}")
+            status = converter_resultado(eng.obter_status())
+        sessao_padrao.update(liga=liga, temporada=temporada)
         
-        status = converter_resultado(engine.obter_status())
         return jsonify({
             'success': True,
             'mensagem': f'Liga {liga} e temporada {temporada} selecionadas com sucesso',
@@ -351,16 +266,19 @@ def selecionar_liga():
 def get_status():
     """Retorna status atual do backtest"""
     try:
-        eng = get_engine()
-        status = converter_resultado(eng.obter_status())
-        # Adicionar informações da liga
-        status['num_times'] = eng.num_times
-        status['max_jogos_rodada'] = eng.max_jogos_rodada
-        
-        print(f"🔵 [API] Status - Liga: {engine_liga_atual}, Temporada: {engine_temporada_atual}")
+        liga, temporada = _sessao_do_request()
+        with registro.sessao(liga, temporada) as eng:
+            status = converter_resultado(eng.obter_status())
+            # Adicionar informações da liga
+            status['num_times'] = eng.num_times
+            status['max_jogos_rodada'] = eng.max_jogos_rodada
+        
+        print(f"🔵 [API] Status - Liga: {liga}, Temporada: {temporada}")
         print(f"🔵 [API] Status - Total jogos: {status['total_jogos']}, Processados: {status['jogos_processados']}, Completo: {status['completo']}")
         
         return jsonify({'success': True, 'status': status})
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         import traceback
         tb_str = traceback.format_exc()
@@ -368,19 +286,35 @@ def get_status():
         print(tb_str)
         return jsonify({'success': False, 'error': str(e), 'traceback': tb_str}), 500
 
+@app.route('/api/backtest/temporadas', methods=['GET'])
+def get_temporadas():
+    """Progresso de todas as ligas/temporadas com resultados (manifesto, sem carregar entradas)"""
+    try:
+        registros = ManifestoResultados(Path(__file__).parent).listar()
+        for r in registros:
+            r.pop('assinatura', None)
+            r.pop('offset_entradas', None)
+        return jsonify({'success': True, 'temporadas': registros})
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
 @app.route('/api/backtest/info-liga', methods=['GET'])
 def info_liga():
     """Retorna informações sobre a liga atual"""
     try:
-        eng = get_engine()
-        return jsonify({
-            'success': True,
-            'liga': engine_liga_atual,
-            'num_times': eng.num_times,
-            'max_jogos_rodada': eng.max_jogos_rodada,
-            'total_jogos': len(eng.df_teste),
-            'jogos_processados': eng.resultados['jogos_processados']
-        })
+        liga, temporada = _sessao_do_request()
+        with registro.sessao(liga, temporada) as eng:
+            return jsonify({
+                'success': True,
+                'liga': liga,
+                'temporada': temporada,
+                'num_times': eng.num_times,
+                'max_jogos_rodada': eng.max_jogos_rodada,
+                'total_jogos': len(eng.df_teste),
+                'jogos_processados': eng.resultados['jogos_processados']
+            })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         import traceback
         tb_str = traceback.format_exc()
@@ -390,12 +324,9 @@ def info_liga():
 def resumo():
     """Retorna resumo da liga/temporada atual (com amostra de times)"""
     try:
-        if request.method == 'POST':
-            dados = request.get_json(silent=True) or {}
-            _atualizar_contexto_por_request(dados)
-
-        eng = get_engine()
-        resumo_data = _gerar_resumo_engine(eng)
+        liga, temporada = _sessao_do_request()
+        with registro.sessao(liga, temporada) as eng:
+            resumo_data = _gerar_resumo_engine(eng)
         return jsonify({'success': True, 'resumo': resumo_data})
     except ValueError as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -408,10 +339,9 @@ def resumo():
 def processar_rodada():
     """Processa próxima rodada do backtest"""
     try:
-        dados = request.get_json(silent=True) or {}
-        _atualizar_contexto_por_request(dados)
-        eng = get_engine()
-        resultado = eng.processar_rodada()
+        liga, temporada = _sessao_do_request()
+        with registro.sessao(liga, temporada, escrita=True) as eng:
+            resultado = eng.processar_rodada()
         
         if resultado is None:
             return jsonify({
@@ -439,16 +369,61 @@ def processar_rodada():
             'traceback': tb_str
         }), 500
 
+# Campos das entradas usados pela página (o stream envia só estes)
+CAMPOS_ENTRADA_STREAM = ('home', 'away', 'fthg', 'ftag', 'entrada', 'b365h', 'b365a',
+                         'xgh', 'xga', 'dxg', 'lp', 'odd_home_calc', 'odd_away_calc')
+
+def _evento_sse(evento, dados):
+    """Formata um evento server-sent events"""
+    return f"event: {evento}\ndata: {json.dumps(dados, cls=NumpyEncoder, ensure_ascii=False)}\n\n"
+
+@app.route('/api/backtest/stream', methods=['GET'])
+def stream_temporada():
+    """
+    Processa as rodadas restantes da sessão no servidor e envia o progresso
+    por SSE. Cada evento 'rodada' traz só as entradas novas e o placar
+    acumulado; no fim vem o evento 'fim' (ou 'erro'). O treino e os
+    resultados são gravados uma vez, ao terminar ou se o cliente desconectar.
+    """
+    try:
+        liga, temporada = _sessao_do_request()
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    def eventos():
+        with registro.sessao(liga, temporada, escrita=True) as eng:
+            try:
+                while True:
+                    resultado = eng.processar_rodada(salvar=False)
+                    if resultado is None or resultado['jogos_rodada'] == 0:
+                        break
+                    yield _evento_sse('rodada', {
+                        'rodada': resultado['rodada'],
+                        'jogos_rodada': resultado['jogos_rodada'],
+                        'lucro_rodada': resultado['lucro_rodada'],
+                        'novas': [{c: vb.get(c) for c in CAMPOS_ENTRADA_STREAM} for vb in resultado['value_bets']],
+                        'status': eng.obter_status(),
+                    })
+                yield _evento_sse('fim', {'status': eng.obter_status()})
+            except Exception as e:
+                import traceback
+                print(f"ERRO no stream {liga} {temporada}: {e}\n{traceback.format_exc()}")
+                yield _evento_sse('erro', {'error': str(e)})
+            finally:
+                eng.salvar_estado()
+
+    return Response(stream_with_context(eventos()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/backtest/resetar', methods=['POST'])
 def resetar():
-    """Reseta o backtest da liga atual"""
+    """Reseta o backtest da liga/temporada informada (ou da sessão padrão)"""
     try:
-        global engine
-        dados = request.get_json(silent=True) or {}
-        _atualizar_contexto_por_request(dados)
-        eng = get_engine()
-        resultado = eng.resetar()
-        engine = BacktestEngine(liga=engine_liga_atual, temporada=engine_temporada_atual)
+        liga, temporada = _sessao_do_request()
+        with registro.sessao(liga, temporada, escrita=True) as eng:
+            resultado = eng.resetar()
+            # Engine novo lendo o treino recriado
+            registro.recarregar(liga, temporada)
         return jsonify({'success': True, 'mensagem': resultado.get('mensagem', 'Resetado')})
     except ValueError as e:
         return jsonify({'success': False, 'error': str(e)}), 400
@@ -462,25 +437,17 @@ def resetar_todos():
     """Reseta todos os backtests de todas as ligas e temporadas"""
     try:
         from pathlib import Path
-        import glob
         pasta_backtest = Path(__file__).parent
         pasta_fixtures = pasta_backtest.parent / 'fixtures'
         
-        resetados = []
         erros = []
         
-        # Buscar todos os arquivos backtest_resultados_*.json (incluindo com temporadas)
-        pattern = str(pasta_backtest / 'backtest_resultados_*.json')
-        arquivos_encontrados = glob.glob(pattern)
-        
-        for arquivo_path in arquivos_encontrados:
-            try:
-                arquivo = Path(arquivo_path)
-                nome_arquivo = arquivo.name
-                arquivo.unlink()  # Deletar arquivo
-                resetados.append(nome_arquivo)
-            except Exception as e:
-                erros.append(f'{nome_arquivo}: {str(e)}')
+        # Apagar todos os arquivos backtest_resultados_*.json (e zerar o manifesto)
+        try:
+            resetados = ManifestoResultados(pasta_backtest).remover_todos()
+        except Exception as e:
+            resetados = []
+            erros.append(f'Erro ao apagar resultados: {str(e)}')
         
         # Limpar arquivo de salvamentos acumulados
         try:
@@ -508,12 +475,15 @@ def resetar_todos():
 def get_entradas():
     """Retorna todas as entradas do backtest"""
     try:
-        eng = get_engine()
-        entradas = converter_resultado(eng.resultados['entradas'])
+        liga, temporada = _sessao_do_request()
+        with registro.sessao(liga, temporada) as eng:
+            entradas = converter_resultado(eng.resultados['entradas'])
         return jsonify({
             'success': True,
             'entradas': entradas
         })
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         import traceback
         tb_str = traceback.format_exc()
@@ -521,57 +491,14 @@ def get_entradas():
 
 @app.route('/api/backtest_acumulado', methods=['GET'])
 def get_backtest_acumulado():
-    """Retorna todos os dados de backtest salvos"""
+    """
+    Retorna os dados de backtest salvos em streaming (filtros liga, temporada,
+    dxg, entrada; paginação inicio/limite; formato=ndjson opcional)
+    """
     try:
-        from pathlib import Path
-
-        def carregar_entradas_detalhadas():
-            backtest_dir = Path(__file__).resolve().parent
-            arquivos = sorted(backtest_dir.glob("backtest_resultados_*.json"))
-            entradas = []
-
-            for arquivo in arquivos:
-                nome = arquivo.stem.replace("backtest_resultados_", "")
-                if "_" in nome:
-                    liga, temporada = nome.split("_", 1)
-                else:
-                    liga, temporada = nome, ""
-
-                try:
-                    with open(arquivo, 'r', encoding='utf-8') as f:
-                        dados_arquivo = json.load(f)
-                except UnicodeDecodeError:
-                    with open(arquivo, 'r', encoding='utf-8-sig') as f:
-                        dados_arquivo = json.load(f)
-
-                for item in dados_arquivo.get('entradas', []):
-                    entrada = dict(item)
-                    entrada.setdefault('liga', liga)
-                    entrada.setdefault('temporada', temporada)
-                    entradas.append(entrada)
-
-            return entradas
-
-        backtest_file = Path(__file__).resolve().parent.parent / "fixtures" / "backtest_acumulado.json"
-
-        if backtest_file.exists():
-            try:
-                with open(backtest_file, 'r', encoding='utf-8') as f:
-                    dados = json.load(f)
-            except UnicodeDecodeError:
-                with open(backtest_file, 'r', encoding='utf-8-sig') as f:
-                    dados = json.load(f)
-
-            if isinstance(dados, list) and dados:
-                amostra = dados[0]
-                possui_detalhe = all(campo in amostra for campo in ['home', 'away', 'entrada', 'dxg', 'lp'])
-                if possui_detalhe:
-                    print(f"DEBUG API: Retornando {len(dados)} entradas do backtest acumulado", flush=True)
-                    return jsonify({'success': True, 'entradas': dados}), 200
-
-        entradas_detalhadas = carregar_entradas_detalhadas()
-        print(f"DEBUG API: Retornando {len(entradas_detalhadas)} entradas detalhadas (geradas)", flush=True)
-        return jsonify({'success': True, 'entradas': entradas_detalhadas}), 200
+        # Acumulado detalhado em fixtures/ ou, na falta dele, os resultados por temporada
+        entradas = iterar_backtest_acumulado(campos_obrigatorios=('home', 'away', 'entrada', 'dxg', 'lp'))
+        return resposta_em_streaming(entradas, 'entradas', request.args)
         
     except Exception as e:
         import traceback
@@ -649,9 +576,23 @@ def salvar_backtest_json():
         print(traceback.format_exc(), flush=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+def _analisar_backtest_tarefa(backtest_file):
+    """Análise DxG do backtest acumulado (roda na fila de tarefas)"""
+    # Análise memorizada: só é recalculada quando o backtest acumulado muda
+    analise = analisar_backtest_dxg_arquivo(backtest_file)
+
+    if analise and (len(analise.get('insights', [])) > 0 or len(analise.get('recomendacoes', [])) > 0):
+        print(f"[API BACKTEST] Análise concluída: {len(analise['insights'])} insights, {len(analise['recomendacoes'])} recomendações", flush=True)
+        return {'success': True, 'data': analise}
+    print(f"[API BACKTEST] Análise retornou vazia", flush=True)
+    return {'success': False, 'message': 'Análise não gerou resultados'}
+
 @app.route('/api/analisar_padroes_backtest', methods=['POST', 'OPTIONS'])
 def analisar_padroes_backtest():
-    """Endpoint para analisar padrões de backtest com IA"""
+    """
+    Endpoint para analisar padrões de backtest com IA.
+    Enfileira a análise e responde 202; resultado em /api/jobs/<id>.
+    """
     if request.method == 'OPTIONS':
         return '', 200
     
@@ -659,25 +600,14 @@ def analisar_padroes_backtest():
         print("[API BACKTEST] Requisição recebida para análise", flush=True)
         
         # Ler dados de backtest acumulado
-        backtest_file = Path("../fixtures/backtest_acumulado.json")
+        backtest_file = Path("../fixtures/backtest_acumulado.json").resolve()
         if not backtest_file.exists():
             print(f"[API BACKTEST] ERRO: Arquivo não encontrado: {backtest_file}", flush=True)
             return jsonify({'success': False, 'message': 'Nenhum backtest salvo encontrado'}), 400
         
-        with open(backtest_file, 'r', encoding='utf-8') as f:
-            backtests = json.load(f)
-        
-        print(f"[API BACKTEST] Carregados {len(backtests)} backtests do arquivo", flush=True)
-        
-        # Executar análise
-        analise = analisar_backtest_dxg(backtests)
-        
-        if analise and (len(analise.get('insights', [])) > 0 or len(analise.get('recomendacoes', [])) > 0):
-            print(f"[API BACKTEST] Análise concluída: {len(analise['insights'])} insights, {len(analise['recomendacoes'])} recomendações", flush=True)
-            return jsonify({'success': True, 'data': analise}), 200
-        else:
-            print(f"[API BACKTEST] Análise retornou vazia", flush=True)
-            return jsonify({'success': False, 'message': 'Análise não gerou resultados'}), 400
+        tarefa, coalescida = fila.enviar('analisar_padroes_backtest', _analisar_backtest_tarefa,
+                                         backtest_file, chave='analisar_padroes_backtest')
+        return resposta_enfileirada(tarefa, coalescida)
     
     except Exception as e:
         import traceback
@@ -685,6 +615,13 @@ def analisar_padroes_backtest():
         print(traceback.format_exc(), flush=True)
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/jobs/<id_tarefa>', methods=['GET'])
+def status_tarefa(id_tarefa):
+    """Estado e resultado de uma tarefa em segundo plano"""
+    return resposta_tarefa(id_tarefa)
+
 if __name__ == '__main__':
-    print("API Backtest rodando em http://localhost:5001")
-    app.run(debug=False, host='127.0.0.1', port=5001, threaded=True)
+    porta = int(os.environ.get('PORTA', 5001))
+    print(f"API Backtest rodando em http://localhost:{porta}")
+    # Um único processo: os engines das sessões (liga/temporada) vivem em memória
+    servir(app, porta, 'api_backtest', workers=1, aquecer=aquecer_analise_backtest)
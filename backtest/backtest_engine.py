@@ -2,13 +2,27 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 import json
+import sys
+import hashlib
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from datas_ligas import datas_liga
+from dicionario_times import SEM_ID, DicionarioTimes
+from esquema_ligas import esquema_liga
+from manifesto_resultados import ManifestoResultados
+
+# Colunas calculadas em memória (não vão para o arquivo de treino)
+COLUNAS_CALCULADAS = ['prob_h', 'prob_a', 'id_home', 'id_away']
+
 class BacktestEngine:
-    def __init__(self, liga='E0', temporada='2024-25'):
-        self.pasta_backtest = Path(__file__).parent
+    def __init__(self, liga='E0', temporada='2024-25', data_limite=None, pasta_backtest=None):
+        # pasta_backtest: onde ficam treino e resultados (padrão: esta pasta)
+        self.pasta_backtest = Path(pasta_backtest) if pasta_backtest else Path(__file__).parent
         self.liga = liga
         self.temporada = temporada  # NOVO: Armazenar temporada selecionada
+        # Jogos depois desta data não entram no teste (padrão: hoje)
+        self.data_limite = pd.to_datetime(data_limite) if data_limite else pd.Timestamp.now().normalize()
         
         # Arquivos para a liga selecionada
         self.arquivo_original = self.pasta_backtest.parent / 'dados_ligas' / f'{liga}_completo.csv'
@@ -19,36 +33,57 @@ class BacktestEngine:
         # MODIFICADO: Incluir temporada no nome do arquivo para separar backtests
         temporada_safe = temporada.replace('/', '-').replace('\\', '-')  # Seguro para nome de arquivo
         self.arquivo_resultados = self.pasta_backtest / f'backtest_resultados_{liga}_{temporada_safe}.json'
+        self.manifesto = ManifestoResultados(self.pasta_backtest)
         
         # Carregar dados
         self.df_original = pd.read_csv(self.arquivo_original, low_memory=False)
         self.df_treino = pd.read_csv(self.arquivo_treino, low_memory=False)
         
-        # Detectar colunas
-        self.coluna_season = self._detectar_coluna_season()
-        self.coluna_data = self._detectar_coluna_data()
-        self.coluna_home = self._detectar_coluna('home|hometeam')
-        self.coluna_away = self._detectar_coluna('away|awayteam')
-        self.coluna_gols_home = self._detectar_coluna('fthg|hg')
-        self.coluna_gols_away = self._detectar_coluna('ftag|ag')
-        self.coluna_odds_home, self.coluna_odds_away = self._detectar_colunas_odds()
-        
-        # Detectar formato de temporada (YYYY/YYYY ou YYYY)
-        self.formato_temporada = self._detectar_formato_temporada()
+        # Colunas e formato de temporada (detectados uma vez por arquivo, ver esquema_ligas.py)
+        esquema = esquema_liga(self.arquivo_original, self.df_original)
+        self.coluna_season = esquema['coluna_season'] or 'Season'
+        self.coluna_data = esquema['coluna_data'] or 'Date'
+        self.coluna_home = esquema['coluna_home']
+        self.coluna_away = esquema['coluna_away']
+        self.coluna_gols_home = esquema['coluna_gols_home']
+        self.coluna_gols_away = esquema['coluna_gols_away']
+        self.coluna_odds_home = esquema['coluna_odds_home']
+        self.coluna_odds_away = esquema['coluna_odds_away']
+        # Par de odds das médias por faixa (precisa existir também no treino); é o
+        # mesmo par por arquivo de odd_h/odd_a na tabela canônica (tabela_canonica.py)
+        self.odds_range = esquema['odds_range']
+        if self.odds_range and not set(self.odds_range) <= set(self.df_treino.columns):
+            self.odds_range = None
+        
+        # Ids inteiros dos times da liga (filtros por time comparam ints, não strings)
+        self.times = DicionarioTimes.de_colunas(
+            self.df_original[self.coluna_home], self.df_original[self.coluna_away],
+            self.df_treino[self.coluna_home], self.df_treino[self.coluna_away],
+        )
+        self.df_treino = self._com_colunas_calculadas(self.df_treino)
+        
+        self.formato_temporada = esquema['formato_temporada']
         print(f"🔵 [BacktestEngine] Formato de temporada detectado para {liga}: {self.formato_temporada}")
         
+        # Datas convertidas uma vez por arquivo, com formato explícito (datas_ligas.py)
+        self.df_original['Date_dt'] = datas_liga(self.arquivo_original, self.df_original).to_numpy()
+        
         # Filtrar apenas temporada 2024/2025 (ou equivalente)
         self.df_teste = self._filtrar_temporada_teste()
         
-        # Converter data e ordenar cronologicamente
-        self.df_teste['Date_dt'] = pd.to_datetime(self.df_teste[self.coluna_data], errors='coerce')
-        self.df_teste = self.df_teste.sort_values('Date_dt').reset_index(drop=True)
+        # Ordenar cronologicamente (Date_dt já convertida). Ordenação estável e
+        # desempatada pelos times: jogos do mesmo dia ficam sempre na mesma
+        # ordem, com ou sem jogos novos no arquivo (modo incremental)
+        self.df_teste = self.df_teste.sort_values(
+            ['Date_dt', self.coluna_home, self.coluna_away], kind='stable').reset_index(drop=True)
+        self.df_teste = self._com_colunas_calculadas(self.df_teste)
         
         # Detectar número de equipes e jogos por rodada
         self.num_times = self._contar_equipes()
         self.max_jogos_rodada = self._detectar_max_jogos_rodada()
         
         # Estado do backtest
+        self._assinatura_jogos = None
         self.resultados = self._carregar_resultados()
 
         # Garantir total_jogos atualizado para a temporada atual
@@ -56,102 +91,22 @@ class BacktestEngine:
             self.resultados['total_jogos'] = len(self.df_teste)
             self._salvar_resultados()
         
-    def _detectar_coluna(self, padroes):
-        """Detecta coluna por padrão (case-insensitive)"""
-        # Padrões específicos para melhor detecção
-        patterns = {
-            'home|hometeam': ['HomeTeam', 'Home'],
-            'away|awayteam': ['AwayTeam', 'Away'],
-            'fthg|hg': ['FTHG', 'HG'],
-            'ftag|ag': ['FTAG', 'AG'],
-        }
-        
-        # Verificar se temos um padrão específico
-        for col in self.df_original.columns:
-            col_upper = col.upper()
-            col_lower = col.lower()
-            
-            for padrao in padroes.split('|'):
-                padrao_lower = padrao.lower()
-                
-                # Correspondência exata prioritária
-                if col_upper == padrao_lower.upper() or col_lower == padrao_lower:
-                    return col
-        
-        # Caso 2: Correspondência parcial, mas evitar falsos positivos
-        for col in self.df_original.columns:
-            col_lower = col.lower()
-            for padrao in padroes.split('|'):
-                # Para colunas de gols, apenas palavras curtas
-                if padrao in ['hg', 'ag', 'fthg', 'ftag']:
-                    # Apenas colunas que terminam com a letra ou começam com F/H/A
-                    if col_lower.startswith('f') or len(col_lower) <= 4:
-                        if padrao in col_lower:
-                            return col
-                else:
-                    # Para outras colunas (home, away)
-                    if padrao in col_lower and 'league' not in col_lower and 'country' not in col_lower:
-                        return col
-        
-        return None
-    
-    def _detectar_coluna_season(self):
-        """Detecta a coluna de temporada/season"""
-        for col in self.df_original.columns:
-            if 'season' in col.lower():
-                return col
-        return 'Season'  # Padrão
-    
-    def _detectar_coluna_data(self):
-        """Detecta a coluna de data"""
-        for col in self.df_original.columns:
-            if 'date' in col.lower():
-                return col
-        return 'Date'  # Padrão
-    
-    def _detectar_formato_temporada(self):
-        """Detecta o formato de temporada usado no CSV (YYYY/YYYY ou YYYY)"""
-        try:
-            # Pegar algumas amostras de valores de season
-            samples = self.df_original[self.coluna_season].unique()[:10]
-            
-            separador_count = 0
-            apenas_ano_count = 0
-            
-            for sample in samples:
-                sample_str = str(sample).strip()
-                if '/' in sample_str:
-                    separador_count += 1
-                elif sample_str.isdigit() and len(sample_str) == 4:
-                    apenas_ano_count += 1
-            
-            # Determinar formato baseado na amostragem
-            if separador_count > apenas_ano_count:
-                print(f"🔵 [BacktestEngine] Análise: {separador_count} com '/', {apenas_ano_count} apenas ano")
-                return 'YYYY/YYYY'
-            else:
-                print(f"🔵 [BacktestEngine] Análise: {separador_count} com '/', {apenas_ano_count} apenas ano")
-                return 'YYYY'
-        except Exception as e:
-            print(f"⚠️  [BacktestEngine] Erro ao detectar formato temporada: {e}")
-            return 'YYYY/YYYY'  # Padrão seguro
-    
-    def _detectar_colunas_odds(self):
-        """Detecta colunas de odds para home e away"""
-        # Procurar por B365H/B365A (padrão) ou PSCH/PSCA (outras ligas)
-        cols_home = [col for col in self.df_original.columns if 'b365h' in col.lower() or ('psch' in col.lower() and 'pscd' not in col.lower())]
-        cols_away = [col for col in self.df_original.columns if 'b365a' in col.lower() or ('psca' in col.lower() and 'pscd' not in col.lower())]
-        
-        # Se não encontrou, procurar por padrões mais gerais
-        if not cols_home:
-            cols_home = [col for col in self.df_original.columns if col.upper().endswith('H') and 'home' not in col.lower()]
-        if not cols_away:
-            cols_away = [col for col in self.df_original.columns if col.upper().endswith('A') and 'away' not in col.lower()]
-        
-        coluna_home = cols_home[0] if cols_home else 'B365H'
-        coluna_away = cols_away[0] if cols_away else 'B365A'
-        
-        return coluna_home, coluna_away
+    def _com_colunas_calculadas(self, df):
+        """
+        Acrescenta id_home/id_away (dicionário de times) e prob_h/prob_a
+        (1/odd do par de odds_range), calculadas uma vez por jogo
+        """
+        df['id_home'] = self.times.codificar(df[self.coluna_home])
+        df['id_away'] = self.times.codificar(df[self.coluna_away])
+        if self.odds_range:
+            col_odd_h, col_odd_a = self.odds_range
+            df['prob_h'] = 1 / df[col_odd_h]
+            df['prob_a'] = 1 / df[col_odd_a]
+        return df
+
+    def _gravar_treino(self):
+        self.df_treino.drop(columns=COLUNAS_CALCULADAS, errors='ignore').to_csv(self.arquivo_treino, index=False)
+
     def _filtrar_temporada_teste(self):
         """Filtra dados da temporada especificada - APENAS ATÉ A DATA ATUAL"""
         df = self.df_original.copy()
@@ -161,8 +116,7 @@ class BacktestEngine:
         print(f"🔵 [BacktestEngine] Total de jogos no dataset: {len(df)}")
         print(f"🔵 [BacktestEngine] Coluna de temporada: {self.coluna_season}")
         
-        # Data atual (1º de fevereiro de 2026)
-        data_atual = pd.to_datetime('2026-02-01')
+        data_atual = self.data_limite
         print(f"🔵 [BacktestEngine] Data limite (hoje): {data_atual.date()}")
         
         # Mostrar valores únicos de temporada disponíveis
@@ -183,8 +137,11 @@ class BacktestEngine:
                 resultado = df[serie_season == padrao_str]
                 if len(resultado) > 0:
                     # FILTRO IMPORTANTE: Apenas jogos até a data atual
-                    resultado['Date_dt'] = pd.to_datetime(resultado[self.coluna_data], errors='coerce')
                     resultado = resultado[resultado['Date_dt'] <= data_atual]
+                    # Só jogos com resultado (fixtures futuros vêm sem placar)
+                    colunas_gols = [c for c in (self.coluna_gols_home, self.coluna_gols_away) if c]
+                    if colunas_gols:
+                        resultado = resultado.dropna(subset=colunas_gols)
                     
                     print(f"🟢 [BacktestEngine] ✓ Temporada encontrada com padrão '{padrao}': {len(resultado)} jogos (até {data_atual.date()})")
                     print(f"{'='*80}\n")
@@ -197,7 +154,6 @@ class BacktestEngine:
         # Se nenhum padrão funcionar, retornar dados mais recentes (fallback)
         print(f"\n⚠️  [BacktestEngine] ATENÇÃO: Temporada '{self.temporada}' não encontrada!")
         print(f"⚠️  [BacktestEngine] Usando FALLBACK - dados dos últimos 600 dias")
-        df['Date_dt'] = pd.to_datetime(df[self.coluna_data], errors='coerce')
         df = df[df['Date_dt'] <= data_atual]  # Também aplicar filtro por data no fallback
         data_limite = data_atual - pd.Timedelta(days=600)
         resultado_fallback = df[df['Date_dt'] >= data_limite]
@@ -255,10 +211,8 @@ class BacktestEngine:
     
     def _contar_equipes(self):
         """Conta o número único de equipes na temporada de teste"""
-        times_home = set(self.df_teste[self.coluna_home].unique())
-        times_away = set(self.df_teste[self.coluna_away].unique())
-        times_totais = times_home.union(times_away)
-        return len(times_totais)
+        ids = np.union1d(self.df_teste['id_home'].to_numpy(), self.df_teste['id_away'].to_numpy())
+        return int((ids != SEM_ID).sum())
     
     def _detectar_max_jogos_rodada(self):
         """
@@ -298,56 +252,101 @@ class BacktestEngine:
             except (json.JSONDecodeError, Exception):
                 pass
         
+        return self._novos_resultados()
+
+    def _novos_resultados(self):
+        """Estado inicial de um backtest"""
         return {
             'rodada_atual': 1,
             'jogos_processados': 0,
             'entradas': [],
             'lucro_total': 0,
             'acertos': 0,
-            'erros': 0
+            'erros': 0,
+            'rodadas': []
         }
+
+    def _assinatura_teste(self, n):
+        """
+        Hash dos n primeiros jogos do df_teste (data, times, gols e odds), na
+        ordem em que são processados
+        """
+        colunas = ['Date_dt', self.coluna_home, self.coluna_away, self.coluna_gols_home,
+                   self.coluna_gols_away, self.coluna_odds_home, self.coluna_odds_away,
+                   *(self.odds_range or ())]
+        colunas = list(dict.fromkeys(c for c in colunas if c))
+        linhas = pd.util.hash_pandas_object(self.df_teste[colunas].iloc[:n], index=False)
+        return hashlib.sha1(linhas.to_numpy().tobytes()).hexdigest()
     
-    def _salvar_resultados(self):
-        """Salva resultados do backtest"""
-        with open(self.arquivo_resultados, 'w', encoding='utf-8') as f:
-            json.dump(self.resultados, f, ensure_ascii=False, indent=2)
+    def _salvar_resultados(self, atualizar_manifesto=None):
+        """
+        Salva resultados do backtest. O resumo no manifesto é atualizado uma
+        vez por temporada (ao concluir, ou com atualizar_manifesto=True);
+        nos checkpoints de rodada só o arquivo de resultados é gravado.
+        """
+        if atualizar_manifesto is None:
+            atualizar_manifesto = bool(self.resultados.get('completo'))
+        self.manifesto.gravar_resultados(self.arquivo_resultados, self.resultados,
+                                         atualizar_manifesto=atualizar_manifesto)
 
     def salvar_resultados(self):
-        """Wrapper público para salvar resultados"""
-        self._salvar_resultados()
+        """Wrapper público para salvar resultados (atualiza o manifesto)"""
+        self._salvar_resultados(atualizar_manifesto=True)
     
-    def obter_proxima_rodada(self):
-        """Obtém jogos da próxima rodada para processar (bloco sem repetir equipes)"""
-        jogos_ja_processados = self.resultados['jogos_processados']
-        
-        if jogos_ja_processados >= len(self.df_teste):
-            return None, None  # Backtest completo
-        
-        # Obter próxima rodada
-        jogos_restantes = self.df_teste.iloc[jogos_ja_processados:].reset_index(drop=True)
+    def _bloco_rodada(self, inicio):
+        """
+        Agrupa os jogos a partir da posição inicio em um bloco sem repetir
+        equipes (rodada dinâmica).
+
+        Returns:
+            tuple: (posições relativas a inicio, fechada). fechada é False quando
+            a busca chegou ao fim dos jogos sem completar as equipes: com jogos
+            novos no arquivo o bloco dessa rodada pode ser outro.
+        """
+        ids_home = self.df_teste['id_home'].to_numpy()[inicio:]
+        ids_away = self.df_teste['id_away'].to_numpy()[inicio:]
         
-        # Agrupar jogos em blocos sem repetir equipes (rodada dinâmica)
-        rodada_jogos = []
-        times_usados = set()
+        posicoes = []
+        times_usados = np.zeros(len(self.times) + 1, dtype=bool)  # última posição: SEM_ID
+        num_usados = 0
         
-        for _, jogo in jogos_restantes.iterrows():
-            home = str(jogo[self.coluna_home])
-            away = str(jogo[self.coluna_away])
+        for i in range(len(ids_home)):
+            home = ids_home[i]
+            away = ids_away[i]
             
             # Se a partida repete equipe, pula para tentar encaixar outras
-            if home in times_usados or away in times_usados:
+            if times_usados[home] or times_usados[away]:
                 continue
             
             # Caso contrário, adiciona ao bloco
-            rodada_jogos.append(jogo)
-            times_usados.add(home)
-            times_usados.add(away)
+            posicoes.append(i)
+            times_usados[home] = True
+            times_usados[away] = True
+            num_usados += 1 if home == away else 2
             
             # Se já usamos todos os times possíveis, encerra o bloco
-            if self.num_times > 0 and len(times_usados) >= self.num_times:
-                break
+            if self.num_times > 0 and num_usados >= self.num_times:
+                return posicoes, True
+        
+        return posicoes, False
+
+    def _proxima_rodada(self):
+        """(número da rodada, jogos, fechada) da próxima rodada, ou (None, None, False) no fim"""
+        jogos_ja_processados = self.resultados['jogos_processados']
+        
+        if jogos_ja_processados >= len(self.df_teste):
+            return None, None, False  # Backtest completo
         
-        return self.resultados['rodada_atual'], rodada_jogos
+        # (índice mantido: jogo.name é a linha no df_teste)
+        jogos_restantes = self.df_teste.iloc[jogos_ja_processados:]
+        posicoes, fechada = self._bloco_rodada(jogos_ja_processados)
+        rodada_jogos = [jogo for _, jogo in jogos_restantes.iloc[posicoes].iterrows()]
+        return self.resultados['rodada_atual'], rodada_jogos, fechada
+
+    def obter_proxima_rodada(self):
+        """Obtém jogos da próxima rodada para processar (bloco sem repetir equipes)"""
+        rodada_num, rodada_jogos, _ = self._proxima_rodada()
+        return rodada_num, rodada_jogos
     
     def calcular_medias_historicas_por_odds(self, time, eh_home, odd_time, odd_adversario, range_percent=0.07):
         """
@@ -367,6 +366,10 @@ class BacktestEngine:
         if self.df_treino is None or len(self.df_treino) == 0:
             return None, None, None, None
         
+        id_time = self.times.id(time)
+        if id_time == SEM_ID:
+            return None, None, None, None
+        
         # Calcular probabilidades
         prob_time = 1 / odd_time if odd_time > 0 else 0
         prob_adversario = 1 / odd_adversario if odd_adversario > 0 else 0
@@ -377,39 +380,18 @@ class BacktestEngine:
         prob_adv_min = prob_adversario * (1 - range_percent)
         prob_adv_max = prob_adversario * (1 + range_percent)
         
-        # Identificar colunas de odds (preferir B365H/B365A)
-        col_odd_h, col_odd_a = None, None
-        odds_priority = [
-            ('B365H', 'B365A'),
-            ('B365CH', 'B365CA'),
-            ('PSCH', 'PSCA'),
-            ('PSH', 'PSA'),
-            ('MaxCH', 'MaxCA'),
-            ('MaxH', 'MaxA'),
-            ('AvgCH', 'AvgCA'),
-            ('AvgH', 'AvgA')
-        ]
-        
-        for h_col, a_col in odds_priority:
-            if h_col in self.df_treino.columns and a_col in self.df_treino.columns:
-                col_odd_h = h_col
-                col_odd_a = a_col
-                break
-        
-        if not col_odd_h or not col_odd_a:
+        # Colunas de odds (preferir B365H/B365A), resolvidas no esquema da liga;
+        # prob_h/prob_a e id_home/id_away já estão no treino (_com_colunas_calculadas)
+        if not self.odds_range:
             return None, None, None, None
         
         if eh_home:
             # Time joga em casa: buscar jogos onde ele foi mandante
-            jogos_time = self.df_treino[self.df_treino[self.coluna_home] == time].copy()
+            jogos_time = self.df_treino[self.df_treino['id_home'] == id_time]
             
             if len(jogos_time) == 0:
                 return None, None, None, None
             
-            # Calcular probabilidades das odds históricas
-            jogos_time['prob_h'] = 1 / jogos_time[col_odd_h]
-            jogos_time['prob_a'] = 1 / jogos_time[col_odd_a]
-            
             # Filtrar por range de probabilidade
             jogos_filtrados = jogos_time[
                 (jogos_time['prob_h'] >= prob_time_min) & 
@@ -431,15 +413,11 @@ class BacktestEngine:
         
         else:
             # Time joga fora: buscar jogos onde ele foi visitante
-            jogos_time = self.df_treino[self.df_treino[self.coluna_away] == time].copy()
+            jogos_time = self.df_treino[self.df_treino['id_away'] == id_time]
             
             if len(jogos_time) == 0:
                 return None, None, None, None
             
-            # Calcular probabilidades das odds históricas
-            jogos_time['prob_h'] = 1 / jogos_time[col_odd_h]
-            jogos_time['prob_a'] = 1 / jogos_time[col_odd_a]
-            
             # Filtrar por range de probabilidade (invertido para away)
             jogos_filtrados = jogos_time[
                 (jogos_time['prob_a'] >= prob_time_min) & 
@@ -473,7 +451,7 @@ class BacktestEngine:
         # Se odds não fornecidas, tentar extrair do histórico ou usar padrão
         if odd_h is None or odd_a is None:
             # Buscar odd médio dos jogos do home_team como mandante
-            jogos_home = self.df_treino[self.df_treino[self.coluna_home] == home_team]
+            jogos_home = self.df_treino[self.df_treino['id_home'] == self.times.id(home_team)]
             if len(jogos_home) > 0 and 'B365H' in jogos_home.columns:
                 odd_h = jogos_home['B365H'].tail(5).mean()
                 odd_a = jogos_home['B365A'].tail(5).mean()
@@ -652,13 +630,19 @@ class BacktestEngine:
         
         return value_bets
     
-    def processar_rodada(self):
-        """Processa a próxima rodada do backtest"""
-        rodada_num, rodada_jogos = self.obter_proxima_rodada()
+    def processar_rodada(self, salvar=True):
+        """
+        Processa a próxima rodada do backtest.
+
+        salvar=False deixa a gravação do treino e dos resultados para
+        salvar_estado() (usado ao processar a temporada inteira de uma vez).
+        """
+        rodada_num, rodada_jogos, fechada = self._proxima_rodada()
         
         if rodada_jogos is None:
             self.resultados['completo'] = True
-            self._salvar_resultados()
+            if salvar:
+                self._salvar_resultados()
             return None  # Backtest completo
         
         # Identificar value bets
@@ -696,17 +680,41 @@ class BacktestEngine:
         
         # Atualizar dados de treino com os jogos da rodada processada
         # (adicionar os resultados reais ao arquivo de treino)
-        for jogo in rodada_jogos:
-            self.df_treino = pd.concat([self.df_treino, pd.DataFrame([jogo])], ignore_index=True)
+        # (linhas do df_teste, com os tipos e as colunas calculadas preservados)
+        novos = self.df_teste.loc[[jogo.name for jogo in rodada_jogos]]
+        self.df_treino = pd.concat([self.df_treino, novos], ignore_index=True)
         
         # Salvar arquivo de treino atualizado
-        self.df_treino.to_csv(self.arquivo_treino, index=False)
+        if salvar:
+            self._gravar_treino()
         
         # Atualizar estado
         self.resultados['jogos_processados'] += len(rodada_jogos)
         self.resultados['rodada_atual'] += 1
+        datas_rodada = [jogo['Date_dt'] for jogo in rodada_jogos if pd.notna(jogo['Date_dt'])]
+        if datas_rodada:
+            ultima = max(datas_rodada)
+            anterior = self.resultados.get('ultima_data')
+            if anterior is None or ultima > pd.Timestamp(anterior):
+                self.resultados['ultima_data'] = ultima.isoformat()
+
+        # Ponto de retomada do modo incremental (ver sincronizar_novos_jogos)
+        if self._assinatura_jogos is None:
+            self._assinatura_jogos = self._assinatura_teste(len(self.df_teste))
+        self.resultados['jogos_teste'] = len(self.df_teste)
+        self.resultados['assinatura_teste'] = self._assinatura_jogos
+        self.resultados['num_times'] = self.num_times
+        self.resultados.setdefault('rodadas', []).append({
+            'jogos': self.resultados['jogos_processados'],
+            'entradas': len(self.resultados['entradas']),
+            'lucro_total': self.resultados['lucro_total'],
+            'acertos': self.resultados['acertos'],
+            'erros': self.resultados['erros'],
+            'fechada': fechada,
+        })
         
-        self._salvar_resultados()
+        if salvar:
+            self._salvar_resultados()
         
         return {
             'rodada': rodada_num,
@@ -715,6 +723,86 @@ class BacktestEngine:
             'lucro_rodada': sum([vb['lp'] for vb in value_bets])
         }
     
+    def salvar_estado(self):
+        """Grava treino e resultados (após rodadas processadas com salvar=False)"""
+        self._gravar_treino()
+        self._salvar_resultados(atualizar_manifesto=True)
+
+    def sincronizar_novos_jogos(self):
+        """
+        Prepara o modo incremental: mantém só as rodadas que um recálculo
+        completo da temporada repetiria iguais e reabre o backtest a partir
+        delas. Continuar exige que:
+
+        - os jogos vistos por essas rodadas sigam iguais e na mesma ordem no
+          df_teste (assinatura_teste dos primeiros jogos_teste jogos) e o
+          número de equipes não tenha mudado;
+        - a rodada seja uma das rodadas fechadas do início (ver _bloco_rodada).
+          A primeira rodada aberta e as seguintes são refeitas.
+
+        Resultados sem esse ponto de retomada (sem ultima_data, gravados antes
+        dele existir, ou com jogos antigos alterados) não são continuados: a
+        temporada é recalculada do zero.
+
+        Returns:
+            int: número de jogos a processar (0 = nada novo)
+        """
+        total = len(self.df_teste)
+        jogos_teste = self.resultados.get('jogos_teste')
+        rodadas = self.resultados.get('rodadas')
+        continuavel = (self.resultados.get('ultima_data') is not None
+                       and rodadas is not None
+                       and jogos_teste is not None and jogos_teste <= total
+                       and self.resultados.get('num_times') == self.num_times
+                       and self.resultados.get('assinatura_teste') == self._assinatura_teste(jogos_teste))
+        if not continuavel:
+            print(f"🔄 [BacktestEngine] Resultados sem ponto de retomada: recalculando {self.liga} - {self.temporada}")
+            self.resultados = self._novos_resultados()
+            self.resultados['total_jogos'] = total
+            return total
+
+        if jogos_teste == total and self.resultados.get('completo'):
+            return 0
+
+        fechadas = 0
+        while fechadas < len(rodadas) and rodadas[fechadas]['fechada']:
+            fechadas += 1
+        estado = rodadas[fechadas - 1] if fechadas else {
+            'jogos': 0, 'entradas': 0, 'lucro_total': 0, 'acertos': 0, 'erros': 0}
+
+        self.resultados.update({
+            'rodada_atual': fechadas + 1,
+            'jogos_processados': estado['jogos'],
+            'entradas': self.resultados['entradas'][:estado['entradas']],
+            'lucro_total': estado['lucro_total'],
+            'acertos': estado['acertos'],
+            'erros': estado['erros'],
+            'rodadas': rodadas[:fechadas],
+            'completo': False,
+        })
+        self.resultados.pop('ultima_data', None)  # refeita por restaurar_treino
+        return total - estado['jogos']
+
+    def restaurar_treino(self):
+        """
+        Reconstrói o treino em memória para continuar a temporada: jogos
+        anteriores à temporada (já no arquivo de treino) + os blocos das
+        rodadas mantidas, na mesma ordem em que o processamento os acrescentou.
+        """
+        blocos = []
+        inicio = 0
+        for _ in range(self.resultados['rodada_atual'] - 1):
+            posicoes, _ = self._bloco_rodada(inicio)
+            blocos.append(self.df_teste.iloc[inicio:].iloc[posicoes])
+            inicio += len(posicoes)
+        if blocos:
+            processados = pd.concat(blocos)
+            self.df_treino = pd.concat([self.df_treino, processados], ignore_index=True)
+            ultima = processados['Date_dt'].max()
+            if pd.notna(ultima):
+                self.resultados['ultima_data'] = ultima.isoformat()
+        self._gravar_treino()
+
     def obter_status(self):
         """Retorna status atual do backtest"""
         total_entradas = len(self.resultados['entradas'])
@@ -736,8 +824,7 @@ class BacktestEngine:
     
     def resetar(self):
         """Reseta o backtest"""
-        if self.arquivo_resultados.exists():
-            self.arquivo_resultados.unlink()
+        self.manifesto.remover(self.arquivo_resultados)
         
         # Recriar arquivo de treino
         df_original = pd.read_csv(self.arquivo_original)
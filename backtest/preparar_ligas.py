@@ -6,9 +6,13 @@ Cria cópias dos dados originais filtrados até 2023/2024
 """
 
 import os
+import sys
 import pandas as pd
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from datas_ligas import datas_liga
+
 # Dicionário com as ligas e suas informações
 LIGAS = {
     # Ligas da Europa (dados_ligas)
@@ -83,8 +87,8 @@ def preparar_dados_liga(codigo_liga, pasta_origem):
             print(f"⚠️  {codigo_liga}: Coluna de data não encontrada")
             return False
         
-        # Converter para datetime
-        df[data_coluna] = pd.to_datetime(df[data_coluna], errors='coerce')
+        # Converter para datetime (formato explícito detectado no esquema do arquivo)
+        df[data_coluna] = datas_liga(arquivo_original, df).to_numpy()
         
         # Filtrar dados até 2023/2024
         # Considerar que temporadas vão de agosto a julho
@@ -0,0 +1,312 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Download incremental dos históricos das 31 ligas (football-data.co.uk)
+
+- Ligas principais (E0, SP1...): um CSV por temporada em
+  mmz4281/<AAaa>/<LIGA>.csv, juntados em dados_ligas/<LIGA>_completo.csv
+  com a coluna Season ('2024/2025'). Com o arquivo já existente só são
+  baixadas as temporadas a partir da última que ele contém.
+- Ligas /new (BRA, ARG...): new/<LIGA>.csv com todas as temporadas, salvo
+  em dados_ligas_new/<LIGA>.csv.
+
+Cada URL é pedida com GET condicional (ETag / Last-Modified guardados em
+estado_downloads.json): arquivo sem mudança volta 304 e não é baixado.
+Só jogos novos (chave temporada + data + times, com placar e odds) são
+acrescentados ao arquivo da liga, e o cálculo de CGH/CGA/VGH/VGA
+(adicionar_colunas_calculadas.processar_arquivo) roda só nas ligas que
+mudaram. As ligas são processadas em paralelo com no máximo MAX_CONEXOES
+conexões; falhas de rede, 429 e 5xx são repetidas com espera exponencial.
+
+Uso:
+    python baixar_ligas.py                 # todas as ligas
+    python baixar_ligas.py E0 BRA          # só as informadas
+    python baixar_ligas.py --completo      # ignora o estado e rebaixa tudo
+
+URL_FOOTBALL_DATA troca o servidor (ex.: http://127.0.0.1:8765 para testar
+com CSVs locais servidos por `python -m http.server`).
+"""
+
+import io
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+from adicionar_colunas_calculadas import processar_arquivo
+from esquema_ligas import inferir_esquema
+from tabela_canonica import LIGAS
+
+BASE_DIR = Path(__file__).parent
+ARQUIVO_ESTADO = BASE_DIR / 'estado_downloads.json'
+
+URL_BASE = os.environ.get('URL_FOOTBALL_DATA', 'https://www.football-data.co.uk').rstrip('/')
+
+LIGAS_PRINCIPAIS = ['B1', 'D1', 'D2', 'E0', 'E1', 'F1', 'F2', 'G1', 'I1', 'I2',
+                    'N1', 'P1', 'SP1', 'SP2', 'T1']
+# Primeira temporada baixada para as ligas principais (2012/2013)
+ANO_INICIAL = 2012
+
+MAX_CONEXOES = int(os.environ.get('MAX_CONEXOES', 4))
+TENTATIVAS = 4
+ESPERA_INICIAL = 1.0  # segundos; dobra a cada nova tentativa
+TIMEOUT = 30
+
+_estado_lock = threading.Lock()
+
+
+def temporada_atual(hoje=None):
+    """Ano de início da temporada em andamento (europeia: começa em julho)"""
+    hoje = hoje or datetime.now()
+    return hoje.year if hoje.month >= 7 else hoje.year - 1
+
+
+def _rotulo_temporada(ano):
+    return f'{ano}/{ano + 1}'
+
+
+def _url_temporada(url_base, liga, ano):
+    return f'{url_base}/mmz4281/{ano % 100:02d}{(ano + 1) % 100:02d}/{liga}.csv'
+
+
+def arquivo_destino(liga):
+    if liga in LIGAS_PRINCIPAIS:
+        return BASE_DIR / 'dados_ligas' / f'{liga}_completo.csv'
+    return BASE_DIR / 'dados_ligas_new' / f'{liga}.csv'
+
+
+def _ler_estado():
+    try:
+        with open(ARQUIVO_ESTADO, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _gravar_estado(estado):
+    with _estado_lock:
+        temporario = ARQUIVO_ESTADO.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(estado, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, ARQUIVO_ESTADO)
+
+
+def criar_sessao(max_conexoes=MAX_CONEXOES):
+    """Sessão HTTP com pool limitado a max_conexoes conexões reaproveitadas"""
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=max_conexoes, pool_maxsize=max_conexoes)
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    return sessao
+
+
+def baixar(sessao, url, estado, completo=False):
+    """
+    GET condicional com repetição.
+
+    Returns:
+        (conteudo, cabecalhos) — conteudo None se o servidor respondeu 304 ou
+        404 (temporada ainda não publicada); cabecalhos = ETag/Last-Modified
+        a gravar no estado depois que o conteúdo for aproveitado
+    """
+    cabecalhos = {}
+    anterior = {} if completo else estado.get(url, {})
+    if anterior.get('etag'):
+        cabecalhos['If-None-Match'] = anterior['etag']
+    if anterior.get('last_modified'):
+        cabecalhos['If-Modified-Since'] = anterior['last_modified']
+
+    for tentativa in range(TENTATIVAS):
+        try:
+            resposta = sessao.get(url, headers=cabecalhos, timeout=TIMEOUT)
+            if resposta.status_code == 304 or resposta.status_code == 404:
+                return None, None
+            if resposta.status_code == 429 or resposta.status_code >= 500:
+                raise requests.HTTPError(f'HTTP {resposta.status_code}', response=resposta)
+            resposta.raise_for_status()
+            return resposta.content, {
+                'etag': resposta.headers.get('ETag'),
+                'last_modified': resposta.headers.get('Last-Modified'),
+            }
+        except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+            status = getattr(e.response, 'status_code', None)
+            if status is not None and status < 500 and status != 429:
+                raise
+            if tentativa == TENTATIVAS - 1:
+                raise
+            time.sleep(ESPERA_INICIAL * 2 ** tentativa)
+
+
+def ler_csv(conteudo):
+    """CSV do football-data (utf-8 com BOM ou latin-1), sem linhas/colunas vazias"""
+    try:
+        df = pd.read_csv(io.BytesIO(conteudo), encoding='utf-8-sig', low_memory=False)
+    except UnicodeDecodeError:
+        df = pd.read_csv(io.BytesIO(conteudo), encoding='latin-1', low_memory=False)
+    df = df.loc[:, [c for c in df.columns if not str(c).startswith('Unnamed')]]
+    return df.dropna(how='all')
+
+
+def _chaves(df):
+    """Chave de cada jogo: temporada + data + mandante + visitante"""
+    esquema = inferir_esquema(None, df)
+    partes = [esquema['coluna_season'], esquema['coluna_data'], esquema['coluna_home'], esquema['coluna_away']]
+    partes = [df[c].astype(str).str.strip() for c in partes if c]
+    return partes[0].str.cat(partes[1:], sep='|')
+
+
+def _jogos_completos(df):
+    """Jogos com placar e o par de odds usado nas colunas calculadas"""
+    esquema = inferir_esquema(None, df)
+    gols = [esquema['coluna_gols_home'], esquema['coluna_gols_away']]
+    odds = esquema['odds_range'] or []
+    obrigatorias = [c for c in gols + odds if c]
+    df = df.dropna(subset=obrigatorias)
+    for col in odds:
+        df = df[pd.to_numeric(df[col], errors='coerce') != 0]
+    return df
+
+
+def _baixar_liga(sessao, liga, estado, url_base, completo):
+    """Baixa os arquivos da liga; devolve (DataFrame baixado ou None, cabeçalhos por URL)"""
+    destino = arquivo_destino(liga)
+    novos_cabecalhos = {}
+    # Sem o arquivo local, um 304 não serviria: pede tudo sem condição
+    completo = completo or not destino.exists()
+
+    if liga not in LIGAS_PRINCIPAIS:
+        url = f'{url_base}/new/{liga}.csv'
+        conteudo, cabecalhos = baixar(sessao, url, estado, completo)
+        if conteudo is None:
+            return None, {}
+        return ler_csv(conteudo), {url: cabecalhos}
+
+    # Temporadas a baixar: todas, ou a partir da última já salva
+    ano_inicio = ANO_INICIAL
+    if not completo:
+        seasons = pd.read_csv(destino, usecols=['Season'], encoding='utf-8-sig')['Season'].dropna().astype(str)
+        if len(seasons):
+            ano_inicio = max(int(s[:4]) for s in seasons)
+
+    partes = []
+    for ano in range(ano_inicio, temporada_atual() + 1):
+        url = _url_temporada(url_base, liga, ano)
+        conteudo, cabecalhos = baixar(sessao, url, estado, completo)
+        if conteudo is None:
+            continue
+        df = ler_csv(conteudo)
+        df.insert(0, 'Season', _rotulo_temporada(ano))
+        partes.append(df)
+        novos_cabecalhos[url] = cabecalhos
+
+    if not partes:
+        return None, {}
+    return pd.concat(partes, ignore_index=True), novos_cabecalhos
+
+
+def atualizar_liga(sessao, liga, estado, url_base=URL_BASE, completo=False):
+    """
+    Baixa a liga e acrescenta os jogos novos ao arquivo dela.
+
+    Returns:
+        dict: {'liga', 'novos', 'total', 'mensagem'}
+    """
+    destino = arquivo_destino(liga)
+    baixado, cabecalhos = _baixar_liga(sessao, liga, estado, url_base, completo)
+    if baixado is None:
+        return {'liga': liga, 'novos': 0, 'total': None, 'mensagem': 'sem mudanças'}
+
+    existente = None
+    if destino.exists() and not completo:
+        existente = pd.read_csv(destino, encoding='utf-8-sig', low_memory=False)
+
+    if existente is not None and len(existente):
+        baixado = baixado[~_chaves(baixado).isin(set(_chaves(existente)))]
+        colunas = list(dict.fromkeys(list(existente.columns) + list(baixado.columns)))
+    else:
+        colunas = list(baixado.columns)
+    novos = _jogos_completos(baixado.reindex(columns=colunas))
+
+    if len(novos):
+        destino.parent.mkdir(exist_ok=True)
+        partes = [existente] if existente is not None else []
+        resultado = pd.concat(partes + [novos], ignore_index=True)[colunas]
+        resultado.to_csv(destino, index=False, encoding='utf-8-sig')
+        # Colunas calculadas só para as ligas que mudaram
+        total, mensagem = processar_arquivo(destino)
+    else:
+        total, mensagem = None, 'sem jogos novos'
+
+    # Estado só depois de aproveitar o conteúdo (falha = baixa de novo na próxima)
+    with _estado_lock:
+        for url, valores in cabecalhos.items():
+            estado[url] = {**valores, 'verificado_em': datetime.now().isoformat()}
+    return {'liga': liga, 'novos': len(novos), 'total': total, 'mensagem': mensagem}
+
+
+def atualizar_ligas(ligas=None, url_base=URL_BASE, max_conexoes=MAX_CONEXOES, completo=False):
+    """
+    Atualiza as ligas em paralelo (no máximo max_conexoes ao mesmo tempo).
+
+    Returns:
+        list: resultado de atualizar_liga por liga (com 'erro' nas que falharam)
+    """
+    ligas = ligas or LIGAS
+    estado = _ler_estado()
+    sessao = criar_sessao(max_conexoes)
+    resultados = []
+
+    with ThreadPoolExecutor(max_workers=max_conexoes) as executor:
+        futuros = {executor.submit(atualizar_liga, sessao, liga, estado, url_base, completo): liga
+                   for liga in ligas}
+        for futuro in as_completed(futuros):
+            liga = futuros[futuro]
+            try:
+                resultado = futuro.result()
+            except Exception as e:
+                resultado = {'liga': liga, 'novos': 0, 'total': None, 'erro': str(e)}
+            resultados.append(resultado)
+            if resultado.get('erro'):
+                print(f"  ❌ {liga}: {resultado['erro']}")
+            elif resultado['novos']:
+                print(f"  ✅ {liga}: {resultado['novos']} jogos novos ({resultado['mensagem']})")
+            else:
+                print(f"  ⏭️  {liga}: {resultado['mensagem']}")
+
+    _gravar_estado(estado)
+    return sorted(resultados, key=lambda r: r['liga'])
+
+
+def main():
+    ligas = [a.upper() for a in sys.argv[1:] if not a.startswith('--')] or LIGAS
+    desconhecidas = [l for l in ligas if l not in LIGAS]
+    if desconhecidas:
+        print(f"Ligas desconhecidas: {', '.join(desconhecidas)}")
+        sys.exit(1)
+
+    print(f"{'='*80}")
+    print(f"DOWNLOAD DAS LIGAS - {len(ligas)} ligas de {URL_BASE}")
+    print(f"{'='*80}\n")
+    inicio = time.time()
+    resultados = atualizar_ligas(ligas, completo='--completo' in sys.argv)
+
+    alteradas = [r for r in resultados if r['novos']]
+    falhas = [r for r in resultados if r.get('erro')]
+    print(f"\n{'='*80}")
+    print(f"Ligas atualizadas: {len(alteradas)} | sem mudanças: {len(resultados) - len(alteradas) - len(falhas)} "
+          f"| falhas: {len(falhas)} | {time.time() - inicio:.1f}s")
+    print(f"{'='*80}")
+    if falhas:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
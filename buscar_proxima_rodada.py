@@ -20,7 +20,7 @@ print(f"{'='*80}")
 print(f"DOWNLOAD DOS JOGOS DA PRÓXIMA RODADA - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 print(f"{'='*80}\n")
 
-# Carregar combinações validadas (73 combinações com critério rigoroso)
+# Carregar combinações validadas (calculadas do backtest, com cache em disco)
 combinacoes_validadas = carregar_combinacoes_validadas()
 print(f"[OK] Carregadas {len(combinacoes_validadas)} combinações validadas para análise\n")
 
@@ -665,7 +665,7 @@ if todos_jogos:
                 <a href="http://localhost:8000/analise_salvos.html" class="nav-link">Análise Salvos</a>
                 <a href="http://localhost:5001/backtest.html" class="nav-link">Backtest</a>
                 <a href="http://localhost:5001/backtest_salvos.html" class="nav-link">Backtests Salvos</a>
-                <a href="http://localhost:5001/backtest_resumo_entradas.html" class="nav-link">Resumo Entradas</a>
+                <a href="http://localhost:5002/backtest_resumo_entradas.html" class="nav-link">Resumo Entradas</a>
             </div>
         </div>
         
@@ -716,6 +716,7 @@ if todos_jogos:
                         <th>ODD D CALC</th>
                         <th>ODD A CALC</th>
                         <th>VALIDADA</th>
+                        <th>STAKE</th>
                         <th>AÇÃO</th>
                     </tr>
                 </thead>
@@ -844,8 +845,12 @@ if todos_jogos:
             chave_away = f'{liga}_{dxg}'
             
             # Validar combinações usando o novo sistema
-            validacao_home = "SIM" if f"{liga}_HOME_{dxg}" in combinacoes_validadas else "NÃO"
-            validacao_away = "SIM" if f"{liga}_AWAY_{dxg}" in combinacoes_validadas else "NÃO"
+            validacao_home = "SIM" if (liga, 'HOME', dxg) in combinacoes_validadas else "NÃO"
+            validacao_away = "SIM" if (liga, 'AWAY', dxg) in combinacoes_validadas else "NÃO"
+            
+            # Stake sugerido (calculado para a rodada inteira em analisar_proxima_rodada.py)
+            stake = row.get('STAKE', None)
+            stake_fmt = f"R$ {stake:.2f}" if pd.notna(stake) else '-'
             
             # Determinar cor da validação
             cor_home = "background-color: #00ff88; color: #000;" if validacao_home == "SIM" else "background-color: #ff4444; color: white;"
@@ -867,6 +872,7 @@ if todos_jogos:
                         <td class="center-cell"><span class="calc-odd {odd_d_class}">{odd_d_calc_fmt}</span></td>
                         <td class="center-cell"><span class="calc-odd {odd_a_class}">{odd_a_calc_fmt}</span></td>
                         <td class="center-cell"><div style="display: flex; gap: 8px; font-weight: bold; font-size: 0.85em;"><span style="{cor_home}; padding: 4px 8px; border-radius: 4px;">{validacao_home}</span><span style="{cor_away}; padding: 4px 8px; border-radius: 4px;">{validacao_away}</span></div></td>
+                        <td class="center-cell">{stake_fmt}</td>
                         <td class="center-cell"><button class="save-btn" onclick="salvarJogo(this, {idx})">Salvar</button></td>
                     </tr>
 """
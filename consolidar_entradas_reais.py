@@ -1,89 +1,263 @@
 """
 Consolidar todas as entradas individuais do backtest em um arquivo JSON
-Lê os dados salvos pelo BacktestEngine e cria um arquivo com TODAS as entradas
-com dados reais de liga, temporada, entrada, dxg, lp
+
+Lê os backtest/backtest_resultados_{liga}_{temporada}.json gravados pelo
+BacktestEngine (via manifesto_resultados) e grava fixtures/backtest_entradas_reais.json
+com TODAS as entradas, cada uma com:
+
+- liga, temporada (normalizada: '2024-25' e '2024/2025' viram '2024-2025')
+- data do jogo (AAAA-MM-DD), buscada na tabela canônica da liga entre os
+  jogos do confronto na temporada com o mesmo placar (e as mesmas odds);
+  None se a liga não tiver dados
+- chave: 'LIGA|data|home|away' (ou 'LIGA|temporada|home|away|n' sem data)
+- origem: arquivo de resultados de onde a entrada veio
+
+Jogos repetidos (a mesma temporada salva com nomes diferentes, temporadas
+que se sobrepõem) ficam uma vez só, pela chave; vale a entrada do arquivo
+gravado por último. O arquivo é ordenado por liga, temporada, data e times,
+e fixtures/backtest_entradas_reais_indice.json guarda as faixas [início, fim)
+de cada liga e de cada liga|temporada.
+
+A consolidação é incremental: só as temporadas cujo arquivo de resultados
+mudou desde a última execução são relidas.
+
+Uso:
+    python consolidar_entradas_reais.py              # incremental
+    python consolidar_entradas_reais.py --completo   # relê todas as temporadas
 """
 
 import json
-from pathlib import Path
+import os
+import re
+import sys
+import time
 from collections import defaultdict
+from pathlib import Path
+
+from manifesto_resultados import ManifestoResultados
 
 BACKTEST_DIR = Path(__file__).parent / 'backtest'
 FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+BACKTEST_ENTRADAS_REAIS = FIXTURES_DIR / 'backtest_entradas_reais.json'
+INDICE_ENTRADAS_REAIS = FIXTURES_DIR / 'backtest_entradas_reais_indice.json'
 
-def consolidar_entradas_reais():
-    """Lê os arquivos de resultados salvos e consolida entradas reais"""
-    
-    # Ligas conhecidas (as que foram processadas)
-    TODAS_LIGAS = {
-        'E0': 'Premier League',
-        'E1': 'Championship',
-        'SP1': 'La Liga',
-        'SP2': 'La Liga 2',
-        'I1': 'Serie A',
-        'I2': 'Serie B',
-        'D1': 'Bundesliga',
-        'D2': 'Bundesliga 2',
-        'F1': 'Ligue 1',
-        'F2': 'Ligue 2',
-        'B1': 'Jupiler Pro League',
-        'N1': 'Eredivisie',
-        'P1': 'Primeira Liga',
-        'T1': 'Süper Lig',
-        'ARG': 'Primera División',
-        'AUT': 'Bundesliga Áustria',
-        'BRA': 'Série A Brasil',
-        'CHN': 'Super League',
-        'DNK': 'Superliga',
-        'FIN': 'Veikkausliiga',
-        'IRL': 'League of Ireland',
-        'JPN': 'J1 League',
-        'MEX': 'Liga MX',
-        'NOR': 'Eliteserien',
-        'POL': 'Ekstraklasa',
-        'ROU': 'Liga 1',
-        'RUS': 'Premier League',
-        'SWE': 'Allsvenskan',
-        'SWZ': 'Super League',
-        'USA': 'MLS'
-    }
-    
-    entradas_consolidadas = []
-    liga_counter = 0
-    
+# Incrementar quando os campos acrescentados mudarem (força consolidação completa)
+VERSAO_CONSOLIDACAO = 1
+
+
+def normalizar_temporada(temporada):
+    """'2024-25', '2024/2025' e '2024-2025' -> '2024-2025'; '2024' fica igual"""
+    partes = re.split(r'[-/\\]', str(temporada).strip())
+    if len(partes) == 2 and len(partes[0]) == 4 and len(partes[1]) == 2 and partes[1].isdigit():
+        partes[1] = partes[0][:2] + partes[1]
+    return '-'.join(partes)
+
+
+def _jogos_confrontos(liga):
+    """
+    {(temporada, home, away): [(data, gols_h, gols_a, odd_h, odd_a), ...]} da
+    tabela canônica da liga, em ordem de data (vazio se a liga não tiver
+    arquivo de origem)
+    """
+    try:
+        from tabela_canonica import carregar_tabela
+        tabela = carregar_tabela(liga)
+    except Exception as e:
+        print(f"   ⚠️  {liga}: sem datas ({e})")
+        return {}
+    if tabela is None or not len(tabela):
+        return {}
+
+    temporadas = tabela['temporada'].astype(str).map(normalizar_temporada)
+    datas = tabela['data'].dt.strftime('%Y-%m-%d')
+    confrontos = defaultdict(list)
+    # A tabela já vem ordenada por data
+    for temporada, home, away, data, gh, ga, odd_h, odd_a in zip(
+            temporadas, tabela['home'], tabela['away'], datas,
+            tabela['gols_h'], tabela['gols_a'], tabela['odd_h'], tabela['odd_a']):
+        if isinstance(data, str):
+            confrontos[(temporada, home, away)].append((data, gh, ga, odd_h, odd_a))
+    return confrontos
+
+
+def _data_do_jogo(candidatos, usados, entrada):
+    """
+    Data do jogo da entrada entre os jogos do confronto na temporada: mesmo
+    placar e, havendo mais de um, mesmas odds; o primeiro ainda não usado.
+    """
+    def igual(a, b):
+        try:
+            return abs(float(a) - float(b)) < 1e-6
+        except (TypeError, ValueError):
+            return False
+
+    livres = [i for i in range(len(candidatos)) if i not in usados]
+    mesmo_placar = [i for i in livres if igual(candidatos[i][1], entrada.get('fthg'))
+                    and igual(candidatos[i][2], entrada.get('ftag'))]
+    mesmas_odds = [i for i in mesmo_placar if igual(candidatos[i][3], entrada.get('b365h'))
+                   and igual(candidatos[i][4], entrada.get('b365a'))]
+    escolhidos = mesmas_odds or mesmo_placar
+    if not escolhidos:
+        return None
+    usados.add(escolhidos[0])
+    return candidatos[escolhidos[0]][0]
+
+
+def _entradas_da_temporada(manifesto, registro, confrontos):
+    """Entradas de um arquivo de resultados com liga, temporada, data, chave e origem"""
+    liga = registro['liga']
+    temporada = normalizar_temporada(registro['temporada'])
+    ocorrencias = defaultdict(int)
+    usados = defaultdict(set)
+    entradas = []
+    for item in manifesto.ler_entradas(registro):
+        entrada = dict(item)
+        home = str(entrada.get('home', '')).strip()
+        away = str(entrada.get('away', '')).strip()
+        n = ocorrencias[(home, away)]
+        ocorrencias[(home, away)] += 1
+        candidatos = confrontos.get((temporada, home, away), [])
+        data = _data_do_jogo(candidatos, usados[(home, away)], entrada) if candidatos else None
+
+        entrada['liga'] = liga
+        entrada['temporada'] = temporada
+        entrada['data'] = data
+        entrada['chave'] = f'{liga}|{data}|{home}|{away}' if data else f'{liga}|{temporada}|{home}|{away}|{n}'
+        entrada['origem'] = registro['arquivo']
+        entradas.append(entrada)
+    return entradas
+
+
+def _ler_indice():
+    try:
+        with open(INDICE_ENTRADAS_REAIS, 'r', encoding='utf-8') as f:
+            indice = json.load(f)
+        if indice.get('versao') == VERSAO_CONSOLIDACAO and BACKTEST_ENTRADAS_REAIS.exists():
+            return indice
+    except (OSError, json.JSONDecodeError, AttributeError):
+        pass
+    return {}
+
+
+def _gravar_atomico(caminho, texto):
+    temporario = caminho.with_suffix(f'.{os.getpid()}.tmp')
+    with open(temporario, 'w', encoding='utf-8') as f:
+        f.write(texto)
+    os.replace(temporario, caminho)
+
+
+def _ordem(entrada):
+    return (entrada['liga'], entrada['temporada'], entrada['data'] or '',
+            str(entrada.get('home', '')), str(entrada.get('away', '')), entrada['chave'])
+
+
+def consolidar_entradas_reais(completo=False, pasta_resultados=None):
+    """
+    Consolida as entradas de todas as temporadas em backtest_entradas_reais.json.
+
+    Args:
+        completo: relê todas as temporadas (ignora a consolidação anterior)
+        pasta_resultados: pasta dos arquivos de resultados (padrão: backtest/)
+
+    Returns:
+        índice gravado (dict)
+    """
     print("🔍 Consolidando entradas individuais do backtest...")
     print("=" * 80)
-    
-    # Para cada liga, procurar pelos arquivos de resultados
-    for liga_codigo, liga_nome in sorted(TODAS_LIGAS.items()):
-        # Verificar se há arquivo de treino com essa liga
-        arquivo_treino = BACKTEST_DIR / f'{liga_codigo}_treino.csv'
-        
-        if arquivo_treino.exists():
-            # Carregar arquivo de resultados
-            # O BacktestEngine salva em backtest_resultados.json durante a execução
-            # Mas para cada liga, precisamos buscar os dados salvos
-            
-            # Estratégia: usar backtest_historico_completo_2012_2026.json
-            # e extrair dados por liga
-            pass
-    
-    # Melhor estratégia: ler backtest_historico_completo_2012_2026.json
-    # e para cada entrada acumulada, criar registros individuais
-    # Mas isso é artificial
-    
-    # Estratégia CORRETA: Modificar executar_backtest_completo.py para salvar
-    # todas as entradas individuais em um arquivo consolidado
-    # Por enquanto, retornar mensagem
-    
-    print("\n❌ Não foi encontrada estrutura com entradas individuais por liga")
-    print("\n🔧 Solução necessária:")
-    print("   1. Modificar executar_backtest_completo.py para coletar")
-    print("      entradas de cada BacktestEngine")
-    print("   2. Salvar em arquivo: backtest_entradas_reais.json")
-    print("   3. Ler desse arquivo para popular backtest_acumulado.json")
-    
-    return None
+
+    manifesto = ManifestoResultados(pasta_resultados or BACKTEST_DIR)
+    registros = {r['arquivo']: r for r in manifesto.listar()}
+    indice = {} if completo else _ler_indice()
+    fontes_antigas = indice.get('fontes', {})
+
+    alteradas = {a for a, r in registros.items() if fontes_antigas.get(a, {}).get('assinatura') != r['assinatura']}
+    removidas = set(fontes_antigas) - set(registros)
+    # Temporadas que perderam jogos repetidos para uma fonte relida voltam a concorrer
+    pendentes = list(alteradas | removidas)
+    while pendentes:
+        for perdedora in fontes_antigas.get(pendentes.pop(), {}).get('descartes', []):
+            if perdedora in registros and perdedora not in alteradas:
+                alteradas.add(perdedora)
+                pendentes.append(perdedora)
+
+    if not alteradas and not removidas:
+        print(f"✓ Nenhuma temporada mudou ({indice.get('total', 0):,} entradas consolidadas)")
+        return indice
+
+    # Entradas das temporadas inalteradas vêm da consolidação anterior
+    entradas = []
+    if fontes_antigas:
+        with open(BACKTEST_ENTRADAS_REAIS, 'r', encoding='utf-8') as f:
+            entradas = [e for e in json.load(f) if e['origem'] not in alteradas and e['origem'] not in removidas]
+
+    por_liga = defaultdict(list)
+    for arquivo in sorted(alteradas):
+        por_liga[registros[arquivo]['liga']].append(registros[arquivo])
+    for liga, da_liga in sorted(por_liga.items()):
+        confrontos = _jogos_confrontos(liga)
+        novas = 0
+        for registro in da_liga:
+            if registro['entradas']:
+                da_temporada = _entradas_da_temporada(manifesto, registro, confrontos)
+                entradas.extend(da_temporada)
+                novas += len(da_temporada)
+        print(f"   ✓ {liga}: {len(da_liga)} temporadas relidas, {novas} entradas")
+
+    # Uma entrada por jogo: vale o arquivo gravado por último
+    def prioridade(entrada):
+        return (registros[entrada['origem']]['assinatura'][1], entrada['origem'])
+
+    vencedoras = {}
+    descartes = defaultdict(set)
+    for entrada in entradas:
+        atual = vencedoras.get(entrada['chave'])
+        if atual is None:
+            vencedoras[entrada['chave']] = entrada
+            continue
+        if prioridade(entrada) > prioridade(atual):
+            entrada, atual = atual, entrada
+            vencedoras[atual['chave']] = atual
+        if entrada['origem'] != atual['origem']:
+            descartes[atual['origem']].add(entrada['origem'])
+    repetidas = len(entradas) - len(vencedoras)
+    entradas = sorted(vencedoras.values(), key=_ordem)
+
+    faixas_ligas = {}
+    faixas_temporadas = {}
+    for i, entrada in enumerate(entradas):
+        for faixas, chave in ((faixas_ligas, entrada['liga']),
+                              (faixas_temporadas, f"{entrada['liga']}|{entrada['temporada']}")):
+            faixas.setdefault(chave, [i, i])[1] = i + 1
+
+    fontes = {}
+    for arquivo, registro in sorted(registros.items()):
+        anteriores = [] if arquivo in alteradas else fontes_antigas.get(arquivo, {}).get('descartes', [])
+        fontes[arquivo] = {
+            'assinatura': registro['assinatura'],
+            'descartes': sorted((descartes[arquivo] | set(anteriores)) & set(registros)),
+        }
+
+    indice = {
+        'versao': VERSAO_CONSOLIDACAO,
+        'total': len(entradas),
+        'ligas': faixas_ligas,
+        'temporadas': faixas_temporadas,
+        'fontes': fontes,
+    }
+
+    FIXTURES_DIR.mkdir(exist_ok=True)
+    # Uma entrada por linha: o arquivo continua sendo uma lista JSON
+    linhas = ',\n'.join(json.dumps(e, ensure_ascii=False) for e in entradas)
+    _gravar_atomico(BACKTEST_ENTRADAS_REAIS, f'[\n{linhas}\n]\n' if entradas else '[]\n')
+    _gravar_atomico(INDICE_ENTRADAS_REAIS, json.dumps(indice, ensure_ascii=False, indent=2))
+
+    print(f"\n✅ {len(entradas):,} entradas consolidadas ({repetidas:,} repetidas descartadas)")
+    print(f"   📁 Arquivo: {BACKTEST_ENTRADAS_REAIS}")
+    print(f"   🔄 Temporadas relidas: {len(alteradas)} de {len(registros)} (removidas: {len(removidas)})")
+    return indice
+
 
 if __name__ == '__main__':
-    consolidar_entradas_reais()
+    inicio = time.time()
+    consolidar_entradas_reais(completo='--completo' in sys.argv)
+    print(f"   ⏱️  {time.time() - inicio:.1f}s")
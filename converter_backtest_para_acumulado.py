@@ -80,7 +80,7 @@ def converter_backtest():
     print(f"   📁 Arquivo: {BACKTEST_ACUMULADO}")
     print(f"   📊 Total de entradas: {len(entradas_acumuladas)}")
     print(f"   🏆 Ligas processadas: {len(ligas)}")
-    print(f"\n✨ A página http://localhost:5001/backtest_resumo_entradas.html agora carregará os dados!")
+    print(f"\n✨ A página http://localhost:5002/backtest_resumo_entradas.html agora carregará os dados!")
 
 if __name__ == '__main__':
     try:
@@ -16,8 +16,8 @@ def converter_entradas_reais():
     # Verificar se arquivo com entradas reais existe
     if not BACKTEST_ENTRADAS_REAIS.exists():
         print(f"❌ Arquivo não encontrado: {BACKTEST_ENTRADAS_REAIS.name}")
-        print("\n⚠️  Você precisa executar NOVAMENTE o backtest com a versão modificada:")
-        print("    python executar_backtest_completo.py")
+        print("\n⚠️  Consolide antes as entradas dos arquivos de resultados:")
+        print("    python consolidar_entradas_reais.py")
         print("\n   Isso vai gerar: backtest_entradas_reais.json")
         return False
     
@@ -101,7 +101,7 @@ def converter_entradas_reais():
             roi = (dados['lucro'] / dados['total'] * 100) if dados['total'] > 0 else 0
             print(f"     {tipo:4s}: {dados['total']:5d} entradas | {winrate:5.1f}% | Lucro: R${dados['lucro']:8.2f} | ROI: {roi:6.2f}%")
     
-    print(f"\n✨ A página http://localhost:5001/backtest_resumo_entradas.html agora carregará dados REAIS!")
+    print(f"\n✨ A página http://localhost:5002/backtest_resumo_entradas.html agora carregará dados REAIS!")
     
     return True
 
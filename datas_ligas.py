@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Datas dos arquivos de liga, convertidas uma vez por arquivo
+
+pd.to_datetime sem formato adivinha o formato pelo primeiro valor e trata
+"01/02/2023" como 2 de janeiro (e "13/02/2023" vira NaT). Aqui a conversão
+usa os formatos explícitos detectados no esquema do arquivo (formatos_data,
+ver esquema_ligas.py), vetorizada, e o resultado fica em memória e em
+datas_convertidas/<arquivo>.npz (na pasta dos dados, ao lado de
+esquemas_ligas.json) enquanto o arquivo não muda. Um processo novo (CLI,
+worker) lê as datas já convertidas em vez de reconverter o CSV:
+
+    datas_liga(caminho)  -> Series datetime64 alinhada às linhas do CSV
+    dias_liga(caminho)   -> array int32 de dias desde 1970-01-01 (SEM_DIA se vazia)
+
+Os consumidores comparam dias inteiros (ou as datas já convertidas) em vez
+de reconverter a coluna de texto.
+"""
+
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from esquema_ligas import VERSAO_ESQUEMA, esquema_liga
+from assinatura_arquivos import assinatura_arquivo
+
+# Dia de uma data vazia/inválida
+SEM_DIA = np.iinfo(np.int32).min
+
+_EPOCA = pd.Timestamp('1970-01-01')
+
+NOME_PASTA_DATAS = 'datas_convertidas'
+
+_CACHE = {}
+_lock = threading.Lock()
+
+
+def converter_datas(valores, formatos):
+    """
+    Converte uma coluna de datas com formatos explícitos (vetorizado).
+
+    Args:
+        valores: coluna de datas em texto
+        formatos: formatos strptime, em ordem; cada um converte o que os
+            anteriores deixaram vazio
+
+    Returns:
+        Series datetime64 (NaT onde nenhum formato serviu)
+    """
+    serie = pd.Series(valores)
+    # Cada data aparece em vários jogos: converte só os valores distintos
+    codigos, distintos = pd.factorize(serie)
+    texto = pd.Series(distintos, dtype=object).astype(str).str.strip()
+    convertidas = pd.Series(pd.NaT, index=texto.index, dtype='datetime64[ns]')
+    for formato in formatos:
+        faltam = convertidas.isna()
+        if not faltam.any():
+            break
+        convertidas[faltam] = pd.to_datetime(texto[faltam], format=formato, errors='coerce')
+    # Código -1 (valor vazio) cai no NaT acrescentado no fim
+    valores_datas = np.append(convertidas.to_numpy(), np.datetime64('NaT', 'ns'))
+    return pd.Series(valores_datas[codigos], index=serie.index)
+
+
+def dias_epoca(datas):
+    """Array int32 de dias desde 1970-01-01 (SEM_DIA para NaT)"""
+    valores = pd.Series(datas).to_numpy(dtype='datetime64[ns]')
+    dias = valores.astype('datetime64[D]').astype(np.int64)
+    dias[np.isnat(valores)] = SEM_DIA
+    return dias.astype(np.int32)
+
+
+def dia_epoca(data):
+    """Dia (int) de uma data avulsa, para comparar com dias_liga"""
+    return (pd.Timestamp(data).normalize() - _EPOCA).days
+
+
+def _arquivo_datas(caminho):
+    return caminho.parent / NOME_PASTA_DATAS / f'{caminho.name}.npz'
+
+
+def _ler_datas_salvas(caminho, assinatura):
+    """Datas convertidas salvas para esta assinatura do arquivo (ou None)"""
+    try:
+        with np.load(_arquivo_datas(caminho), allow_pickle=False) as salvo:
+            if (int(salvo['versao']) != VERSAO_ESQUEMA
+                    or salvo['assinatura'].tolist() != list(assinatura)):
+                return None
+            return pd.Series(salvo['datas'])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _gravar_datas(caminho, assinatura, datas):
+    destino = _arquivo_datas(caminho)
+    try:
+        destino.parent.mkdir(exist_ok=True)
+        temporario = destino.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp.npz')
+        np.savez(temporario, versao=np.array(VERSAO_ESQUEMA), assinatura=np.array(assinatura, dtype=np.int64),
+                 datas=datas.to_numpy(dtype='datetime64[ns]'))
+        os.replace(temporario, destino)
+    except OSError as e:
+        print(f"⚠️  Não foi possível salvar as datas de {caminho.name}: {e}")
+
+
+def _carregar(caminho, df):
+    caminho = Path(caminho).resolve()
+    assinatura = assinatura_arquivo(caminho)
+    if assinatura is None:
+        return None
+
+    with _lock:
+        em_memoria = _CACHE.get(caminho)
+        if em_memoria and em_memoria[0] == assinatura:
+            return em_memoria[1], em_memoria[2]
+
+    datas = _ler_datas_salvas(caminho, assinatura)
+    if datas is not None:
+        dias = dias_epoca(datas)
+        with _lock:
+            _CACHE[caminho] = (assinatura, datas, dias)
+        return datas, dias
+
+    esquema = esquema_liga(caminho, df)
+    coluna_data = esquema['coluna_data']
+    if df is None:
+        valores = pd.read_csv(caminho, usecols=[coluna_data], dtype=str)[coluna_data] if coluna_data else None
+    else:
+        valores = df[coluna_data] if coluna_data else None
+    if valores is None:
+        return None
+
+    datas = converter_datas(valores.reset_index(drop=True), esquema['formatos_data'])
+    dias = dias_epoca(datas)
+    _gravar_datas(caminho, assinatura, datas)
+    with _lock:
+        _CACHE[caminho] = (assinatura, datas, dias)
+    return datas, dias
+
+
+def datas_liga(caminho, df=None):
+    """
+    Datas convertidas do CSV de liga, na ordem das linhas.
+
+    Args:
+        caminho: CSV da liga
+        df: DataFrame já carregado do mesmo arquivo (evita reler)
+
+    Returns:
+        Series datetime64 com índice 0..n-1 (None se o arquivo ou a coluna
+        de data não existirem)
+    """
+    carregado = _carregar(caminho, df)
+    return carregado[0] if carregado else None
+
+
+def dias_liga(caminho, df=None):
+    """Dias desde 1970-01-01 (int32) do CSV de liga, na ordem das linhas (ou None)"""
+    carregado = _carregar(caminho, df)
+    return carregado[1] if carregado else None
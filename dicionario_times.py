@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Dicionário de times por liga: nome -> id inteiro denso (0..n-1)
+
+Os filtros por time (histórico do mandante, blocos de rodada sem repetir
+equipe, contagem de equipes) comparam ids inteiros em vez de strings em
+colunas object. Os nomes passam por normalizar_nome (maiúsculas/minúsculas,
+acentos, espaços) e por ALIASES antes de virar id, então "Atlético-MG",
+"Atletico-MG " e "atletico-mg" caem no mesmo time.
+
+Nome desconhecido recebe SEM_ID (-1), que nunca coincide com um id válido.
+"""
+
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+SEM_ID = -1
+
+# Nome nos fixtures -> nome no histórico (os dois já normalizados).
+# O histórico usa as grafias do football-data.co.uk ("Man United", "Ath Madrid");
+# fixtures digitados ou de outras fontes costumam vir com o nome por extenso.
+# Acrescentar aqui quando uma fonte de fixtures grafar um time diferente.
+ALIASES = {
+    # Mesmo clube com duas grafias no próprio histórico
+    'ham-kam': 'hamkam',                            # NOR
+    'gornik z.': 'gornik zabrze',                   # POL
+    'u craiova': 'univ. craiova',                   # ROU
+    'osters': 'oster',                              # SWE
+    'mouscron-peruwelz': 'mouscron',                # B1
+    # E0 / E1
+    'manchester united': 'man united',
+    'manchester utd': 'man united',
+    'man utd': 'man united',
+    'manchester city': 'man city',
+    'nottingham forest': "nott'm forest",
+    'nottm forest': "nott'm forest",
+    'wolverhampton': 'wolves',
+    'wolverhampton wanderers': 'wolves',
+    'tottenham hotspur': 'tottenham',
+    'spurs': 'tottenham',
+    'newcastle united': 'newcastle',
+    'west ham united': 'west ham',
+    'west bromwich': 'west brom',
+    'west bromwich albion': 'west brom',
+    'brighton & hove albion': 'brighton',
+    'brighton and hove albion': 'brighton',
+    'leeds united': 'leeds',
+    'leicester city': 'leicester',
+    'sheffield utd': 'sheffield united',
+    'sheffield wednesday': 'sheffield weds',
+    'queens park rangers': 'qpr',
+    'peterborough': 'peterboro',
+    'peterborough united': 'peterboro',
+    'mk dons': 'milton keynes dons',
+    # SP1 / SP2
+    'atletico madrid': 'ath madrid',
+    'atletico de madrid': 'ath madrid',
+    'athletic bilbao': 'ath bilbao',
+    'athletic club': 'ath bilbao',
+    'real sociedad': 'sociedad',
+    'real betis': 'betis',
+    'celta vigo': 'celta',
+    'celta de vigo': 'celta',
+    'espanyol': 'espanol',
+    'rayo vallecano': 'vallecano',
+    'sporting gijon': 'sp gijon',
+    'deportivo la coruna': 'la coruna',
+    # D1 / D2
+    'bayern munchen': 'bayern munich',
+    'borussia dortmund': 'dortmund',
+    'borussia monchengladbach': "m'gladbach",
+    'monchengladbach': "m'gladbach",
+    'bayer leverkusen': 'leverkusen',
+    'eintracht frankfurt': 'ein frankfurt',
+    '1. fc koln': 'fc koln',
+    'koln': 'fc koln',
+    'cologne': 'fc koln',
+    # I1
+    'inter milan': 'inter',
+    'internazionale': 'inter',
+    'ac milan': 'milan',
+    'hellas verona': 'verona',
+    # F1
+    'paris saint-germain': 'paris sg',
+    'paris saint germain': 'paris sg',
+    'psg': 'paris sg',
+    'saint-etienne': 'st etienne',
+    'st-etienne': 'st etienne',
+    # P1 / N1 / G1
+    'sporting cp': 'sp lisbon',
+    'sporting lisbon': 'sp lisbon',
+    'sporting braga': 'sp braga',
+    'braga': 'sp braga',
+    'vitoria guimaraes': 'guimaraes',
+    'psv': 'psv eindhoven',
+    'fortuna sittard': 'for sittard',
+    'olympiacos': 'olympiakos',
+}
+
+
+def normalizar_nome(nome):
+    """Chave de comparação do nome: sem acentos, minúsculo, espaços simples"""
+    if nome is None or (isinstance(nome, float) and np.isnan(nome)):
+        return None
+    texto = unicodedata.normalize('NFKD', str(nome))
+    texto = ''.join(c for c in texto if not unicodedata.combining(c))
+    texto = ' '.join(texto.casefold().split())
+    if not texto:
+        return None
+    return ALIASES.get(texto, texto)
+
+
+class DicionarioTimes:
+    def __init__(self, nomes=()):
+        """
+        Args:
+            nomes: nomes dos times; os ids seguem a ordem de primeira
+                aparição (nomes que normalizam igual compartilham o id)
+        """
+        self.nomes = []
+        self._ids = {}
+        for nome in nomes:
+            self.adicionar(nome)
+
+    @classmethod
+    def de_colunas(cls, *series):
+        """Dicionário com todos os nomes das colunas, em ordem alfabética"""
+        nomes = pd.unique(pd.concat([s.dropna().astype(str).str.strip() for s in series], ignore_index=True))
+        return cls(sorted(nomes))
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def adicionar(self, nome):
+        """Id do nome, criando um novo se ainda não existir"""
+        chave = normalizar_nome(nome)
+        if chave is None:
+            return SEM_ID
+        id_time = self._ids.get(chave)
+        if id_time is None:
+            id_time = len(self.nomes)
+            self._ids[chave] = id_time
+            self.nomes.append(str(nome).strip())
+        return id_time
+
+    def id(self, nome):
+        """Id do nome (SEM_ID se o time não estiver no dicionário)"""
+        chave = normalizar_nome(nome)
+        return self._ids.get(chave, SEM_ID) if chave is not None else SEM_ID
+
+    def nome(self, id_time):
+        return self.nomes[id_time] if 0 <= id_time < len(self.nomes) else None
+
+    def codificar(self, valores):
+        """Array int32 de ids para uma coluna de nomes (normaliza cada nome distinto uma vez)"""
+        codigos, distintos = pd.factorize(pd.Series(valores))
+        ids_distintos = np.array([self.id(nome) for nome in distintos], dtype=np.int32)
+        ids = np.full(len(codigos), SEM_ID, dtype=np.int32)
+        validos = codigos >= 0
+        ids[validos] = ids_distintos[codigos[validos]]
+        return ids
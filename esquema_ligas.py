@@ -0,0 +1,266 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Esquema dos arquivos de liga (colunas, odds, formato de temporada)
+
+Cada CSV de liga tem nomes de colunas próprios (HomeTeam/Home, FTHG/HG,
+B365H/PSCH...). A detecção roda uma vez por arquivo e o resultado fica em
+esquemas_ligas.json, na mesma pasta dos dados, com o hash do conteúdo:
+
+    {"E0_completo.csv": {"versao": 1, "assinatura": [tamanho, mtime_ns],
+                         "hash": "<sha1>", "esquema": {...}}}
+
+esquema_liga(caminho) devolve o esquema em O(1) enquanto o arquivo não muda
+(memória do processo, depois tamanho/mtime no JSON). Se a assinatura mudar
+mas o conteúdo for o mesmo (cópia, touch), só o hash é recalculado.
+
+Campos do esquema:
+    coluna_home, coluna_away, coluna_gols_home, coluna_gols_away,
+    coluna_data, coluna_season (None se não existir),
+    formatos_data (formatos strptime que cobrem as datas do arquivo, em ordem),
+    coluna_odds_home, coluna_odds_away (odds dos jogos do teste),
+    odds_range (par usado nas médias por faixa de odds, ou None),
+    formato_temporada ('YYYY/YYYY' ou 'YYYY'), temporadas (valores distintos)
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from assinatura_arquivos import assinatura_arquivo, hash_arquivo
+
+NOME_ARQUIVO_ESQUEMAS = 'esquemas_ligas.json'
+
+# Incrementar quando a regra de detecção mudar (invalida os esquemas salvos)
+VERSAO_ESQUEMA = 2
+
+# Pares de odds para as médias por faixa, em ordem de preferência
+ODDS_PRIORIDADE = [
+    ('B365H', 'B365A'),      # Bet365 abertura (mais comum nos fixtures)
+    ('B365CH', 'B365CA'),    # Bet365 fechamento
+    ('PSCH', 'PSCA'),        # Pinnacle fechamento
+    ('PSH', 'PSA'),          # Pinnacle abertura
+    ('MaxCH', 'MaxCA'),
+    ('MaxH', 'MaxA'),
+    ('AvgCH', 'AvgCA'),
+    ('AvgH', 'AvgA'),
+]
+
+# Formatos de data aceitos, em ordem de preferência (football-data usa
+# dd/mm/yyyy e, nas temporadas antigas, dd/mm/yy)
+FORMATOS_DATA = ['%d/%m/%Y', '%d/%m/%y', '%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%d.%m.%Y']
+
+_CACHE = {}
+_lock = threading.Lock()
+
+
+def _detectar_coluna(colunas, padroes):
+    """Detecta coluna por padrão (case-insensitive)"""
+    # Correspondência exata prioritária
+    for col in colunas:
+        for padrao in padroes.split('|'):
+            if col.lower() == padrao.lower():
+                return col
+
+    # Correspondência parcial, mas evitar falsos positivos
+    for col in colunas:
+        col_lower = col.lower()
+        for padrao in padroes.split('|'):
+            # Para colunas de gols, apenas palavras curtas
+            if padrao in ['hg', 'ag', 'fthg', 'ftag']:
+                # Apenas colunas que começam com F ou têm até 4 letras
+                if col_lower.startswith('f') or len(col_lower) <= 4:
+                    if padrao in col_lower:
+                        return col
+            else:
+                # Para outras colunas (home, away)
+                if padrao in col_lower and 'league' not in col_lower and 'country' not in col_lower:
+                    return col
+
+    return None
+
+
+def _detectar_coluna_data(colunas):
+    for col in colunas:
+        if 'date' in col.lower():
+            return col
+    return None
+
+
+def _detectar_coluna_season(colunas):
+    for col in colunas:
+        if 'season' in col.lower():
+            return col
+    for col in colunas:
+        if col.lower() in ['year', 'yr', 'ano']:
+            return col
+    return None
+
+
+def _detectar_colunas_odds(colunas):
+    """Odds do jogo: B365H/B365A (padrão) ou PSCH/PSCA (outras ligas)"""
+    cols_home = [col for col in colunas if 'b365h' in col.lower() or ('psch' in col.lower() and 'pscd' not in col.lower())]
+    cols_away = [col for col in colunas if 'b365a' in col.lower() or ('psca' in col.lower() and 'pscd' not in col.lower())]
+
+    # Se não encontrou, procurar por padrões mais gerais
+    if not cols_home:
+        cols_home = [col for col in colunas if col.upper().endswith('H') and 'home' not in col.lower()]
+    if not cols_away:
+        cols_away = [col for col in colunas if col.upper().endswith('A') and 'away' not in col.lower()]
+
+    return (cols_home[0] if cols_home else 'B365H',
+            cols_away[0] if cols_away else 'B365A')
+
+
+def par_odds_range(colunas):
+    """Primeiro par de ODDS_PRIORIDADE presente nas colunas (ou None)"""
+    colunas = set(colunas)
+    for h_col, a_col in ODDS_PRIORIDADE:
+        if h_col in colunas and a_col in colunas:
+            return [h_col, a_col]
+    return None
+
+
+def detectar_formato_temporada(valores):
+    """Formato de temporada pelos 10 primeiros valores distintos (YYYY/YYYY ou YYYY)"""
+    amostras = [str(v).strip() for v in pd.unique(pd.Series(valores).dropna())[:10]]
+    separador_count = sum(1 for s in amostras if '/' in s)
+    apenas_ano_count = sum(1 for s in amostras if s.isdigit() and len(s) == 4)
+    return 'YYYY/YYYY' if separador_count > apenas_ano_count else 'YYYY'
+
+
+def detectar_formatos_data(valores):
+    """
+    Formatos de FORMATOS_DATA necessários para converter as datas distintas
+    da coluna: cada formato só entra se converter alguma data que os
+    anteriores não converteram.
+    """
+    restantes = pd.Series(pd.unique(pd.Series(valores).dropna().astype(str).str.strip()))
+    restantes = restantes[restantes != '']
+    formatos = []
+    for formato in FORMATOS_DATA:
+        if restantes.empty:
+            break
+        convertidas = pd.to_datetime(restantes, format=formato, errors='coerce')
+        if convertidas.notna().any():
+            formatos.append(formato)
+            restantes = restantes[convertidas.isna()]
+    return formatos
+
+
+def inferir_esquema(caminho, df=None):
+    """
+    Detecta o esquema de um CSV de liga. Sem df, lê só o cabeçalho e as
+    colunas de temporada e data.
+    """
+    if df is None:
+        colunas = list(pd.read_csv(caminho, nrows=0).columns)
+    else:
+        colunas = list(df.columns)
+
+    coluna_season = _detectar_coluna_season(colunas)
+    coluna_data = _detectar_coluna_data(colunas)
+    if df is None:
+        usar = [c for c in (coluna_season, coluna_data) if c]
+        df = pd.read_csv(caminho, usecols=usar, low_memory=False) if usar else pd.DataFrame()
+    valores_season = df[coluna_season] if coluna_season else pd.Series(dtype=object)
+    valores_data = df[coluna_data] if coluna_data else pd.Series(dtype=object)
+
+    coluna_odds_home, coluna_odds_away = _detectar_colunas_odds(colunas)
+    temporadas = valores_season.dropna().astype(str).str.strip()
+
+    return {
+        'coluna_home': _detectar_coluna(colunas, 'home|hometeam'),
+        'coluna_away': _detectar_coluna(colunas, 'away|awayteam'),
+        'coluna_gols_home': _detectar_coluna(colunas, 'fthg|hg'),
+        'coluna_gols_away': _detectar_coluna(colunas, 'ftag|ag'),
+        'coluna_data': coluna_data,
+        'coluna_season': coluna_season,
+        'formatos_data': detectar_formatos_data(valores_data),
+        'coluna_odds_home': coluna_odds_home,
+        'coluna_odds_away': coluna_odds_away,
+        'odds_range': par_odds_range(colunas),
+        'formato_temporada': detectar_formato_temporada(valores_season),
+        'temporadas': sorted(temporadas.unique().tolist()),
+    }
+
+
+def _arquivo_esquemas(caminho):
+    return Path(caminho).parent / NOME_ARQUIVO_ESQUEMAS
+
+
+def _ler_esquemas(arquivo):
+    try:
+        with open(arquivo, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _gravar_esquema(caminho, registro):
+    arquivo = _arquivo_esquemas(caminho)
+    try:
+        esquemas = _ler_esquemas(arquivo)
+        esquemas[Path(caminho).name] = registro
+        temporario = arquivo.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(esquemas, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, arquivo)
+    except OSError as e:
+        print(f"⚠️  Não foi possível salvar o esquema de {Path(caminho).name}: {e}")
+
+
+def esquema_liga(caminho, df=None):
+    """
+    Esquema do CSV de liga, detectado uma vez por conteúdo do arquivo.
+
+    Args:
+        caminho: CSV da liga
+        df: DataFrame já carregado do mesmo arquivo (evita reler se for
+            preciso detectar)
+
+    Returns:
+        dict com os campos descritos no topo do módulo (None se o arquivo
+        não existir)
+    """
+    caminho = Path(caminho).resolve()
+    assinatura = assinatura_arquivo(caminho)
+    if assinatura is None:
+        return None
+
+    with _lock:
+        em_memoria = _CACHE.get(caminho)
+        if em_memoria and em_memoria[0] == assinatura:
+            return em_memoria[1]
+
+        salvo = _ler_esquemas(_arquivo_esquemas(caminho)).get(caminho.name)
+        if salvo and salvo.get('versao') != VERSAO_ESQUEMA:
+            salvo = None
+
+        if salvo and salvo.get('assinatura') == assinatura:
+            esquema, conteudo = salvo['esquema'], salvo['hash']
+        else:
+            conteudo = hash_arquivo(caminho)
+            if salvo and salvo.get('hash') == conteudo:
+                esquema = salvo['esquema']
+            else:
+                esquema = inferir_esquema(caminho, df)
+            _gravar_esquema(caminho, {
+                'versao': VERSAO_ESQUEMA,
+                'assinatura': assinatura,
+                'hash': conteudo,
+                'esquema': esquema,
+            })
+
+        _CACHE[caminho] = (assinatura, esquema, conteudo)
+        return esquema
+
+
+def hash_conteudo(caminho):
+    """sha1 do conteúdo do CSV de liga, o mesmo que valida o esquema (None se não existir)"""
+    if esquema_liga(caminho) is None:
+        return None
+    return _CACHE[Path(caminho).resolve()][2]
@@ -2,21 +2,36 @@
 # -*- coding: utf-8 -*-
 """
 Script para executar backtests automaticamente para todas as ligas e temporadas
-De 2020 até a data atual (2026-02-01)
+De 2020 até a data atual
 Salva resultados automaticamente após cada temporada
+
+Modo incremental (só jogos novos das temporadas atuais, sem confirmação):
+    python executar_backtest_automatico.py --incremental [LIGA ...]
+
+Modo banca sequencial (usa só o backtest acumulado, sem rodar os motores):
+    python executar_backtest_automatico.py --banca [adaptativo|faixa_odd|flat] [--validadas]
+
+Situação do ledger e dos resultados (não carrega pandas nem os motores):
+    python executar_backtest_automatico.py --status
 """
 
 import sys
 import json
 import time
-import pandas as pd
+import signal
+import hashlib
+import threading
 from pathlib import Path
 from datetime import datetime
 
 # Adicionar pasta backtest ao path
 sys.path.insert(0, str(Path(__file__).parent / 'backtest'))
 
-from backtest_engine import BacktestEngine
+# pandas, numpy e os motores são importados dentro das funções que os usam,
+# para --status e --banca não pagarem a importação
+from assinatura_arquivos import assinatura_arquivo, hash_arquivo
+from ledger_backtest import LedgerBacktest, PENDENTE, EXECUTANDO, CONCLUIDA, FALHOU
+from manifesto_resultados import manifesto
 
 # Ligas disponíveis
 LIGAS = {
@@ -83,11 +98,14 @@ MAPA_TRADUCAO = {
     'EUA': 'USA',
 }
 
-# Temporadas para processar
-ANOS = list(range(2020, 2027))  # 2020 a 2026
+# Temporadas para processar (2020 até o ano corrente)
+ANOS = list(range(2020, datetime.now().year + 1))
 
-# Cache de temporadas por liga (evita reler CSV a cada ano)
-_CACHE_TEMPORADAS = {}
+# Código do motor entra no hash das tarefas: mudou o modelo, refaz tudo
+ARQUIVO_MOTOR = Path(__file__).parent / 'backtest' / 'backtest_engine.py'
+
+# Sinalizado por SIGINT/SIGTERM: termina a rodada atual e para
+_PARADA_SOLICITADA = threading.Event()
 
 # Relatório de progresso
 relatorio = {
@@ -96,15 +114,36 @@ relatorio = {
     'temporadas_processadas': 0,
     'erros': [],
     'sucesso': [],
+    'puladas': 0,
 }
 
 
 def deve_parar_execucao():
-    """Verifica se arquivo de parada foi criado"""
+    """Verifica se a parada foi pedida por sinal ou pelo arquivo de parada"""
+    if _PARADA_SOLICITADA.is_set():
+        return True
     arquivo_parada = Path(__file__).parent / 'PARAR_BACKTEST.stop'
     return arquivo_parada.exists()
 
 
+def instalar_tratamento_sinais():
+    """
+    Primeiro Ctrl+C (ou SIGTERM) pede parada graciosa: a rodada em andamento
+    termina, o checkpoint é gravado e a execução para. O segundo interrompe na hora.
+    """
+    def tratar(signum, frame):
+        if _PARADA_SOLICITADA.is_set():
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            raise KeyboardInterrupt
+        _PARADA_SOLICITADA.set()
+        print(f"\n🛑 Sinal {signal.Signals(signum).name} recebido: parando após a rodada atual "
+              f"(repita para interromper imediatamente)")
+
+    signal.signal(signal.SIGINT, tratar)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, tratar)
+
+
 def limpar_arquivo_parada():
     """Remove arquivo de parada"""
     arquivo_parada = Path(__file__).parent / 'PARAR_BACKTEST.stop'
@@ -121,37 +160,6 @@ def gerar_temporadas(ano):
     ]
 
 
-def _detectar_coluna_data(df):
-    """Detecta a coluna de data"""
-    for col in df.columns:
-        if 'date' in col.lower():
-            return col
-    return None
-
-
-def _detectar_coluna_season(df):
-    """Detecta a coluna de temporada/season"""
-    for col in df.columns:
-        if 'season' in col.lower():
-            return col
-    for col in df.columns:
-        if col.lower() in ['year', 'yr', 'ano']:
-            return col
-    return None
-
-
-def _detectar_formato_temporada(df, coluna_season):
-    """Detecta o formato de temporada (YYYY/YYYY ou YYYY)"""
-    if coluna_season is None or coluna_season not in df.columns:
-        return 'YYYY'
-
-    samples = df[coluna_season].dropna().astype(str).unique()[:10]
-    separador_count = sum(1 for s in samples if '/' in s)
-    apenas_ano_count = sum(1 for s in samples if s.isdigit() and len(s) == 4)
-
-    return 'YYYY/YYYY' if separador_count > apenas_ano_count else 'YYYY'
-
-
 def _gerar_padroes_temporada(temporada, formato_detectado):
     """Gera padrões de busca para temporada"""
     padroes = []
@@ -193,40 +201,28 @@ def _gerar_padroes_temporada(temporada, formato_detectado):
     return padroes
 
 
-def _carregar_temporadas_disponiveis(liga):
-    """Carrega e cacheia as temporadas disponíveis para a liga"""
-    if liga in _CACHE_TEMPORADAS:
-        return _CACHE_TEMPORADAS[liga]
-
+def _arquivo_original(liga):
+    """CSV completo da liga (dados_ligas ou, na falta, dados_ligas_new)"""
     projeto_root = Path(__file__).parent
     arquivo_original = projeto_root / 'dados_ligas' / f'{liga}_completo.csv'
     if not arquivo_original.exists():
         arquivo_original = projeto_root / 'dados_ligas_new' / f'{liga}.csv'
+    return arquivo_original
 
-    if not arquivo_original.exists():
-        _CACHE_TEMPORADAS[liga] = ([], None, 'YYYY')
-        return _CACHE_TEMPORADAS[liga]
-
-    try:
-        df_cols = pd.read_csv(arquivo_original, nrows=0)
-        coluna_season = _detectar_coluna_season(df_cols)
 
-        if coluna_season is None:
-            _CACHE_TEMPORADAS[liga] = ([], None, 'YYYY')
-            return _CACHE_TEMPORADAS[liga]
-
-        df_seasons = pd.read_csv(arquivo_original, usecols=[coluna_season], low_memory=False)
-        df_seasons[coluna_season] = df_seasons[coluna_season].astype(str).str.strip()
-        temporadas = sorted(df_seasons[coluna_season].dropna().unique().tolist())
-
-        formato = _detectar_formato_temporada(df_seasons, coluna_season)
-
-        _CACHE_TEMPORADAS[liga] = (temporadas, coluna_season, formato)
-        return _CACHE_TEMPORADAS[liga]
+def _carregar_temporadas_disponiveis(liga):
+    """Temporadas disponíveis, coluna de temporada e formato (do esquema da liga)"""
+    from esquema_ligas import esquema_liga
 
+    arquivo_original = _arquivo_original(liga)
+    try:
+        esquema = esquema_liga(arquivo_original)
     except Exception:
-        _CACHE_TEMPORADAS[liga] = ([], None, 'YYYY')
-        return _CACHE_TEMPORADAS[liga]
+        esquema = None
+
+    if not esquema or esquema['coluna_season'] is None:
+        return [], None, 'YYYY'
+    return esquema['temporadas'], esquema['coluna_season'], esquema['formato_temporada']
 
 
 def _resolver_temporada_real(liga, ano):
@@ -245,12 +241,69 @@ def _resolver_temporada_real(liga, ano):
     return None
 
 
+def calcular_hashes_entradas(liga, temporadas):
+    """
+    Hash das entradas de cada temporada: todas as linhas do CSV até o último
+    jogo da temporada (treino + teste) e o código do motor.
+
+    Cada linha é hasheada uma vez e o hash da temporada combina os hashes
+    ordenados, então reordenar o CSV não muda nada e acrescentar uma temporada
+    nova só altera o hash dela.
+
+    Returns:
+        dict: temporada -> hash (None se a temporada não for encontrada)
+    """
+    import numpy as np
+    import pandas as pd
+    from datas_ligas import SEM_DIA, dias_liga
+    from esquema_ligas import esquema_liga
+
+    arquivo_original = _arquivo_original(liga)
+    if not arquivo_original.exists() or not temporadas:
+        return {t: None for t in temporadas}
+
+    df = pd.read_csv(arquivo_original, low_memory=False)
+    esquema = esquema_liga(arquivo_original, df)
+    coluna_data = esquema['coluna_data']
+    coluna_season = esquema['coluna_season']
+    if coluna_data is None or coluna_season is None:
+        return {t: None for t in temporadas}
+
+    dias = dias_liga(arquivo_original, df)
+    com_data = dias != SEM_DIA
+    seasons = df[coluna_season].astype(str).str.strip()
+    linhas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    formato = esquema['formato_temporada']
+    motor = (hash_arquivo(ARQUIVO_MOTOR) or '').encode()
+
+    hashes = {}
+    for temporada in temporadas:
+        # Como o BacktestEngine: vale o primeiro padrão que encontra jogos
+        na_temporada = None
+        for padrao in _gerar_padroes_temporada(temporada, formato):
+            mascara = (seasons == padrao).to_numpy()
+            if mascara.any():
+                na_temporada = mascara
+                break
+        if na_temporada is None:
+            hashes[temporada] = None
+            continue
+        dias_temporada = dias[na_temporada & com_data]
+        usadas = na_temporada.copy()
+        if dias_temporada.size:
+            usadas |= com_data & (dias <= dias_temporada.max())
+        hashes[temporada] = hashlib.sha1(motor + np.sort(linhas[usadas]).tobytes()).hexdigest()
+    return hashes
+
+
 def recriar_arquivo_treino(liga, temporada):
     """Recria o arquivo de treino usando todos os jogos antes da temporada informada"""
+    import pandas as pd
+    from datas_ligas import datas_liga
+    from esquema_ligas import esquema_liga
+
     projeto_root = Path(__file__).parent
-    arquivo_original = projeto_root / 'dados_ligas' / f'{liga}_completo.csv'
-    if not arquivo_original.exists():
-        arquivo_original = projeto_root / 'dados_ligas_new' / f'{liga}.csv'
+    arquivo_original = _arquivo_original(liga)
 
     arquivo_treino = projeto_root / 'backtest' / f'{liga}_treino.csv'
 
@@ -260,20 +313,21 @@ def recriar_arquivo_treino(liga, temporada):
 
     try:
         df = pd.read_csv(arquivo_original, low_memory=False)
-        coluna_data = _detectar_coluna_data(df)
-        coluna_season = _detectar_coluna_season(df)
+        esquema = esquema_liga(arquivo_original, df)
+        coluna_data = esquema['coluna_data']
+        coluna_season = esquema['coluna_season']
 
         if coluna_data is None:
             print(f"  ⚠️  Coluna de data não encontrada para {liga}")
             return False
 
-        df[coluna_data] = pd.to_datetime(df[coluna_data], errors='coerce')
+        df[coluna_data] = datas_liga(arquivo_original, df).to_numpy()
         df = df.dropna(subset=[coluna_data])
 
         # Descobrir data de início da temporada
         season_start = None
         if coluna_season and coluna_season in df.columns:
-            formato = _detectar_formato_temporada(df, coluna_season)
+            formato = esquema['formato_temporada']
             padroes = _gerar_padroes_temporada(temporada, formato)
             temporada_df = df[df[coluna_season].astype(str).str.strip().isin(padroes)].copy()
 
@@ -292,7 +346,7 @@ def recriar_arquivo_treino(liga, temporada):
                 return False
 
         df_treino = df[df[coluna_data] < season_start].copy()
-        df_treino = df_treino.sort_values(coluna_data)
+        df_treino = df_treino.sort_values(coluna_data, kind='stable')
         df_treino.to_csv(arquivo_treino, index=False)
 
         print(f"  ✅ Treino recriado: {liga} até {season_start.date()} ({len(df_treino)} jogos)")
@@ -303,26 +357,104 @@ def recriar_arquivo_treino(liga, temporada):
         return False
 
 
-def processar_backtest(liga, temporada):
-    """Processa backtest para uma liga e temporada específicas"""
+def _arquivo_resultados(liga, temporada):
+    """Mesmo nome de arquivo usado pelo BacktestEngine"""
+    temporada_safe = temporada.replace('/', '-').replace('\\', '-')
+    return Path(__file__).parent / 'backtest' / f'backtest_resultados_{liga}_{temporada_safe}.json'
+
+
+def tarefa_ja_concluida(ledger, liga, temporada, hash_entradas):
+    """
+    True se a temporada não precisa rodar: concluída no ledger com as mesmas
+    entradas.
+
+    Resultados completos de execuções anteriores ao ledger não contam: vieram
+    de outro motor e de outra leitura de datas, sem hash das entradas. Essas
+    temporadas são recalculadas (processar_backtest descarta o arquivo antigo).
+    """
+    return (ledger.esta_concluida(liga, temporada, hash_entradas)
+            and _arquivo_resultados(liga, temporada).exists())
+
+
+def processar_backtest(liga, temporada, ledger=None, hash_entradas=None, incremental=False, acumulado=None):
+    """
+    Processa backtest para uma liga e temporada específicas.
+
+    Com ledger, a temporada retoma da rodada salva quando as entradas não
+    mudaram; caso contrário recomeça do zero. Retorna None se a execução foi
+    interrompida (o checkpoint fica no ledger).
+
+    incremental: com resultados já salvos, continua das rodadas que um
+    recálculo completo repetiria iguais, com o treino reconstruído (ver
+    BacktestEngine.sincronizar_novos_jogos); sem ponto de retomada nos
+    resultados, a temporada é recalculada do início.
+    acumulado: lista que recebe (liga, temporada, entradas) em vez de gravar
+    o arquivo acumulado a cada temporada.
+    """
+    from backtest_engine import BacktestEngine
+
     try:
         print(f"\n{'='*80}")
         print(f"🔵 Processando: {liga} - Temporada {temporada}")
         print(f"{'='*80}")
 
-        # Recriar arquivo de treino com base nos jogos ANTERIORES à temporada
-        if not recriar_arquivo_treino(liga, temporada):
-            print(f"  ⚠️  Treino não foi recriado para {liga} - {temporada}. Pulando temporada.")
-            return False
-        
+        arquivo_treino = Path(__file__).parent / 'backtest' / f'{liga}_treino.csv'
+        retomar = ledger is not None and ledger.pode_retomar(
+            liga, temporada, hash_entradas, assinatura_arquivo(arquivo_treino))
+
+        continuar = incremental and not retomar and _arquivo_resultados(liga, temporada).exists()
+
+        if retomar:
+            print(f"  ⏩ Retomando da rodada {ledger.obter(liga, temporada)['rodada']}")
+        elif continuar:
+            # Treino = jogos antes da temporada; os já processados entram via restaurar_treino
+            if not recriar_arquivo_treino(liga, temporada):
+                print(f"  ⚠️  Treino não foi recriado para {liga} - {temporada}. Pulando temporada.")
+                return False
+        else:
+            if ledger is not None:
+                # Resultados parciais de outras entradas não servem mais
+                manifesto.remover(_arquivo_resultados(liga, temporada))
+
+            # Recriar arquivo de treino com base nos jogos ANTERIORES à temporada
+            if not recriar_arquivo_treino(liga, temporada):
+                print(f"  ⚠️  Treino não foi recriado para {liga} - {temporada}. Pulando temporada.")
+                if ledger is not None:
+                    ledger.atualizar(liga, temporada, estado=FALHOU, hash_entradas=hash_entradas,
+                                     erro='treino não recriado')
+                return False
+
+        if ledger is not None:
+            tarefa = ledger.obter(liga, temporada) or {}
+            ledger.atualizar(liga, temporada, estado=EXECUTANDO, hash_entradas=hash_entradas,
+                             tentativas=tarefa.get('tentativas', 0) + 1,
+                             rodada=tarefa.get('rodada', 1) if retomar else 1,
+                             assinatura_treino=assinatura_arquivo(arquivo_treino), erro=None, adotada=None)
+
         # Criar engine
         engine = BacktestEngine(liga=liga, temporada=temporada)
+
+        if continuar:
+            novos = engine.sincronizar_novos_jogos()
+            if novos == 0:
+                print(f"  ✓ Sem jogos novos: {liga} - {temporada}")
+                if ledger is not None:
+                    ledger.atualizar(liga, temporada, estado=CONCLUIDA)
+                return True
+            engine.restaurar_treino()
+            if engine.resultados['rodada_atual'] > 1:
+                print(f"  🆕 {novos} jogos a processar desde {engine.resultados.get('ultima_data')} "
+                      f"(rodada {engine.resultados['rodada_atual']})")
+            else:
+                print(f"  🔄 {liga} - {temporada} recalculada do início ({novos} jogos)")
         
         # Calcular limite máximo de rodadas (baseado em total de jogos)
         total_jogos = len(engine.df_teste)
         
         if total_jogos == 0:
             print(f"  ⚠️  Nenhum jogo encontrado para {liga} - {temporada}")
+            if ledger is not None:
+                ledger.atualizar(liga, temporada, estado=FALHOU, erro='nenhum jogo encontrado')
             return False
         
         # Limite seguro: número de times * 4 (em vez de apenas num_times * 2)
@@ -337,6 +469,14 @@ def processar_backtest(liga, temporada):
         rodadas_sem_progresso = 0
         
         while not engine.resultados.get('completo', False):
+            # Parada graciosa: o estado da rodada já está salvo pelo engine
+            if deve_parar_execucao():
+                if ledger is not None:
+                    ledger.atualizar(liga, temporada, estado=PENDENTE)
+                print(f"  🛑 Interrompido na rodada {engine.resultados.get('rodada_atual')} "
+                      f"({engine.resultados.get('jogos_processados', 0)}/{total_jogos} jogos)")
+                return None
+
             # PROTEÇÃO 1: Limite máximo de iterações
             if rodada_count >= max_rodadas:
                 print(f"  ⚠️  ATENÇÃO: Limite de {max_rodadas} rodadas atingido. Forçando conclusão.")
@@ -359,6 +499,12 @@ def processar_backtest(liga, temporada):
                 rodadas_sem_progresso = 0
             
             jogos_processados_anterior = jogos_processados_atual
+
+            # Checkpoint: rodada salva + assinatura do treino atualizado pelo engine
+            if ledger is not None:
+                ledger.atualizar(liga, temporada, rodada=engine.resultados.get('rodada_atual', 1),
+                                 jogos_processados=jogos_processados_atual,
+                                 assinatura_treino=assinatura_arquivo(arquivo_treino))
             
             # Mostrar progresso
             if rodada_count % 5 == 0:
@@ -368,7 +514,10 @@ def processar_backtest(liga, temporada):
         engine.salvar_resultados()
         
         # Salvar também no arquivo acumulado
-        salvar_em_acumulado(engine)
+        if acumulado is not None:
+            acumulado.append((engine.liga, engine.temporada, engine.resultados.get('entradas', [])))
+        else:
+            salvar_em_acumulado(engine)
         
         info = {
             'liga': liga,
@@ -383,6 +532,10 @@ def processar_backtest(liga, temporada):
             'timestamp': datetime.now().isoformat(),
         }
         
+        if ledger is not None:
+            ledger.atualizar(liga, temporada, estado=CONCLUIDA, entradas=len(engine.resultados.get('entradas', [])),
+                             finalizada_em=datetime.now().isoformat())
+
         print(f"✅ Sucesso: {liga} - {temporada}")
         print(f"   Rodadas: {rodada_count}, Jogos: {info['total_jogos']}, ROI: {info['roi']:.1f}%")
         
@@ -392,6 +545,8 @@ def processar_backtest(liga, temporada):
     except Exception as e:
         erro_msg = f"{liga} - {temporada}: {str(e)}"
         print(f"❌ Erro: {erro_msg}")
+        if ledger is not None:
+            ledger.atualizar(liga, temporada, estado=FALHOU, erro=str(e))
         relatorio['erros'].append({
             'liga': liga,
             'temporada': temporada,
@@ -403,6 +558,19 @@ def processar_backtest(liga, temporada):
 
 def salvar_em_acumulado(engine):
     """Salva resultados também no arquivo acumulado"""
+    if 'entradas' in engine.resultados:
+        atualizar_acumulado([(engine.liga, engine.temporada, engine.resultados['entradas'])])
+
+
+def atualizar_acumulado(temporadas):
+    """
+    Substitui no arquivo acumulado as entradas de cada (liga, temporada)
+    pelas informadas, com uma única leitura e gravação do arquivo.
+
+    temporadas: lista de (liga, temporada, entradas)
+    """
+    if not temporadas:
+        return
     try:
         arquivo_acumulado = Path(__file__).parent / 'fixtures' / 'backtest_acumulado.json'
         
@@ -413,26 +581,17 @@ def salvar_em_acumulado(engine):
         else:
             dados_acumulados = []
         
-        # Adicionar entradas do backtest atual
-        if 'entradas' in engine.resultados:
-            for entrada in engine.resultados['entradas']:
+        # Substituir as entradas destas ligas/temporadas pelas do backtest atual
+        # (uma temporada refeita não deixa entradas antigas para trás)
+        chaves = {(liga, temporada) for liga, temporada, _ in temporadas}
+        dados_acumulados = [e for e in dados_acumulados if (e.get('liga'), e.get('temporada')) not in chaves]
+        for liga, temporada, entradas in temporadas:
+            for entrada in entradas:
                 # Adicionar informações da liga e temporada
                 entrada_completa = entrada.copy()
-                entrada_completa['liga'] = engine.liga
-                entrada_completa['temporada'] = engine.temporada
-                
-                # Verificar se não é duplicada (por data, times e temporada)
-                # Usar campos corretos: 'home'/'away' em vez de 'casa'/'visitante'
-                existe = False
-                for e_existente in dados_acumulados:
-                    if (e_existente.get('home') == entrada_completa.get('home') and
-                        e_existente.get('away') == entrada_completa.get('away') and
-                        e_existente.get('temporada') == entrada_completa.get('temporada')):
-                        existe = True
-                        break
-                
-                if not existe:
-                    dados_acumulados.append(entrada_completa)
+                entrada_completa['liga'] = liga
+                entrada_completa['temporada'] = temporada
+                dados_acumulados.append(entrada_completa)
         
         # Salvar
         with open(arquivo_acumulado, 'w', encoding='utf-8') as f:
@@ -444,6 +603,19 @@ def salvar_em_acumulado(engine):
         print(f"   ⚠️  Erro ao salvar em arquivo acumulado: {e}")
 
 
+def atualizar_colunares(ligas):
+    """Regrava o formato colunar (backtest/colunar/) das ligas com resultados novos"""
+    from resultados_colunares import converter_ligas
+
+    ligas = sorted(set(ligas))
+    if not ligas:
+        return
+    for liga, erro in converter_ligas(ligas).items():
+        if erro:
+            print(f"   ⚠️  Colunar não atualizado para {liga}: {erro}")
+    print(f"   🗜️  Formato colunar atualizado: {', '.join(ligas)}")
+
+
 def gerar_relatorio_final():
     """Gera relatório final de execução"""
     relatorio['data_fim'] = datetime.now().isoformat()
@@ -461,6 +633,7 @@ def gerar_relatorio_final():
     print(f"Ligas processadas: {relatorio['ligas_processadas']}")
     print(f"Temporadas processadas: {relatorio['temporadas_processadas']}")
     print(f"Sucessos: {len(relatorio['sucesso'])}")
+    print(f"Puladas (já concluídas com as mesmas entradas): {relatorio['puladas']}")
     print(f"Erros: {len(relatorio['erros'])}")
     print(f"Tempo total: {(datetime.fromisoformat(relatorio['data_fim']) - datetime.fromisoformat(relatorio['data_inicio'])).total_seconds() / 60:.1f} minutos")
     print(f"Relatório salvo em: {arquivo_relatorio}")
@@ -471,24 +644,138 @@ def gerar_relatorio_final():
             print(f"   - {erro['liga']} ({erro['temporada']}): {erro['erro'][:60]}...")
 
 
+def executar_backtest_banca(politica='adaptativo', somente_validadas=False):
+    """
+    Modo --banca: percorre o backtest acumulado em ordem cronológica com uma
+    banca única (stakes compostos do StakeSizer, desconto de 4,5%) sem rodar
+    os motores novamente. Salva a curva de capital e o resumo por liga/dxg.
+    """
+    from simulador_banca import backtest_banca_sequencial, imprimir_backtest_banca
+
+    curva, por_combinacao, resumo = backtest_banca_sequencial(politica, somente_validadas=somente_validadas)
+    imprimir_backtest_banca(curva, por_combinacao, resumo)
+
+    pasta = Path(__file__).parent / 'backtest'
+    arquivo_curva = pasta / f'curva_banca_{politica}.csv'
+    arquivo_combinacoes = pasta / f'curva_banca_{politica}_combinacoes.csv'
+    curva.to_csv(arquivo_curva, index=False)
+    por_combinacao.to_csv(arquivo_combinacoes, index=False)
+    print(f"\n💾 Curva de capital: {arquivo_curva}")
+    print(f"💾 Resumo por liga/dxg: {arquivo_combinacoes}")
+
+
+def executar_incremental(ligas=None):
+    """
+    Atualização diária: para as temporadas dos dois últimos anos de cada
+    liga, pula as que não mudaram (hash das entradas igual ao do ledger),
+    processa só os jogos novos das que já têm resultados e roda do zero as
+    temporadas que ainda não existem. O arquivo acumulado é gravado uma vez.
+    """
+    tempo_inicio = time.time()
+    ligas = [l for l in (ligas or sorted(LIGAS)) if l in LIGAS]
+    print(f"🔄 Backtest incremental: {len(ligas)} ligas, anos {ANOS[-2]}-{ANOS[-1]}")
+
+    instalar_tratamento_sinais()
+    ledger = LedgerBacktest()
+    acumulado = []
+    atualizadas = 0
+    falhas = []
+
+    for liga in ligas:
+        if deve_parar_execucao():
+            print(f"\n🛑 Parada solicitada")
+            break
+
+        _carregar_temporadas_disponiveis(liga)
+        temporadas = sorted({t for t in (_resolver_temporada_real(liga, ano) for ano in ANOS[-2:]) if t})
+        if not temporadas:
+            continue
+        hashes = calcular_hashes_entradas(liga, temporadas)
+
+        for temporada in temporadas:
+            hash_entradas = hashes.get(temporada)
+            if not hash_entradas or ledger.esta_concluida(liga, temporada, hash_entradas):
+                continue
+            resultado = processar_backtest(liga, temporada, ledger, hash_entradas,
+                                           incremental=True, acumulado=acumulado)
+            if resultado is None:
+                break
+            if resultado:
+                atualizadas += 1
+            else:
+                falhas.append(f"{liga} ({temporada})")
+
+    atualizar_acumulado(acumulado)
+    atualizar_colunares(liga for liga, _, _ in acumulado)
+    limpar_arquivo_parada()
+    print(f"\n✅ Incremental concluído em {time.time() - tempo_inicio:.1f}s: "
+          f"{atualizadas} temporadas verificadas, {len(acumulado)} com jogos novos, {len(falhas)} com erro")
+    if falhas:
+        print(f"   ❌ Com erro (refeitas na próxima execução): {', '.join(falhas)}")
+
+
+def mostrar_status():
+    """
+    Modo --status: estado das tarefas no ledger e resumo dos resultados por
+    liga (do manifesto), sem ler CSVs nem importar pandas.
+    """
+    ledger = LedgerBacktest()
+    print(f"📒 Ledger: {len(ledger.tarefas)} tarefas")
+    for estado, n in ledger.contagem().items():
+        print(f"   {estado:<11} {n}")
+    for tarefa in ledger.tarefas.values():
+        if tarefa['estado'] == FALHOU:
+            print(f"   ❌ {tarefa['liga']} ({tarefa['temporada']}): {str(tarefa.get('erro', ''))[:60]}")
+
+    por_liga = {}
+    for registro in manifesto.listar():
+        resumo = por_liga.setdefault(registro['liga'], [0, 0, 0, 0.0])
+        resumo[0] += 1
+        resumo[1] += registro['completo']
+        resumo[2] += registro['entradas']
+        resumo[3] += registro['lucro_total']
+    print(f"\n📁 Resultados: {sum(r[0] for r in por_liga.values())} temporadas em {len(por_liga)} ligas")
+    for liga, (temporadas, completas, entradas, lucro) in sorted(por_liga.items()):
+        print(f"   {liga:<4} {completas}/{temporadas} completas, {entradas:>5} entradas, lucro {lucro:+.2f}")
+
+
 def main():
     """Função principal"""
+    if '--status' in sys.argv:
+        mostrar_status()
+        return
+
+    if '--incremental' in sys.argv:
+        executar_incremental([a.upper() for a in sys.argv[1:] if not a.startswith('--')])
+        return
+
+    if '--banca' in sys.argv:
+        args = [a for a in sys.argv[1:] if not a.startswith('--')]
+        executar_backtest_banca(args[0] if args else 'adaptativo', '--validadas' in sys.argv)
+        return
+
     print(f"{'='*80}")
     print("🚀 SISTEMA DE BACKTEST AUTOMÁTICO")
     print(f"{'='*80}")
     print(f"Ligas: {len(LIGAS)}")
-    print(f"Temporadas: {len(ANOS)} anos (2020-2026)")
+    print(f"Temporadas: {len(ANOS)} anos ({ANOS[0]}-{ANOS[-1]})")
     print(f"Total de combinações: ~{len(LIGAS) * len(ANOS)} (1 temporada por ano)")
     print(f"Hora de início: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*80}")
-    print(f"💡 Dica: Para parar a execução graciosamente, crie um arquivo 'PARAR_BACKTEST.stop'")
-    print(f"         ou pressione Ctrl+C")
+    print(f"💡 Dica: Para parar a execução graciosamente, pressione Ctrl+C (ou envie SIGTERM)")
+    print(f"         ou crie um arquivo 'PARAR_BACKTEST.stop'. A próxima execução retoma do checkpoint.")
     print(f"{'='*80}\n")
     
     # Limpar arquivo de parada anterior
     limpar_arquivo_parada()
     
     input("Pressione ENTER para iniciar ou Ctrl+C para cancelar...")
+
+    instalar_tratamento_sinais()
+    ledger = LedgerBacktest()
+    if ledger.tarefas:
+        contagem = ledger.contagem()
+        print(f"📒 Ledger: " + ', '.join(f"{estado}: {n}" for estado, n in contagem.items()))
     
     tempo_inicio = time.time()
     
@@ -496,7 +783,7 @@ def main():
     for idx_liga, (codigo_liga, nome_liga) in enumerate(sorted(LIGAS.items()), 1):
         # VERIFICAÇÃO: Parada segura entre ligas
         if deve_parar_execucao():
-            print(f"\n\n🛑 Parada solicitada via arquivo PARAR_BACKTEST.stop")
+            print(f"\n\n🛑 Parada solicitada")
             break
         
         print(f"\n{'#'*80}")
@@ -505,19 +792,21 @@ def main():
         
         # Pré-carregar temporadas disponíveis da liga
         _carregar_temporadas_disponiveis(codigo_liga)
+        temporadas_reais = {ano: _resolver_temporada_real(codigo_liga, ano) for ano in ANOS}
+        hashes = calcular_hashes_entradas(codigo_liga, sorted({t for t in temporadas_reais.values() if t}))
         temporadas_processadas = set()
 
         # Processar cada ano
         for idx_ano, ano in enumerate(ANOS, 1):
             # VERIFICAÇÃO: Parada segura entre anos também
             if deve_parar_execucao():
-                print(f"\n\n🛑 Parada solicitada via arquivo PARAR_BACKTEST.stop")
+                print(f"\n\n🛑 Parada solicitada")
                 break
             
             print(f"\n  [{idx_ano}/{len(ANOS)}] Ano {ano}")
             
-            # Resolver temporada real no CSV para este ano
-            temporada_real = _resolver_temporada_real(codigo_liga, ano)
+            # Temporada real no CSV para este ano
+            temporada_real = temporadas_reais[ano]
 
             if not temporada_real:
                 if ano != ANOS[-1]:
@@ -527,10 +816,18 @@ def main():
             if temporada_real in temporadas_processadas:
                 print(f"  ⚠️  Temporada já processada (evitando duplicação): {codigo_liga} - {temporada_real}")
                 continue
+            temporadas_processadas.add(temporada_real)
 
-            if processar_backtest(codigo_liga, temporada_real):
-                temporadas_processadas.add(temporada_real)
-            else:
+            hash_entradas = hashes.get(temporada_real)
+            if hash_entradas and tarefa_ja_concluida(ledger, codigo_liga, temporada_real, hash_entradas):
+                print(f"  ✓ Já concluída com as mesmas entradas: {codigo_liga} - {temporada_real}")
+                relatorio['puladas'] += 1
+                continue
+
+            resultado = processar_backtest(codigo_liga, temporada_real, ledger, hash_entradas)
+            if resultado is None:
+                break
+            if not resultado:
                 print(f"  ⚠️  Falha ao processar: {codigo_liga} - {temporada_real}")
             
             # Pausa entre processamentos
@@ -542,6 +839,8 @@ def main():
     
     tempo_total = time.time() - tempo_inicio
     
+    atualizar_colunares(s['liga'] for s in relatorio['sucesso'])
+    
     # Gerar relatório
     gerar_relatorio_final()
     
@@ -15,6 +15,7 @@ import time
 # Adicionar pasta backtest ao path
 sys.path.append(str(Path(__file__).parent / 'backtest'))
 from backtest_engine import BacktestEngine
+from consolidar_entradas_reais import consolidar_entradas_reais
 
 # TODAS as ligas disponíveis
 TODAS_LIGAS = {
@@ -332,20 +333,9 @@ def main():
     
     print(f"✅ Resultados salvos: {arquivo_saida.name}")
     
-    # Coletar e salvar TODAS as entradas individuais
-    print("\n🔄 Coletando entradas individuais de todas as ligas...")
-    todas_entradas = []
-    for liga_resultado in resultados_todas_ligas:
-        for temporada_resultado in liga_resultado.get('detalhes', []):
-            for entrada in temporada_resultado.get('entradas', []):
-                todas_entradas.append(entrada)
-    
-    if todas_entradas:
-        arquivo_entradas = Path(__file__).parent / 'fixtures' / 'backtest_entradas_reais.json'
-        with open(arquivo_entradas, 'w', encoding='utf-8') as f:
-            json.dump(todas_entradas, f, indent=2, ensure_ascii=False)
-        print(f"✅ Entradas individuais salvas: {arquivo_entradas.name}")
-        print(f"   📊 Total de entradas: {len(todas_entradas):,}")
+    # Consolidar TODAS as entradas individuais (a partir dos arquivos de resultados)
+    print("\n🔄 Consolidando entradas individuais de todas as ligas...")
+    consolidar_entradas_reais()
     
     
     # Exibir resumo final
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Fila de tarefas em segundo plano para os endpoints demorados
+
+Os endpoints enfileiram o trabalho e respondem na hora com o id da tarefa;
+o cliente acompanha por GET /api/jobs/<id>. Pedidos repetidos com a mesma
+chave enquanto uma tarefa está na fila ou executando são coalescidos: todos
+recebem o id da tarefa que já existe.
+
+A chave é reivindicada criando fixtures/tarefas/chave_<hash>.json com
+O_CREAT|O_EXCL, o que é atômico entre processos: com vários workers do
+gunicorn só um deles inicia a tarefa. O arquivo da chave é apagado quando
+a tarefa termina; chaves de tarefas finalizadas ou perdidas (processo morto)
+são descartadas no próximo pedido.
+
+O estado de cada tarefa é gravado em fixtures/tarefas/<id>.json, então a
+consulta funciona em qualquer worker quando o servidor roda com vários
+processos (modo produção).
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from flask import jsonify
+
+BASE_DIR = Path(__file__).parent
+PASTA_TAREFAS = BASE_DIR / 'fixtures' / 'tarefas'
+
+NA_FILA = 'na_fila'
+EXECUTANDO = 'executando'
+CONCLUIDA = 'concluida'
+FALHOU = 'falhou'
+ESTADOS_ATIVOS = (NA_FILA, EXECUTANDO)
+
+# Tarefa ativa há mais tempo que isso é considerada perdida (processo morto)
+TEMPO_MAX_TAREFA = 15 * 60
+# Tarefas finalizadas são apagadas depois de um dia
+VALIDADE_TAREFA = 24 * 3600
+# Arquivo de chave ainda vazio há menos que isso está sendo gravado por outro processo
+ESPERA_CHAVE = 2.0
+INTERVALO_CHAVE = 0.05
+
+
+class FilaTarefas:
+    def __init__(self, max_workers=2, pasta=None):
+        self.max_workers = max_workers
+        self.pasta = Path(pasta or PASTA_TAREFAS)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _obter_executor(self):
+        # Criado sob demanda: no gunicorn isso acontece depois do fork
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='tarefa')
+        return self._executor
+
+    def _caminho(self, id_tarefa):
+        return self.pasta / f'{id_tarefa}.json'
+
+    def _caminho_chave(self, chave):
+        return self.pasta / f"chave_{hashlib.sha1(chave.encode('utf-8')).hexdigest()[:16]}.json"
+
+    def _gravar_json(self, caminho, dados):
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, default=str)
+        os.replace(temporario, caminho)
+
+    def _ler_json(self, caminho):
+        try:
+            with open(caminho, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _atualizar(self, id_tarefa, **campos):
+        with self._lock:
+            tarefa = self._ler_json(self._caminho(id_tarefa)) or {'id': id_tarefa}
+            tarefa.update(campos)
+            self._gravar_json(self._caminho(id_tarefa), tarefa)
+            return tarefa
+
+    def obter(self, id_tarefa):
+        """Estado atual da tarefa (None se o id não existir)"""
+        if not id_tarefa or not all(c.isalnum() for c in id_tarefa):
+            return None
+        return self._ler_json(self._caminho(id_tarefa))
+
+    def _tarefa_ativa_do_registro(self, registro):
+        if not registro:
+            return None
+        tarefa = self.obter(registro.get('id'))
+        if not tarefa or tarefa.get('estado') not in ESTADOS_ATIVOS:
+            return None
+        if time.time() - tarefa.get('criada_ts', 0) > TEMPO_MAX_TAREFA:
+            return None
+        return tarefa
+
+    def tarefa_ativa(self, chave):
+        """Tarefa na fila ou executando para a chave, se houver"""
+        return self._tarefa_ativa_do_registro(self._ler_json(self._caminho_chave(chave)))
+
+    def _liberar_chave(self, chave, id_tarefa):
+        """
+        Apaga o arquivo da chave se ele ainda for da tarefa id_tarefa (None:
+        arquivo vazio). O arquivo é primeiro renomeado, então dois processos
+        nunca apagam a reivindicação nova um do outro.
+        """
+        caminho = self._caminho_chave(chave)
+        descarte = caminho.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.descarte')
+        try:
+            os.replace(caminho, descarte)
+        except OSError:
+            return
+        registro = self._ler_json(descarte)
+        if (registro or {}).get('id') != id_tarefa:
+            # Já era de outra tarefa: devolve, se ninguém reivindicou a chave nesse meio tempo
+            try:
+                os.link(descarte, caminho)
+            except OSError:
+                pass
+        try:
+            descarte.unlink()
+        except OSError:
+            pass
+
+    def _reivindicar_chave(self, chave, id_tarefa):
+        """
+        Cria o arquivo da chave apontando para id_tarefa (atômico entre processos).
+
+        Returns:
+            None se a chave foi reivindicada; a tarefa ativa dona da chave caso contrário
+        """
+        caminho = self._caminho_chave(chave)
+        self.pasta.mkdir(parents=True, exist_ok=True)
+        while True:
+            try:
+                fd = os.open(caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                registro = self._ler_json(caminho)
+                if registro is None:
+                    try:
+                        idade = time.time() - caminho.stat().st_mtime
+                    except OSError:
+                        continue
+                    if idade < ESPERA_CHAVE:
+                        # Outro processo acabou de criar a chave e ainda vai gravar o id
+                        time.sleep(INTERVALO_CHAVE)
+                        continue
+                    self._liberar_chave(chave, None)
+                    continue
+                ativa = self._tarefa_ativa_do_registro(registro)
+                if ativa:
+                    return ativa
+                # Tarefa finalizada ou perdida: a chave está livre
+                self._liberar_chave(chave, registro.get('id'))
+                continue
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'id': id_tarefa}, f)
+            return None
+
+    def enviar(self, tipo, funcao, *args, chave=None, **kwargs):
+        """
+        Enfileira funcao(*args, **kwargs).
+
+        Returns:
+            tuple: (tarefa, coalescida) — coalescida=True quando já havia uma
+            tarefa ativa com a mesma chave e ela foi reaproveitada
+        """
+        tarefa = {
+            'id': uuid.uuid4().hex,
+            'tipo': tipo,
+            'chave': chave,
+            'estado': NA_FILA,
+            'criada_em': datetime.now().isoformat(),
+            'criada_ts': time.time(),
+            'resultado': None,
+            'erro': None,
+        }
+        # A tarefa é gravada antes da chave: quem ler a chave sempre encontra a tarefa
+        self._gravar_json(self._caminho(tarefa['id']), tarefa)
+        if chave:
+            ativa = self._reivindicar_chave(chave, tarefa['id'])
+            if ativa:
+                self._caminho(tarefa['id']).unlink(missing_ok=True)
+                return ativa, True
+
+        self._obter_executor().submit(self._executar, tarefa['id'], chave, funcao, args, kwargs)
+        self.limpar_antigas()
+        return tarefa, False
+
+    def _executar(self, id_tarefa, chave, funcao, args, kwargs):
+        self._atualizar(id_tarefa, estado=EXECUTANDO, iniciada_em=datetime.now().isoformat())
+        try:
+            resultado = funcao(*args, **kwargs)
+            self._atualizar(id_tarefa, estado=CONCLUIDA, resultado=resultado,
+                            finalizada_em=datetime.now().isoformat())
+        except Exception as e:
+            print(f"[TAREFAS] Erro na tarefa {id_tarefa}: {e}", flush=True)
+            traceback.print_exc()
+            self._atualizar(id_tarefa, estado=FALHOU, erro=str(e), finalizada_em=datetime.now().isoformat())
+        finally:
+            if chave:
+                self._liberar_chave(chave, id_tarefa)
+
+    def limpar_antigas(self):
+        """Remove registros de tarefas finalizadas há mais de VALIDADE_TAREFA"""
+        limite = time.time() - VALIDADE_TAREFA
+        for caminho in self.pasta.glob('*.json'):
+            try:
+                if caminho.stat().st_mtime < limite:
+                    caminho.unlink()
+            except OSError:
+                pass
+
+
+# Fila única por processo
+fila = FilaTarefas()
+
+
+def resposta_enfileirada(tarefa, coalescida):
+    """Resposta 202 padrão dos endpoints que enfileiram trabalho"""
+    return jsonify({
+        'success': True,
+        'job_id': tarefa['id'],
+        'estado': tarefa['estado'],
+        'coalescida': coalescida,
+        'status_url': f"/api/jobs/{tarefa['id']}",
+    }), 202
+
+
+def resposta_tarefa(id_tarefa):
+    """Resposta de GET /api/jobs/<id>"""
+    tarefa = fila.obter(id_tarefa)
+    if tarefa is None:
+        return jsonify({'success': False, 'message': 'Tarefa não encontrada'}), 404
+    tarefa = {k: v for k, v in tarefa.items() if k != 'criada_ts'}
+    return jsonify({'success': True, 'job': tarefa}), 200
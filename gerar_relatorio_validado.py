@@ -1,76 +1,20 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import requests
-import json
-from datetime import datetime
+from leitor_backtest import CRITERIOS, agrupar_backtest, separar_por_criterios
 
-CRITERIOS = {
-    'min_entradas': 75,
-    'min_roi_pct': 5.0,
-    'min_lucro': 20.0
-}
+# Agrupar por liga, tipo e dxg
+VISAO = ('liga', ('tipo', 'entrada'), 'dxg')
 
-try:
-    response = requests.get('http://localhost:5001/api/backtest_acumulado')
-    data = response.json()
-    
-    if not data.get('success'):
-        print("❌ API retornou erro:", data.get('message'))
-        exit(1)
-    
-    entradas = data.get('entradas', [])
-    
-    # Agrupar por liga, tipo e dxg
-    combinacoes = {}
-    
-    for entrada in entradas:
-        liga = entrada.get('liga', 'Desconhecida')
-        entrada_tipo = entrada.get('entrada', 'UNKNOWN')
-        dxg = entrada.get('dxg', 'EQ')
-        
-        chave = f"{liga}_{entrada_tipo}_{dxg}"
-        
-        if chave not in combinacoes:
-            combinacoes[chave] = {
-                'liga': liga,
-                'tipo': entrada_tipo,
-                'dxg': dxg,
-                'total': 0,
-                'lucro': 0.0,
-                'acertos': 0
-            }
-        
-        combinacoes[chave]['total'] += 1
-        lp = float(entrada.get('lp', 0))
-        combinacoes[chave]['lucro'] += lp
-        if lp > 0:
-            combinacoes[chave]['acertos'] += 1
+
+def gerar_relatorio_validado(combinacoes=None):
+    """Gera RELATORIO_COMBINACOES_VALIDADAS.txt com as combinações liga/tipo/dxg validadas"""
+    if combinacoes is None:
+        combinacoes, _ = agrupar_backtest(VISAO)
     
     # Filtrar combinações que atendem aos critérios
-    combinacoes_validadas = []
-    
-    for chave, dados in combinacoes.items():
-        total = dados['total']
-        lucro = dados['lucro']
-        roi = (lucro / total * 100) if total > 0 else 0
-        winrate = (dados['acertos'] / total * 100) if total > 0 else 0
-        
-        # Verificar critérios
-        atende_quantidade = total >= CRITERIOS['min_entradas']
-        atende_roi = roi >= CRITERIOS['min_roi_pct']
-        atende_lucro = lucro >= CRITERIOS['min_lucro']
-        
-        if atende_quantidade and atende_roi and atende_lucro:
-            combinacoes_validadas.append({
-                'liga': dados['liga'],
-                'tipo': dados['tipo'],
-                'dxg': dados['dxg'],
-                'total': total,
-                'lucro': lucro,
-                'roi': roi,
-                'winrate': winrate
-            })
+    validadas, _ = separar_por_criterios(combinacoes)
+    combinacoes_validadas = list(validadas.values())
     
     # Ordenar por ROI decrescente
     combinacoes_validadas.sort(key=lambda x: x['roi'], reverse=True)
@@ -94,7 +38,7 @@ try:
             
             for idx, combo in enumerate(combinacoes_validadas, 1):
                 f.write(f"{idx:<4} {combo['liga']:<13} {combo['tipo']:<6} {combo['dxg']:<5} "
-                       f"{combo['total']:<10} {combo['lucro']:<10.2f} {combo['roi']:<10.2f} "
+                       f"{combo['entradas']:<10} {combo['lucro']:<10.2f} {combo['roi']:<10.2f} "
                        f"{combo['winrate']:<.2f}\n")
             
             f.write("\n" + "=" * 100 + "\n")
@@ -156,7 +100,7 @@ try:
         
         for idx, combo in enumerate(combinacoes_validadas, 1):
             print(f"{idx:<4} {combo['liga']:<13} {combo['tipo']:<6} {combo['dxg']:<5} "
-                  f"{combo['total']:<10} {combo['lucro']:<10.2f} {combo['roi']:<10.2f} "
+                  f"{combo['entradas']:<10} {combo['lucro']:<10.2f} {combo['roi']:<10.2f} "
                   f"{combo['winrate']:<.2f}")
         
         print()
@@ -168,8 +112,9 @@ try:
     print("=" * 100)
     print()
 
-except requests.exceptions.ConnectionError:
-    print("❌ Erro: Não consegui conectar à API em http://localhost:5001")
-    print("   Verifique se o servidor está rodando: python servidor_api.py")
-except Exception as e:
-    print(f"❌ Erro: {e}")
+
+if __name__ == '__main__':
+    try:
+        gerar_relatorio_validado()
+    except Exception as e:
+        print(f"❌ Erro: {e}")
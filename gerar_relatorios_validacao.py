@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Gera todos os relatórios de validação com uma única leitura do backtest acumulado:
+- validar_combinacoes.py        (liga / tipo)
+- gerar_relatorio_validado.py   (liga / tipo / dxg)
+- relatorio_filtrado.py         (liga / temporada / dxg)
+- relatorio_detalhado_3d.py     (liga / dxg / entrada)
+
+Os dados são lidos direto do disco (não precisa do servidor na porta 5002).
+Os lucros das vitórias entram com o desconto de 4,5% (leitor_backtest.aplicar_desconto_lucro).
+"""
+
+import sys
+
+from leitor_backtest import agrupar, iterar_backtest_acumulado
+
+import validar_combinacoes
+import gerar_relatorio_validado
+import relatorio_filtrado
+import relatorio_detalhado_3d
+
+sys.stdout.reconfigure(encoding='utf-8')
+
+
+def gerar_relatorios(caminho=None):
+    """Agrupa todas as visões em uma passada e entrega cada uma ao seu relatório"""
+    print("📖 Carregando e agrupando backtest acumulado (passada única)...")
+    grupos, total = agrupar(iterar_backtest_acumulado(caminho), {
+        'validar': validar_combinacoes.VISAO,
+        'validado': gerar_relatorio_validado.VISAO,
+        'filtrado': relatorio_filtrado.VISAO,
+        'detalhado_3d': relatorio_detalhado_3d.VISAO,
+    })
+    print(f"   ✓ {total:,} entradas processadas (lucros com desconto de 4,5% nas vitórias)")
+
+    validar_combinacoes.validar_combinacoes(grupos['validar'])
+    gerar_relatorio_validado.gerar_relatorio_validado(grupos['validado'])
+    relatorio_filtrado.aplicar_filtros(grupos['filtrado'], total)
+    relatorio_detalhado_3d.relatorio_detalhado(grupos['detalhado_3d'], total)
+
+
+if __name__ == '__main__':
+    try:
+        gerar_relatorios(sys.argv[1] if len(sys.argv) > 1 else None)
+    except Exception as e:
+        print(f"❌ Erro: {e}")
+        import traceback
+        traceback.print_exc()
@@ -62,40 +62,34 @@ def abrir_salvos():
     time.sleep(2)
 
 def iniciar_tudo():
-    """Inicia todos os servidores e abre páginas"""
-    print("\nIniciando servidor API...")
-    api_proc = subprocess.Popen([sys.executable, "servidor_api.py"])
-    time.sleep(3)
-    
-    print("Iniciando servidor HTTP...")
-    http_proc = subprocess.Popen(
-        [sys.executable, "-m", "http.server", "8000"],
-        cwd="fixtures"
-    )
-    time.sleep(3)
-    
-    print("Abrindo páginas no navegador...")
-    webbrowser.open("http://localhost:8000/proxima_rodada.html")
-    time.sleep(2)
-    webbrowser.open("http://localhost:8000/jogos_salvos.html")
-    
-    print("\n" + "="*80)
-    print("Sistema iniciado com sucesso!")
-    print("\nServidor API: http://localhost:5000")
-    print("Servidor HTTP: http://localhost:8000")
-    print("\nPáginas abertas no navegador.")
-    print("Pressione Ctrl+C para parar os servidores.")
-    print("="*80)
-    
+    """Inicia todos os servidores (supervisionados) e abre páginas quando estiverem prontos"""
+    from iniciar_todos_servidores import Supervisor, gerar_paginas_em_segundo_plano, print_paginas
+
+    print("\nIniciando servidores...")
+    supervisor = Supervisor()
+    gerar_paginas_em_segundo_plano()
     try:
-        # Manter processos rodando
-        api_proc.wait()
-        http_proc.wait()
+        if not supervisor.iniciar():
+            print("\nErro ao iniciar os servidores (veja a pasta logs/).")
+            return
+
+        print("Abrindo páginas no navegador...")
+        webbrowser.open("http://localhost:8000/proxima_rodada.html")
+        webbrowser.open("http://localhost:8000/jogos_salvos.html")
+
+        print("\n" + "="*80)
+        print("Sistema iniciado com sucesso!")
+        print_paginas(supervisor)
+        print("Pressione Ctrl+C para parar os servidores.")
+        print("="*80)
+
+        # Manter processos rodando (o supervisor reinicia os que caírem)
+        while True:
+            time.sleep(1)
     except KeyboardInterrupt:
         print("\n\nParando servidores...")
-        api_proc.terminate()
-        http_proc.terminate()
-        print("Servidores parados.")
+    finally:
+        supervisor.parar()
 
 def main():
     """Loop principal"""
@@ -14,10 +14,10 @@ Write-Host "    - Proxima Rodada: http://localhost:8000/proxima_rodada.html" -Fo
 Write-Host "    - Jogos Salvos: http://localhost:8000/jogos_salvos.html" -ForegroundColor Gray
 Write-Host "    - Análise Salvos: http://localhost:8000/analise_salvos.html" -ForegroundColor Gray
 Write-Host ""
-Write-Host "  ✓ servidor_analise_backtest.py (porta 5001)" -ForegroundColor White
+Write-Host "  ✓ servidor_analise_backtest.py (porta 5002)" -ForegroundColor White
 Write-Host "    - Backtest: http://localhost:5001/backtest.html" -ForegroundColor Gray
 Write-Host "    - Backtests Salvos: http://localhost:5001/backtest_salvos.html" -ForegroundColor Gray
-Write-Host "    - Resumo Entradas: http://localhost:5001/backtest_resumo_entradas.html" -ForegroundColor Gray
+Write-Host "    - Resumo Entradas: http://localhost:5002/backtest_resumo_entradas.html" -ForegroundColor Gray
 Write-Host ""
 
 # Gerando páginas HTML
@@ -46,7 +46,7 @@ Start-Sleep -Seconds 2
 Write-Host " ✓ OK" -ForegroundColor Green
 
 # Iniciar servidor_analise_backtest.py
-Write-Host "[INICIANDO] Servidor de Backtest (porta 5001)..." -NoNewline -ForegroundColor Blue
+Write-Host "[INICIANDO] Servidor de Análise de Backtest (porta 5002)..." -NoNewline -ForegroundColor Blue
 Start-Process python -ArgumentList "servidor_analise_backtest.py" -WindowStyle Normal
 Start-Sleep -Seconds 2
 Write-Host " ✓ OK" -ForegroundColor Green
@@ -75,7 +75,7 @@ Write-Host "  📊 Backtests Salvos" -ForegroundColor White
 Write-Host "     http://localhost:5001/backtest_salvos.html" -ForegroundColor Cyan
 Write-Host ""
 Write-Host "  📊 Resumo de Entradas" -ForegroundColor White
-Write-Host "     http://localhost:5001/backtest_resumo_entradas.html" -ForegroundColor Cyan
+Write-Host "     http://localhost:5002/backtest_resumo_entradas.html" -ForegroundColor Cyan
 Write-Host ""
 
 Write-Host "Pressione Ctrl+C para parar os servidores" -ForegroundColor Yellow
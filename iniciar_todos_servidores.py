@@ -1,18 +1,28 @@
 #!/usr/bin/env python3
 """
-Script para iniciar todos os servidores e APIs necessárias
-Inicia:
+Script para iniciar todos os servidores e APIs necessárias (supervisor)
+Inicia ao mesmo tempo:
 1. servidor_api.py (porta 8000) - Páginas: proxima_rodada.html, jogos_salvos.html, analise_salvos.html
-2. servidor_analise_backtest.py (porta 5001) - Páginas: backtest.html, backtest_salvos.html, backtest_resumo_entradas.html
-3. Gera automaticamente os arquivos HTML necessários
+2. backtest/api_backtest.py (porta 5001) - Páginas: backtest.html, backtest_salvos.html (motor de backtest)
+3. servidor_analise_backtest.py (porta 5002) - Página: backtest_resumo_entradas.html + análise de backtests
+
+Cada servidor é considerado pronto quando responde em /api/health (sem esperas
+fixas). Servidores que caem são reiniciados com espera crescente. As páginas
+HTML são regeneradas em segundo plano, sem atrasar a subida dos servidores.
+Logs de cada servidor em logs/<nome>.log.
+
+Uso:
+    python iniciar_todos_servidores.py              # servidores de desenvolvimento do Flask
+    python iniciar_todos_servidores.py --producao   # gunicorn/waitress (ver servidor_wsgi.py)
 """
 
+import os
 import subprocess
 import sys
+import threading
 import time
-import os
+import urllib.request
 from pathlib import Path
-import signal
 
 # Configurar codificação UTF-8
 sys.stdout.reconfigure(encoding='utf-8')
@@ -30,7 +40,181 @@ class Colors:
     BOLD = '\033[1m'
 
 BASE_DIR = Path(__file__).parent
-PROCESSES = []
+LOGS_DIR = BASE_DIR / 'logs'
+
+# nome, script, pasta de trabalho, porta, páginas
+SERVIDORES = [
+    ('servidor_api', 'servidor_api.py', BASE_DIR, 8000,
+     ['proxima_rodada.html', 'jogos_salvos.html', 'analise_salvos.html']),
+    ('api_backtest', 'api_backtest.py', BASE_DIR / 'backtest', 5001,
+     ['backtest.html', 'backtest_salvos.html']),
+    ('servidor_analise_backtest', 'servidor_analise_backtest.py', BASE_DIR, 5002,
+     ['backtest_resumo_entradas.html']),
+]
+
+ROTA_SAUDE = '/api/health'
+TEMPO_MAX_PRONTIDAO = 60    # segundos até desistir de um servidor na subida
+INTERVALO_SONDAGEM = 0.1    # segundos entre sondagens de prontidão
+ESPERA_REINICIO_MAX = 30    # teto da espera entre reinícios
+
+# Scripts de geração de páginas (rodam em segundo plano)
+GERADORES_HTML = [
+    (['buscar_proxima_rodada.py'], 'proxima_rodada.html'),
+    (['salvar_jogo.py', 'gerar'], 'jogos_salvos.html'),
+    (['salvar_jogo.py', 'gerar_analise'], 'analise_salvos.html'),
+]
+
+
+def responde(porta, timeout=0.5):
+    """True se o servidor na porta responde 200 na rota de saúde"""
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{porta}{ROTA_SAUDE}', timeout=timeout) as resposta:
+            return resposta.status == 200
+    except Exception:
+        return False
+
+
+class Servidor:
+    def __init__(self, nome, script, cwd, porta, paginas, modo='dev'):
+        self.nome = nome
+        self.script = script
+        self.cwd = cwd
+        self.porta = porta
+        self.paginas = paginas
+        self.modo = modo
+        self.processo = None
+        self.pronto = False
+        self.reinicios = 0
+        self.inicio = None
+        self.tempo_prontidao = None
+
+    def iniciar(self):
+        LOGS_DIR.mkdir(exist_ok=True)
+        log = open(LOGS_DIR / f'{self.nome}.log', 'a', encoding='utf-8')
+        env = dict(os.environ, PORTA=str(self.porta), MODO_SERVIDOR=self.modo, PYTHONUNBUFFERED='1')
+        self.processo = subprocess.Popen([sys.executable, self.script], cwd=self.cwd, env=env,
+                                         stdout=log, stderr=subprocess.STDOUT)
+        log.close()  # o processo filho mantém o próprio descritor
+        self.pronto = False
+        self.inicio = time.time()
+
+    def caiu(self):
+        return self.processo is not None and self.processo.poll() is not None
+
+    def parar(self):
+        if self.processo is None or self.processo.poll() is not None:
+            return
+        self.processo.terminate()
+        try:
+            self.processo.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.processo.kill()
+
+
+class Supervisor:
+    def __init__(self, servidores=SERVIDORES, modo='dev'):
+        self.servidores = [Servidor(*s, modo=modo) for s in servidores]
+        self._parar = threading.Event()
+        self._monitor = None
+
+    def iniciar(self):
+        """
+        Sobe todos os servidores de uma vez e espera cada um responder.
+        O tempo total é o do servidor mais lento.
+
+        Returns:
+            bool: True se todos ficaram prontos
+        """
+        for s in self.servidores:
+            if responde(s.porta):
+                print(f"{Colors.YELLOW}[AVISO]{Colors.END} Porta {s.porta} já atende {ROTA_SAUDE}: "
+                      f"{s.nome} não será iniciado")
+                s.pronto = True
+                continue
+            print(f"{Colors.BLUE}[INICIANDO]{Colors.END} {s.nome} (porta {s.porta})")
+            s.iniciar()
+
+        pendentes = [s for s in self.servidores if not s.pronto]
+        limite = time.time() + TEMPO_MAX_PRONTIDAO
+        while pendentes and time.time() < limite:
+            for s in list(pendentes):
+                if s.caiu():
+                    print(f"{Colors.RED}✗ {s.nome} encerrou na subida (código {s.processo.returncode}); "
+                          f"veja logs/{s.nome}.log{Colors.END}")
+                    pendentes.remove(s)
+                elif responde(s.porta):
+                    s.pronto = True
+                    s.tempo_prontidao = time.time() - s.inicio
+                    print(f"{Colors.GREEN}✓ {s.nome} pronto em {s.tempo_prontidao:.1f}s{Colors.END}")
+                    pendentes.remove(s)
+            time.sleep(INTERVALO_SONDAGEM)
+
+        for s in pendentes:
+            print(f"{Colors.RED}✗ {s.nome} não respondeu em {TEMPO_MAX_PRONTIDAO}s{Colors.END}")
+
+        self._monitor = threading.Thread(target=self._supervisionar, daemon=True)
+        self._monitor.start()
+        return all(s.pronto for s in self.servidores)
+
+    def _supervisionar(self):
+        """Reinicia servidores que caírem, com espera crescente entre tentativas"""
+        proxima_tentativa = {}
+        while not self._parar.wait(1.0):
+            for s in self.servidores:
+                if s.processo is None:
+                    continue
+                if not s.pronto and not s.caiu() and responde(s.porta):
+                    s.pronto = True
+                    print(f"{Colors.GREEN}✓ {s.nome} pronto novamente{Colors.END}")
+                if not s.caiu():
+                    continue
+                agora = time.time()
+                if s.nome not in proxima_tentativa:
+                    espera = min(2 ** s.reinicios, ESPERA_REINICIO_MAX)
+                    proxima_tentativa[s.nome] = agora + espera
+                    s.pronto = False
+                    print(f"\n{Colors.RED}✗ {s.nome} caiu (código {s.processo.returncode}); "
+                          f"reiniciando em {espera}s{Colors.END}")
+                elif agora >= proxima_tentativa[s.nome]:
+                    del proxima_tentativa[s.nome]
+                    s.reinicios += 1
+                    print(f"{Colors.BLUE}[REINICIANDO]{Colors.END} {s.nome} (tentativa {s.reinicios})")
+                    s.iniciar()
+
+    def parar(self):
+        """Para todos os servidores em execução"""
+        self._parar.set()
+        print(f"\n{Colors.YELLOW}[ENCERRANDO]{Colors.END} Parando servidores...")
+        for s in self.servidores:
+            if s.processo is None:
+                continue
+            print(f"  → Parando {s.nome} (porta {s.porta})...", end=" ")
+            try:
+                s.parar()
+                print(f"{Colors.GREEN}OK{Colors.END}")
+            except Exception as e:
+                print(f"{Colors.RED}Erro: {str(e)}{Colors.END}")
+        print(f"\n{Colors.CYAN}Todos os servidores foram encerrados.{Colors.END}\n")
+
+
+def gerar_paginas_html():
+    """Gera os arquivos HTML necessários"""
+    for argumentos, arquivo in GERADORES_HTML:
+        try:
+            result = subprocess.run([sys.executable] + argumentos, cwd=BASE_DIR,
+                                    capture_output=True, text=True, timeout=120)
+            status = f"{Colors.GREEN}OK{Colors.END}" if result.returncode == 0 else f"{Colors.YELLOW}Aviso{Colors.END}"
+        except Exception as e:
+            status = f"{Colors.YELLOW}Erro: {str(e)}{Colors.END}"
+        print(f"  [PÁGINAS] {arquivo}: {status}")
+
+
+def gerar_paginas_em_segundo_plano():
+    """Dispara a geração das páginas sem bloquear a subida dos servidores"""
+    tarefa = threading.Thread(target=gerar_paginas_html, name='gerar_paginas_html', daemon=True)
+    tarefa.start()
+    return tarefa
+
 
 def print_header():
     """Exibe o cabeçalho do script"""
@@ -40,159 +224,62 @@ def print_header():
     print("="*80)
     print(f"{Colors.END}\n")
     print(f"{Colors.BLUE}Servidores que serão inicializados:{Colors.END}")
-    print(f"  ✓ servidor_api.py (porta 8000)")
-    print(f"    - Proxima Rodada: http://localhost:8000/proxima_rodada.html")
-    print(f"    - Jogos Salvos: http://localhost:8000/jogos_salvos.html")
-    print(f"    - Análise Salvos: http://localhost:8000/analise_salvos.html")
-    print(f"\n  ✓ servidor_analise_backtest.py (porta 5001)")
-    print(f"    - Backtest: http://localhost:5001/backtest.html")
-    print(f"    - Backtests Salvos: http://localhost:5001/backtest_salvos.html")
-    print(f"    - Resumo Entradas: http://localhost:5001/backtest_resumo_entradas.html")
+    for nome, script, _, porta, _ in SERVIDORES:
+        print(f"  ✓ {script} (porta {porta})")
     print()
 
-def gerar_paginas_html():
-    """Gera os arquivos HTML necessários"""
-    print(f"{Colors.YELLOW}[PREPARAÇÃO]{Colors.END} Gerando páginas HTML...")
-    
-    scripts = [
-        ('buscar_proxima_rodada.py', 'proxima_rodada.html'),
-        ('salvar_jogo.py gerar', 'jogos_salvos.html'),
-        ('salvar_jogo.py gerar_analise', 'analise_salvos.html'),
-    ]
-    
-    for script, arquivo in scripts:
-        try:
-            print(f"  → Gerando {arquivo}...", end=" ")
-            cmd = f"python {script}" if "gerar" not in script else f"python {script}"
-            result = subprocess.run(cmd, shell=True, cwd=BASE_DIR, capture_output=True, text=True, timeout=60)
-            
-            if result.returncode == 0:
-                print(f"{Colors.GREEN}OK{Colors.END}")
-            else:
-                print(f"{Colors.YELLOW}Aviso{Colors.END}")
-        except Exception as e:
-            print(f"{Colors.YELLOW}Erro: {str(e)}{Colors.END}")
 
-def iniciar_servidor(script_name, porta, descricao):
-    """Inicia um servidor em processo separado"""
-    try:
-        print(f"{Colors.BLUE}[INICIANDO]{Colors.END} {descricao} (porta {porta})...", end=" ")
-        
-        # Criar processo
-        process = subprocess.Popen(
-            [sys.executable, script_name],
-            cwd=BASE_DIR,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
-        )
-        
-        PROCESSES.append((process, script_name, porta))
-        
-        # Aguardar para validar se iniciou
-        time.sleep(2)
-        
-        if process.poll() is None:  # Processo ainda está rodando
-            print(f"{Colors.GREEN}✓ OK{Colors.END}")
-            return True
-        else:
-            print(f"{Colors.RED}✗ FALHOU{Colors.END}")
-            stderr = process.stderr.read() if process.stderr else "Erro desconhecido"
-            print(f"  Erro: {stderr[:100]}")
-            return False
-            
-    except Exception as e:
-        print(f"{Colors.RED}✗ ERRO: {str(e)}{Colors.END}")
-        return False
+def print_paginas(supervisor):
+    """Lista as páginas dos servidores prontos"""
+    print(f"{Colors.BOLD}Páginas disponíveis:{Colors.END}\n")
+    for s in supervisor.servidores:
+        if not s.pronto:
+            continue
+        for pagina in s.paginas:
+            print(f"  📄 {Colors.CYAN}http://localhost:{s.porta}/{pagina}{Colors.END}")
+    print()
+
 
 def aguardar_entrada():
     """Aguarda entrada do usuário para parar os servidores"""
     try:
-        input(f"\n{Colors.GREEN}✓ Todos os servidores iniciados com sucesso!{Colors.END}\n"
-              f"Pressione {Colors.BOLD}ENTER{Colors.END} para parar os servidores...\n")
-    except KeyboardInterrupt:
+        input(f"Pressione {Colors.BOLD}ENTER{Colors.END} para parar os servidores...\n")
+    except (KeyboardInterrupt, EOFError):
         print()
 
-def parar_servidores():
-    """Para todos os servidores em execução"""
-    print(f"\n{Colors.YELLOW}[ENCERRANDO]{Colors.END} Parando servidores...")
-    
-    for process, nome, porta in PROCESSES:
-        try:
-            print(f"  → Parando {nome} (porta {porta})...", end=" ")
-            process.terminate()
-            try:
-                process.wait(timeout=5)
-                print(f"{Colors.GREEN}OK{Colors.END}")
-            except subprocess.TimeoutExpired:
-                print(f"{Colors.YELLOW}Forçando encerramento{Colors.END}")
-                process.kill()
-        except Exception as e:
-            print(f"{Colors.RED}Erro: {str(e)}{Colors.END}")
-    
-    print(f"\n{Colors.CYAN}Todos os servidores foram encerrados.{Colors.END}\n")
 
 def main():
     """Função principal"""
     print_header()
-    
-    # Gerar páginas HTML
-    gerar_paginas_html()
-    print()
-    
-    # Iniciar servidores
-    print(f"{Colors.BOLD}{Colors.CYAN}Iniciando Servidores:{Colors.END}\n")
-    
-    sucesso = True
-    
-    # Servidor API (porta 8000)
-    if not iniciar_servidor('servidor_api.py', 8000, 'Servidor API'):
-        sucesso = False
-    
-    # Servidor Backtest (porta 5001)
-    if not iniciar_servidor('servidor_analise_backtest.py', 5001, 'Servidor de Backtest'):
-        sucesso = False
-    
-    if sucesso and len(PROCESSES) > 0:
+
+    modo = 'producao' if '--producao' in sys.argv else 'dev'
+    if modo == 'producao':
+        print(f"{Colors.BLUE}Modo produção: servidores WSGI com vários workers/threads{Colors.END}\n")
+
+    inicio = time.time()
+    supervisor = Supervisor(modo=modo)
+    paginas = gerar_paginas_em_segundo_plano()
+    try:
+        sucesso = supervisor.iniciar()
+        if not sucesso:
+            print(f"\n{Colors.RED}{Colors.BOLD}✗ Erro ao iniciar os servidores{Colors.END}\n")
+            sys.exit(1)
+
         print(f"\n{Colors.GREEN}{Colors.BOLD}")
         print("="*80)
-        print("✓ SISTEMA TOTALMENTE OPERACIONAL")
+        print(f"✓ SISTEMA TOTALMENTE OPERACIONAL em {time.time() - inicio:.1f}s")
         print("="*80)
-        print(f"{Colors.END}\n")
-        
-        print(f"{Colors.BOLD}Páginas disponíveis:{Colors.END}\n")
-        print(f"  📄 Próxima Rodada")
-        print(f"     {Colors.CYAN}http://localhost:8000/proxima_rodada.html{Colors.END}")
-        print(f"\n  📄 Jogos Salvos")
-        print(f"     {Colors.CYAN}http://localhost:8000/jogos_salvos.html{Colors.END}")
-        print(f"\n  📄 Análise Salvos")
-        print(f"     {Colors.CYAN}http://localhost:8000/analise_salvos.html{Colors.END}")
-        print(f"\n  📊 Backtest")
-        print(f"     {Colors.CYAN}http://localhost:5001/backtest.html{Colors.END}")
-        print(f"\n  📊 Backtests Salvos")
-        print(f"     {Colors.CYAN}http://localhost:5001/backtest_salvos.html{Colors.END}")
-        print(f"\n  📊 Resumo de Entradas")
-        print(f"     {Colors.CYAN}http://localhost:5001/backtest_resumo_entradas.html{Colors.END}")
-        print()
-        
-        # Aguardar entrada do usuário
-        aguardar_entrada()
-    else:
-        print(f"\n{Colors.RED}{Colors.BOLD}✗ Erro ao iniciar os servidores{Colors.END}\n")
-        sys.exit(1)
-    
-    # Parar servidores
-    parar_servidores()
+        print(f"{Colors.END}")
+        print_paginas(supervisor)
+        if paginas.is_alive():
+            print(f"{Colors.YELLOW}(páginas HTML ainda sendo regeneradas em segundo plano){Colors.END}\n")
 
-if __name__ == '__main__':
-    try:
-        main()
+        aguardar_entrada()
     except KeyboardInterrupt:
         print(f"\n{Colors.YELLOW}Interrupção detectada...{Colors.END}")
-        parar_servidores()
-        sys.exit(0)
-    except Exception as e:
-        print(f"\n{Colors.RED}Erro fatal: {str(e)}{Colors.END}\n")
-        parar_servidores()
-        sys.exit(1)
+    finally:
+        supervisor.parar()
+
+
+if __name__ == '__main__':
+    main()
@@ -8,7 +8,7 @@ Adiciona cálculo automático de stake sugerido para cada jogo
 import json
 from stake_sizing import StakeSizer
 
-def adicionar_stake_sizing_aos_jogos(jogos_analise, bankroll=10000, roi_medio=0.18):
+def adicionar_stake_sizing_aos_jogos(jogos_analise, bankroll=10000, roi_medio=0.18, simultaneo=False):
     """
     Adiciona stake sizing a cada jogo analisado
     
@@ -16,53 +16,104 @@ def adicionar_stake_sizing_aos_jogos(jogos_analise, bankroll=10000, roi_medio=0.
         jogos_analise: Lista de jogos com análise (dicts)
         bankroll: Bankroll disponível
         roi_medio: ROI médio do modelo
+        simultaneo: Dividir a banca entre os jogos (Kelly simultâneo)
     
     Returns:
         Lista de jogos com stake sizing adicionado
     """
     sizer = StakeSizer(bankroll=bankroll, roi_medio=roi_medio, kelly_fraction=0.25)
     
-    jogos_com_stake = []
+    jogos_com_stake = [jogo.copy() for jogo in jogos_analise]
     
-    for jogo in jogos_analise:
-        # Copiar jogo original
-        jogo_novo = jogo.copy()
-        
-        # Pular se não tem dados necessários
+    # Separar os jogos com dados necessários; os demais ficam sem stake
+    posicoes, odds, cfs_h, cfs_a = [], [], [], []
+    for i, jogo in enumerate(jogos_com_stake):
+        jogo['stake_sugerido'] = None
+        jogo['stake_info'] = None
         if 'odd' not in jogo or 'cfxgh' not in jogo or 'cfxga' not in jogo:
-            jogo_novo['stake_sugerido'] = None
-            jogo_novo['stake_info'] = None
-            jogos_com_stake.append(jogo_novo)
             continue
-        
         try:
-            # Calcular stake
-            stake_info = sizer.stake_sizing_adaptativo(
-                odd=jogo['odd'],
-                cfxgh=jogo.get('cfxgh', 0.5),
-                cfxga=jogo.get('cfxga', 0.5),
-                bankroll_atual=bankroll
-            )
-            
-            # Adicionar ao jogo
-            jogo_novo['stake_sugerido'] = round(stake_info['stake'], 2)
-            jogo_novo['stake_info'] = {
-                'pct_bankroll': round(stake_info['pct_bankroll'], 1),
-                'roi_esperado': round(stake_info['roi_esperado_stake'], 2),
-                'kelly_puro': round(stake_info['kelly_puro']*100, 2),
-                'kelly_fracionado': round(stake_info['kelly_fracionado']*100, 2),
-                'prob_ajustada': round(stake_info['prob_ajustada']*100, 1),
-                'edge': round(stake_info['edge']*100, 1)
-            }
-        except Exception as e:
-            jogo_novo['stake_sugerido'] = None
-            jogo_novo['stake_info'] = {'erro': str(e)}
-        
-        jogos_com_stake.append(jogo_novo)
+            odds.append(float(jogo['odd']))
+            cfs_h.append(float(jogo.get('cfxgh', 0.5)))
+            cfs_a.append(float(jogo.get('cfxga', 0.5)))
+            posicoes.append(i)
+        except (TypeError, ValueError) as e:
+            jogo['stake_info'] = {'erro': str(e)}
+    
+    if not posicoes:
+        return jogos_com_stake
+    
+    # Calcular todos os stakes de uma vez
+    lote = sizer.stake_sizing_lote(odds, cfs_h, cfs_a, bankroll_atual=bankroll, simultaneo=simultaneo)
+    
+    for k, i in enumerate(posicoes):
+        jogos_com_stake[i]['stake_sugerido'] = round(float(lote['stake'][k]), 2)
+        jogos_com_stake[i]['stake_info'] = {
+            'pct_bankroll': round(float(lote['pct_bankroll'][k]), 1),
+            'roi_esperado': round(float(lote['roi_esperado_stake'][k]), 2),
+            'kelly_puro': round(float(lote['kelly_puro'][k])*100, 2),
+            'kelly_fracionado': round(float(lote['kelly_fracionado'][k])*100, 2),
+            'prob_ajustada': round(float(lote['prob_ajustada'][k])*100, 1),
+            'edge': round(float(lote['edge'][k])*100, 1)
+        }
     
     return jogos_com_stake
 
 
+def adicionar_stakes_rodada(df_rodada, bankroll=10000, roi_medio=0.18, simultaneo=True, somente_validadas=True):
+    """
+    Calcula os stakes de toda a tabela da próxima rodada em uma passada.
+    
+    Usa a coluna BACK (HOME/AWAY) para escolher a odd (B365H/B365A) e
+    CFxGH/CFxGA como confiança. Com simultaneo=True as entradas da rodada
+    dividem a banca (Kelly simultâneo).
+    
+    Args:
+        df_rodada: DataFrame de fixtures/proxima_rodada_com_analise.csv
+        bankroll: Bankroll disponível
+        roi_medio: ROI médio do modelo
+        simultaneo: Dividir a banca entre as entradas da rodada
+        somente_validadas: Só dimensionar entradas com VALIDADA_HOME/AWAY = 'SIM'
+    
+    Returns:
+        DataFrame com as colunas STAKE, STAKE_PCT e KELLY_FRAC (NaN sem entrada)
+    """
+    import numpy as np
+    import pandas as pd
+    
+    df = df_rodada.copy()
+    df['STAKE'] = np.nan
+    df['STAKE_PCT'] = np.nan
+    df['KELLY_FRAC'] = np.nan
+    if 'BACK' not in df.columns or df.empty:
+        return df
+    
+    back = df['BACK'].fillna('').astype(str).str.upper()
+    odd = np.where(back == 'HOME',
+                   pd.to_numeric(df.get('B365H'), errors='coerce'),
+                   pd.to_numeric(df.get('B365A'), errors='coerce'))
+    entrada = back.isin(['HOME', 'AWAY']).to_numpy() & (odd > 1)
+    
+    if somente_validadas:
+        validada_home = df.get('VALIDADA_HOME', pd.Series('NÃO', index=df.index)).astype(str).eq('SIM').to_numpy()
+        validada_away = df.get('VALIDADA_AWAY', pd.Series('NÃO', index=df.index)).astype(str).eq('SIM').to_numpy()
+        entrada &= np.where(back == 'HOME', validada_home, validada_away)
+    
+    if not entrada.any():
+        return df
+    
+    cfxgh = pd.to_numeric(df.get('CFxGH'), errors='coerce').fillna(0.5).to_numpy()[entrada]
+    cfxga = pd.to_numeric(df.get('CFxGA'), errors='coerce').fillna(0.5).to_numpy()[entrada]
+    
+    sizer = StakeSizer(bankroll=bankroll, roi_medio=roi_medio, kelly_fraction=0.25)
+    lote = sizer.stake_sizing_lote(odd[entrada], cfxgh, cfxga, bankroll_atual=bankroll, simultaneo=simultaneo)
+    
+    df.loc[entrada, 'STAKE'] = np.round(lote['stake'], 2)
+    df.loc[entrada, 'STAKE_PCT'] = np.round(lote['pct_bankroll'], 2)
+    df.loc[entrada, 'KELLY_FRAC'] = np.round(lote['kelly_fracionado'] * 100, 2)
+    return df
+
+
 def gerar_resumo_stakes(jogos_com_stake):
     """
     Gera resumo dos stakes calculados
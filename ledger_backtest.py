@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Ledger de tarefas do backtest automático
+
+Uma linha por (liga, temporada) com o estado da tarefa e o hash das entradas:
+- pendente:   ainda não rodou (ou foi interrompida; 'rodada' indica onde parou)
+- executando: em andamento (se o processo morrer, é retomada na próxima execução)
+- concluida:  resultados completos para o hash registrado
+- falhou:     erro na última tentativa (é refeita na próxima execução)
+
+O arquivo é regravado de forma atômica a cada mudança de estado, então um
+Ctrl+C ou kill no meio da gravação nunca deixa o ledger corrompido.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+ARQUIVO_LEDGER = Path(__file__).parent / 'ledger_backtest_automatico.json'
+
+# Incrementar quando o formato do ledger mudar
+VERSAO_FORMATO = 1
+
+PENDENTE = 'pendente'
+EXECUTANDO = 'executando'
+CONCLUIDA = 'concluida'
+FALHOU = 'falhou'
+ESTADOS = (PENDENTE, EXECUTANDO, CONCLUIDA, FALHOU)
+
+
+class LedgerBacktest:
+    def __init__(self, caminho=None):
+        self.caminho = Path(caminho) if caminho else ARQUIVO_LEDGER
+        self._lock = threading.Lock()
+        self.tarefas = self._carregar()
+
+    @staticmethod
+    def chave(liga, temporada):
+        return f"{liga}|{temporada}"
+
+    def _carregar(self):
+        if not self.caminho.exists():
+            return {}
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️  Ledger ilegível ({e}); começando um novo")
+            return {}
+        if dados.get('versao') != VERSAO_FORMATO:
+            print("⚠️  Ledger em formato antigo; começando um novo")
+            return {}
+        return dados.get('tarefas', {})
+
+    def _salvar(self):
+        temporario = self.caminho.with_suffix('.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'versao': VERSAO_FORMATO, 'tarefas': self.tarefas}, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, self.caminho)
+
+    def obter(self, liga, temporada):
+        return self.tarefas.get(self.chave(liga, temporada))
+
+    def atualizar(self, liga, temporada, **campos):
+        """Atualiza (ou cria) a linha da tarefa e grava o ledger"""
+        with self._lock:
+            tarefa = self.tarefas.setdefault(self.chave(liga, temporada), {
+                'liga': liga,
+                'temporada': temporada,
+                'estado': PENDENTE,
+                'rodada': 1,
+                'tentativas': 0,
+            })
+            tarefa.update(campos)
+            tarefa['atualizado_em'] = datetime.now().isoformat()
+            self._salvar()
+            return tarefa
+
+    def esta_concluida(self, liga, temporada, hash_entradas):
+        """
+        True se a tarefa já terminou com exatamente as mesmas entradas.
+        Linhas 'adotada' (resultados de antes do ledger, marcados com o hash
+        da época) nunca contam: a temporada é recalculada.
+        """
+        tarefa = self.obter(liga, temporada)
+        return bool(tarefa and tarefa['estado'] == CONCLUIDA and not tarefa.get('adotada')
+                    and tarefa.get('hash_entradas') == hash_entradas)
+
+    def pode_retomar(self, liga, temporada, hash_entradas, assinatura_treino):
+        """
+        True se a tarefa parou no meio com as mesmas entradas e o arquivo de
+        treino ainda é o que foi gravado no último checkpoint.
+        """
+        tarefa = self.obter(liga, temporada)
+        return bool(tarefa
+                    and tarefa['estado'] in (PENDENTE, EXECUTANDO)
+                    and tarefa.get('rodada', 1) > 1
+                    and tarefa.get('hash_entradas') == hash_entradas
+                    and tarefa.get('assinatura_treino') == assinatura_treino)
+
+    def contagem(self):
+        """Número de tarefas por estado"""
+        contagem = {estado: 0 for estado in ESTADOS}
+        for tarefa in self.tarefas.values():
+            contagem[tarefa['estado']] = contagem.get(tarefa['estado'], 0) + 1
+        return contagem
@@ -0,0 +1,367 @@
+"""
+Leitor incremental do backtest acumulado e dos jogos salvos
+Função: percorrer listas JSON grandes (fixtures/backtest_acumulado.json,
+fixtures/jogos_salvos.json) item a item, filtrar e paginar sem carregar o
+arquivo inteiro, e devolver o resultado em streaming pelos servidores Flask.
+Também concentra a leitura local do backtest acumulado e o agrupamento
+(liga/tipo/DxG/temporada) usado pelos relatórios de validação.
+"""
+import json
+from itertools import chain, groupby, islice
+from pathlib import Path
+
+from manifesto_resultados import ManifestoResultados
+
+BASE_DIR = Path(__file__).parent
+BACKTEST_ACUMULADO = BASE_DIR / 'fixtures' / 'backtest_acumulado.json'
+RESULTADOS_DIR = BASE_DIR / 'backtest'
+
+# Critérios para uma combinação ser considerada validada
+MIN_ENTRADAS = 75
+MIN_ROI = 5.0
+MIN_LUCRO = 20.0
+
+CRITERIOS = {
+    'min_entradas': MIN_ENTRADAS,
+    'min_roi_pct': MIN_ROI,
+    'min_lucro': MIN_LUCRO
+}
+
+# Comissão da casa sobre o lucro das apostas vencedoras
+COMISSAO = 0.045
+
+# Campos mínimos para o acumulado servir aos relatórios
+CAMPOS_RELATORIO = ('liga', 'entrada', 'dxg', 'lp')
+
+# Valor usado quando a entrada não tem o campo agrupado
+PADROES_AGRUPAMENTO = {
+    'liga': 'Desconhecida',
+    'entrada': 'UNKNOWN',
+    'dxg': 'EQ',
+    'temporada': ''
+}
+
+# Tamanho de cada leitura do arquivo (em caracteres)
+TAMANHO_BLOCO = 1 << 20
+
+# Itens serializados por pedaço da resposta em streaming
+ITENS_POR_PEDACO = 500
+
+# Filtros aceitos na query string e os campos onde cada um é procurado
+# (formato mapeado do backtest, formato do motor e formato da próxima rodada)
+CAMPOS_FILTRO = {
+    'liga': ('liga', 'LIGA'),
+    'temporada': ('temporada', 'TEMPORADA'),
+    'dxg': ('dxg', 'DxG', 'DXG'),
+    'entrada': ('entrada', 'ENTRADA'),
+}
+
+_SEPARADORES = ' \t\r\n,'
+
+
+def iterar_entradas(caminho, tamanho_bloco=TAMANHO_BLOCO):
+    """
+    Gera os itens de um arquivo JSON que contém uma lista, um por vez.
+
+    O arquivo é lido em blocos e cada item é decodificado com raw_decode,
+    então a memória usada fica limitada ao bloco atual + maior item.
+    """
+    decodificador = json.JSONDecoder()
+    with open(caminho, 'r', encoding='utf-8-sig') as f:
+        buffer = ''
+        pos = 0
+        dentro_da_lista = False
+
+        while True:
+            while pos < len(buffer) and buffer[pos] in _SEPARADORES:
+                pos += 1
+
+            if pos >= len(buffer):
+                bloco = f.read(tamanho_bloco)
+                if not bloco:
+                    if dentro_da_lista:
+                        raise ValueError(f"Lista JSON não terminada em {caminho}")
+                    return
+                buffer, pos = bloco, 0
+                continue
+
+            if not dentro_da_lista:
+                if buffer[pos] != '[':
+                    raise ValueError(f"Arquivo não contém uma lista JSON: {caminho}")
+                dentro_da_lista = True
+                pos += 1
+                continue
+
+            if buffer[pos] == ']':
+                return
+
+            try:
+                item, fim = decodificador.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # Item cortado no fim do bloco: ler mais e tentar de novo
+                bloco = f.read(tamanho_bloco)
+                if not bloco:
+                    raise
+                buffer, pos = buffer[pos:] + bloco, 0
+                continue
+
+            yield item
+            pos = fim
+
+
+def ler_filtros(args):
+    """
+    Extrai filtros (liga, temporada, dxg, entrada) de um dict de parâmetros.
+    Cada filtro aceita vários valores separados por vírgula (ex: liga=E0,D1).
+    """
+    filtros = {}
+    for nome in CAMPOS_FILTRO:
+        valor = args.get(nome)
+        if not valor:
+            continue
+        valores = {v.strip().upper() for v in str(valor).split(',') if v.strip()}
+        if valores:
+            filtros[nome] = valores
+    return filtros
+
+
+def atende_filtros(item, filtros):
+    """Verifica se o item atende a todos os filtros (comparação sem caixa)"""
+    for nome, valores in filtros.items():
+        for campo in CAMPOS_FILTRO[nome]:
+            if campo in item and item[campo] is not None:
+                if str(item[campo]).strip().upper() not in valores:
+                    return False
+                break
+        else:
+            return False
+    return True
+
+
+def filtrar_e_paginar(itens, filtros=None, inicio=0, limite=None):
+    """Aplica filtros e a janela [inicio, inicio + limite) de forma preguiçosa"""
+    if filtros:
+        itens = (item for item in itens if atende_filtros(item, filtros))
+    inicio = max(inicio or 0, 0)
+    fim = inicio + limite if limite is not None and limite >= 0 else None
+    return islice(itens, inicio, fim)
+
+
+def _pedacos_json(itens):
+    """Serializa os itens agrupando ITENS_POR_PEDACO por pedaço"""
+    pedaco = []
+    for item in itens:
+        pedaco.append(json.dumps(item, ensure_ascii=False))
+        if len(pedaco) >= ITENS_POR_PEDACO:
+            yield pedaco
+            pedaco = []
+    if pedaco:
+        yield pedaco
+
+
+def gerar_lista_json(itens, chave, extras=None):
+    """
+    Gera um envelope JSON em pedaços:
+    {"success": true, "<chave>": [ ... ], "total": N, ...extras}
+    """
+    yield '{"success": true, ' + json.dumps(chave) + ': ['
+    total = 0
+    for pedaco in _pedacos_json(itens):
+        yield (',' if total else '') + ','.join(pedaco)
+        total += len(pedaco)
+    rodape = {'total': total}
+    rodape.update(extras or {})
+    yield '], ' + json.dumps(rodape, ensure_ascii=False)[1:]
+
+
+def gerar_ndjson(itens):
+    """Gera um item JSON por linha (application/x-ndjson)"""
+    for pedaco in _pedacos_json(itens):
+        yield '\n'.join(pedaco) + '\n'
+
+
+def resposta_em_streaming(itens, chave, args, prefixo_log='DEBUG API'):
+    """
+    Monta a Response Flask em streaming para uma listagem.
+
+    Parâmetros lidos de args (query string):
+    - formato: 'json' (padrão, lista JSON em pedaços) ou 'ndjson'
+    - inicio / limite: paginação
+    - liga, temporada, dxg, entrada: filtros
+    """
+    from flask import Response, stream_with_context
+
+    filtros = ler_filtros(args)
+    inicio = args.get('inicio', default=0, type=int) or 0
+    limite = args.get('limite', default=None, type=int)
+    pagina = filtrar_e_paginar(itens, filtros, inicio, limite)
+
+    # Ler o primeiro item ainda dentro do endpoint: erros de abertura/formato
+    # do arquivo viram exceção normal (e resposta 500) em vez de um corpo truncado
+    primeiro = next(pagina, None)
+    if primeiro is not None:
+        pagina = chain([primeiro], pagina)
+
+    def com_log(gerador):
+        try:
+            yield from gerador
+        except Exception as e:
+            # Os cabeçalhos já foram enviados: só resta registrar e encerrar
+            print(f"{prefixo_log}: Erro durante streaming de '{chave}': {e}", flush=True)
+            import traceback
+            traceback.print_exc()
+
+    if str(args.get('formato', 'json')).lower() == 'ndjson':
+        corpo = gerar_ndjson(pagina)
+        mimetype = 'application/x-ndjson'
+    else:
+        extras = {'inicio': inicio}
+        if limite is not None:
+            extras['limite'] = limite
+        corpo = gerar_lista_json(pagina, chave, extras)
+        mimetype = 'application/json'
+
+    return Response(stream_with_context(com_log(corpo)), mimetype=mimetype)
+
+
+# ===== Leitura local do backtest acumulado =====
+
+def iterar_resultados_temporadas(pasta=None):
+    """
+    Gera as entradas dos arquivos backtest/backtest_resultados_{liga}_{temporada}.json,
+    completando liga e temporada a partir do nome do arquivo (via manifesto).
+    Ligas com arquivo colunar atualizado (resultados_colunares.py) são lidas dele.
+    """
+    import resultados_colunares
+
+    manifesto = ManifestoResultados(pasta or RESULTADOS_DIR)
+    for liga, registros in groupby(manifesto.listar(), key=lambda r: r['liga']):
+        registros = list(registros)
+        colunas = resultados_colunares.carregar_liga(liga, pasta, registros)
+        if colunas is not None:
+            yield from resultados_colunares.iterar_entradas(colunas)
+            continue
+
+        for registro in registros:
+            if not registro['entradas']:
+                continue
+            for item in manifesto.ler_entradas(registro):
+                entrada = dict(item)
+                entrada.setdefault('liga', registro['liga'])
+                entrada.setdefault('temporada', registro['temporada'])
+                yield entrada
+
+
+def iterar_backtest_acumulado(caminho=None, pasta_resultados=None, campos_obrigatorios=CAMPOS_RELATORIO):
+    """
+    Gera as entradas do backtest acumulado direto do disco (sem passar pela API).
+
+    Usa fixtures/backtest_acumulado.json quando ele existe e a primeira entrada
+    tem os campos obrigatórios; caso contrário, monta as entradas a partir dos
+    resultados por temporada em backtest/.
+    """
+    caminho = Path(caminho) if caminho else BACKTEST_ACUMULADO
+    if caminho.exists():
+        itens = iterar_entradas(caminho)
+        try:
+            primeiro = next(itens, None)
+        except ValueError:
+            # Arquivo vazio/corrompido ou que não é uma lista: usar os resultados por temporada
+            primeiro = None
+        if primeiro is not None and all(campo in primeiro for campo in campos_obrigatorios):
+            yield primeiro
+            yield from itens
+            return
+        itens.close()
+
+    yield from iterar_resultados_temporadas(pasta_resultados)
+
+
+# ===== Agrupamento e critérios de validação =====
+
+def aplicar_desconto_lucro(lp):
+    """
+    Aplica desconto de 4,5% nos lucros de apostas vencedoras.
+    - Se lp > 0: aplica desconto de 4,5%
+    - Se lp <= 0: mantém o valor como está (perda não tem desconto)
+    """
+    if lp > 0:
+        return lp * (1 - COMISSAO)
+    return lp
+
+
+def _normalizar_visao(visao):
+    """Aceita ('liga', 'dxg') ou (('liga', 'liga'), ('tipo', 'dxg')): nome no grupo -> campo da entrada"""
+    return tuple((item, item) if isinstance(item, str) else tuple(item) for item in visao)
+
+
+def agrupar(entradas, visoes):
+    """
+    Agrupa as entradas em uma única passada para várias visões ao mesmo tempo.
+
+    visoes: {nome_visao: dimensões}, onde cada dimensão é o nome do campo ou um
+    par (nome no grupo, campo da entrada). Ex: {'3d': ('liga', ('tipo', 'dxg'), 'entrada')}
+
+    O lucro de cada entrada entra com o desconto de aplicar_desconto_lucro,
+    como no /api/backtest_acumulado de servidor_analise_backtest.py, de onde
+    os relatórios liam antes; os critérios (ROI, lucro) valem sobre esse valor.
+
+    Retorna (grupos_por_visao, total_entradas). Cada grupo é um dict com as
+    dimensões + entradas, lucro, positivos, negativos, winrate e roi.
+    """
+    specs = {nome: _normalizar_visao(visao) for nome, visao in visoes.items()}
+    grupos_por_visao = {nome: {} for nome in specs}
+    total = 0
+
+    for entrada in entradas:
+        total += 1
+        try:
+            lp = aplicar_desconto_lucro(float(entrada.get('lp', 0) or 0))
+        except (TypeError, ValueError):
+            lp = 0.0
+        positivo = lp > 0
+
+        for nome, dimensoes in specs.items():
+            chave = tuple(entrada.get(campo, PADROES_AGRUPAMENTO.get(campo)) for _, campo in dimensoes)
+            grupo = grupos_por_visao[nome].get(chave)
+            if grupo is None:
+                grupo = {rotulo: valor for (rotulo, _), valor in zip(dimensoes, chave)}
+                grupo.update({'entradas': 0, 'lucro': 0.0, 'positivos': 0, 'negativos': 0})
+                grupos_por_visao[nome][chave] = grupo
+            grupo['entradas'] += 1
+            grupo['lucro'] += lp
+            if positivo:
+                grupo['positivos'] += 1
+            else:
+                grupo['negativos'] += 1
+
+    for grupos in grupos_por_visao.values():
+        for grupo in grupos.values():
+            grupo['winrate'] = grupo['positivos'] / grupo['entradas'] * 100
+            grupo['roi'] = grupo['lucro'] / grupo['entradas'] * 100
+
+    return grupos_por_visao, total
+
+
+def agrupar_backtest(visao, caminho=None):
+    """Atalho para um relatório isolado: lê o acumulado local e agrupa por uma única visão"""
+    grupos_por_visao, total = agrupar(iterar_backtest_acumulado(caminho), {'visao': visao})
+    return grupos_por_visao['visao'], total
+
+
+def atende_criterios(grupo, min_entradas=MIN_ENTRADAS, min_roi=MIN_ROI, min_lucro=MIN_LUCRO):
+    """Verifica se um grupo atende aos critérios de validação"""
+    return (grupo['entradas'] >= min_entradas and
+            grupo['roi'] >= min_roi and
+            grupo['lucro'] >= min_lucro)
+
+
+def separar_por_criterios(grupos, **criterios):
+    """Separa {chave: grupo} em (validados, invalidados) conforme os critérios"""
+    validados, invalidados = {}, {}
+    for chave, grupo in grupos.items():
+        if atende_criterios(grupo, **criterios):
+            validados[chave] = grupo
+        else:
+            invalidados[chave] = grupo
+    return validados, invalidados
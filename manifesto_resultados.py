@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Manifesto dos resultados de backtest por temporada
+
+Cada backtest/backtest_resultados_<LIGA>_<TEMPORADA>.json guarda todas as
+entradas da temporada. Monitor, APIs e o backtest automático só precisam
+dos contadores, então o motor mantém um resumo por arquivo em
+backtest/manifesto_resultados.json:
+
+    {"versao": 1, "resultados": {"backtest_resultados_E0_2024-25.json": {
+        "liga": "E0", "temporada": "2024-25", "completo": true,
+        "rodada_atual": 38, "jogos_processados": 380, "total_jogos": 380,
+        "entradas": 57, "acertos": 30, "erros": 27, "lucro_total": 4.1,
+        "ultima_data": "2025-05-25T00:00:00", "offset_entradas": 123,
+        "assinatura": [tamanho, mtime_ns]}}}
+
+offset_entradas é a posição (bytes) do '[' da lista de entradas no arquivo,
+para ler só as entradas sem decodificar o resto.
+
+O manifesto é um arquivo só e é regravado inteiro (de forma atômica) a
+cada atualização, então o motor não o atualiza a cada rodada: os
+checkpoints por rodada regravam só o arquivo de resultados e o registro é
+atualizado uma vez por temporada (ao concluir ou ao salvar o estado).
+Registros cuja assinatura não bate mais com o arquivo (checkpoint de
+rodada, outro processo, versão antiga) são refeitos a partir do arquivo ao
+listar, então o manifesto nunca fica desatualizado.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from assinatura_arquivos import assinatura_arquivo
+
+PASTA_RESULTADOS = Path(__file__).parent / 'backtest'
+NOME_MANIFESTO = 'manifesto_resultados.json'
+PREFIXO = 'backtest_resultados_'
+
+# Incrementar quando os campos do manifesto mudarem (força reconstrução)
+VERSAO_MANIFESTO = 1
+
+_lock = threading.Lock()
+_decodificador = json.JSONDecoder()
+
+
+def liga_temporada(nome_arquivo):
+    """('E0', '2024-25') a partir de backtest_resultados_E0_2024-25.json"""
+    nome = Path(nome_arquivo).stem.replace(PREFIXO, '')
+    if '_' in nome:
+        liga, temporada = nome.split('_', 1)
+        return liga, temporada
+    return nome, ''
+
+
+def _offset_entradas(texto):
+    """Posição em bytes do '[' das entradas (json.dump com indent=2), ou None"""
+    marca = '\n  "entradas": '
+    i = texto.find(marca)
+    if i < 0 or texto[i + len(marca):i + len(marca) + 1] != '[':
+        return None
+    return len(texto[:i + len(marca)].encode('utf-8'))
+
+
+def _registro(nome, resultados, texto, assinatura):
+    liga, temporada = liga_temporada(nome)
+    entradas = resultados.get('entradas', [])
+    return {
+        'liga': liga,
+        'temporada': temporada,
+        'completo': bool(resultados.get('completo', False)),
+        'rodada_atual': resultados.get('rodada_atual', 1),
+        'jogos_processados': resultados.get('jogos_processados', 0),
+        'total_jogos': resultados.get('total_jogos'),
+        'entradas': len(entradas),
+        'acertos': resultados.get('acertos', 0),
+        'erros': resultados.get('erros', 0),
+        'lucro_total': round(resultados.get('lucro_total', 0), 4),
+        'ultima_data': resultados.get('ultima_data'),
+        'offset_entradas': _offset_entradas(texto),
+        'assinatura': assinatura,
+    }
+
+
+class ManifestoResultados:
+    def __init__(self, pasta=None):
+        self.pasta = Path(pasta) if pasta else PASTA_RESULTADOS
+        self.caminho = self.pasta / NOME_MANIFESTO
+
+    def _ler(self):
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            if dados.get('versao') == VERSAO_MANIFESTO:
+                return dados.get('resultados', {})
+        except (OSError, json.JSONDecodeError, AttributeError):
+            pass
+        return {}
+
+    def _gravar(self, registros):
+        temporario = self.caminho.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump({'versao': VERSAO_MANIFESTO, 'resultados': registros}, f, ensure_ascii=False, indent=1)
+        os.replace(temporario, self.caminho)
+
+    def gravar_resultados(self, arquivo, resultados, atualizar_manifesto=True):
+        """
+        Grava o arquivo de resultados (atômico) e, com atualizar_manifesto,
+        o registro dele no manifesto (regrava o manifesto inteiro). Sem
+        atualizar, o registro fica desatualizado até o próximo listar/obter.
+        """
+        arquivo = Path(arquivo)
+        texto = json.dumps(resultados, ensure_ascii=False, indent=2)
+        temporario = arquivo.with_suffix(f'.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(texto)
+        os.replace(temporario, arquivo)
+        if not atualizar_manifesto:
+            return
+
+        with _lock:
+            registros = self._ler()
+            registros[arquivo.name] = _registro(arquivo.name, resultados, texto, assinatura_arquivo(arquivo))
+            self._gravar(registros)
+
+    def _refazer(self, nome):
+        """Registro a partir do arquivo de resultados (None se ilegível)"""
+        caminho = self.pasta / nome
+        try:
+            with open(caminho, 'r', encoding='utf-8-sig') as f:
+                texto = f.read()
+            resultados = json.loads(texto)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(resultados, dict):
+            return None
+        return _registro(nome, resultados, texto, assinatura_arquivo(caminho))
+
+    def listar(self):
+        """
+        Registros de todos os arquivos de resultados, ordenados pelo nome.
+        Só os arquivos novos ou alterados desde o último registro são lidos.
+        """
+        with _lock:
+            registros = self._ler()
+            nomes = sorted(p.name for p in self.pasta.glob(f'{PREFIXO}*.json'))
+            alterado = set(registros) != set(nomes)
+            atuais = {}
+            for nome in nomes:
+                registro = registros.get(nome)
+                if registro is None or registro.get('assinatura') != assinatura_arquivo(self.pasta / nome):
+                    registro = self._refazer(nome)
+                    alterado = True
+                if registro is not None:
+                    atuais[nome] = registro
+            if alterado:
+                self._gravar(atuais)
+        return [dict(registro, arquivo=nome) for nome, registro in atuais.items()]
+
+    def obter(self, arquivo):
+        """Registro de um arquivo de resultados (None se não existir)"""
+        nome = Path(arquivo).name
+        assinatura = assinatura_arquivo(self.pasta / nome)
+        with _lock:
+            registros = self._ler()
+            registro = registros.get(nome)
+            if assinatura is None:
+                if registro is not None:
+                    del registros[nome]
+                    self._gravar(registros)
+                return None
+            if registro is None or registro.get('assinatura') != assinatura:
+                registro = self._refazer(nome)
+                if registro is None:
+                    return None
+                registros[nome] = registro
+                self._gravar(registros)
+        return dict(registro, arquivo=nome)
+
+    def ler_entradas(self, registro):
+        """
+        Lista com todas as entradas do arquivo do registro.
+
+        Não é incremental: o arquivo é sempre lido inteiro. Com
+        offset_entradas válido só a lista de entradas é decodificada (os
+        outros campos são pulados); sem ele, o arquivo todo passa por
+        json.loads.
+        """
+        with open(self.pasta / registro['arquivo'], 'rb') as f:
+            conteudo = f.read()
+        offset = registro.get('offset_entradas')
+        if offset is not None and conteudo[offset:offset + 1] == b'[':
+            entradas, _ = _decodificador.raw_decode(conteudo[offset:].decode('utf-8'))
+            return entradas
+        resultados = json.loads(conteudo.decode('utf-8-sig'))
+        return resultados.get('entradas', [])
+
+    def remover(self, arquivo):
+        """Apaga o arquivo de resultados e o registro dele"""
+        arquivo = Path(arquivo)
+        arquivo.unlink(missing_ok=True)
+        with _lock:
+            registros = self._ler()
+            if registros.pop(arquivo.name, None) is not None:
+                self._gravar(registros)
+
+    def remover_todos(self):
+        """Apaga todos os arquivos de resultados; devolve os nomes apagados"""
+        with _lock:
+            apagados = []
+            for caminho in sorted(self.pasta.glob(f'{PREFIXO}*.json')):
+                caminho.unlink(missing_ok=True)
+                apagados.append(caminho.name)
+            self._gravar({})
+        return apagados
+
+
+# Manifesto da pasta backtest/ do projeto
+manifesto = ManifestoResultados()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tempo de inicialização dos pontos de entrada de linha de comando
+
+Cada caso roda em um processo novo (como o servidor_api faz com o
+salvar_jogo.py), várias vezes, e mostra a mediana do tempo total e quais
+dependências pesadas (pandas, numpy, scipy, flask) foram carregadas.
+
+As operações rápidas (salvar/excluir/atualizar jogo, status do backtest)
+devem ficar bem abaixo de LIMITE_SEGUNDOS; os casos marcados com ❌
+passaram do limite. Só são medidas importações e comandos que não alteram
+arquivos.
+
+Uso:
+    python medir_inicializacao.py          # 5 execuções por caso
+    python medir_inicializacao.py -n 10
+"""
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).parent
+LIMITE_SEGUNDOS = 1.0
+PESADOS = ('pandas', 'numpy', 'scipy', 'flask')
+MARCA = 'MODULOS_PESADOS='
+
+# (descrição, código executado no processo novo, deve ser rápido)
+CASOS = [
+    ('import salvar_jogo (excluir/atualizar/gerar)', 'import salvar_jogo', True),
+    ('import executar_backtest_automatico', 'import executar_backtest_automatico', True),
+    ('executar_backtest_automatico.py --status',
+     "import runpy, sys; sys.argv = ['executar_backtest_automatico.py', '--status']; "
+     "runpy.run_path('executar_backtest_automatico.py', run_name='__main__')", True),
+    ('import monitor_backtest', 'import monitor_backtest', True),
+    ('import ledger_backtest, manifesto_resultados', 'import ledger_backtest, manifesto_resultados', True),
+    ('salvar_jogo.py salvar (carrega pandas)', 'import salvar_jogo, pandas', True),
+    ('import servidor_api (flask)', 'import servidor_api', False),
+    ('import backtest_engine (pandas)', "import sys; sys.path.insert(0, 'backtest'); import backtest_engine", False),
+]
+
+
+def medir(codigo, execucoes):
+    """(mediana dos tempos em segundos, módulos pesados carregados, erro ou None)"""
+    script = (f"{codigo}\n"
+              f"import sys\n"
+              f"print({MARCA!r} + ','.join(m for m in {PESADOS!r} if m in sys.modules), file=sys.stderr)\n")
+    tempos = []
+    pesados = []
+    for _ in range(execucoes):
+        inicio = time.perf_counter()
+        processo = subprocess.run([sys.executable, '-c', script], cwd=BASE_DIR,
+                                  capture_output=True, text=True, encoding='utf-8', errors='replace')
+        tempos.append(time.perf_counter() - inicio)
+        if processo.returncode != 0:
+            return None, [], processo.stderr.strip().splitlines()[-1:] or ['erro']
+        for linha in processo.stderr.splitlines():
+            if linha.startswith(MARCA):
+                pesados = [m for m in linha[len(MARCA):].split(',') if m]
+    return statistics.median(tempos), pesados, None
+
+
+def main():
+    execucoes = 5
+    if '-n' in sys.argv:
+        execucoes = int(sys.argv[sys.argv.index('-n') + 1])
+
+    print(f"{'='*80}")
+    print(f"TEMPO DE INICIALIZAÇÃO ({execucoes} execuções por caso, mediana)")
+    print(f"{'='*80}\n")
+
+    base, _, _ = medir('pass', execucoes)
+    print(f"  {'python (sem importar nada)':<50} {base:6.2f}s\n")
+
+    lentos = []
+    resultados = []
+    for descricao, codigo, rapido in CASOS:
+        tempo, pesados, erro = medir(codigo, execucoes)
+        if erro:
+            print(f"  ⚠️  {descricao:<47} erro: {erro[0][:60]}")
+            continue
+        marca = '  '
+        if rapido:
+            marca = '✅' if tempo < LIMITE_SEGUNDOS else '❌'
+            if tempo >= LIMITE_SEGUNDOS:
+                lentos.append(descricao)
+        print(f"  {marca} {descricao:<47} {tempo:6.2f}s  {', '.join(pesados) or '-'}")
+        resultados.append({'caso': descricao, 'segundos': round(tempo, 3), 'pesados': pesados})
+
+    arquivo = BASE_DIR / 'logs' / 'medir_inicializacao.json'
+    arquivo.parent.mkdir(exist_ok=True)
+    with open(arquivo, 'w', encoding='utf-8') as f:
+        json.dump({'data': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': round(base, 3),
+                   'casos': resultados}, f, ensure_ascii=False, indent=2)
+
+    print(f"\nLimite para operações rápidas: {LIMITE_SEGUNDOS:.1f}s. Resultados em {arquivo}")
+    if lentos:
+        print(f"❌ Acima do limite: {', '.join(lentos)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
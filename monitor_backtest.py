@@ -8,7 +8,8 @@ Mostra estatísticas e permite retomar execução
 import json
 from pathlib import Path
 from datetime import datetime
-from tabulate import tabulate
+
+from manifesto_resultados import ManifestoResultados
 
 def listar_progresso():
     """Lista o progresso de backtests completados"""
@@ -18,10 +19,10 @@ def listar_progresso():
     print("📊 MONITOR DE BACKTESTS AUTOMÁTICOS")
     print("="*100)
     
-    # Procurar arquivos de resultados
-    arquivos_resultados = list(pasta_backtest.glob('backtest_resultados_*.json'))
+    # Resumo de cada temporada pelo manifesto (sem ler as entradas)
+    registros = ManifestoResultados(pasta_backtest).listar()
     
-    if not arquivos_resultados:
+    if not registros:
         print("Nenhum resultado de backtest encontrado.")
         return
     
@@ -29,43 +30,35 @@ def listar_progresso():
     total_jogos = 0
     total_lucro = 0
     
-    for arquivo in sorted(arquivos_resultados):
-        try:
-            with open(arquivo, 'r', encoding='utf-8') as f:
-                resultado = json.load(f)
-            
-            # Extrair informações do nome do arquivo
-            nome = arquivo.stem  # Ex: backtest_resultados_E0_2024-25
-            partes = nome.replace('backtest_resultados_', '').split('_')
-            liga = partes[0]
-            temporada = '_'.join(partes[1:])
-            
-            status = resultado.get('status', {})
-            
-            total_jogos += status.get('total_jogos', 0)
-            total_lucro += status.get('lucro_total', 0)
-            
-            dados.append([
-                liga,
-                temporada,
-                status.get('completo', False),
-                status.get('total_jogos', 0),
-                status.get('acertos', 0),
-                status.get('erros', 0),
-                f"{status.get('winrate', 0):.1f}%",
-                f"{status.get('roi', 0):+.1f}%",
-                f"{status.get('lucro_total', 0):+.2f}",
-            ])
-        except Exception as e:
-            print(f"⚠️  Erro ao ler {arquivo.name}: {e}")
+    for registro in registros:
+        entradas = registro['entradas']
+        lucro = registro['lucro_total']
+        winrate = registro['acertos'] / entradas * 100 if entradas else 0
+        roi = lucro / entradas * 100 if entradas else 0
+        
+        total_jogos += registro['jogos_processados']
+        total_lucro += lucro
+        
+        dados.append([
+            registro['liga'],
+            registro['temporada'],
+            registro['completo'],
+            registro['jogos_processados'],
+            registro['acertos'],
+            registro['erros'],
+            f"{winrate:.1f}%",
+            f"{roi:+.1f}%",
+            f"{lucro:+.2f}",
+        ])
     
     # Exibir tabela
     if dados:
+        from tabulate import tabulate
         headers = ['Liga', 'Temporada', 'Completo', 'Jogos', 'Acertos', 'Erros', 'Winrate', 'ROI', 'Lucro']
         print(tabulate(dados, headers=headers, tablefmt='grid'))
         print(f"\nTotal de jogos processados: {total_jogos}")
         print(f"Lucro total: {total_lucro:+.2f}")
-        print(f"Número de temporadas completadas: {len(dados)}")
+        print(f"Número de temporadas completadas: {sum(1 for r in registros if r['completo'])}")
     
     # Verificar relatório final
     relatorio_file = Path(__file__).parent / 'relatorio_backtest_automatico.json'
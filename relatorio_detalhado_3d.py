@@ -2,17 +2,12 @@
 Relatório detalhado tridimensional: LIGA / TIPO (DxG) / ENTRADA (HOME/AWAY)
 """
 
-import json
-from pathlib import Path
 from collections import defaultdict
 
-FIXTURES_DIR = Path(__file__).parent / 'fixtures'
-BACKTEST_ACUMULADO = FIXTURES_DIR / 'backtest_acumulado.json'
+from leitor_backtest import MIN_ENTRADAS, MIN_ROI, MIN_LUCRO, agrupar_backtest, separar_por_criterios
 
-# Critérios de filtro
-MIN_ENTRADAS = 75
-MIN_ROI = 5.0
-MIN_LUCRO = 20.0
+# Agrupar por LIGA + TIPO (DxG) + ENTRADA (HOME/AWAY)
+VISAO = ('liga', ('tipo', 'dxg'), 'entrada')
 
 def formatar_tabela(dados_lista, titulo, colunas):
     """Formata e exibe uma tabela"""
@@ -48,59 +43,18 @@ def formatar_tabela(dados_lista, titulo, colunas):
                 linha += f"{str(valor):>{col['width']}} "
         print(linha)
 
-def relatorio_detalhado():
+def relatorio_detalhado(grupos_3d=None, total_entradas=None):
     """Gera relatório tridimensional com filtros"""
     
-    print("📖 Carregando dados...")
     print(f"   Filtros: Entradas >= {MIN_ENTRADAS}, ROI >= {MIN_ROI}%, Lucro >= R${MIN_LUCRO:.2f}")
-    with open(BACKTEST_ACUMULADO, 'r', encoding='utf-8') as f:
-        entradas = json.load(f)
+    if grupos_3d is None:
+        print("📖 Carregando dados e processando em 3 dimensões...")
+        grupos_3d, total_entradas = agrupar_backtest(VISAO)
     
-    print(f"   ✓ {len(entradas):,} entradas carregadas\n")
-    
-    # Agrupar por liga, tipo, entrada
-    grupos_3d = defaultdict(lambda: {
-        'entradas': 0,
-        'lucro': 0.0,
-        'positivos': 0,
-        'negativos': 0
-    })
-    
-    print("🔄 Processando dados em 3 dimensões...")
-    
-    for entrada in entradas:
-        liga = entrada['liga']
-        tipo = entrada['dxg']
-        entrada_tipo = entrada['entrada']  # HOME ou AWAY
-        lp = entrada['lp']
-        
-        # Chave: LIGA + TIPO + ENTRADA
-        chave = f"{liga}|{tipo}|{entrada_tipo}"
-        
-        grupos_3d[chave]['liga'] = liga
-        grupos_3d[chave]['tipo'] = tipo
-        grupos_3d[chave]['entrada'] = entrada_tipo
-        grupos_3d[chave]['entradas'] += 1
-        grupos_3d[chave]['lucro'] += lp
-        
-        if lp > 0:
-            grupos_3d[chave]['positivos'] += 1
-        else:
-            grupos_3d[chave]['negativos'] += 1
-    
-    # Calcular ROI e winrate
-    for dados in grupos_3d.values():
-        if dados['entradas'] > 0:
-            dados['winrate'] = (dados['positivos'] / dados['entradas']) * 100
-            dados['roi'] = (dados['lucro'] / dados['entradas']) * 100
+    print(f"   ✓ {total_entradas:,} entradas carregadas\n")
     
     # Aplicar filtros
-    grupos_filtrados = {}
-    for chave, dados in grupos_3d.items():
-        if (dados['entradas'] >= MIN_ENTRADAS and 
-            dados['roi'] >= MIN_ROI and 
-            dados['lucro'] >= MIN_LUCRO):
-            grupos_filtrados[chave] = dados
+    grupos_filtrados, _ = separar_por_criterios(grupos_3d)
     
     print(f"   ✓ {len(grupos_3d)} combinações processadas")
     print(f"   ✓ {len(grupos_filtrados)} combinações atendem aos filtros\n")
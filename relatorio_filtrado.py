@@ -6,66 +6,23 @@ Filtros:
 - Lucro >= 20
 """
 
-import json
-from pathlib import Path
 from collections import defaultdict
 
-FIXTURES_DIR = Path(__file__).parent / 'fixtures'
-BACKTEST_ACUMULADO = FIXTURES_DIR / 'backtest_acumulado.json'
+from leitor_backtest import MIN_ENTRADAS, MIN_ROI, MIN_LUCRO, agrupar_backtest, separar_por_criterios
 
-# Critérios de filtro
-MIN_ENTRADAS = 75
-MIN_ROI = 5.0
-MIN_LUCRO = 20.0
+# Agrupar por liga + temporada + tipo
+VISAO = ('liga', 'temporada', ('tipo', 'dxg'))
 
-def aplicar_filtros():
+def aplicar_filtros(grupos=None, total_entradas=None):
     """Aplica filtros e gera relatório"""
     
-    # Carregar dados
-    print("📖 Carregando dados...")
-    with open(BACKTEST_ACUMULADO, 'r', encoding='utf-8') as f:
-        entradas = json.load(f)
+    if grupos is None:
+        # Carregar e agrupar dados numa única passada
+        print("📖 Carregando dados...")
+        grupos, total_entradas = agrupar_backtest(VISAO)
     
-    print(f"   ✓ {len(entradas):,} entradas carregadas")
-    
-    # Agrupar por liga + temporada + tipo
-    print("\n🔄 Agrupando dados e aplicando filtros...")
-    
-    grupos = defaultdict(lambda: {
-        'entradas': 0,
-        'lucro': 0.0,
-        'positivos': 0,
-        'negativos': 0
-    })
-    
-    for entrada in entradas:
-        liga = entrada['liga']
-        temporada = entrada['temporada']
-        tipo = entrada['dxg']
-        lp = entrada['lp']
-        
-        # Criar chave única
-        chave = f"{liga}_{temporada}_{tipo}"
-        
-        grupos[chave]['liga'] = liga
-        grupos[chave]['temporada'] = temporada
-        grupos[chave]['tipo'] = tipo
-        grupos[chave]['entradas'] += 1
-        grupos[chave]['lucro'] += lp
-        
-        if lp > 0:
-            grupos[chave]['positivos'] += 1
-        else:
-            grupos[chave]['negativos'] += 1
-    
-    # Calcular ROI para cada grupo
-    for chave, dados in grupos.items():
-        if dados['entradas'] > 0:
-            dados['winrate'] = (dados['positivos'] / dados['entradas']) * 100
-            dados['roi'] = (dados['lucro'] / dados['entradas']) * 100
-        else:
-            dados['winrate'] = 0
-            dados['roi'] = 0
+    print(f"   ✓ {total_entradas:,} entradas carregadas")
+    print(f"   ✓ {len(grupos)} combinações liga/temporada/tipo")
     
     # Filtrar
     print("\n🎯 Aplicando filtros:")
@@ -73,13 +30,8 @@ def aplicar_filtros():
     print(f"   - ROI >= {MIN_ROI}%")
     print(f"   - Lucro >= R${MIN_LUCRO:.2f}")
     
-    resultados_filtrados = []
-    
-    for chave, dados in grupos.items():
-        if (dados['entradas'] >= MIN_ENTRADAS and 
-            dados['roi'] >= MIN_ROI and 
-            dados['lucro'] >= MIN_LUCRO):
-            resultados_filtrados.append(dados)
+    validados, _ = separar_por_criterios(grupos)
+    resultados_filtrados = list(validados.values())
     
     # Ordenar por lucro descendente
     resultados_filtrados.sort(key=lambda x: x['lucro'], reverse=True)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Resultados de backtest em formato colunar binário (um arquivo por liga)
+
+Os backtest/backtest_resultados_<LIGA>_<TEMPORADA>.json repetem os nomes dos
+campos em cada entrada e guardam números como texto. Aqui as entradas de
+todas as temporadas de uma liga ficam em backtest/colunar/<LIGA>.npz:
+
+- b365h, b365a, xgh, xga, odd_home_calc, odd_away_calc, lp: float64 (NaN se ausente)
+- fthg, ftag: int16 (SEM_GOL se ausente)
+- home, away: códigos int32 no dicionário 'times'
+- dxg, entrada: códigos int8 nos dicionários 'valores_dxg' e 'valores_entrada'
+- temporada: código int16 no dicionário 'temporadas' (ordem dos arquivos)
+- resumos: JSON com o registro do manifesto de cada temporada
+- fontes: JSON {arquivo: assinatura} dos JSONs convertidos
+
+carregar_liga devolve as colunas como arrays; leitor_backtest usa o arquivo
+colunar de uma liga enquanto as fontes baterem com o manifesto e volta aos
+JSONs quando alguma temporada mudar.
+
+Uso:
+    python resultados_colunares.py            # converte todas as ligas
+    python resultados_colunares.py E0 BRA     # só as ligas informadas
+"""
+
+import json
+import os
+import sys
+import time
+from itertools import groupby
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from manifesto_resultados import ManifestoResultados
+
+PASTA_RESULTADOS = Path(__file__).parent / 'backtest'
+NOME_PASTA_COLUNAR = 'colunar'
+
+# Incrementar quando as colunas mudarem (arquivos antigos deixam de ser usados)
+VERSAO_COLUNAR = 1
+
+CAMPOS_FLOAT = ['b365h', 'b365a', 'xgh', 'xga', 'odd_home_calc', 'odd_away_calc', 'lp']
+CAMPOS_GOLS = ['fthg', 'ftag']
+# Campo -> nome do dicionário no arquivo (home e away compartilham 'times')
+CAMPOS_TEXTO = {'home': 'times', 'away': 'times', 'dxg': 'valores_dxg', 'entrada': 'valores_entrada'}
+
+# Ordem dos campos nas entradas do BacktestEngine
+CAMPOS = ['home', 'away', 'b365h', 'b365a', 'xgh', 'xga', 'dxg',
+          'odd_home_calc', 'odd_away_calc', 'entrada', 'fthg', 'ftag', 'lp']
+
+SEM_GOL = -1
+_TIPOS_CODIGO = {'times': np.int32, 'valores_dxg': np.int8, 'valores_entrada': np.int8}
+
+
+def pasta_colunar(pasta_resultados=None):
+    return Path(pasta_resultados or PASTA_RESULTADOS) / NOME_PASTA_COLUNAR
+
+
+def _codificar(valores, dicionario, tipo):
+    """Códigos no dicionário (acrescenta valores novos); -1 para vazio"""
+    codigos, distintos = pd.factorize(pd.Series(valores, dtype=object))
+    posicoes = []
+    for valor in distintos:
+        valor = str(valor)
+        if valor not in dicionario:
+            dicionario[valor] = len(dicionario)
+        posicoes.append(dicionario[valor])
+    posicoes = np.append(np.array(posicoes, dtype=np.int64), -1)
+    return posicoes[codigos].astype(tipo)
+
+
+def converter_liga(liga, pasta_resultados=None):
+    """
+    Grava backtest/colunar/<LIGA>.npz com as temporadas da liga no manifesto.
+
+    Returns:
+        caminho do arquivo gravado (None se a liga não tiver resultados)
+
+    Raises:
+        ValueError: se alguma entrada tiver campos fora de CAMPOS
+    """
+    manifesto = ManifestoResultados(pasta_resultados or PASTA_RESULTADOS)
+    registros = [r for r in manifesto.listar() if r['liga'] == liga]
+    if not registros:
+        return None
+
+    entradas = []
+    temporadas = []
+    for i, registro in enumerate(registros):
+        da_temporada = manifesto.ler_entradas(registro)
+        for entrada in da_temporada:
+            extras = set(entrada) - set(CAMPOS)
+            if extras:
+                raise ValueError(f"{registro['arquivo']}: campos sem coluna {sorted(extras)}")
+        entradas.extend(da_temporada)
+        temporadas.append(np.full(len(da_temporada), i, dtype=np.int16))
+
+    bruto = pd.DataFrame.from_records(entradas, columns=CAMPOS)
+    colunas = {'temporada': np.concatenate(temporadas)}
+    for campo in CAMPOS_FLOAT:
+        colunas[campo] = pd.to_numeric(bruto[campo], errors='coerce').to_numpy(dtype=np.float64)
+    for campo in CAMPOS_GOLS:
+        gols = pd.to_numeric(bruto[campo], errors='coerce')
+        colunas[campo] = gols.fillna(SEM_GOL).to_numpy().astype(np.int16)
+
+    dicionarios = {nome: {} for nome in set(CAMPOS_TEXTO.values())}
+    for campo, nome in CAMPOS_TEXTO.items():
+        colunas[campo] = _codificar(bruto[campo], dicionarios[nome], _TIPOS_CODIGO[nome])
+    for nome, dicionario in dicionarios.items():
+        colunas[nome] = np.array(list(dicionario), dtype=str)
+
+    colunas['temporadas'] = np.array([r['temporada'] for r in registros], dtype=str)
+    resumos = [{k: v for k, v in r.items() if k not in ('assinatura', 'offset_entradas')} for r in registros]
+    colunas['resumos'] = np.array(json.dumps(resumos, ensure_ascii=False))
+    colunas['fontes'] = np.array(json.dumps({r['arquivo']: r['assinatura'] for r in registros}))
+    colunas['versao'] = np.array(VERSAO_COLUNAR)
+
+    pasta = pasta_colunar(pasta_resultados)
+    pasta.mkdir(exist_ok=True)
+    destino = pasta / f'{liga}.npz'
+    temporario = pasta / f'{liga}.{os.getpid()}.tmp.npz'
+    np.savez_compressed(temporario, **colunas)
+    os.replace(temporario, destino)
+    return destino
+
+
+def carregar_liga(liga, pasta_resultados=None, registros=None):
+    """
+    Colunas da liga como arrays (dict nome -> ndarray).
+
+    Args:
+        liga: código da liga
+        pasta_resultados: pasta dos JSONs (padrão: backtest/)
+        registros: registros do manifesto da liga; se informados, devolve
+            None quando o arquivo colunar não corresponder mais a eles
+
+    Returns:
+        dict com as colunas, os dicionários e 'resumos' (lista de dicts), ou
+        None se o arquivo não existir ou estiver desatualizado
+    """
+    caminho = pasta_colunar(pasta_resultados) / f'{liga}.npz'
+    try:
+        with np.load(caminho, allow_pickle=False) as arquivo:
+            if int(arquivo['versao']) != VERSAO_COLUNAR:
+                return None
+            if registros is not None:
+                fontes = {r['arquivo']: r['assinatura'] for r in registros}
+                if json.loads(str(arquivo['fontes'])) != fontes:
+                    return None
+            colunas = {nome: arquivo[nome] for nome in arquivo.files if nome not in ('fontes', 'versao')}
+    except (OSError, KeyError, ValueError):
+        return None
+    colunas['resumos'] = json.loads(str(colunas['resumos']))
+    return colunas
+
+
+def iterar_entradas(colunas):
+    """Entradas (dicts no formato do BacktestEngine, com liga e temporada) das colunas"""
+    n = len(colunas['temporada'])
+    valores = {}
+    for campo in CAMPOS_FLOAT:
+        coluna = colunas[campo]
+        valores[campo] = [None if v != v else v for v in coluna.tolist()]
+    for campo in CAMPOS_GOLS:
+        valores[campo] = [None if v == SEM_GOL else v for v in colunas[campo].tolist()]
+    for campo, nome in CAMPOS_TEXTO.items():
+        dicionario = colunas[nome].tolist() + [None]
+        valores[campo] = [dicionario[c] for c in colunas[campo].tolist()]
+
+    ligas = [r['liga'] for r in colunas['resumos']]
+    temporadas = colunas['temporadas'].tolist()
+    codigos_temporada = colunas['temporada'].tolist()
+    linhas = [valores[campo] for campo in CAMPOS]
+    for i in range(n):
+        entrada = {campo: linha[i] for campo, linha in zip(CAMPOS, linhas) if linha[i] is not None}
+        entrada['liga'] = ligas[codigos_temporada[i]]
+        entrada['temporada'] = temporadas[codigos_temporada[i]]
+        yield entrada
+
+
+def converter_ligas(ligas=None, pasta_resultados=None):
+    """Converte as ligas informadas (padrão: todas do manifesto); devolve {liga: erro ou None}"""
+    manifesto = ManifestoResultados(pasta_resultados or PASTA_RESULTADOS)
+    registros = manifesto.listar()
+    if ligas is None:
+        ligas = [liga for liga, _ in groupby(registros, key=lambda r: r['liga'])]
+    situacao = {}
+    for liga in ligas:
+        try:
+            converter_liga(liga, pasta_resultados)
+            situacao[liga] = None
+        except (OSError, ValueError) as e:
+            situacao[liga] = str(e)
+    return situacao
+
+
+def main():
+    ligas = [l for l in sys.argv[1:] if not l.startswith('-')] or None
+    print(f"{'='*80}")
+    print("RESULTADOS DE BACKTEST -> FORMATO COLUNAR")
+    print(f"{'='*80}\n")
+
+    inicio = time.time()
+    situacao = converter_ligas(ligas)
+    registros = ManifestoResultados(PASTA_RESULTADOS).listar()
+    pasta = pasta_colunar()
+    for liga, erro in situacao.items():
+        if erro:
+            print(f"  ❌ {liga}: {erro}")
+            continue
+        da_liga = [r for r in registros if r['liga'] == liga]
+        tamanho_json = sum(r['assinatura'][0] for r in da_liga)
+        tamanho_colunar = (pasta / f'{liga}.npz').stat().st_size
+        print(f"  ✅ {liga}: {len(da_liga)} temporadas, {sum(r['entradas'] for r in da_liga)} entradas, "
+              f"{tamanho_json / 1024:.0f} KB -> {tamanho_colunar / 1024:.0f} KB")
+
+    print(f"\nConcluído em {time.time() - inicio:.1f}s. Arquivos em {pasta}")
+
+
+if __name__ == '__main__':
+    main()
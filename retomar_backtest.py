@@ -2,6 +2,10 @@
 # -*- coding: utf-8 -*-
 """
 Script para retomar o backtest do ponto onde parou
+
+O progresso vem do ledger (ledger_backtest_automatico.json): temporadas
+concluídas com as mesmas entradas são puladas e as interrompidas continuam
+da rodada salva.
 """
 
 import json
@@ -9,6 +13,9 @@ from pathlib import Path
 import subprocess
 import sys
 
+from ledger_backtest import ARQUIVO_LEDGER, LedgerBacktest
+from manifesto_resultados import ManifestoResultados
+
 def main():
     projeto_root = Path(__file__).parent
     relatorio_file = projeto_root / 'relatorio_backtest_automatico.json'
@@ -40,6 +47,18 @@ def main():
         print("⚠️  Nenhum relatório anterior encontrado.")
         print("   O backtest será iniciado do início.\n")
     
+    # Verificar ledger de tarefas
+    if ARQUIVO_LEDGER.exists():
+        ledger = LedgerBacktest()
+        contagem = ledger.contagem()
+        print(f"\n📒 Ledger: {len(ledger.tarefas)} tarefas")
+        for estado, n in contagem.items():
+            print(f"   {estado}: {n}")
+        interrompidas = [t for t in ledger.tarefas.values()
+                         if t['estado'] in ('pendente', 'executando') and t.get('rodada', 1) > 1]
+        for t in interrompidas:
+            print(f"   ⏩ {t['liga']} - {t['temporada']} continua da rodada {t['rodada']}")
+
     # Verificar arquivo acumulado
     if acumulado_file.exists():
         with open(acumulado_file, 'r', encoding='utf-8') as f:
@@ -74,14 +93,14 @@ def main():
         files_to_remove = [
             'fixtures/backtest_acumulado.json',
             'relatorio_backtest_automatico.json',
+            ARQUIVO_LEDGER.name,
         ]
         
-        # Remover resultados individuais
+        # Remover resultados individuais (e zerar o manifesto)
         backtest_dir = projeto_root / 'backtest'
         if backtest_dir.exists():
-            for f in backtest_dir.glob('backtest_resultados_*.json'):
-                f.unlink()
-                print(f"   ✓ Deletado: {f.name}")
+            for nome in ManifestoResultados(backtest_dir).remover_todos():
+                print(f"   ✓ Deletado: {nome}")
         
         # Remover outros arquivos
         for file in files_to_remove:
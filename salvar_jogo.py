@@ -1,5 +1,4 @@
 import json
-import pandas as pd
 from pathlib import Path
 from datetime import datetime
 
@@ -129,6 +128,8 @@ def _calcular_dxg(xgh, xga):
 
 def salvar_jogo(index_jogo):
     """Salva um jogo específico da próxima rodada para análise futura"""
+    # pandas só aqui: excluir/atualizar/gerar não precisam dele
+    import pandas as pd
     
     # Carregar fixtures atuais
     fixtures_dir = Path("fixtures")
@@ -855,7 +856,7 @@ def gerar_pagina_salvos():
                 <a href="http://localhost:8000/analise_salvos.html" class="nav-link">Análise Salvos</a>
                 <a href="http://localhost:5001/backtest.html" class="nav-link">Backtest</a>
                 <a href="http://localhost:5001/backtest_salvos.html" class="nav-link">Backtests Salvos</a>
-                <a href="http://localhost:5001/backtest_resumo_entradas.html" class="nav-link">Resumo Entradas</a>
+                <a href="http://localhost:5002/backtest_resumo_entradas.html" class="nav-link">Resumo Entradas</a>
             </div>
         </div>
         <div class="stats">
@@ -1299,862 +1300,56 @@ def gerar_pagina_salvos():
 def analisar_padroes_ia(dados_fornecidos=None):
     """Analisa padroes nos dados salvos com relatorio detalhado de odds, xG, estrategias, confianca e combinacoes
     
+    Os agrupamentos (liga × DxG × faixa de odd × temporada × momento) são
+    calculados pela camada colunar em analise_colunar.py.
+    
     Args:
         dados_fornecidos: Lista de jogos para analisar. Se None, lê do arquivo fixtures/backtest_acumulado.json
     """
     import sys
-    
-    def _estrategia_local(jogo):
-        try:
-            b365h = jogo.get('B365H', None)
-            b365a = jogo.get('B365A', None)
-            odd_h_calc = jogo.get('ODD_H_CALC', None)
-            odd_a_calc = jogo.get('ODD_A_CALC', None)
-            if b365h is None or b365a is None or odd_h_calc is None or odd_a_calc is None:
-                return None
-            b365h = float(b365h)
-            b365a = float(b365a)
-            odd_h_calc = float(odd_h_calc)
-            odd_a_calc = float(odd_a_calc)
-            if b365h > odd_h_calc * 1.1:
-                return 'Back Home'
-            if b365a > odd_a_calc * 1.1:
-                return 'Back Away'
-            return None
-        except Exception:
-            return None
+    import analise_colunar
     
     # Se dados foram fornecidos, usar eles; caso contrário, ler do arquivo de backtest
     if dados_fornecidos is not None:
-        jogos_salvos = dados_fornecidos
-        print(f"DEBUG: Usando dados fornecidos: {len(jogos_salvos)} jogos", file=sys.stderr)
+        print(f"DEBUG: Usando dados fornecidos: {len(dados_fornecidos)} jogos", file=sys.stderr)
+        tabela = analise_colunar.tabela_de_entradas(dados_fornecidos)
     else:
-        # Tentar ler do arquivo de backtest primeiro
+        # Tentar ler do arquivo de backtest primeiro (tabela em cache até o arquivo mudar)
         backtest_file = Path("fixtures/backtest_acumulado.json")
+        salvos_file = Path("fixtures/jogos_salvos.json")
         if backtest_file.exists():
             print(f"DEBUG: Lendo do arquivo de backtest: {backtest_file}", file=sys.stderr)
-            with open(backtest_file, 'r', encoding='utf-8') as f:
-                jogos_salvos = json.load(f)
-            print(f"DEBUG: Total de jogos lidos do backtest: {len(jogos_salvos)}", file=sys.stderr)
-        else:
+            tabela = analise_colunar.carregar_tabela(backtest_file)
+        elif salvos_file.exists():
             # Fallback para arquivo antigo
-            salvos_file = Path("fixtures/jogos_salvos.json")
-            if not salvos_file.exists():
-                print("DEBUG: Nenhum arquivo de dados encontrado", file=sys.stderr)
-                return None
-            
             print(f"DEBUG: Lendo do arquivo antigo: {salvos_file}", file=sys.stderr)
-            with open(salvos_file, 'r', encoding='utf-8') as f:
-                jogos_salvos = json.load(f)
-            print(f"DEBUG: Total de jogos lidos do arquivo antigo: {len(jogos_salvos)}", file=sys.stderr)
+            tabela = analise_colunar.carregar_tabela(salvos_file)
+        else:
+            print("DEBUG: Nenhum arquivo de dados encontrado", file=sys.stderr)
+            return None
     
-    if not jogos_salvos:
+    if tabela is None or not tabela.attrs.get('total_entradas'):
         print("DEBUG: jogos_salvos está vazio", file=sys.stderr)
         return None
     
-    # Separar jogos com resultados (aceita tanto maiúsculas quanto minúsculas)
-    resultados = []
-    for i, j in enumerate(jogos_salvos):
-        # Verificar se tem resultados (GH/gc, GA/gv, LP/lp)
-        gh = j.get('GH') if j.get('GH') is not None else j.get('gc')
-        ga = j.get('GA') if j.get('GA') is not None else j.get('gv')
-        lp = j.get('LP') if j.get('LP') is not None else j.get('lp')
-        
-        # Debug: mostrar valores para os primeiros 3 jogos
-        if i < 3:
-            print(f"DEBUG: Jogo {i}: GH={gh}, GA={ga}, LP={lp}, LP_type={type(lp)}", file=sys.stderr)
-        
-        # Converter LP para float se for string (pode vir com vírgula no formato brasileiro)
-        if lp is not None and isinstance(lp, str):
-            try:
-                lp = float(lp.replace(',', '.'))
-            except:
-                lp = None
-        
-        if gh is not None and ga is not None and lp is not None:
-            # Normalizar campos para maiúsculas para compatibilidade
-            jogo_normalizado = j.copy()
-            if 'gc' in j and 'GH' not in j:
-                jogo_normalizado['GH'] = gh
-            if 'gv' in j and 'GA' not in j:
-                jogo_normalizado['GA'] = ga
-            if 'lp' in j and 'LP' not in j:
-                jogo_normalizado['LP'] = lp
-            # Garantir que LP é um float
-            if 'LP' in jogo_normalizado and isinstance(jogo_normalizado['LP'], str):
-                try:
-                    jogo_normalizado['LP'] = float(jogo_normalizado['LP'].replace(',', '.'))
-                except:
-                    pass
-            # Normalizar outros campos comuns
-            if 'casa' in j and 'CASA' not in j:
-                jogo_normalizado['CASA'] = j['casa']
-            if 'visitante' in j and 'VISITANTE' not in j:
-                jogo_normalizado['VISITANTE'] = j['visitante']
-            if 'liga' in j and 'LIGA' not in j:
-                jogo_normalizado['LIGA'] = j['liga']
-            if 'xg_casa' in j and 'xGH' not in j:
-                jogo_normalizado['xGH'] = j['xg_casa']
-            if 'xg_visitante' in j and 'xGA' not in j:
-                jogo_normalizado['xGA'] = j['xg_visitante']
-            if 'odd_casa' in j and 'B365H' not in j:
-                jogo_normalizado['B365H'] = j['odd_casa']
-            if 'odd_visitante' in j and 'B365A' not in j:
-                jogo_normalizado['B365A'] = j['odd_visitante']
-            
-            # Calcular odds esperadas se não existirem (baseado em xG)
-            if 'ODD_H_CALC' not in jogo_normalizado and 'xGH' in jogo_normalizado:
-                xgh_val = float(jogo_normalizado.get('xGH', 1))
-                xga_val = float(jogo_normalizado.get('xGA', 1))
-                # Fórmula simplificada: odd_casa = 1 / (xGH / (xGH + xGA))
-                if (xgh_val + xga_val) > 0:
-                    prob_casa = xgh_val / (xgh_val + xga_val)
-                    jogo_normalizado['ODD_H_CALC'] = 1 / prob_casa if prob_casa > 0 else 2.0
-                    jogo_normalizado['ODD_A_CALC'] = 1 / (1 - prob_casa) if (1 - prob_casa) > 0 else 2.0
-            
-            # Adicionar CFxGH e CFxGA com valor padrão se não existirem
-            if 'CFxGH' not in jogo_normalizado:
-                jogo_normalizado['CFxGH'] = 0.5  # Valor neutro
-            if 'CFxGA' not in jogo_normalizado:
-                jogo_normalizado['CFxGA'] = 0.5  # Valor neutro
-            
-            resultados.append(jogo_normalizado)
-    
-    print(f"DEBUG: Jogos com resultados completos: {len(resultados)}", file=sys.stderr)
+    print(f"DEBUG: Jogos com resultados completos: {len(tabela)}", file=sys.stderr)
     
-    if len(resultados) < 3:
-        print(f"DEBUG: Retornando mensagem de poucos resultados: {len(resultados)}", file=sys.stderr)
+    if len(tabela) < 3:
+        print(f"DEBUG: Retornando mensagem de poucos resultados: {len(tabela)}", file=sys.stderr)
         return {
-            'resumo': f'Apenas {len(resultados)} resultado(s) disponivel(is). Minimo de 3 necessarios para analise.',
+            'resumo': f'Apenas {len(tabela)} resultado(s) disponivel(is). Minimo de 3 necessarios para analise.',
             'insights': [],
             'recomendacoes': []
         }
     
-    print(f"DEBUG: Iniciando análise com {len(resultados)} jogos", file=sys.stderr)
-    insights = []
-    recomendacoes = []
-    
-    # SEÇÕES 1-4 REMOVIDAS - FOCO APENAS EM 4.5, 4.6 E 5 (ANÁLISE DE TENDÊNCIAS)
-    
-    # ==================== SECAO 4.5: ANALISE DE DxG POR LIGA ====================
-    print("\nDEBUG: === INICIANDO SECAO 4.5: ANALISE DE DxG POR LIGA ===", file=sys.stderr)
-    insights.append("═" * 80)
-    insights.append("SECAO 4.5: ANALISE DE LUCRO, ROI E WINRATE POR DxG E LIGA")
-    insights.append("═" * 80)
-    
-    # Dicionário para armazenar dados por liga e DxG
-    analise_por_liga = {}
-    
-    # Categorias DxG
-    categorias_dxg = ['FH', 'LH', 'EQ', 'LA', 'FA']
-    
-    # Processar cada jogo
-    for jogo in resultados:
-        try:
-            liga = jogo.get('LIGA', 'Desconhecida')
-            
-            # Determinar DxG do jogo
-            xgh = float(jogo.get('xGH', 0))
-            xga = float(jogo.get('xGA', 0))
-            diff = xgh - xga
-            
-            if diff > 1.0:
-                dxg = 'FH'  # Forte Home
-            elif 0.3 < diff <= 1.0:
-                dxg = 'LH'  # Leve Home
-            elif -0.3 <= diff <= 0.3:
-                dxg = 'EQ'  # Equilibrado
-            elif -1.0 <= diff < -0.3:
-                dxg = 'LA'  # Leve Away
-            else:
-                dxg = 'FA'  # Forte Away
-            
-            # Inicializar estrutura se necessário
-            if liga not in analise_por_liga:
-                analise_por_liga[liga] = {}
-            if dxg not in analise_por_liga[liga]:
-                analise_por_liga[liga][dxg] = {'jogos': [], 'por_odd': {}}
-            
-            # Adicionar jogo
-            analise_por_liga[liga][dxg]['jogos'].append(jogo)
-            
-            # Classificar por faixa de odd
-            b365h = float(jogo.get('B365H', 0))
-            b365a = float(jogo.get('B365A', 0))
-            odd_h_calc = float(jogo.get('ODD_H_CALC', 1))
-            odd_a_calc = float(jogo.get('ODD_A_CALC', 1))
-            
-            odd_apostada = None
-            if b365h > odd_h_calc * 1.1:
-                odd_apostada = b365h
-            elif b365a > odd_a_calc * 1.1:
-                odd_apostada = b365a
-            
-            if odd_apostada:
-                # Determinar faixa de odd
-                if odd_apostada < 1.5:
-                    faixa_odd = '1.0-1.5'
-                elif odd_apostada < 2.0:
-                    faixa_odd = '1.5-2.0'
-                elif odd_apostada < 3.0:
-                    faixa_odd = '2.0-3.0'
-                elif odd_apostada < 5.0:
-                    faixa_odd = '3.0-5.0'
-                else:
-                    faixa_odd = '5.0+'
-                
-                if faixa_odd not in analise_por_liga[liga][dxg]['por_odd']:
-                    analise_por_liga[liga][dxg]['por_odd'][faixa_odd] = []
-                
-                analise_por_liga[liga][dxg]['por_odd'][faixa_odd].append(jogo)
-        
-        except Exception as e:
-            print(f"DEBUG: Erro ao processar jogo na seção DxG por liga: {e}", file=sys.stderr)
-            pass
-    
-    # Gerar relatório por liga
-    for liga in sorted(analise_por_liga.keys()):
-        insights.append("")
-        insights.append(f"  ▼ LIGA: {liga}")
-        insights.append("  " + "─" * 76)
-        
-        dados_liga = analise_por_liga[liga]
-        
-        # Calcular total de entradas nesta liga para determinar threshold de relevância
-        total_entradas_liga = sum(len(dados_liga[d]['jogos']) for d in categorias_dxg if d in dados_liga)
-        # Threshold: mínimo 3 entradas OU 15% do total da liga (o que for maior)
-        threshold_minimo = max(3, int(total_entradas_liga * 0.15))
-        
-        for dxg in categorias_dxg:
-            if dxg not in dados_liga or not dados_liga[dxg]['jogos']:
-                continue
-            
-            jogos_dxg = dados_liga[dxg]['jogos']
-            apostas = len(jogos_dxg)
-            
-            # Verificar se este DxG tem entradas suficientes para ser relevante
-            if apostas < threshold_minimo:
-                # Mostrar como não relevante (silenciosamente omitir)
-                continue
-            
-            lps = [float(j.get('LP', 0)) for j in jogos_dxg]
-            acertos = sum(1 for lp in lps if lp > 0)
-            total_lp = sum(lps)
-            taxa = (acertos / apostas * 100) if apostas > 0 else 0
-            roi = (total_lp / apostas * 100) if apostas > 0 else 0
-            
-            status = "★ LUCRATIVO" if total_lp > 0 and roi > 0 else "✗ PREJUIZO"
-            insights.append(f"    {dxg}: {apostas} apostas | {acertos} acertos ({taxa:.1f}%) | L/P: {total_lp:+.2f} | ROI: {roi:+.1f}% | {status}")
-            
-            # Analisar melhores faixas de odd para este DxG
-            melhor_faixa = None
-            melhor_roi_faixa = -999
-            
-            for faixa_odd, jogos_faixa in sorted(dados_liga[dxg]['por_odd'].items()):
-                if not jogos_faixa:
-                    continue
-                
-                apostas_faixa = len(jogos_faixa)
-                
-                # Também aplicar threshold de relevância por faixa de odd
-                threshold_faixa = max(2, int(apostas * 0.20))  # Mínimo 2 ou 20% do DxG
-                if apostas_faixa < threshold_faixa:
-                    continue  # Pular faixas com poucas entradas
-                
-                lps_faixa = [float(j.get('LP', 0)) for j in jogos_faixa]
-                acertos_faixa = sum(1 for lp in lps_faixa if lp > 0)
-                total_lp_faixa = sum(lps_faixa)
-                taxa_faixa = (acertos_faixa / apostas_faixa * 100) if apostas_faixa > 0 else 0
-                roi_faixa = (total_lp_faixa / apostas_faixa * 100) if apostas_faixa > 0 else 0
-                
-                status_faixa = "✓" if total_lp_faixa > 0 else "✗"
-                insights.append(f"      Odds {faixa_odd}: {apostas_faixa} ap. | {acertos_faixa} acertos ({taxa_faixa:.1f}%) | L/P: {total_lp_faixa:+.2f} | ROI: {roi_faixa:+.1f}% {status_faixa}")
-                
-                if roi_faixa > melhor_roi_faixa and total_lp_faixa > 0:
-                    melhor_roi_faixa = roi_faixa
-                    melhor_faixa = faixa_odd
-            
-            # Adicionar recomendação se houver melhor faixa
-            if melhor_faixa and melhor_roi_faixa > 0:
-                insights.append(f"      ★ MELHOR FAIXA: {melhor_faixa} com ROI {melhor_roi_faixa:+.1f}%")
-                recomendacoes.append(f"★ {liga} - {dxg}: Focar odds {melhor_faixa} (ROI {melhor_roi_faixa:+.1f}%)")
-    
-    insights.append("")
-    
-    # ==================== SECAO 4.6: ANALISE DE DxG POR MOMENTO DA TEMPORADA ====================
-    print("\nDEBUG: === INICIANDO SECAO 4.6: ANALISE DE DxG POR MOMENTO DA TEMPORADA ===", file=sys.stderr)
-    insights.append("═" * 80)
-    insights.append("SECAO 4.6: ANALISE DE DxG POR MOMENTO DA TEMPORADA (INICIO, MEIO, FIM)")
-    insights.append("═" * 80)
-    
-    # Para cada liga, dividir em 3 momentos: início (5 primeiros), meio, fim (5 últimos)
-    for liga in sorted(analise_por_liga.keys()):
-        dados_liga = analise_por_liga[liga]
-        
-        # Coletar todos os jogos desta liga com datas (ordenados)
-        todos_jogos_liga = []
-        for dxg in categorias_dxg:
-            if dxg in dados_liga:
-                todos_jogos_liga.extend(dados_liga[dxg]['jogos'])
-        
-        if not todos_jogos_liga:
-            continue
-        
-        # Tentar ordenar por data (campo 'data' ou similar)
-        try:
-            todos_jogos_liga.sort(key=lambda x: x.get('data', ''))
-        except:
-            pass  # Se não houver data, manter ordem original
-        
-        total_jogos = len(todos_jogos_liga)
-        
-        # Definir os limites por percentual: 25% início, 50% meio, 25% fim
-        inicio_count = max(2, int(total_jogos * 0.25))  # 25% das partidas
-        fim_count = max(2, int(total_jogos * 0.25))     # 25% das partidas
-        
-        jogos_inicio = todos_jogos_liga[:inicio_count]
-        jogos_fim = todos_jogos_liga[-fim_count:] if fim_count > 0 else []
-        jogos_meio = todos_jogos_liga[inicio_count:total_jogos - fim_count] if fim_count > 0 else todos_jogos_liga[inicio_count:]
-        
-        # Análise por momento
-        momentos = [
-            ('INÍCIO', jogos_inicio),
-            ('MEIO', jogos_meio),
-            ('FIM', jogos_fim)
-        ]
-        
-        insights.append("")
-        insights.append(f"  ▼ LIGA: {liga} (Total: {total_jogos} jogos | Início: {len(jogos_inicio)} | Meio: {len(jogos_meio)} | Fim: {len(jogos_fim)})")
-        insights.append("  " + "─" * 76)
-        
-        for momento_nome, jogos_momento in momentos:
-            if not jogos_momento:
-                continue
-            
-            insights.append(f"    └─ {momento_nome} ({len(jogos_momento)} jogos):")
-            
-            # Classificar os jogos deste momento por DxG
-            dxg_momento = {}
-            for jogo in jogos_momento:
-                try:
-                    xgh = float(jogo.get('xGH', 0))
-                    xga = float(jogo.get('xGA', 0))
-                    diff = xgh - xga
-                    
-                    if diff > 1.0:
-                        dxg_class = 'FH'
-                    elif 0.3 < diff <= 1.0:
-                        dxg_class = 'LH'
-                    elif -0.3 <= diff <= 0.3:
-                        dxg_class = 'EQ'
-                    elif -1.0 <= diff < -0.3:
-                        dxg_class = 'LA'
-                    else:
-                        dxg_class = 'FA'
-                    
-                    if dxg_class not in dxg_momento:
-                        dxg_momento[dxg_class] = []
-                    dxg_momento[dxg_class].append(jogo)
-                except:
-                    pass
-            
-            # Mostrar estatísticas por DxG neste momento
-            for dxg in categorias_dxg:
-                if dxg not in dxg_momento or not dxg_momento[dxg]:
-                    continue
-                
-                jogos_dxg = dxg_momento[dxg]
-                apostas = len(jogos_dxg)
-                
-                # Aplicar relevância mínima também por momento
-                if apostas < 2:
-                    continue
-                
-                lps = [float(j.get('LP', 0)) for j in jogos_dxg]
-                acertos = sum(1 for lp in lps if lp > 0)
-                total_lp = sum(lps)
-                taxa = (acertos / apostas * 100) if apostas > 0 else 0
-                roi = (total_lp / apostas * 100) if apostas > 0 else 0
-                
-                status = "★" if total_lp > 0 and roi > 0 else "✗"
-                insights.append(f"       {dxg}: {apostas} ap. | {acertos} acer. ({taxa:.1f}%) | L/P: {total_lp:+.2f} | ROI: {roi:+.1f}% {status}")
-    
-    insights.append("")
-    
-    # ==================== SECAO 5: ANALISE DE TENDENCIAS (4.5 + 4.6 + MULTI-TEMPORADA) ====================
-    print("\nDEBUG: === INICIANDO SECAO 5: ANALISE DE TENDENCIAS ===", file=sys.stderr)
-    insights.append("═" * 80)
-    insights.append("SECAO 5: TENDENCIAS E RECOMENDACOES POR LIGA (INCLUINDO COMPARACAO MULTI-TEMPORADA)")
-    insights.append("═" * 80)
-    
-    # ==================== SECAO 5.1: ANALISE COMPARATIVA ENTRE TEMPORADAS ====================
-    print("\nDEBUG: === INICIANDO SECAO 5.1: COMPARACAO MULTI-TEMPORADA ===", file=sys.stderr)
-    insights.append("")
-    insights.append("─" * 80)
-    insights.append("SECAO 5.1: COMPARACAO DE ESTRATEGIAS ENTRE TEMPORADAS")
-    insights.append("─" * 80)
-    
-    # Estrutura: {liga: {temporada: {dxg: [jogos]}}}
-    dados_por_temporada = {}
-    
-    # Agrupar jogos por liga, temporada e DxG
-    for jogo in resultados:
-        try:
-            liga = jogo.get('LIGA', 'Desconhecida')
-            temporada = jogo.get('temporada', '2024-25')  # Fallback para temporada padrão
-            
-            # Determinar DxG
-            xgh = float(jogo.get('xGH', 0))
-            xga = float(jogo.get('xGA', 0))
-            diff = xgh - xga
-            
-            if diff > 1.0:
-                dxg = 'FH'
-            elif 0.3 < diff <= 1.0:
-                dxg = 'LH'
-            elif -0.3 <= diff <= 0.3:
-                dxg = 'EQ'
-            elif -1.0 <= diff < -0.3:
-                dxg = 'LA'
-            else:
-                dxg = 'FA'
-            
-            # Inicializar estrutura
-            if liga not in dados_por_temporada:
-                dados_por_temporada[liga] = {}
-            if temporada not in dados_por_temporada[liga]:
-                dados_por_temporada[liga][temporada] = {}
-            if dxg not in dados_por_temporada[liga][temporada]:
-                dados_por_temporada[liga][temporada][dxg] = []
-            
-            dados_por_temporada[liga][temporada][dxg].append(jogo)
-        except Exception as e:
-            print(f"DEBUG: Erro ao agrupar por temporada: {e}", file=sys.stderr)
-            pass
-    
-    # Analisar cada liga para comparar temporadas
-    for liga in sorted(dados_por_temporada.keys()):
-        temporadas_liga = dados_por_temporada[liga]
-        
-        # Só analisar se houver pelo menos 2 temporadas
-        if len(temporadas_liga) < 2:
-            continue
-        
-        insights.append("")
-        insights.append(f"  ▼ LIGA: {liga} ({len(temporadas_liga)} temporadas)")
-        insights.append("  " + "─" * 76)
-        
-        # Calcular ROI por DxG em cada temporada
-        roi_por_dxg_temporada = {}  # {dxg: {temporada: roi}}
-        
-        for temporada in sorted(temporadas_liga.keys(), reverse=True):
-            dados_temp = temporadas_liga[temporada]
-            
-            # Calcular total da temporada
-            total_jogos_temp = sum(len(dados_temp[d]) for d in categorias_dxg if d in dados_temp)
-            total_lp_temp = sum(float(j.get('LP', 0)) for d in categorias_dxg if d in dados_temp for j in dados_temp[d])
-            roi_temp = (total_lp_temp / total_jogos_temp * 100) if total_jogos_temp > 0 else 0
-            
-            insights.append(f"    📅 TEMPORADA {temporada}: {total_jogos_temp} jogos | ROI: {roi_temp:+.1f}%")
-            
-            for dxg in categorias_dxg:
-                if dxg not in dados_temp or not dados_temp[dxg]:
-                    continue
-                
-                jogos_dxg = dados_temp[dxg]
-                apostas = len(jogos_dxg)
-                
-                # Threshold mínimo de 2 jogos
-                if apostas < 2:
-                    continue
-                
-                lps = [float(j.get('LP', 0)) for j in jogos_dxg]
-                acertos = sum(1 for lp in lps if lp > 0)
-                total_lp = sum(lps)
-                taxa = (acertos / apostas * 100) if apostas > 0 else 0
-                roi = (total_lp / apostas * 100) if apostas > 0 else 0
-                
-                # Armazenar ROI para comparação
-                if dxg not in roi_por_dxg_temporada:
-                    roi_por_dxg_temporada[dxg] = {}
-                roi_por_dxg_temporada[dxg][temporada] = roi
-                
-                status = "✓" if total_lp > 0 else "✗"
-                insights.append(f"       {dxg}: {apostas} ap. | {acertos} acer. ({taxa:.1f}%) | ROI: {roi:+.1f}% {status}")
-        
-        # Análise de consistência entre temporadas
-        insights.append("")
-        insights.append("    🔍 ANALISE DE CONSISTENCIA ENTRE TEMPORADAS:")
-        
-        estrategias_consistentes = []
-        estrategias_variacao_alta = []
-        
-        for dxg in categorias_dxg:
-            if dxg not in roi_por_dxg_temporada:
-                continue
-            
-            rois = list(roi_por_dxg_temporada[dxg].values())
-            
-            # Precisa de pelo menos 2 temporadas para comparar
-            if len(rois) < 2:
-                continue
-            
-            roi_medio = sum(rois) / len(rois)
-            rois_positivos = sum(1 for r in rois if r > 0)
-            taxa_sucesso = (rois_positivos / len(rois) * 100)
-            
-            # Calcular desvio padrão (variação)
-            variancia = sum((r - roi_medio) ** 2 for r in rois) / len(rois)
-            desvio = variancia ** 0.5
-            
-            # Classificar estratégia
-            temporadas_str = ", ".join(sorted(roi_por_dxg_temporada[dxg].keys(), reverse=True))
-            
-            # Estratégia consistente: ROI médio positivo e baixa variação
-            if roi_medio > 5 and desvio < 20:
-                estrategias_consistentes.append({
-                    'dxg': dxg,
-                    'roi_medio': roi_medio,
-                    'desvio': desvio,
-                    'taxa_sucesso': taxa_sucesso,
-                    'temporadas': temporadas_str
-                })
-                insights.append(f"       ★★ {dxg}: ESTRATEGIA CONSISTENTE - ROI médio {roi_medio:+.1f}% | Variação: {desvio:.1f}% | Lucro em {rois_positivos}/{len(rois)} temporadas")
-                recomendacoes.append(f"★★ {liga} - {dxg}: Estratégia CONSISTENTE entre temporadas (ROI médio {roi_medio:+.1f}%)")
-            
-            # Estratégia com alta variação: pode ser afetada por fatores externos
-            elif desvio > 40:
-                estrategias_variacao_alta.append({
-                    'dxg': dxg,
-                    'roi_medio': roi_medio,
-                    'desvio': desvio,
-                    'temporadas': temporadas_str
-                })
-                insights.append(f"       ⚠ {dxg}: ALTA VARIACAO - ROI médio {roi_medio:+.1f}% | Variação: {desvio:.1f}% | Instável entre temporadas")
-            
-            # Estratégia lucrativa mas não muito estável
-            elif roi_medio > 0:
-                insights.append(f"       ★ {dxg}: LUCRATIVA - ROI médio {roi_medio:+.1f}% | Variação: {desvio:.1f}% | Lucro em {rois_positivos}/{len(rois)} temporadas")
-            
-            # Estratégia não lucrativa
-            else:
-                insights.append(f"       ✗ {dxg}: NÃO LUCRATIVA - ROI médio {roi_medio:+.1f}% | Evitar")
-        
-        # Resumo da liga
-        if estrategias_consistentes:
-            insights.append("")
-            insights.append(f"    💎 MELHORES ESTRATEGIAS PARA {liga}:")
-            for est in sorted(estrategias_consistentes, key=lambda x: x['roi_medio'], reverse=True)[:3]:
-                insights.append(f"       1º {est['dxg']}: ROI {est['roi_medio']:+.1f}% (±{est['desvio']:.1f}%)")
-        
-        # ==================== ANALISE POR MOMENTO DA TEMPORADA (MULTI-TEMPORADA) ====================
-        insights.append("")
-        insights.append("    ⏱ ANALISE POR MOMENTO DA TEMPORADA (INICIO/MEIO/FIM):")
-        
-        # Estrutura: {dxg: {momento: {temporada: roi}}}
-        roi_por_momento_temporada = {}
-        
-        for temporada in sorted(temporadas_liga.keys(), reverse=True):
-            dados_temp = temporadas_liga[temporada]
-            
-            # Coletar todos os jogos desta temporada ordenados por data
-            jogos_temp_todos = []
-            for dxg in categorias_dxg:
-                if dxg in dados_temp:
-                    jogos_temp_todos.extend(dados_temp[dxg])
-            
-            if not jogos_temp_todos:
-                continue
-            
-            # Ordenar por data
-            try:
-                jogos_temp_todos.sort(key=lambda x: x.get('data', ''))
-            except:
-                pass
-            
-            total_jogos_temp = len(jogos_temp_todos)
-            
-            # Dividir em início (25%), meio (50%), fim (25%)
-            inicio_count = max(2, int(total_jogos_temp * 0.25))
-            fim_count = max(2, int(total_jogos_temp * 0.25))
-            
-            jogos_inicio = jogos_temp_todos[:inicio_count]
-            jogos_fim = jogos_temp_todos[-fim_count:] if fim_count > 0 else []
-            jogos_meio = jogos_temp_todos[inicio_count:total_jogos_temp - fim_count] if fim_count > 0 else jogos_temp_todos[inicio_count:]
-            
-            momentos = {
-                'INICIO': jogos_inicio,
-                'MEIO': jogos_meio,
-                'FIM': jogos_fim
-            }
-            
-            # Analisar cada momento
-            for momento_nome, jogos_momento in momentos.items():
-                if not jogos_momento:
-                    continue
-                
-                # Classificar por DxG
-                for jogo in jogos_momento:
-                    try:
-                        xgh = float(jogo.get('xGH', 0))
-                        xga = float(jogo.get('xGA', 0))
-                        diff = xgh - xga
-                        
-                        if diff > 1.0:
-                            dxg = 'FH'
-                        elif 0.3 < diff <= 1.0:
-                            dxg = 'LH'
-                        elif -0.3 <= diff <= 0.3:
-                            dxg = 'EQ'
-                        elif -1.0 <= diff < -0.3:
-                            dxg = 'LA'
-                        else:
-                            dxg = 'FA'
-                        
-                        # Inicializar estrutura
-                        if dxg not in roi_por_momento_temporada:
-                            roi_por_momento_temporada[dxg] = {}
-                        if momento_nome not in roi_por_momento_temporada[dxg]:
-                            roi_por_momento_temporada[dxg][momento_nome] = {}
-                        
-                        if temporada not in roi_por_momento_temporada[dxg][momento_nome]:
-                            roi_por_momento_temporada[dxg][momento_nome][temporada] = []
-                        
-                        roi_por_momento_temporada[dxg][momento_nome][temporada].append(jogo)
-                    except:
-                        pass
-        
-        # Calcular ROI por momento e temporada
-        for dxg in categorias_dxg:
-            if dxg not in roi_por_momento_temporada:
-                continue
-            
-            insights.append(f"       {dxg}:")
-            
-            for momento in ['INICIO', 'MEIO', 'FIM']:
-                if momento not in roi_por_momento_temporada[dxg]:
-                    continue
-                
-                temporadas_momento = roi_por_momento_temporada[dxg][momento]
-                
-                if len(temporadas_momento) < 2:
-                    continue
-                
-                # Calcular ROI para cada temporada neste momento
-                rois_momento = []
-                temporadas_info = []
-                
-                for temp in sorted(temporadas_momento.keys(), reverse=True):
-                    jogos = temporadas_momento[temp]
-                    
-                    if len(jogos) < 2:
-                        continue
-                    
-                    lps = [float(j.get('LP', 0)) for j in jogos]
-                    total_lp = sum(lps)
-                    roi = (total_lp / len(jogos) * 100) if len(jogos) > 0 else 0
-                    
-                    rois_momento.append(roi)
-                    temporadas_info.append(f"{temp}:{roi:+.1f}%")
-                
-                if len(rois_momento) < 2:
-                    continue
-                
-                # Calcular estatísticas do momento
-                roi_medio_momento = sum(rois_momento) / len(rois_momento)
-                variancia_momento = sum((r - roi_medio_momento) ** 2 for r in rois_momento) / len(rois_momento)
-                desvio_momento = variancia_momento ** 0.5
-                rois_positivos_momento = sum(1 for r in rois_momento if r > 0)
-                
-                # Determinar se o momento é consistentemente bom
-                if roi_medio_momento > 5 and desvio_momento < 15:
-                    status = "★★ CONSISTENTE"
-                    recomendacoes.append(f"★★ {liga} - {dxg} no {momento}: Altamente consistente (ROI médio {roi_medio_momento:+.1f}%)")
-                elif roi_medio_momento > 0:
-                    status = "★ LUCRATIVO"
-                else:
-                    status = "✗"
-                
-                temporadas_str = " | ".join(temporadas_info)
-                insights.append(f"          {momento}: ROI médio {roi_medio_momento:+.1f}% (±{desvio_momento:.1f}%) | {rois_positivos_momento}/{len(rois_momento)} temp. lucrativas | {status}")
-                insights.append(f"             [{temporadas_str}]")
-        
-        # Identificar padrões de momento que se repetem
-        insights.append("")
-        insights.append("    🎯 PADROES IDENTIFICADOS:")
-        
-        for dxg in categorias_dxg:
-            if dxg not in roi_por_momento_temporada:
-                continue
-            
-            # Calcular ROI médio por momento
-            roi_por_momento = {}
-            
-            for momento in ['INICIO', 'MEIO', 'FIM']:
-                if momento not in roi_por_momento_temporada[dxg]:
-                    continue
-                
-                temporadas_momento = roi_por_momento_temporada[dxg][momento]
-                
-                if len(temporadas_momento) < 2:
-                    continue
-                
-                rois = []
-                for temp in temporadas_momento.keys():
-                    jogos = temporadas_momento[temp]
-                    if len(jogos) >= 2:
-                        lps = [float(j.get('LP', 0)) for j in jogos]
-                        roi = (sum(lps) / len(jogos) * 100)
-                        rois.append(roi)
-                
-                if rois:
-                    roi_por_momento[momento] = sum(rois) / len(rois)
-            
-            if len(roi_por_momento) >= 2:
-                # Identificar melhor e pior momento
-                melhor_momento = max(roi_por_momento, key=roi_por_momento.get)
-                pior_momento = min(roi_por_momento, key=roi_por_momento.get)
-                
-                diferenca = roi_por_momento[melhor_momento] - roi_por_momento[pior_momento]
-                
-                if diferenca > 15:
-                    insights.append(f"       • {dxg}: FORTE preferência pelo {melhor_momento} (ROI {roi_por_momento[melhor_momento]:+.1f}% vs {roi_por_momento[pior_momento]:+.1f}% no {pior_momento})")
-                    recomendacoes.append(f"⏱ {liga} - {dxg}: Focar no {melhor_momento} da temporada (+{diferenca:.1f}% de diferença)")
-                elif diferenca > 8:
-                    insights.append(f"       • {dxg}: Melhor desempenho no {melhor_momento} (ROI {roi_por_momento[melhor_momento]:+.1f}%)")
-    
-    insights.append("")
-    
-    # ==================== SECAO 5.2: TENDENCIAS POR LIGA (ANÁLISE GERAL) ====================
-    print("\nDEBUG: === INICIANDO SECAO 5.2: TENDENCIAS POR LIGA ===", file=sys.stderr)
-    insights.append("─" * 80)
-    insights.append("SECAO 5.2: TENDENCIAS GERAIS POR LIGA")
-    insights.append("─" * 80)
-    
-    # Analisar tendências de cada liga baseado nas seções 4.5 e 4.6
-    for liga in sorted(analise_por_liga.keys()):
-        dados_liga = analise_por_liga[liga]
-        
-        # Coletar todos os jogos desta liga
-        todos_jogos_liga = []
-        for dxg in categorias_dxg:
-            if dxg in dados_liga:
-                todos_jogos_liga.extend(dados_liga[dxg]['jogos'])
-        
-        if not todos_jogos_liga:
-            continue
-        
-        total_entradas_liga = len(todos_jogos_liga)
-        total_lp_liga = sum(float(j.get('LP', 0)) for j in todos_jogos_liga)
-        total_acertos_liga = sum(1 for j in todos_jogos_liga if float(j.get('LP', 0)) > 0)
-        taxa_liga = (total_acertos_liga / total_entradas_liga * 100) if total_entradas_liga > 0 else 0
-        roi_liga = (total_lp_liga / total_entradas_liga * 100) if total_entradas_liga > 0 else 0
-        
-        insights.append("")
-        insights.append(f"  ▼ LIGA: {liga}")
-        insights.append(f"     Total: {total_entradas_liga} apostas | Taxa: {taxa_liga:.1f}% | L/P: {total_lp_liga:+.2f} | ROI: {roi_liga:+.1f}%")
-        
-        # Analisar melhor DxG da liga
-        melhor_dxg_roi = None
-        melhor_dxg_valor = -999
-        
-        for dxg in categorias_dxg:
-            if dxg not in dados_liga or not dados_liga[dxg]['jogos']:
-                continue
-            
-            jogos_dxg = dados_liga[dxg]['jogos']
-            apostas_dxg = len(jogos_dxg)
-            
-            # Threshold de relevância
-            threshold_minimo = max(3, int(total_entradas_liga * 0.15))
-            if apostas_dxg < threshold_minimo:
-                continue
-            
-            lps_dxg = [float(j.get('LP', 0)) for j in jogos_dxg]
-            total_lp_dxg = sum(lps_dxg)
-            roi_dxg = (total_lp_dxg / apostas_dxg * 100) if apostas_dxg > 0 else 0
-            
-            if roi_dxg > melhor_dxg_valor:
-                melhor_dxg_valor = roi_dxg
-                melhor_dxg_roi = dxg
-        
-        # Analisar desempenho por momento da temporada
-        try:
-            todos_jogos_liga.sort(key=lambda x: x.get('data', ''))
-        except:
-            pass
-        
-        inicio_count = max(2, int(total_entradas_liga * 0.25))
-        fim_count = max(2, int(total_entradas_liga * 0.25))
-        
-        jogos_inicio = todos_jogos_liga[:inicio_count]
-        jogos_fim = todos_jogos_liga[-fim_count:] if fim_count > 0 else []
-        
-        # Calcular performance por momento
-        desempenho_inicio = None
-        desempenho_fim = None
-        
-        if jogos_inicio:
-            lps_inicio = [float(j.get('LP', 0)) for j in jogos_inicio]
-            roi_inicio = (sum(lps_inicio) / len(jogos_inicio) * 100) if len(jogos_inicio) > 0 else 0
-            desempenho_inicio = roi_inicio
-        
-        if jogos_fim:
-            lps_fim = [float(j.get('LP', 0)) for j in jogos_fim]
-            roi_fim = (sum(lps_fim) / len(jogos_fim) * 100) if len(jogos_fim) > 0 else 0
-            desempenho_fim = roi_fim
-        
-        # Gerar recomendações baseadas nas análises
-        tendencias = []
-        
-        # Tendência 1: Melhor DxG
-        if melhor_dxg_roi:
-            tendencias.append(f"★ DxG {melhor_dxg_roi} é mais lucrativo (ROI {melhor_dxg_valor:+.1f}%)")
-            recomendacoes.append(f"★ {liga}: Priorizar DxG {melhor_dxg_roi} (ROI {melhor_dxg_valor:+.1f}%)")
-        
-        # Tendência 2: Desempenho por momento
-        if desempenho_inicio is not None and desempenho_fim is not None:
-            if desempenho_inicio > desempenho_fim + 20:
-                tendencias.append(f"★ TEMPORADA: Melhor desempenho no INÍCIO (ROI {desempenho_inicio:+.1f}% vs {desempenho_fim:+.1f}%)")
-                recomendacoes.append(f"★ {liga}: Aumentar volume no INÍCIO da temporada")
-            elif desempenho_fim > desempenho_inicio + 20:
-                tendencias.append(f"★ TEMPORADA: Melhor desempenho no FIM (ROI {desempenho_fim:+.1f}% vs {desempenho_inicio:+.1f}%)")
-                recomendacoes.append(f"★ {liga}: Aumentar volume no FIM da temporada")
-            else:
-                tendencias.append(f"★ TEMPORADA: Desempenho equilibrado entre início e fim")
-        
-        # Tendência 3: Saúde geral
-        if roi_liga > 20:
-            tendencias.append(f"★ SAUDE: Liga com ROI positivo e consistente (+{roi_liga:.1f}%)")
-        elif roi_liga > 0:
-            tendencias.append(f"★ SAUDE: Liga com ROI positivo mas marginal (+{roi_liga:.1f}%)")
-        else:
-            tendencias.append(f"★ SAUDE: Liga com ROI negativo ({roi_liga:.1f}%) - Revisar estratégia")
-        
-        for tendencia in tendencias:
-            insights.append(f"     {tendencia}")
-    
-    insights.append("")
-    
-    # Resumo executivo
-    total_jogos = len(resultados)
-    total_lp = sum(float(j.get('LP', 0)) for j in resultados)
-    total_wins = sum(1 for j in resultados if float(j.get('LP', 0)) > 0)
-    taxa_geral = (total_wins / total_jogos * 100) if total_jogos > 0 else 0
-    roi_geral = (total_lp / total_jogos * 100) if total_jogos > 0 else 0
-    
-    resumo = f"ANALISE COMPLETA: {total_jogos} resultados | Taxa Geral: {taxa_geral:.1f}% | L/P Total: {total_lp:+.2f} | ROI Geral: {roi_geral:+.1f}%"
+    analise = analise_colunar.analisar_padroes(tabela)
     
     print(f"\nDEBUG: === ANALISE CONCLUIDA ===", file=sys.stderr)
-    print(f"DEBUG: Resumo: {resumo}", file=sys.stderr)
-    print(f"DEBUG: Total de insights: {len(insights)}", file=sys.stderr)
-    print(f"DEBUG: Total de recomendações: {len(recomendacoes)}", file=sys.stderr)
+    print(f"DEBUG: Resumo: {analise['resumo']}", file=sys.stderr)
+    print(f"DEBUG: Total de insights: {len(analise['insights'])}", file=sys.stderr)
+    print(f"DEBUG: Total de recomendações: {len(analise['recomendacoes'])}", file=sys.stderr)
     
-    return {
-        'resumo': resumo,
-        'insights': insights,
-        'recomendacoes': recomendacoes
-    }
+    return analise
 
 def gerar_pagina_analise():
     """Gera pagina HTML com analise dos jogos salvos"""
@@ -2670,7 +1865,7 @@ def gerar_pagina_analise():
                 <a href="http://localhost:8000/analise_salvos.html" class="nav-link">Análise Salvos</a>
                 <a href="http://localhost:5001/backtest.html" class="nav-link">Backtest</a>
                 <a href="http://localhost:5001/backtest_salvos.html" class="nav-link">Backtests Salvos</a>
-                <a href="http://localhost:5001/backtest_resumo_entradas.html" class="nav-link">Resumo Entradas</a>
+                <a href="http://localhost:5002/backtest_resumo_entradas.html" class="nav-link">Resumo Entradas</a>
             </div>
         </div>
         <div class="ai-panel">
@@ -8,6 +8,10 @@ import os
 import json
 from pathlib import Path
 
+from leitor_backtest import iterar_entradas, resposta_em_streaming
+from servidor_wsgi import aquecer_analise_backtest, com_tempo_limite, servir
+from fila_tarefas import fila, resposta_enfileirada, resposta_tarefa
+
 # Configurar stdout/stderr para UTF-8
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
@@ -32,6 +36,34 @@ def aplicar_desconto_lucro(lp):
     except (ValueError, TypeError):
         return 0.0
 
+def _mapear_entrada_backtest(jogo):
+    """Mapeia uma entrada do backtest acumulado para o formato esperado pelo HTML, com desconto aplicado"""
+    return {
+        'data': jogo.get('data', ''),  # Pode estar vazio no JSON original
+        'liga': jogo.get('liga', 'ARG'),
+        'casa': jogo.get('home', 'Unknown'),
+        'visitante': jogo.get('away', 'Unknown'),
+        'gc': jogo.get('fthg', 0),  # Full Time Home Goals
+        'gv': jogo.get('ftag', 0),  # Full Time Away Goals
+        'odd_casa': jogo.get('b365h', jogo.get('odd_home_calc', 0)),  # Bet365 Home ou odd calculada
+        'odd_visitante': jogo.get('b365a', jogo.get('odd_away_calc', 0)),  # Bet365 Away
+        'xg_casa': jogo.get('xgh', 0),  # xG Home
+        'xg_visitante': jogo.get('xga', 0),  # xG Away
+        'dxg': jogo.get('dxg', 'EQ'),  # Diferença xG
+        'entrada': jogo.get('entrada', 'HOME'),
+        'lp': aplicar_desconto_lucro(jogo.get('lp', 0)),  # Lucro com desconto aplicado
+        'temporada': jogo.get('temporada', '2024-25')
+    }
+
+def _aplicar_desconto_jogo(jogo):
+    """Copia um jogo salvo aplicando o desconto ao campo LP ou similarmente nomeado"""
+    jogo_copia = jogo.copy()
+    if 'LP' in jogo_copia:
+        jogo_copia['LP'] = aplicar_desconto_lucro(jogo_copia.get('LP', 0))
+    elif 'lp' in jogo_copia:
+        jogo_copia['lp'] = aplicar_desconto_lucro(jogo_copia.get('lp', 0))
+    return jogo_copia
+
 app = Flask(__name__, static_folder=str(FIXTURES_DIR), static_url_path='')
 
 # Configurar CORS manualmente
@@ -70,6 +102,11 @@ def serve_files(filepath):
     # Se não encontrar, retornar 404
     return jsonify({'error': f'Arquivo não encontrado: {filepath}'}), 404
 
+@app.route('/api/health', methods=['GET'])
+def health():
+    """Prova de prontidão usada pelo supervisor (iniciar_todos_servidores.py)"""
+    return jsonify({'status': 'ok', 'servidor': 'servidor_api'}), 200
+
 @app.route('/api/salvar_jogo', methods=['POST'])
 def salvar_jogo_api():
     """Endpoint para salvar um jogo"""
@@ -319,38 +356,9 @@ def carregar_backtest_acumulado_api():
         if not backtest_file.exists():
             return jsonify({'success': True, 'entradas': [], 'message': 'Arquivo não encontrado'}), 200
 
-        with open(backtest_file, 'r', encoding='utf-8') as f:
-            dados = json.load(f)
-
-        # Mapear nomes de campos do JSON para o formato esperado pelo HTML e aplicar desconto
-        dados_mapeados = []
-        for jogo in dados:
-            lp_original = float(jogo.get('lp', 0))
-            lp_com_desconto = aplicar_desconto_lucro(lp_original)
-            
-            jogo_mapeado = {
-                'data': jogo.get('data', ''),  # Pode estar vazio no JSON original
-                'liga': jogo.get('liga', 'ARG'),
-                'casa': jogo.get('home', 'Unknown'),
-                'visitante': jogo.get('away', 'Unknown'),
-                'gc': jogo.get('fthg', 0),  # Full Time Home Goals
-                'gv': jogo.get('ftag', 0),  # Full Time Away Goals
-                'odd_casa': jogo.get('b365h', jogo.get('odd_home_calc', 0)),  # Bet365 Home ou odd calculada
-                'odd_visitante': jogo.get('b365a', jogo.get('odd_away_calc', 0)),  # Bet365 Away
-                'xg_casa': jogo.get('xgh', 0),  # xG Home
-                'xg_visitante': jogo.get('xga', 0),  # xG Away
-                'dxg': jogo.get('dxg', 'EQ'),  # Diferença xG
-                'entrada': jogo.get('entrada', 'HOME'),
-                'lp': lp_com_desconto,  # Lucro com desconto aplicado
-                'temporada': jogo.get('temporada', '2024-25')
-            }
-            dados_mapeados.append(jogo_mapeado)
-
-        return jsonify({
-            'success': True,
-            'entradas': dados_mapeados,
-            'total': len(dados_mapeados)
-        }), 200
+        # Remapeamento + desconto item a item: nada é montado inteiro em memória
+        entradas = (_mapear_entrada_backtest(jogo) for jogo in iterar_entradas(backtest_file))
+        return resposta_em_streaming(entradas, 'entradas', request.args)
     except Exception as e:
         print(f"DEBUG API: Erro ao carregar backtest acumulado: {e}", flush=True)
         import traceback
@@ -358,6 +366,7 @@ def carregar_backtest_acumulado_api():
         return jsonify({'success': False, 'message': str(e)}), 500
 
 @app.route('/api/analisar_ia', methods=['POST'])
+@com_tempo_limite(30)
 def analisar_ia_api():
     """Endpoint de análise DxG simplificada de jogos salvos"""
     print(">>> ENDPOINT /api/analisar_ia CHAMADO <<<", flush=True)
@@ -403,31 +412,39 @@ def analisar_padroes_jogos_api():
     """Endpoint para analisar padroes de JOGOS SALVOS (fixtures) com IA"""
     return jsonify({'debug': 'OK'}), 200
 
+def _analisar_backtest_salvos_tarefa(salvamento, total_dados):
+    """Análise de backtests salvos (roda na fila de tarefas)"""
+    print(f"DEBUG API: Salvamento: {salvamento}, Total de entradas: {total_dados}", flush=True)
+
+    # Importar e executar função diretamente
+    from salvar_jogo import analisar_padroes_ia
+
+    print("DEBUG API: Executando análise de backtest salvo...", flush=True)
+    # A função vai ler automaticamente de fixtures/backtest_acumulado.json
+    analise = analisar_padroes_ia()
+
+    if analise:
+        print(f"DEBUG API: Análise de backtest completa!", flush=True)
+        return {'success': True, 'data': analise}
+    print("DEBUG API: Análise retornou None", flush=True)
+    return {'success': False, 'message': 'Nenhum dado disponível para análise'}
+
 @app.route('/api/analisar_padroes_backtest', methods=['POST'])
 def analisar_padroes_backtest_api():
-    """Endpoint para analisar padrões de BACKTESTS SALVOS com IA"""
+    """
+    Enfileira a análise de padrões de BACKTESTS SALVOS com IA.
+    Responde 202 com o id da tarefa; resultado em /api/jobs/<id>.
+    """
     try:
         print("DEBUG API: Iniciando análise de BACKTESTS SALVOS com IA...", flush=True)
         
-        data = request.get_json()
+        data = request.get_json(silent=True)
         salvamento = data.get('salvamento', '') if data else ''
         dados = data.get('dados', []) if data else []
-        
-        print(f"DEBUG API: Salvamento: {salvamento}, Total de entradas: {len(dados)}", flush=True)
-        
-        # Importar e executar função diretamente
-        from salvar_jogo import analisar_padroes_ia
-        
-        print("DEBUG API: Executando análise de backtest salvo...", flush=True)
-        # A função vai ler automaticamente de fixtures/backtest_acumulado.json
-        analise = analisar_padroes_ia()
-        
-        if analise:
-            print(f"DEBUG API: Análise de backtest completa!", flush=True)
-            return jsonify({'success': True, 'data': analise}), 200
-        else:
-            print("DEBUG API: Análise retornou None", flush=True)
-            return jsonify({'success': False, 'message': 'Nenhum dado disponível para análise'}), 400
+
+        tarefa, coalescida = fila.enviar('analisar_padroes_backtest', _analisar_backtest_salvos_tarefa,
+                                         salvamento, len(dados), chave='analisar_padroes_backtest')
+        return resposta_enfileirada(tarefa, coalescida)
             
     except Exception as e:
         print(f"DEBUG API: Exception na análise de backtest: {e}", flush=True)
@@ -435,15 +452,11 @@ def analisar_padroes_backtest_api():
         traceback.print_exc()
         return jsonify({'success': False, 'message': str(e)}), 500
 
-@app.route('/api/atualizar_proxima_rodada', methods=['POST'])
-def atualizar_proxima_rodada():
-    """
-    Endpoint que executa o script buscar_proxima_rodada.py para atualizar dados
-    """
+def _buscar_proxima_rodada_tarefa():
+    """Executa buscar_proxima_rodada.py (roda na fila de tarefas)"""
+    print("Iniciando busca de dados da próxima rodada...")
+
     try:
-        print("Iniciando busca de dados da próxima rodada...")
-        
-        # Executar o script Python
         resultado = subprocess.run(
             [sys.executable, 'buscar_proxima_rodada.py'],
             cwd=BASE_DIR,
@@ -451,34 +464,41 @@ def atualizar_proxima_rodada():
             text=True,
             timeout=60
         )
-        
-        if resultado.returncode == 0:
-            # Script executado com sucesso
-            print("✓ Busca de dados concluída com sucesso")
-            print("stdout:", resultado.stdout)
-            return jsonify({
-                'success': True, 
-                'message': 'Dados da próxima rodada atualizados com sucesso!',
-                'output': resultado.stdout
-            })
-        else:
-            # Script retornou erro
-            error_msg = resultado.stderr or resultado.stdout or "Erro desconhecido"
-            print(f"✗ Erro ao executar buscar_proxima_rodada.py: {error_msg}")
-            return jsonify({
-                'success': False,
-                'message': 'Nenhum dado disponível no momento. Tente novamente em alguns instantes.',
-                'error': error_msg
-            }), 200
-            
     except subprocess.TimeoutExpired:
         print("✗ Timeout ao buscar dados da próxima rodada")
-        return jsonify({
-            'success': False,
-            'message': 'A busca demorou muito tempo. Tente novamente.'
-        }), 504
+        raise RuntimeError('A busca demorou muito tempo. Tente novamente.')
+
+    if resultado.returncode == 0:
+        # Script executado com sucesso
+        print("✓ Busca de dados concluída com sucesso")
+        print("stdout:", resultado.stdout)
+        return {
+            'success': True,
+            'message': 'Dados da próxima rodada atualizados com sucesso!',
+            'output': resultado.stdout
+        }
+
+    # Script retornou erro
+    error_msg = resultado.stderr or resultado.stdout or "Erro desconhecido"
+    print(f"✗ Erro ao executar buscar_proxima_rodada.py: {error_msg}")
+    return {
+        'success': False,
+        'message': 'Nenhum dado disponível no momento. Tente novamente em alguns instantes.',
+        'error': error_msg
+    }
+
+@app.route('/api/atualizar_proxima_rodada', methods=['POST'])
+def atualizar_proxima_rodada():
+    """
+    Enfileira a execução de buscar_proxima_rodada.py para atualizar dados.
+    Pedidos repetidos enquanto a busca roda recebem a mesma tarefa.
+    """
+    try:
+        tarefa, coalescida = fila.enviar('atualizar_proxima_rodada', _buscar_proxima_rodada_tarefa,
+                                         chave='atualizar_proxima_rodada')
+        return resposta_enfileirada(tarefa, coalescida)
     except Exception as e:
-        print(f"✗ Erro ao buscar dados da próxima rodada: {str(e)}")
+        print(f"✗ Erro ao enfileirar busca da próxima rodada: {str(e)}")
         import traceback
         traceback.print_exc()
         return jsonify({
@@ -486,6 +506,11 @@ def atualizar_proxima_rodada():
             'message': 'Erro ao buscar dados. Verifique se os dados estão disponíveis no football-data.'
         }), 500
 
+@app.route('/api/jobs/<id_tarefa>', methods=['GET'])
+def status_tarefa(id_tarefa):
+    """Estado e resultado de uma tarefa em segundo plano"""
+    return resposta_tarefa(id_tarefa)
+
 @app.route('/api/jogos_salvos', methods=['GET', 'OPTIONS'])
 def carregar_jogos_salvos_api():
     """Endpoint para carregar jogos salvos com desconto de 4,5% aplicado"""
@@ -497,29 +522,8 @@ def carregar_jogos_salvos_api():
         if not jogos_file.exists():
             return jsonify({'success': True, 'jogos': [], 'message': 'Arquivo não encontrado'}), 200
 
-        with open(jogos_file, 'r', encoding='utf-8') as f:
-            jogos = json.load(f)
-
-        # Aplicar desconto de 4,5% em todos os lucros
-        jogos_com_desconto = []
-        for jogo in jogos:
-            jogo_copia = jogo.copy()
-            
-            # Aplicar desconto ao campo LP ou similarmente nomeado
-            if 'LP' in jogo_copia:
-                lp_original = float(jogo_copia.get('LP', 0))
-                jogo_copia['LP'] = aplicar_desconto_lucro(lp_original)
-            elif 'lp' in jogo_copia:
-                lp_original = float(jogo_copia.get('lp', 0))
-                jogo_copia['lp'] = aplicar_desconto_lucro(lp_original)
-            
-            jogos_com_desconto.append(jogo_copia)
-
-        return jsonify({
-            'success': True,
-            'jogos': jogos_com_desconto,
-            'total': len(jogos_com_desconto)
-        }), 200
+        jogos = (_aplicar_desconto_jogo(jogo) for jogo in iterar_entradas(jogos_file))
+        return resposta_em_streaming(jogos, 'jogos', request.args)
     except Exception as e:
         print(f"DEBUG API: Erro ao carregar jogos salvos: {e}", flush=True)
         import traceback
@@ -528,7 +532,8 @@ def carregar_jogos_salvos_api():
 
 if __name__ == '__main__':
     print("="*80)
-    print("Servidor API iniciado em http://localhost:8000")
+    porta = int(os.environ.get('PORTA', 8000))
+    print(f"Servidor API iniciado em http://localhost:{porta}")
     print("Endpoints disponíveis:")
     print("  POST /api/salvar_jogo - Salvar um jogo")
     print("  POST /api/atualizar_resultado - Atualizar resultado de um jogo")
@@ -537,4 +542,4 @@ if __name__ == '__main__':
     print("  POST /api/analisar_padroes_backtest - Analisar padrões de backtests")
     print("  POST /api/atualizar_proxima_rodada - Buscar dados da próxima rodada")
     print("="*80)
-    app.run(debug=False, port=8000)
+    servir(app, porta, 'servidor_api', aquecer=aquecer_analise_backtest)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Modo de produção para os servidores Flask
+
+Os servidores chamam servir(app, porta, ...) no lugar de app.run(...):
+- modo 'dev' (padrão): servidor de desenvolvimento do Flask, como antes
+- modo 'producao' (--producao ou MODO_SERVIDOR=producao):
+    * gunicorn (Linux/macOS): vários workers gthread, com a aplicação e os
+      caches de leitura carregados antes do fork (preload) e compartilhados
+    * waitress (Windows ou sem gunicorn): um processo com pool de threads
+    * sem nenhum dos dois: Flask com threads, com aviso
+
+Variáveis de ambiente: WORKERS (padrão: até 4 conforme CPUs), THREADS (8)
+e TEMPO_LIMITE_WORKER (120s, só gunicorn).
+
+com_tempo_limite(segundos) limita o tempo de um endpoint: a requisição
+recebe 504 quando o limite estoura, sem prender o worker.
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as TempoEsgotado
+from functools import wraps
+
+from flask import copy_current_request_context, jsonify
+
+MODOS = ('dev', 'producao')
+
+# Pool compartilhado pelos endpoints com tempo limite
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def modo_servidor():
+    """'producao' se pedido por --producao ou MODO_SERVIDOR, senão 'dev'"""
+    if '--producao' in sys.argv:
+        return 'producao'
+    modo = os.environ.get('MODO_SERVIDOR', 'dev').strip().lower()
+    return modo if modo in MODOS else 'dev'
+
+
+def _num_workers():
+    padrao = min(4, os.cpu_count() or 1)
+    return int(os.environ.get('WORKERS', padrao))
+
+
+def _num_threads():
+    return int(os.environ.get('THREADS', 8))
+
+
+def _instalado(modulo):
+    return importlib.util.find_spec(modulo) is not None
+
+
+def _obter_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_num_threads(), thread_name_prefix='endpoint')
+        return _executor
+
+
+def com_tempo_limite(segundos):
+    """
+    Decorador de endpoint: executa a view em um pool de threads e devolve 504
+    se ela não terminar em `segundos`. O cálculo continua em segundo plano
+    (e preenche os caches memorizados), então a próxima chamada tende a ser rápida.
+    """
+    def decorador(view):
+        @wraps(view)
+        def envolvida(*args, **kwargs):
+            tarefa = _obter_executor().submit(copy_current_request_context(view), *args, **kwargs)
+            try:
+                return tarefa.result(timeout=segundos)
+            except TempoEsgotado:
+                print(f"[WSGI] Tempo limite de {segundos}s excedido em {view.__name__}", flush=True)
+                return jsonify({
+                    'success': False,
+                    'message': f'Tempo limite de {segundos}s excedido. Tente novamente em instantes.',
+                }), 504
+        return envolvida
+    return decorador
+
+
+def _servir_gunicorn(app, host, porta, aquecer, workers):
+    from gunicorn.app.base import BaseApplication
+
+    class Aplicacao(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', f'{host}:{porta}')
+            self.cfg.set('workers', workers)
+            self.cfg.set('threads', _num_threads())
+            self.cfg.set('worker_class', 'gthread')
+            self.cfg.set('preload_app', True)
+            self.cfg.set('timeout', int(os.environ.get('TEMPO_LIMITE_WORKER', 120)))
+            self.cfg.set('accesslog', '-')
+
+        def load(self):
+            # preload_app: roda uma vez no processo mestre, antes do fork
+            if aquecer:
+                aquecer()
+            return app
+
+    Aplicacao().run()
+
+
+def _servir_waitress(app, host, porta, aquecer):
+    from waitress import serve
+
+    if aquecer:
+        aquecer()
+    serve(app, host=host, port=porta, threads=_num_threads())
+
+
+def servir(app, porta, nome, host='127.0.0.1', aquecer=None, workers=None):
+    """
+    Sobe o app no modo escolhido.
+
+    aquecer: função opcional que carrega caches de leitura antes de atender
+    (no gunicorn roda antes do fork, então os workers compartilham o resultado).
+    workers: força o número de processos (1 para apps com estado em memória).
+    """
+    workers = workers or _num_workers()
+    if modo_servidor() != 'producao':
+        app.run(debug=False, host=host, port=porta, threaded=True)
+        return
+
+    if os.name != 'nt' and _instalado('gunicorn'):
+        print(f"[WSGI] {nome}: gunicorn com {workers} workers x {_num_threads()} threads "
+              f"em http://{host}:{porta}", flush=True)
+        _servir_gunicorn(app, host, porta, aquecer, workers)
+        return
+
+    if _instalado('waitress'):
+        print(f"[WSGI] {nome}: waitress com {_num_threads()} threads em http://{host}:{porta}", flush=True)
+        _servir_waitress(app, host, porta, aquecer)
+        return
+
+    print(f"[WSGI] ⚠️  {nome}: gunicorn/waitress não instalados; usando o servidor do Flask com threads "
+          f"(pip install gunicorn ou waitress)", flush=True)
+    if aquecer:
+        aquecer()
+    app.run(debug=False, host=host, port=porta, threaded=True)
+
+
+def aquecer_analise_backtest():
+    """Pré-carrega a análise DxG do backtest acumulado (cache por versão do arquivo)"""
+    from analise_colunar import analisar_backtest_dxg_arquivo
+
+    try:
+        if analisar_backtest_dxg_arquivo() is not None:
+            print("[WSGI] Cache da análise do backtest carregado", flush=True)
+    except Exception as e:
+        print(f"[WSGI] ⚠️  Não foi possível pré-carregar a análise do backtest: {e}", flush=True)
@@ -0,0 +1,439 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Simulador Monte Carlo de Banca
+Reproduz as entradas reais do backtest acumulado sob as políticas de stake do
+StakeSizer e mede o risco de cada uma.
+
+Políticas comparadas:
+- adaptativo: StakeSizer.stake_sizing_adaptativo (Kelly fracionado com limites mín/máx)
+- faixa_odd:  StakeSizer.stake_por_faixa_odd (% do bankroll por faixa de odd)
+- flat:       stake fixo (% do bankroll inicial)
+
+Modos:
+- histórico: as entradas na ordem real (um único caminho)
+- bootstrap: N caminhos reamostrando as entradas com reposição, todos
+  simulados em paralelo como arrays NumPy
+- sequencial: banca única percorrendo todas as ligas em ordem cronológica,
+  com curva de capital e pico de drawdown por combinação (liga, dxg)
+
+Uso:
+    python simulador_banca.py [caminhos] [horizonte] [--validadas]
+    python simulador_banca.py --sequencial [adaptativo|faixa_odd|flat] [--validadas]
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from leitor_backtest import iterar_backtest_acumulado
+from stake_sizing import StakeSizer
+
+COMISSAO = 0.045
+POLITICAS = ('adaptativo', 'faixa_odd', 'flat')
+QUANTIS = (0.05, 0.25, 0.50, 0.75, 0.95)
+
+
+def carregar_apostas(caminho=None, somente_validadas=False):
+    """
+    Lê as entradas do backtest acumulado e devolve arrays NumPy:
+    odd apostada, retorno líquido por unidade (com comissão), confianças CF
+    e os campos usados para ordenar e agrupar (liga, dxg, temporada, data, ordem).
+    """
+    combinacoes = None
+    if somente_validadas:
+        from validador_combinacoes import carregar_combinacoes_validadas
+        combinacoes = carregar_combinacoes_validadas()
+
+    odds, lps, cfs_h, cfs_a = [], [], [], []
+    ligas, dxgs, temporadas, datas, ordens = [], [], [], [], []
+    for ordem, entrada in enumerate(iterar_backtest_acumulado(caminho)):
+        tipo = str(entrada.get('entrada', '')).upper()
+        if combinacoes is not None and (entrada.get('liga'), tipo, entrada.get('dxg')) not in combinacoes:
+            continue
+
+        if tipo == 'AWAY':
+            odd = entrada.get('b365a', entrada.get('odd_visitante', entrada.get('odd_away_calc')))
+        else:
+            odd = entrada.get('b365h', entrada.get('odd_casa', entrada.get('odd_home_calc')))
+        try:
+            odd = float(odd)
+            lp = float(entrada.get('lp', 0) or 0)
+        except (TypeError, ValueError):
+            continue
+        if odd <= 1.0:
+            continue
+
+        odds.append(odd)
+        lps.append(lp)
+        cfs_h.append(float(entrada.get('cfxgh', entrada.get('CFxGH', 0.8)) or 0.8))
+        cfs_a.append(float(entrada.get('cfxga', entrada.get('CFxGA', 0.8)) or 0.8))
+        ligas.append(entrada.get('liga', 'Desconhecida'))
+        dxgs.append(entrada.get('dxg', 'EQ'))
+        temporadas.append(str(entrada.get('temporada', '')))
+        datas.append(entrada.get('date', entrada.get('data', '')) or '')
+        ordens.append(ordem)
+
+    lp = np.asarray(lps, dtype=np.float64)
+    # Retorno por unidade apostada: lucro com desconto de 4,5% ou perda de 1 unidade
+    retorno = np.where(lp > 0, lp * (1 - COMISSAO), lp)
+    return {
+        'odd': np.asarray(odds, dtype=np.float64),
+        'retorno': retorno,
+        'cfxgh': np.asarray(cfs_h, dtype=np.float64),
+        'cfxga': np.asarray(cfs_a, dtype=np.float64),
+        'liga': np.asarray(ligas, dtype=object),
+        'dxg': np.asarray(dxgs, dtype=object),
+        'temporada': np.asarray(temporadas, dtype=object),
+        'data': np.asarray(datas, dtype=object),
+        'ordem': np.asarray(ordens, dtype=np.int64),
+    }
+
+
+def parametros_stake(apostas, sizer, pct_flat=0.02):
+    """
+    Converte cada política do StakeSizer em stake = clip(fracao × banca, minimo, maximo).
+
+    As frações saem do próprio StakeSizer (chamado uma vez por combinação
+    distinta de odd/CF, com bankroll 1), então a simulação segue exatamente
+    as mesmas regras usadas no cálculo de stake de uma aposta.
+
+    Returns:
+        dict: politica -> (fracao[n_apostas], minimo, maximo)
+    """
+    chaves = np.stack([apostas['odd'], apostas['cfxgh'], apostas['cfxga']], axis=1)
+    unicas, inverso = np.unique(chaves, axis=0, return_inverse=True)
+    inverso = inverso.ravel()
+
+    frac_adaptativo = np.empty(len(unicas))
+    frac_faixa = np.empty(len(unicas))
+    for i, (odd, cfh, cfa) in enumerate(unicas):
+        frac_adaptativo[i] = sizer.stake_sizing_adaptativo(odd, cfh, cfa, bankroll_atual=1.0)['kelly_fracionado']
+        frac_faixa[i] = sizer.stake_por_faixa_odd(odd, cfh, cfa, bankroll_atual=1.0)['pct_ajustado'] / 100
+
+    n = len(apostas['odd'])
+    return {
+        'adaptativo': (frac_adaptativo[inverso], sizer.stake_min, sizer.stake_max),
+        'faixa_odd': (frac_faixa[inverso], 0.0, np.inf),
+        'flat': (np.zeros(n), sizer.bankroll * pct_flat, sizer.bankroll * pct_flat),
+    }
+
+
+def _stake(fracao, banca, minimo, maximo):
+    """
+    Regra única de stake e ruína (simular e _curva_banca):
+    clip(fracao × banca, minimo, maximo), nunca mais do que há na banca.
+    Com a banca zerada o stake é zero e a banca fica em zero.
+    """
+    return np.minimum(np.minimum(np.maximum(fracao * banca, minimo), maximo), banca)
+
+
+def simular(apostas, params, bankroll_inicial, indices):
+    """
+    Simula todos os caminhos em paralelo.
+
+    indices: matriz (n_passos, n_caminhos) com a entrada usada em cada passo.
+    Cada passo é vetorizado sobre os caminhos; só a dependência temporal da
+    banca (stake depende da banca atual) fica no laço.
+
+    Returns:
+        dict: politica -> {'final', 'max_drawdown', 'minimo'} (arrays por caminho)
+    """
+    n_passos, n_caminhos = indices.shape
+    retorno = apostas['retorno']
+    resultados = {}
+
+    for politica, (fracao, minimo, maximo) in params.items():
+        banca = np.full(n_caminhos, float(bankroll_inicial))
+        pico = banca.copy()
+        max_dd = np.zeros(n_caminhos)
+        menor = banca.copy()
+
+        for passo in range(n_passos):
+            idx = indices[passo]
+            banca += _stake(fracao[idx], banca, minimo, maximo) * retorno[idx]
+            np.maximum(pico, banca, out=pico)
+            np.maximum(max_dd, (pico - banca) / pico, out=max_dd)
+            np.minimum(menor, banca, out=menor)
+
+        resultados[politica] = {'final': banca, 'max_drawdown': max_dd, 'minimo': menor}
+
+    return resultados
+
+
+def resumir(resultados, sizer):
+    """Distribuição de drawdown, probabilidade de ruína e quantis da banca final"""
+    resumo = {}
+    limite_dd = sizer.drawdown_limit / sizer.bankroll
+    for politica, r in resultados.items():
+        resumo[politica] = {
+            'banca_final_media': float(r['final'].mean()),
+            'banca_final_quantis': {q: float(v) for q, v in zip(QUANTIS, np.quantile(r['final'], QUANTIS))},
+            'drawdown_quantis': {q: float(v) for q, v in zip(QUANTIS, np.quantile(r['max_drawdown'], QUANTIS))},
+            'prob_lucro': float((r['final'] > sizer.bankroll).mean()),
+            # Ruína: banca abaixo do stake mínimo (não dá mais para apostar)
+            'prob_ruina': float((r['minimo'] < sizer.stake_min).mean()),
+            # Atingiu o limite de drawdown do StakeSizer (30%)
+            'prob_drawdown_limite': float((r['max_drawdown'] >= limite_dd).mean()),
+        }
+    return resumo
+
+
+def simular_monte_carlo(n_caminhos=5000, horizonte=1000, bankroll=1000, kelly_fraction=0.25,
+                        pct_flat=0.02, somente_validadas=False, semente=None, caminho=None):
+    """
+    Executa o histórico real e o bootstrap para as três políticas.
+
+    Returns:
+        dict: {'n_apostas', 'historico', 'bootstrap', 'tempo'}
+    """
+    inicio = time.time()
+    apostas = carregar_apostas(caminho, somente_validadas)
+    n_apostas = len(apostas['odd'])
+    if n_apostas == 0:
+        raise ValueError("Nenhuma entrada disponível no backtest acumulado")
+
+    sizer = StakeSizer(bankroll=bankroll, kelly_fraction=kelly_fraction)
+    params = parametros_stake(apostas, sizer, pct_flat)
+
+    # Histórico: todas as entradas na ordem real, um caminho
+    historico = simular(apostas, params, bankroll, np.arange(n_apostas).reshape(-1, 1))
+
+    # Bootstrap: horizonte apostas por caminho, reamostradas com reposição
+    rng = np.random.default_rng(semente)
+    indices = rng.integers(0, n_apostas, size=(horizonte, n_caminhos), dtype=np.int32)
+    bootstrap = simular(apostas, params, bankroll, indices)
+
+    return {
+        'n_apostas': n_apostas,
+        'historico': {p: {k: float(v[0]) for k, v in r.items()} for p, r in historico.items()},
+        'bootstrap': resumir(bootstrap, sizer),
+        'n_caminhos': n_caminhos,
+        'horizonte': horizonte,
+        'bankroll': bankroll,
+        'tempo': time.time() - inicio,
+    }
+
+
+# ===== Backtest sequencial de banca (curva de capital) =====
+
+def _posicao_no_tempo(apostas):
+    """
+    Chave cronológica (em anos) de cada entrada, comparável entre ligas.
+
+    Usa a data do jogo quando existe. Os resultados do motor não guardam a
+    data, então a posição da entrada dentro do arquivo da temporada (que segue
+    a ordem das rodadas) é espalhada pelo período típico da temporada:
+    fev-nov para temporadas de ano único ('2024'), ago-mai para '2024-2025'.
+    """
+    import pandas as pd
+    from datas_ligas import converter_datas
+    from esquema_ligas import FORMATOS_DATA
+
+    df = pd.DataFrame({
+        'liga': apostas['liga'],
+        'temporada': apostas['temporada'],
+        'ordem': apostas['ordem'],
+    })
+    ano_inicio = pd.to_numeric(df['temporada'].str.slice(0, 4), errors='coerce').fillna(0)
+    europeia = df['temporada'].str.contains('-', regex=False)
+    inicio = ano_inicio + np.where(europeia, 0.6, 0.15)
+
+    grupo = df.groupby(['liga', 'temporada'], sort=False)['ordem']
+    posicao = grupo.rank(method='first') - 1
+    relativa = posicao / grupo.transform('size').clip(lower=1)
+    chave = (inicio + relativa * 0.8).to_numpy()
+
+    # As entradas vêm de vários arquivos: todos os formatos aceitos, em ordem
+    datas = converter_datas(apostas['data'], FORMATOS_DATA)
+    com_data = datas.notna().to_numpy()
+    if com_data.any():
+        d = datas[com_data]
+        chave[com_data] = (d.dt.year + (d.dt.dayofyear - 1) / 366).to_numpy()
+    return chave
+
+
+def _curva_banca(fracao, minimo, maximo, retorno, bankroll):
+    """
+    Banca e stake de cada aposta, com o stake e a ruína de _stake (a mesma
+    regra de simular).
+
+    Políticas puramente proporcionais viram um cumprod (o stake nunca passa
+    da banca). Stakes fixos são um cumsum enquanto a banca antes da aposta
+    cobre o stake; a partir daí, e na política com limites absolutos
+    (adaptativo), a sequência é percorrida aposta a aposta.
+    """
+    if minimo == 0 and np.isinf(maximo):
+        proporcao = np.clip(fracao, 0.0, 1.0)
+        banca = bankroll * np.cumprod(1 + proporcao * retorno)
+        anterior = np.concatenate(([bankroll], banca[:-1]))
+        return banca, proporcao * anterior
+
+    banca = np.empty(len(retorno))
+    stake = np.empty(len(retorno))
+    inicio = 0
+    atual = float(bankroll)
+
+    if not fracao.any() and minimo == maximo:
+        acumulada = bankroll + np.cumsum(minimo * retorno)
+        anterior = np.concatenate(([bankroll], acumulada[:-1]))
+        falta = np.flatnonzero(anterior < minimo)
+        inicio = int(falta[0]) if len(falta) else len(retorno)
+        banca[:inicio] = acumulada[:inicio]
+        stake[:inicio] = minimo
+        if inicio:
+            atual = float(acumulada[inicio - 1])
+
+    for i in range(inicio, len(retorno)):
+        s = float(_stake(fracao[i], atual, minimo, maximo))
+        atual += s * retorno[i]
+        stake[i] = s
+        banca[i] = atual
+    return banca, stake
+
+
+def backtest_banca_sequencial(politica='adaptativo', bankroll=1000, kelly_fraction=0.25, pct_flat=0.02,
+                              somente_validadas=False, caminho=None):
+    """
+    Percorre todas as entradas do backtest acumulado em ordem cronológica
+    (todas as ligas juntas) com uma banca única, stakes compostos pela
+    política escolhida do StakeSizer e desconto de 4,5% nos lucros.
+
+    Returns:
+        tuple: (curva, por_combinacao, resumo)
+            curva: DataFrame com uma linha por aposta (stake, lucro, banca,
+                   curva e drawdown da combinação liga/dxg)
+            por_combinacao: DataFrame por (liga, dxg) com lucro e pico de drawdown
+            resumo: dict com banca final e drawdown máximo da banca
+    """
+    import pandas as pd
+
+    if politica not in POLITICAS:
+        raise ValueError(f"Política desconhecida: {politica} (use {', '.join(POLITICAS)})")
+
+    apostas = carregar_apostas(caminho, somente_validadas)
+    if len(apostas['odd']) == 0:
+        raise ValueError("Nenhuma entrada disponível no backtest acumulado")
+
+    sizer = StakeSizer(bankroll=bankroll, kelly_fraction=kelly_fraction)
+    fracao, minimo, maximo = parametros_stake(apostas, sizer, pct_flat)[politica]
+
+    # Uma ordenação estável para todas as ligas
+    ordem = np.argsort(_posicao_no_tempo(apostas), kind='stable')
+    retorno = apostas['retorno'][ordem]
+    banca, stake = _curva_banca(fracao[ordem], minimo, maximo, retorno, bankroll)
+
+    curva = pd.DataFrame({
+        'liga': apostas['liga'][ordem],
+        'temporada': apostas['temporada'][ordem],
+        'dxg': apostas['dxg'][ordem],
+        'odd': apostas['odd'][ordem],
+        'stake': stake,
+        'lucro': stake * retorno,
+        'banca': banca,
+    })
+
+    # Curva de capital e drawdown por combinação, vetorizados com groupby
+    grupo = curva.groupby(['liga', 'dxg'], sort=False)
+    curva['curva_combinacao'] = grupo['lucro'].cumsum()
+    pico = curva.groupby(['liga', 'dxg'], sort=False)['curva_combinacao'].cummax().clip(lower=0)
+    curva['drawdown_combinacao'] = pico - curva['curva_combinacao']
+
+    por_combinacao = curva.groupby(['liga', 'dxg'], sort=True).agg(
+        apostas=('lucro', 'size'),
+        stake_total=('stake', 'sum'),
+        lucro=('lucro', 'sum'),
+        pico_drawdown=('drawdown_combinacao', 'max'),
+    ).reset_index()
+    por_combinacao['roi'] = np.where(por_combinacao['stake_total'] > 0,
+                                     por_combinacao['lucro'] / por_combinacao['stake_total'] * 100, 0.0)
+    por_combinacao['pico_drawdown_pct_banca'] = por_combinacao['pico_drawdown'] / bankroll * 100
+
+    pico_banca = np.maximum.accumulate(np.concatenate(([bankroll], banca)))[1:]
+    resumo = {
+        'politica': politica,
+        'apostas': int(len(curva)),
+        'bankroll_inicial': float(bankroll),
+        'banca_final': float(banca[-1]),
+        'banca_minima': float(banca.min()),
+        'max_drawdown_pct': float(((pico_banca - banca) / pico_banca).max() * 100),
+        'stake_total': float(stake.sum()),
+        'lucro': float(banca[-1] - bankroll),
+    }
+    return curva, por_combinacao, resumo
+
+
+def imprimir_backtest_banca(curva, por_combinacao, resumo, top=15):
+    """Exibe o resultado de backtest_banca_sequencial"""
+    print("=" * 80)
+    print(f"BACKTEST SEQUENCIAL DE BANCA - política: {resumo['politica']}")
+    print("=" * 80)
+    print(f"Apostas: {resumo['apostas']:,} | Stake total: R$ {resumo['stake_total']:,.2f}")
+    print(f"Banca: R$ {resumo['bankroll_inicial']:,.2f} → R$ {resumo['banca_final']:,.2f} "
+          f"(mínima R$ {resumo['banca_minima']:,.2f})")
+    print(f"Drawdown máximo da banca: {resumo['max_drawdown_pct']:.1f}%")
+    print()
+    print(f"{'Liga':<6} {'DxG':<4} {'Apostas':>8} {'Stake':>12} {'Lucro':>12} {'ROI':>8} {'Pico DD':>12}")
+    print("-" * 80)
+    for _, c in por_combinacao.sort_values('lucro', ascending=False).head(top).iterrows():
+        print(f"{c['liga']:<6} {c['dxg']:<4} {c['apostas']:>8} R$ {c['stake_total']:>9,.2f} "
+              f"R$ {c['lucro']:>9,.2f} {c['roi']:>7.2f}% R$ {c['pico_drawdown']:>9,.2f}")
+    print(f"... {len(por_combinacao)} combinações liga/dxg no total")
+
+
+def main():
+    if '--sequencial' in sys.argv:
+        args = [a for a in sys.argv[1:] if not a.startswith('--')]
+        politica = args[0] if args else 'adaptativo'
+        curva, por_combinacao, resumo = backtest_banca_sequencial(
+            politica, somente_validadas='--validadas' in sys.argv)
+        imprimir_backtest_banca(curva, por_combinacao, resumo)
+        return
+
+    args = [a for a in sys.argv[1:] if not a.startswith('--')]
+    n_caminhos = int(args[0]) if len(args) > 0 else 5000
+    horizonte = int(args[1]) if len(args) > 1 else 1000
+    somente_validadas = '--validadas' in sys.argv
+
+    print("=" * 80)
+    print("SIMULADOR MONTE CARLO DE BANCA")
+    print("=" * 80)
+
+    r = simular_monte_carlo(n_caminhos=n_caminhos, horizonte=horizonte, somente_validadas=somente_validadas)
+
+    origem = "combinações validadas" if somente_validadas else "todas as entradas"
+    print(f"Entradas usadas: {r['n_apostas']:,} ({origem})")
+    print(f"Bankroll inicial: R$ {r['bankroll']:,.2f}")
+    print(f"Bootstrap: {r['n_caminhos']:,} caminhos x {r['horizonte']:,} apostas")
+    print()
+
+    print("-" * 80)
+    print("HISTÓRICO (ordem real das entradas)")
+    print("-" * 80)
+    print(f"{'Política':<12} {'Banca Final':>15} {'Banca Mínima':>15} {'Max Drawdown':>14}")
+    for politica in POLITICAS:
+        h = r['historico'][politica]
+        print(f"{politica:<12} R$ {h['final']:>12,.2f} R$ {h['minimo']:>12,.2f} {h['max_drawdown']*100:>13.1f}%")
+    print()
+
+    print("-" * 80)
+    print("BOOTSTRAP")
+    print("-" * 80)
+    for politica in POLITICAS:
+        b = r['bootstrap'][politica]
+        q = b['banca_final_quantis']
+        dd = b['drawdown_quantis']
+        print(f"{politica}:")
+        print(f"  Banca final  P5: R$ {q[0.05]:,.2f} | P25: R$ {q[0.25]:,.2f} | P50: R$ {q[0.5]:,.2f} | "
+              f"P75: R$ {q[0.75]:,.2f} | P95: R$ {q[0.95]:,.2f}")
+        print(f"  Drawdown     P50: {dd[0.5]*100:.1f}% | P75: {dd[0.75]*100:.1f}% | P95: {dd[0.95]*100:.1f}%")
+        print(f"  Prob. lucro: {b['prob_lucro']*100:.1f}% | Prob. drawdown >= 30%: {b['prob_drawdown_limite']*100:.1f}% | "
+              f"Prob. ruína: {b['prob_ruina']*100:.2f}%")
+        print()
+
+    print(f"Tempo total: {r['tempo']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -10,10 +10,13 @@ Características:
 - Ajuste pela confiança do modelo
 - Aplicação de fractional Kelly (segurança)
 - Limites mín/máx de stake
+- Cálculo em lote (rodada inteira) com Kelly simultâneo
 """
 
 import math
 
+import numpy as np
+
 class StakeSizer:
     """Calcula stake sizing usando Kelly Criterion adaptado"""
     
@@ -224,6 +227,84 @@ class StakeSizer:
             'roi_esperado_stake': stake * self.roi_medio
         }
     
+    def stake_sizing_lote(self, odds, cfxgh=0.8, cfxga=0.8, bankroll_atual=None, simultaneo=True):
+        """
+        Versão vetorizada de stake_sizing_adaptativo para uma rodada inteira
+
+        Com simultaneo=True as apostas da rodada dividem a mesma banca: cada
+        stake é dimensionado contra a banca que sobra depois das outras
+        apostas da rodada, s_i = f_i × (B - soma_{j≠i} s_j). A solução fechada é
+        s_i = g_i × B / (1 + G), com g_i = f_i / (1 - f_i) e G = soma(g_i);
+        para uma aposta isolada o resultado é o mesmo do Kelly individual.
+        Apostas com Kelly zero ficam com stake 0 e, se a soma passar da banca,
+        os stakes são reduzidos na mesma proporção.
+
+        Com simultaneo=False cada stake é o de stake_sizing_adaptativo
+        (inclusive o piso stake_min), sem limite para o total.
+
+        Args:
+            odds: Array/lista de odds das apostas da rodada
+            cfxgh: Coeficientes de confiança xG Home (array ou escalar)
+            cfxga: Coeficientes de confiança xG Away (array ou escalar)
+            bankroll_atual: Bankroll atual (default = self.bankroll)
+            simultaneo: Dividir a banca entre as apostas da rodada
+
+        Returns:
+            dict: Arrays NumPy com os mesmos campos de stake_sizing_adaptativo
+        """
+        if bankroll_atual is None:
+            bankroll_atual = self.bankroll
+
+        odds = np.asarray(odds, dtype=np.float64)
+        cfxgh = np.broadcast_to(np.asarray(cfxgh, dtype=np.float64), odds.shape)
+        cfxga = np.broadcast_to(np.asarray(cfxga, dtype=np.float64), odds.shape)
+
+        # 1-3. Probabilidade implícita ajustada pela confiança média (geométrica)
+        prob_implicita = 1 / odds
+        validos = (cfxgh > 0) & (cfxga > 0)
+        confianca_media = np.where(validos, np.sqrt(np.where(validos, cfxgh * cfxga, 1.0)), 0.5)
+        prob_ajustada = np.clip(prob_implicita + (confianca_media - 0.5) * 0.1, 0.1, 0.95)
+
+        # 4. Kelly com comissão de 4,5% (negativo = não apostar)
+        b_efetivo = (odds - 1) * (1 - 0.045)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            kelly = (b_efetivo * prob_ajustada - (1 - prob_ajustada)) / b_efetivo
+        kelly = np.where(np.isfinite(kelly) & (kelly > 0), kelly, 0.0)
+
+        # 5. Fractional Kelly
+        kelly_fracionado = kelly * self.kelly_fraction
+
+        # 6-7. Stake com limites mín/máx por aposta
+        if simultaneo:
+            # Dividindo a banca entre as apostas simultâneas; as que o Kelly
+            # rejeitou ficam sem stake (o piso não vale para elas) e, no
+            # total, a rodada nunca aposta mais do que a banca
+            g = kelly_fracionado / (1 - np.minimum(kelly_fracionado, 0.99))
+            stake = g * bankroll_atual / (1 + g.sum())
+            stake = np.where(kelly_fracionado > 0, np.clip(stake, self.stake_min, self.stake_max), 0.0)
+            total = stake.sum()
+            if total > bankroll_atual > 0:
+                stake = stake * (bankroll_atual / total)
+        else:
+            # Igual a stake_sizing_adaptativo, aposta por aposta
+            stake = np.clip(kelly_fracionado * bankroll_atual, self.stake_min, self.stake_max)
+
+        return {
+            'odd': odds,
+            'bankroll': bankroll_atual,
+            'prob_implicita': prob_implicita,
+            'confianca_cf': confianca_media,
+            'prob_ajustada': prob_ajustada,
+            'edge': self.roi_medio * prob_implicita,
+            'kelly_puro': kelly,
+            'kelly_fracionado': kelly_fracionado,
+            'stake': stake,
+            'roi_esperado_stake': stake * self.roi_medio,
+            'limite_min': self.stake_min,
+            'limite_max': self.stake_max,
+            'pct_bankroll': stake / bankroll_atual * 100
+        }
+    
     def _obter_faixa_odd(self, odd):
         """Retorna a faixa de odd em formato legível"""
         if odd < 1.5:
@@ -0,0 +1,275 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Tabela canônica de partidas por liga
+
+Os CSVs do football-data têm layouts diferentes (HomeTeam/Home, FTHG/HG,
+Season ou não, B365H/PSCH/AvgH...). A ingestão normaliza cada liga uma vez
+para a mesma tabela, ordenada por data:
+
+    liga, temporada, data, dia, home, away, id_home, id_away, gols_h, gols_a,
+    odd_h, odd_a, fonte_odds, prob_h, prob_a, CGH, CGA, VGH, VGA
+
+- data: convertida com os formatos explícitos do esquema (datas_ligas.py);
+  dia = dias desde 1970-01-01 (int32, SEM_DIA se vazia)
+- id_home/id_away: ids inteiros do dicionário de times da liga
+  (dicionario_times.py), guardado no índice junto com a tabela
+- odd_h/odd_a: o par odds_range do esquema do arquivo (o primeiro de
+  ODDS_PRIORIDADE presente no CSV), NaN nas linhas sem as duas odds válidas;
+  fonte_odds diz qual foi ('B365', 'B365C', 'PS', 'PSC', 'Max'...). O par
+  canônico é esse, escolhido por arquivo e não por linha: é o mesmo que o
+  BacktestEngine usa nas médias por faixa de odds, então a análise da
+  próxima rodada e o backtest leem a mesma população de odds
+- prob_h/prob_a = 1/odd (já calculadas)
+- CGH = 1/(odd_h*gols_h) (1 quando gols_h = 0), CGA idem; VGH = gols_h/odd_a,
+  VGA = gols_a/odd_h — mesmas fórmulas de adicionar_colunas_calculadas.py
+
+A tabela fica em dados_canonicos/<LIGA>.pkl (tipos preservados) e é refeita
+quando o CSV de origem muda (hash do conteúdo, via esquema_ligas).
+
+Uso:
+    python tabela_canonica.py            # (re)constrói todas as ligas
+    python tabela_canonica.py E0 BRA     # só as ligas informadas
+"""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from datas_ligas import converter_datas, dias_epoca
+from dicionario_times import DicionarioTimes
+from esquema_ligas import esquema_liga, hash_conteudo
+from assinatura_arquivos import assinatura_arquivo
+
+BASE_DIR = Path(__file__).parent
+PASTA_CANONICA = BASE_DIR / 'dados_canonicos'
+ARQUIVO_INDICE = PASTA_CANONICA / 'indice.json'
+
+# Incrementar quando as colunas, fórmulas ou ALIASES de times mudarem (força reconstrução)
+VERSAO_TABELA = 5
+
+LIGAS = [
+    'B1', 'D1', 'D2', 'E0', 'E1', 'F1', 'F2', 'G1', 'I1', 'I2', 'N1', 'P1',
+    'SP1', 'SP2', 'T1', 'ARG', 'AUT', 'BRA', 'CHN', 'DNK', 'FIN', 'IRL',
+    'JPN', 'MEX', 'NOR', 'POL', 'ROU', 'RUS', 'SWE', 'SWZ', 'USA',
+]
+
+COLUNAS = ['liga', 'temporada', 'data', 'dia', 'home', 'away', 'id_home', 'id_away', 'gols_h', 'gols_a',
+           'odd_h', 'odd_a', 'fonte_odds', 'prob_h', 'prob_a', 'CGH', 'CGA', 'VGH', 'VGA']
+
+_CACHE = {}
+_lock = threading.Lock()
+
+
+def arquivo_liga(liga):
+    """CSV de origem da liga (dados_ligas ou, na falta, dados_ligas_new)"""
+    arquivo = BASE_DIR / 'dados_ligas' / f'{liga}_completo.csv'
+    if not arquivo.exists():
+        arquivo = BASE_DIR / 'dados_ligas_new' / f'{liga}.csv'
+    return arquivo
+
+
+def _unificar_odds(df, esquema):
+    """
+    odd_h, odd_a e fonte_odds do par odds_range do esquema (mesma escolha por
+    arquivo do BacktestEngine); NaN onde o par não tem as duas odds válidas
+    """
+    odd_h = pd.Series(np.nan, index=df.index)
+    odd_a = pd.Series(np.nan, index=df.index)
+    fonte = pd.Series(None, index=df.index, dtype=object)
+
+    par = esquema.get('odds_range')
+    if not par or not set(par) <= set(df.columns):
+        return odd_h, odd_a, fonte
+    h_col, a_col = par
+    h = pd.to_numeric(df[h_col], errors='coerce')
+    a = pd.to_numeric(df[a_col], errors='coerce')
+    usar = (h > 0) & (a > 0)
+    odd_h[usar] = h[usar]
+    odd_a[usar] = a[usar]
+    fonte[usar] = h_col[:-1]
+    return odd_h, odd_a, fonte
+
+
+def normalizar_partidas(df, liga, esquema, times=None):
+    """
+    Converte um DataFrame no layout de origem para a tabela canônica.
+
+    Args:
+        df: dados brutos da liga
+        liga: código da liga
+        esquema: esquema do arquivo (esquema_ligas.esquema_liga)
+        times: DicionarioTimes da liga (padrão: criado com os times do df)
+
+    Returns:
+        DataFrame com COLUNAS, ordenado por data
+    """
+    coluna_season = esquema['coluna_season']
+    gols_h = pd.to_numeric(df[esquema['coluna_gols_home']], errors='coerce')
+    gols_a = pd.to_numeric(df[esquema['coluna_gols_away']], errors='coerce')
+    odd_h, odd_a, fonte = _unificar_odds(df, esquema)
+    home = df[esquema['coluna_home']].astype(str).str.strip()
+    away = df[esquema['coluna_away']].astype(str).str.strip()
+    if times is None:
+        times = DicionarioTimes.de_colunas(home, away)
+
+    tabela = pd.DataFrame({
+        'liga': liga,
+        'temporada': (df[coluna_season].astype(str).str.strip() if coluna_season else ''),
+        'data': converter_datas(df[esquema['coluna_data']], esquema['formatos_data']),
+        'home': home,
+        'away': away,
+        'id_home': times.codificar(home),
+        'id_away': times.codificar(away),
+        'gols_h': gols_h,
+        'gols_a': gols_a,
+        'odd_h': odd_h,
+        'odd_a': odd_a,
+        'fonte_odds': fonte,
+    })
+    tabela['dia'] = dias_epoca(tabela['data'])
+    tabela['prob_h'] = 1 / tabela['odd_h']
+    tabela['prob_a'] = 1 / tabela['odd_a']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        tabela['CGH'] = np.where(gols_h == 0, 1.0, 1 / (odd_h * gols_h))
+        tabela['CGA'] = np.where(gols_a == 0, 1.0, 1 / (odd_a * gols_a))
+        tabela['VGH'] = gols_h / odd_a
+        tabela['VGA'] = gols_a / odd_h
+    # Sem placar ou sem odds: sem coeficientes
+    for col in ['CGH', 'CGA', 'VGH', 'VGA']:
+        tabela[col] = tabela[col].replace([np.inf, -np.inf], np.nan)
+        tabela.loc[gols_h.isna() | gols_a.isna() | odd_h.isna(), col] = np.nan
+
+    tabela = tabela.sort_values('data', kind='stable').reset_index(drop=True)
+    for col in ['liga', 'temporada', 'fonte_odds']:
+        tabela[col] = tabela[col].astype('category')
+    return tabela[COLUNAS]
+
+
+def _ler_indice():
+    try:
+        with open(ARQUIVO_INDICE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def _gravar_indice(indice):
+    PASTA_CANONICA.mkdir(exist_ok=True)
+    temporario = ARQUIVO_INDICE.with_suffix(f'.{os.getpid()}.tmp')
+    with open(temporario, 'w', encoding='utf-8') as f:
+        json.dump(indice, f, ensure_ascii=False, indent=2)
+    os.replace(temporario, ARQUIVO_INDICE)
+
+
+def construir_tabela(liga):
+    """
+    Lê o CSV de origem, normaliza e grava dados_canonicos/<LIGA>.pkl.
+
+    Returns:
+        (tabela, DicionarioTimes) ou None se não houver arquivo de origem
+    """
+    origem = arquivo_liga(liga)
+    if not origem.exists():
+        return None
+
+    df = pd.read_csv(origem, low_memory=False)
+    esquema = esquema_liga(origem, df)
+    times = DicionarioTimes.de_colunas(df[esquema['coluna_home']], df[esquema['coluna_away']])
+    tabela = normalizar_partidas(df, liga, esquema, times)
+
+    PASTA_CANONICA.mkdir(exist_ok=True)
+    destino = PASTA_CANONICA / f'{liga}.pkl'
+    temporario = destino.with_suffix(f'.{os.getpid()}.tmp')
+    tabela.to_pickle(temporario)
+    os.replace(temporario, destino)
+
+    indice = _ler_indice()
+    indice[liga] = {
+        'versao': VERSAO_TABELA,
+        'origem': str(origem.relative_to(BASE_DIR)),
+        'hash_origem': hash_conteudo(origem),
+        'assinatura_origem': assinatura_arquivo(origem),
+        'linhas': len(tabela),
+        'fontes_odds': tabela['fonte_odds'].value_counts().to_dict(),
+        'times': times.nomes,
+    }
+    _gravar_indice(indice)
+    return tabela, times
+
+
+def _atualizada(liga, origem):
+    """True se a tabela gravada corresponde ao CSV de origem atual"""
+    registro = _ler_indice().get(liga)
+    if not registro or registro.get('versao') != VERSAO_TABELA:
+        return False
+    if not (PASTA_CANONICA / f'{liga}.pkl').exists():
+        return False
+    if registro.get('assinatura_origem') == assinatura_arquivo(origem):
+        return True
+    # Assinatura mudou (cópia, touch): compara o conteúdo
+    return hash_conteudo(origem) == registro.get('hash_origem')
+
+
+def carregar_tabela(liga):
+    """
+    Tabela canônica da liga, reconstruída só se a origem mudou.
+
+    Returns:
+        DataFrame com COLUNAS (None se a liga não tiver arquivo de origem)
+    """
+    origem = arquivo_liga(liga)
+    assinatura = assinatura_arquivo(origem)
+    if assinatura is None:
+        return None
+
+    with _lock:
+        em_memoria = _CACHE.get(liga)
+        if em_memoria and em_memoria[0] == assinatura:
+            return em_memoria[1]
+
+        if _atualizada(liga, origem):
+            tabela = pd.read_pickle(PASTA_CANONICA / f'{liga}.pkl')
+            times = DicionarioTimes(_ler_indice()[liga]['times'])
+        else:
+            tabela, times = construir_tabela(liga)
+        _CACHE[liga] = (assinatura, tabela, times)
+        return tabela
+
+
+def dicionario_liga(liga):
+    """DicionarioTimes da tabela canônica da liga (None sem arquivo de origem)"""
+    if carregar_tabela(liga) is None:
+        return None
+    return _CACHE[liga][2]
+
+
+def main():
+    ligas = [l for l in sys.argv[1:] if not l.startswith('-')] or LIGAS
+    print(f"{'='*80}")
+    print(f"TABELA CANÔNICA DE PARTIDAS - {len(ligas)} ligas")
+    print(f"{'='*80}\n")
+
+    for liga in ligas:
+        origem = arquivo_liga(liga)
+        if not origem.exists():
+            print(f"  ⚠️  {liga}: arquivo de origem não encontrado")
+            continue
+        try:
+            tabela, times = construir_tabela(liga)
+            fontes = ', '.join(f"{k}={v}" for k, v in tabela['fonte_odds'].value_counts().items() if v)
+            print(f"  ✅ {liga}: {len(tabela)} jogos, {len(times)} times ({fontes})")
+        except Exception as e:
+            print(f"  ❌ {liga}: {e}")
+
+    print(f"\nTabelas em {PASTA_CANONICA}")
+
+
+if __name__ == '__main__':
+    main()
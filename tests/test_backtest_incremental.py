@@ -0,0 +1,119 @@
+"""
+Modo incremental do BacktestEngine: continuar uma temporada cortada no meio
+tem que dar o mesmo resultado que processá-la inteira de uma vez.
+
+Usa os dados reais da Premier League (dados_ligas/E0_completo.xlsx),
+convertidos para CSV numa pasta temporária com a mesma estrutura do projeto
+e com as colunas CGH/CGA/VGH/VGA de adicionar_colunas_calculadas.py.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ))
+sys.path.insert(0, str(RAIZ / 'backtest'))
+
+from adicionar_colunas_calculadas import processar_arquivo  # noqa: E402
+from backtest_engine import BacktestEngine  # noqa: E402
+
+LIGA = 'E0'
+TEMPORADA = '2023-24'
+SEASON = '2023/2024'
+CORTE = '2024-01-15'
+FIM_TEMPORADA = '2024-06-30'
+
+
+@pytest.fixture(scope='module')
+def projeto(tmp_path_factory):
+    """Pasta com dados_ligas/E0_completo.csv e o DataFrame original"""
+    raiz = tmp_path_factory.mktemp('projeto')
+    (raiz / 'dados_ligas').mkdir()
+    arquivo = raiz / 'dados_ligas' / f'{LIGA}_completo.csv'
+    pd.read_excel(RAIZ / 'dados_ligas' / f'{LIGA}_completo.xlsx').to_csv(arquivo, index=False)
+    jogos, mensagem = processar_arquivo(arquivo)
+    assert jogos, mensagem
+    return raiz, pd.read_csv(arquivo, low_memory=False)
+
+
+def _pasta_backtest(projeto, nome):
+    """Pasta de backtest com o treino recriado (jogos anteriores à temporada)"""
+    raiz, df = projeto
+    pasta = raiz / nome
+    pasta.mkdir(exist_ok=True)
+    _recriar_treino(pasta, df)
+    return pasta
+
+
+def _recriar_treino(pasta, df):
+    df[df['Season'].astype(str) < SEASON].to_csv(pasta / f'{LIGA}_treino.csv', index=False)
+
+
+def _processar(engine):
+    while engine.processar_rodada(salvar=False) is not None:
+        pass
+    engine.salvar_estado()
+    return engine.resultados
+
+
+def _normalizar(entradas):
+    return json.loads(json.dumps(entradas, default=str))
+
+
+def test_incremental_igual_ao_recalculo_completo(projeto):
+    _, df = projeto
+
+    pasta = _pasta_backtest(projeto, 'incremental')
+    cortado = _processar(BacktestEngine(LIGA, TEMPORADA, data_limite=CORTE, pasta_backtest=pasta))
+    assert cortado['completo'] and cortado['entradas']
+
+    # Continuação com a temporada inteira, como em processar_backtest(incremental=True)
+    _recriar_treino(pasta, df)
+    engine = BacktestEngine(LIGA, TEMPORADA, data_limite=FIM_TEMPORADA, pasta_backtest=pasta)
+    novos = engine.sincronizar_novos_jogos()
+    assert 0 < novos < len(engine.df_teste)  # continuou, não recalculou do zero
+    assert engine.resultados['rodada_atual'] > 1
+    engine.restaurar_treino()
+    incremental = _processar(engine)
+
+    completo = _processar(BacktestEngine(LIGA, TEMPORADA, data_limite=FIM_TEMPORADA,
+                                         pasta_backtest=_pasta_backtest(projeto, 'completo')))
+
+    assert len(completo['entradas']) > len(cortado['entradas'])
+    assert _normalizar(incremental['entradas']) == _normalizar(completo['entradas'])
+    for campo in ('jogos_processados', 'rodada_atual', 'acertos', 'erros', 'ultima_data'):
+        assert incremental[campo] == completo[campo], campo
+    assert incremental['lucro_total'] == pytest.approx(completo['lucro_total'])
+
+
+def test_sem_ponto_de_retomada_recalcula_a_temporada(projeto):
+    _, df = projeto
+
+    pasta = _pasta_backtest(projeto, 'sem_retomada')
+    engine = BacktestEngine(LIGA, TEMPORADA, data_limite=CORTE, pasta_backtest=pasta)
+    _processar(engine)
+
+    # Resultados de antes do ponto de retomada: só a contagem de jogos
+    for campo in ('ultima_data', 'rodadas', 'jogos_teste', 'assinatura_teste'):
+        engine.resultados.pop(campo, None)
+    engine.salvar_resultados()
+
+    _recriar_treino(pasta, df)
+    engine = BacktestEngine(LIGA, TEMPORADA, data_limite=FIM_TEMPORADA, pasta_backtest=pasta)
+    assert engine.sincronizar_novos_jogos() == len(engine.df_teste)
+    assert engine.resultados['jogos_processados'] == 0
+    assert engine.resultados['entradas'] == []
+
+
+def test_sem_jogos_novos_nao_reprocessa(projeto):
+    _, df = projeto
+
+    pasta = _pasta_backtest(projeto, 'sem_novos')
+    _processar(BacktestEngine(LIGA, TEMPORADA, data_limite=CORTE, pasta_backtest=pasta))
+
+    _recriar_treino(pasta, df)
+    engine = BacktestEngine(LIGA, TEMPORADA, data_limite=CORTE, pasta_backtest=pasta)
+    assert engine.sincronizar_novos_jogos() == 0
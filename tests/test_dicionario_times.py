@@ -0,0 +1,53 @@
+"""
+Dicionário de times: grafias diferentes do mesmo time caem no mesmo id
+"""
+import sys
+import unicodedata
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dicionario_times import ALIASES, SEM_ID, DicionarioTimes, normalizar_nome  # noqa: E402
+
+
+@pytest.mark.parametrize('fixture, historico', [
+    ('Manchester United', 'Man United'),
+    ('Nottingham Forest', "Nott'm Forest"),
+    ('Atlético Madrid', 'Ath Madrid'),
+    ('Borussia Mönchengladbach', "M'gladbach"),
+    ('Paris Saint-Germain', 'Paris SG'),
+    ('Ham-Kam', 'HamKam'),
+    ('Gornik Z.', 'Gornik Zabrze'),
+])
+def test_alias_resolve_para_o_mesmo_id(fixture, historico):
+    times = DicionarioTimes.de_colunas(pd.Series([historico, 'Arsenal']), pd.Series(['Chelsea']))
+    assert times.id(fixture) != SEM_ID
+    assert times.id(fixture) == times.id(historico)
+    assert len(times) == 3
+
+
+def test_grafias_no_mesmo_arquivo_compartilham_o_id():
+    times = DicionarioTimes.de_colunas(pd.Series(['Man United', 'Chelsea']),
+                                       pd.Series(['Manchester United', 'Man Utd']))
+    assert len(times) == 2
+    ids = times.codificar(['Man United', 'Manchester United', 'man utd', 'Chelsea'])
+    assert ids[0] == ids[1] == ids[2] != ids[3]
+
+
+def test_times_diferentes_continuam_separados():
+    times = DicionarioTimes(['Man United', 'Man City', 'Sheffield United', 'Sheffield Weds'])
+    assert len(times) == 4
+    assert times.id('Manchester City') != times.id('Manchester United')
+    assert times.id('Sheffield Wednesday') != times.id('Sheffield Utd')
+
+
+def test_aliases_normalizados_e_sem_encadeamento():
+    for origem, destino in ALIASES.items():
+        # Chave e valor já na forma de normalizar_nome (sem acentos, minúsculo, espaços simples)
+        sem_acento = ''.join(c for c in unicodedata.normalize('NFKD', origem) if not unicodedata.combining(c))
+        assert origem == ' '.join(sem_acento.casefold().split())
+        assert destino not in ALIASES, destino
+        assert normalizar_nome(origem) == destino
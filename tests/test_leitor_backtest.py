@@ -0,0 +1,40 @@
+"""
+Agrupamento dos relatórios de validação: lucro das vitórias com desconto de 4,5%
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from leitor_backtest import agrupar, aplicar_desconto_lucro, atende_criterios  # noqa: E402
+
+VISAO = ('liga', ('tipo', 'entrada'), 'dxg')
+
+
+def _entradas(*lps):
+    return [{'liga': 'E0', 'entrada': 'HOME', 'dxg': 'FH', 'lp': lp} for lp in lps]
+
+
+def test_desconto_so_nas_vitorias():
+    assert aplicar_desconto_lucro(1.0) == pytest.approx(0.955)
+    assert aplicar_desconto_lucro(-1.0) == -1.0
+    assert aplicar_desconto_lucro(0) == 0
+
+
+def test_agrupar_aplica_o_desconto():
+    grupos, total = agrupar(_entradas(1.0, 1.0, -1.0, 'x'), {'v': VISAO})
+    grupo = grupos['v'][('E0', 'HOME', 'FH')]
+    assert total == 4
+    assert grupo['lucro'] == pytest.approx(0.91)
+    assert grupo['roi'] == pytest.approx(22.75)
+    assert (grupo['positivos'], grupo['negativos']) == (2, 2)
+
+
+def test_criterios_sobre_o_lucro_com_desconto():
+    # 75 entradas com lucro bruto 21 (ROI 28%): com desconto o lucro cai para 19,1 < 20
+    entradas = _entradas(*([1.0] * 48 + [-1.0] * 27))
+    grupo = agrupar(entradas, {'v': VISAO})[0]['v'][('E0', 'HOME', 'FH')]
+    assert grupo['lucro'] == pytest.approx(48 * 0.955 - 27)
+    assert not atende_criterios(grupo)
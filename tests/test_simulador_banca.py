@@ -0,0 +1,74 @@
+"""
+simular (Monte Carlo) e _curva_banca (backtest sequencial) seguem a mesma
+regra de stake e de ruína: a mesma política gera a mesma curva nos dois.
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simulador_banca import _curva_banca, simular  # noqa: E402
+
+BANKROLL = 250.0
+
+# Três derrotas seguidas quebram a banca com stake fixo de 100: 250 → 150 → 50 →
+# aposta os 50 que restam → 0. Depois disso nenhuma vitória pode recuperar a banca.
+RETORNO_RUINA = np.array([-1.0, -1.0, 0.9, -1.0, -1.0, -1.0, 1.5, 0.8, -1.0, 2.0])
+
+POLITICAS = {
+    'flat': (np.zeros(len(RETORNO_RUINA)), 100.0, 100.0),
+    'adaptativo': (np.full(len(RETORNO_RUINA), 0.3), 60.0, 120.0),
+    'faixa_odd': (np.full(len(RETORNO_RUINA), 0.5), 0.0, np.inf),
+}
+
+
+def _pelo_simular(politica, retorno):
+    apostas = {'retorno': retorno}
+    indices = np.arange(len(retorno)).reshape(-1, 1)
+    r = simular(apostas, {politica: POLITICAS[politica]}, BANKROLL, indices)[politica]
+    return {chave: float(valor[0]) for chave, valor in r.items()}
+
+
+def _pela_curva(politica, retorno):
+    fracao, minimo, maximo = POLITICAS[politica]
+    banca, stake = _curva_banca(fracao, minimo, maximo, retorno, BANKROLL)
+    pico = np.maximum.accumulate(np.concatenate(([BANKROLL], banca)))[1:]
+    return {
+        'final': float(banca[-1]),
+        'minimo': float(min(BANKROLL, banca.min())),
+        'max_drawdown': float(((pico - banca) / pico).max()),
+    }, banca, stake
+
+
+@pytest.mark.parametrize('politica', sorted(POLITICAS))
+def test_simular_e_curva_concordam(politica):
+    esperado = _pelo_simular(politica, RETORNO_RUINA)
+    obtido, banca, stake = _pela_curva(politica, RETORNO_RUINA)
+    assert obtido == pytest.approx(esperado)
+    assert (banca >= 0).all()
+    assert (stake >= 0).all()
+
+
+def test_ruina_com_stake_fixo():
+    esperado = _pelo_simular('flat', RETORNO_RUINA)
+    _, banca, stake = _pela_curva('flat', RETORNO_RUINA)
+
+    assert esperado['final'] == 0.0
+    assert banca.tolist()[:5] == [150.0, 50.0, 95.0, 0.0, 0.0]
+    # A última aposta antes da ruína usa só o que restava na banca
+    assert stake.tolist()[:4] == [100.0, 100.0, 50.0, 95.0]
+    # Banca zerada: sem stake e sem recuperação
+    assert not stake[4:].any()
+    assert not banca[3:].any()
+
+
+def test_stake_fixo_sem_ruina_igual_ao_cumsum():
+    retorno = np.array([0.5, -1.0, 0.9, -1.0, 1.2])
+    esperado = _pelo_simular('flat', retorno)
+    _, banca, stake = _pela_curva('flat', retorno)
+    assert banca.tolist() == pytest.approx(BANKROLL + np.cumsum(100.0 * retorno))
+    assert (stake == 100.0).all()
+    assert banca[-1] == pytest.approx(esperado['final'])
@@ -1,103 +1,209 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import hashlib
 import json
+import os
+import threading
+from pathlib import Path
 
-def carregar_combinacoes_validadas():
+from leitor_backtest import (BACKTEST_ACUMULADO, CRITERIOS, RESULTADOS_DIR,
+                             agrupar_backtest, separar_por_criterios)
+
+# Cache em disco das combinações calculadas a partir do backtest
+ARQUIVO_CACHE = Path(__file__).parent / 'fixtures' / 'combinacoes_validadas.json'
+
+# Incrementar quando o formato do cache ou a regra de cálculo mudar
+VERSAO_FORMATO = 2
+
+# Agrupamento usado na validação: liga + tipo de entrada + DxG
+VISAO = ('liga', ('tipo', 'entrada'), 'dxg')
+
+# As 73 combinações validadas do último relatório manual.
+# Usadas apenas quando não há backtest em disco para calcular o conjunto.
+COMBINACOES_PADRAO = frozenset([
+    ('IRL', 'AWAY', 'LA'),
+    ('BRA', 'AWAY', 'FA'),
+    ('CHN', 'AWAY', 'FA'),
+    ('IRL', 'HOME', 'LH'),
+    ('SWZ', 'AWAY', 'LH'),
+    ('FIN', 'AWAY', 'LA'),
+    ('CHN', 'HOME', 'FH'),
+    ('E0', 'AWAY', 'FA'),
+    ('JPN', 'AWAY', 'LH'),
+    ('N1', 'AWAY', 'FA'),
+    ('SWE', 'AWAY', 'FA'),
+    ('RUS', 'AWAY', 'LH'),
+    ('P1', 'AWAY', 'FA'),
+    ('F1', 'AWAY', 'FA'),
+    ('CHN', 'HOME', 'LH'),
+    ('JPN', 'AWAY', 'LA'),
+    ('SWE', 'AWAY', 'LA'),
+    ('BRA', 'HOME', 'FH'),
+    ('IRL', 'AWAY', 'FA'),
+    ('JPN', 'AWAY', 'FA'),
+    ('BRA', 'HOME', 'LH'),
+    ('FIN', 'HOME', 'LH'),
+    ('I2', 'AWAY', 'FA'),
+    ('CHN', 'AWAY', 'EQ'),
+    ('SP1', 'AWAY', 'FA'),
+    ('IRL', 'HOME', 'FH'),
+    ('NOR', 'HOME', 'FH'),
+    ('ROU', 'AWAY', 'FA'),
+    ('SWZ', 'AWAY', 'FA'),
+    ('USA', 'AWAY', 'LA'),
+    ('NOR', 'AWAY', 'LH'),
+    ('SWE', 'HOME', 'FH'),
+    ('CHN', 'AWAY', 'LA'),
+    ('T1', 'HOME', 'LH'),
+    ('E0', 'AWAY', 'LH'),
+    ('BRA', 'AWAY', 'LH'),
+    ('P1', 'HOME', 'FH'),
+    ('SP2', 'AWAY', 'LA'),
+    ('POL', 'AWAY', 'FA'),
+    ('ROU', 'HOME', 'LH'),
+    ('F1', 'AWAY', 'LA'),
+    ('USA', 'AWAY', 'FA'),
+    ('SWE', 'HOME', 'LH'),
+    ('NOR', 'AWAY', 'LA'),
+    ('BRA', 'AWAY', 'LA'),
+    ('T1', 'AWAY', 'FA'),
+    ('E1', 'HOME', 'FH'),
+    ('FIN', 'HOME', 'EQ'),
+    ('BRA', 'AWAY', 'EQ'),
+    ('E1', 'AWAY', 'FA'),
+    ('E1', 'AWAY', 'EQ'),
+    ('SWE', 'AWAY', 'EQ'),
+    ('E0', 'HOME', 'LH'),
+    ('E1', 'AWAY', 'LA'),
+    ('N1', 'HOME', 'FH'),
+    ('N1', 'AWAY', 'LA'),
+    ('E0', 'AWAY', 'LA'),
+    ('F1', 'HOME', 'FH'),
+    ('SP1', 'HOME', 'FH'),
+    ('JPN', 'AWAY', 'EQ'),
+    ('USA', 'HOME', 'FH'),
+    ('SWE', 'HOME', 'EQ'),
+    ('E0', 'HOME', 'FH'),
+    ('JPN', 'HOME', 'FH'),
+    ('POL', 'HOME', 'LH'),
+    ('F2', 'HOME', 'FH'),
+    ('JPN', 'HOME', 'LH'),
+    ('MEX', 'AWAY', 'EQ'),
+    ('T1', 'HOME', 'FH'),
+    ('MEX', 'HOME', 'LH'),
+    ('USA', 'AWAY', 'EQ'),
+    ('I2', 'HOME', 'FH'),
+    ('SP2', 'HOME', 'FH'),
+])
+
+_combinacoes_processo = None
+_lock = threading.Lock()
+
+
+def _carimbo_fontes():
     """
-    Carrega as 73 combinações validadas do relatório.
-    Retorna um set com as combinações no formato: 'LIGA_TIPO_DXG'
-    
+    Carimbo de versão das fontes do backtest: muda sempre que o acumulado ou
+    algum backtest_resultados_*.json for criado, alterado ou removido.
+    """
+    fontes = []
+    arquivos = [BACKTEST_ACUMULADO] + sorted(Path(RESULTADOS_DIR).glob("backtest_resultados_*.json"))
+    for arquivo in arquivos:
+        try:
+            st = arquivo.stat()
+        except OSError:
+            continue
+        fontes.append(f"{arquivo.name}:{st.st_mtime_ns}:{st.st_size}")
+
+    if not fontes:
+        return None
+
+    conteudo = json.dumps({'formato': VERSAO_FORMATO, 'criterios': CRITERIOS, 'fontes': fontes})
+    return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()
+
+
+def _ler_cache():
+    try:
+        with open(ARQUIVO_CACHE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _salvar_cache(carimbo, combinacoes):
+    """Grava o cache de forma atômica (arquivo temporário + replace)"""
+    dados = {
+        'versao': carimbo,
+        'formato': VERSAO_FORMATO,
+        'criterios': CRITERIOS,
+        'total': len(combinacoes),
+        'combinacoes': sorted(list(c) for c in combinacoes)
+    }
+    temporario = ARQUIVO_CACHE.with_suffix('.json.tmp')
+    try:
+        ARQUIVO_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados, f, ensure_ascii=False, indent=2)
+        os.replace(temporario, ARQUIVO_CACHE)
+    except OSError as e:
+        print(f"[AVISO] Não foi possível salvar {ARQUIVO_CACHE.name}: {e}")
+
+
+def calcular_combinacoes_validadas():
+    """
+    Calcula as combinações (liga, tipo, dxg) que atendem aos critérios
+    (>= 75 entradas, ROI >= 5%, lucro >= 20) a partir do backtest em disco.
+    """
+    grupos, _ = agrupar_backtest(VISAO)
+    validados, _ = separar_por_criterios(grupos)
+    return frozenset(validados.keys())
+
+
+def carregar_combinacoes_validadas(recarregar=False):
+    """
+    Carrega as combinações validadas como um frozenset de tuplas (liga, tipo, dxg).
+
+    O conjunto é calculado a partir do backtest acumulado e guardado em
+    fixtures/combinacoes_validadas.json com um carimbo das fontes; só é
+    recalculado quando algum arquivo de backtest muda. Dentro do processo,
+    a primeira chamada é memorizada (use recarregar=True para reavaliar).
+
     Returns:
-        set: Conjunto de combinações validadas
+        frozenset: Conjunto de combinações validadas
     """
-    combinacoes = set()
-    
-    # As 73 combinações validadas extraídas do relatório
-    combinacoes_data = [
-        ('IRL', 'AWAY', 'LA'),
-        ('BRA', 'AWAY', 'FA'),
-        ('CHN', 'AWAY', 'FA'),
-        ('IRL', 'HOME', 'LH'),
-        ('SWZ', 'AWAY', 'LH'),
-        ('FIN', 'AWAY', 'LA'),
-        ('CHN', 'HOME', 'FH'),
-        ('E0', 'AWAY', 'FA'),
-        ('JPN', 'AWAY', 'LH'),
-        ('N1', 'AWAY', 'FA'),
-        ('SWE', 'AWAY', 'FA'),
-        ('RUS', 'AWAY', 'LH'),
-        ('P1', 'AWAY', 'FA'),
-        ('F1', 'AWAY', 'FA'),
-        ('CHN', 'HOME', 'LH'),
-        ('JPN', 'AWAY', 'LA'),
-        ('SWE', 'AWAY', 'LA'),
-        ('BRA', 'HOME', 'FH'),
-        ('IRL', 'AWAY', 'FA'),
-        ('JPN', 'AWAY', 'FA'),
-        ('BRA', 'HOME', 'LH'),
-        ('FIN', 'HOME', 'LH'),
-        ('I2', 'AWAY', 'FA'),
-        ('CHN', 'AWAY', 'EQ'),
-        ('SP1', 'AWAY', 'FA'),
-        ('IRL', 'HOME', 'FH'),
-        ('NOR', 'HOME', 'FH'),
-        ('ROU', 'AWAY', 'FA'),
-        ('SWZ', 'AWAY', 'FA'),
-        ('USA', 'AWAY', 'LA'),
-        ('NOR', 'AWAY', 'LH'),
-        ('SWE', 'HOME', 'FH'),
-        ('CHN', 'AWAY', 'LA'),
-        ('T1', 'HOME', 'LH'),
-        ('E0', 'AWAY', 'LH'),
-        ('BRA', 'AWAY', 'LH'),
-        ('P1', 'HOME', 'FH'),
-        ('SP2', 'AWAY', 'LA'),
-        ('POL', 'AWAY', 'FA'),
-        ('ROU', 'HOME', 'LH'),
-        ('F1', 'AWAY', 'LA'),
-        ('USA', 'AWAY', 'FA'),
-        ('SWE', 'HOME', 'LH'),
-        ('NOR', 'AWAY', 'LA'),
-        ('BRA', 'AWAY', 'LA'),
-        ('T1', 'AWAY', 'FA'),
-        ('E1', 'HOME', 'FH'),
-        ('FIN', 'HOME', 'EQ'),
-        ('BRA', 'AWAY', 'EQ'),
-        ('E1', 'AWAY', 'FA'),
-        ('E1', 'AWAY', 'EQ'),
-        ('SWE', 'AWAY', 'EQ'),
-        ('E0', 'HOME', 'LH'),
-        ('E1', 'AWAY', 'LA'),
-        ('N1', 'HOME', 'FH'),
-        ('N1', 'AWAY', 'LA'),
-        ('E0', 'AWAY', 'LA'),
-        ('F1', 'HOME', 'FH'),
-        ('SP1', 'HOME', 'FH'),
-        ('JPN', 'AWAY', 'EQ'),
-        ('USA', 'HOME', 'FH'),
-        ('SWE', 'HOME', 'EQ'),
-        ('E0', 'HOME', 'FH'),
-        ('JPN', 'HOME', 'FH'),
-        ('POL', 'HOME', 'LH'),
-        ('F2', 'HOME', 'FH'),
-        ('JPN', 'HOME', 'LH'),
-        ('MEX', 'AWAY', 'EQ'),
-        ('T1', 'HOME', 'FH'),
-        ('MEX', 'HOME', 'LH'),
-        ('USA', 'AWAY', 'EQ'),
-        ('I2', 'HOME', 'FH'),
-        ('SP2', 'HOME', 'FH'),
-    ]
-    
-    for liga, tipo, dxg in combinacoes_data:
-        chave = f"{liga}_{tipo}_{dxg}"
-        combinacoes.add(chave)
-    
-    return combinacoes
+    global _combinacoes_processo
+
+    with _lock:
+        if _combinacoes_processo is not None and not recarregar:
+            return _combinacoes_processo
+
+        carimbo = _carimbo_fontes()
+        cache = _ler_cache()
+
+        if carimbo is None:
+            # Sem backtest em disco: usar o cache antigo, se houver, ou o conjunto padrão
+            if cache and cache.get('formato') == VERSAO_FORMATO:
+                combinacoes = frozenset(tuple(c) for c in cache.get('combinacoes', []))
+            else:
+                combinacoes = COMBINACOES_PADRAO
+        elif cache and cache.get('versao') == carimbo:
+            combinacoes = frozenset(tuple(c) for c in cache.get('combinacoes', []))
+        else:
+            try:
+                combinacoes = calcular_combinacoes_validadas()
+                _salvar_cache(carimbo, combinacoes)
+            except Exception as e:
+                print(f"[AVISO] Falha ao recalcular combinações validadas: {e}")
+                if cache and cache.get('formato') == VERSAO_FORMATO:
+                    combinacoes = frozenset(tuple(c) for c in cache.get('combinacoes', []))
+                else:
+                    combinacoes = COMBINACOES_PADRAO
+
+        _combinacoes_processo = combinacoes
+        return combinacoes
 
 
-def validar_jogo(liga, tipo_entrada, dxg, combinacoes_validadas):
+def validar_jogo(liga, tipo_entrada, dxg, combinacoes_validadas=None):
     """
     Valida se uma combinação específica está nas combinações validadas.
     
@@ -105,17 +211,18 @@ def validar_jogo(liga, tipo_entrada, dxg, combinacoes_validadas):
         liga (str): Código da liga (ex: 'BRA', 'E0')
         tipo_entrada (str): Tipo de entrada ('HOME' ou 'AWAY')
         dxg (str): Tipo de DxG ('FH', 'LH', 'EQ', 'LA', 'FA')
-        combinacoes_validadas (set): Set com as combinações validadas
+        combinacoes_validadas (frozenset): Combinações validadas (padrão: as do processo)
     
     Returns:
         bool: True se a combinação está validada, False caso contrário
     """
-    chave = f"{liga}_{tipo_entrada}_{dxg}"
-    return chave in combinacoes_validadas
+    if combinacoes_validadas is None:
+        combinacoes_validadas = carregar_combinacoes_validadas()
+    return (liga, tipo_entrada, dxg) in combinacoes_validadas
 
 
 if __name__ == "__main__":
     # Teste
     combinacoes = carregar_combinacoes_validadas()
     print(f"Total de combinações validadas: {len(combinacoes)}")
-    print(f"Exemplo de combinação: BRA_AWAY_FA - {'Validada' if 'BRA_AWAY_FA' in combinacoes else 'Não validada'}")
+    print(f"Exemplo de combinação: BRA_AWAY_FA - {'Validada' if ('BRA', 'AWAY', 'FA') in combinacoes else 'Não validada'}")
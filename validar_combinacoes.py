@@ -1,68 +1,19 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
-import requests
-import json
+from leitor_backtest import CRITERIOS, agrupar_backtest, separar_por_criterios
 
-CRITERIOS = {
-    'min_entradas': 75,
-    'min_roi_pct': 5.0,
-    'min_lucro': 20.0
-}
+# Agrupar por liga e tipo de entrada (HOME/AWAY)
+VISAO = ('liga', ('tipo', 'entrada'))
 
-try:
-    response = requests.get('http://localhost:5001/api/backtest_acumulado')
-    data = response.json()
-    
-    if not data.get('success'):
-        print("❌ API retornou erro:", data.get('message'))
-        exit(1)
-    
-    entradas = data.get('entradas', [])
-    
-    # Agrupar por liga e tipo de entrada
-    combinacoes = {}
-    
-    for entrada in entradas:
-        liga = entrada.get('liga', 'Desconhecida')
-        entrada_tipo = entrada.get('entrada', 'UNKNOWN')
-        
-        chave = f"{liga}_{entrada_tipo}"
-        
-        if chave not in combinacoes:
-            combinacoes[chave] = {
-                'liga': liga,
-                'tipo': entrada_tipo,
-                'total': 0,
-                'lucro': 0.0,
-                'entradas_list': []
-            }
-        
-        combinacoes[chave]['total'] += 1
-        lp = float(entrada.get('lp', 0))
-        combinacoes[chave]['lucro'] += lp
-        combinacoes[chave]['entradas_list'].append(entrada)
+
+def validar_combinacoes(combinacoes=None):
+    """Mostra as combinações liga/tipo que atendem (ou não) aos critérios"""
+    if combinacoes is None:
+        combinacoes, _ = agrupar_backtest(VISAO)
     
     # Filtrar combinações que atendem aos critérios
-    combinacoes_validadas = {}
-    combinacoes_invalidas = {}
-    
-    for chave, dados in combinacoes.items():
-        total = dados['total']
-        lucro = dados['lucro']
-        roi = (lucro / total * 100) if total > 0 else 0
-        
-        # Verificar critérios
-        atende_quantidade = total >= CRITERIOS['min_entradas']
-        atende_roi = roi >= CRITERIOS['min_roi_pct']
-        atende_lucro = lucro >= CRITERIOS['min_lucro']
-        
-        dados['roi'] = roi
-        
-        if atende_quantidade and atende_roi and atende_lucro:
-            combinacoes_validadas[chave] = dados
-        else:
-            combinacoes_invalidas[chave] = dados
+    combinacoes_validadas, combinacoes_invalidas = separar_por_criterios(combinacoes)
     
     print()
     print("=" * 110)
@@ -78,7 +29,7 @@ try:
     if combinacoes_validadas:
         for chave in sorted(combinacoes_validadas.keys()):
             dados = combinacoes_validadas[chave]
-            print(f"   {dados['liga']:5} {dados['tipo']:6} | Entradas: {dados['total']:4} | ROI: {dados['roi']:6.2f}% | Lucro: {dados['lucro']:8.2f}")
+            print(f"   {dados['liga']:5} {dados['tipo']:6} | Entradas: {dados['entradas']:4} | ROI: {dados['roi']:6.2f}% | Lucro: {dados['lucro']:8.2f}")
     else:
         print("   ❌ Nenhuma combinação validada encontrada!")
     
@@ -94,7 +45,7 @@ try:
     if combinacoes_invalidas:
         for chave in sorted(combinacoes_invalidas.keys()):
             dados = combinacoes_invalidas[chave]
-            total = dados['total']
+            total = dados['entradas']
             lucro = dados['lucro']
             roi = dados['roi']
             
@@ -124,7 +75,7 @@ try:
     print("📈 ANÁLISE DE CRITÉRIOS NÃO ATENDIDOS:")
     print("-" * 110)
     
-    falha_entradas = sum(1 for d in combinacoes_invalidas.values() if d['total'] < CRITERIOS['min_entradas'])
+    falha_entradas = sum(1 for d in combinacoes_invalidas.values() if d['entradas'] < CRITERIOS['min_entradas'])
     falha_roi = sum(1 for d in combinacoes_invalidas.values() if d['roi'] < CRITERIOS['min_roi_pct'])
     falha_lucro = sum(1 for d in combinacoes_invalidas.values() if d['lucro'] < CRITERIOS['min_lucro'])
     
@@ -134,8 +85,9 @@ try:
     print("=" * 110)
     print()
 
-except requests.exceptions.ConnectionError:
-    print("❌ Erro: Não consegui conectar à API em http://localhost:5001")
-    print("   Verifique se o servidor está rodando: python servidor_api.py")
-except Exception as e:
-    print(f"❌ Erro: {e}")
+
+if __name__ == '__main__':
+    try:
+        validar_combinacoes()
+    except Exception as e:
+        print(f"❌ Erro: {e}")
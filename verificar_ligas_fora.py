@@ -4,7 +4,7 @@
 import requests
 
 try:
-    response = requests.get('http://localhost:5001/api/backtest_acumulado')
+    response = requests.get('http://localhost:5002/api/backtest_acumulado')
     data = response.json()
     
     entradas = data.get('entradas', [])